@@ -5,9 +5,9 @@ Mostly boilerplate generated with `alembic init alembic` command.
 
 from logging.config import fileConfig
 
+import sqlalchemy as sa
 from ska_src_maltopuft_backend.app import models
 from ska_src_maltopuft_backend.core.config import settings
-from ska_src_maltopuft_backend.core.database.database import engine
 
 from alembic import context
 
@@ -53,7 +53,13 @@ def run_migrations_online() -> None:
     In this scenario we need to create an Engine
     and associate a connection with the context.
 
+    Migrations use a single connection, so the engine doesn't pool
+    connections.
     """
+    engine = sa.create_engine(
+        str(settings.MALTOPUFT_POSTGRES_URI),
+        poolclass=sa.pool.NullPool,
+    )
     with engine.connect() as connection:
         context.configure(
             connection=connection, target_metadata=target_metadata,
@@ -61,6 +67,7 @@ def run_migrations_online() -> None:
 
         with context.begin_transaction():
             context.run_migrations()
+    engine.dispose()
 
 
 if context.is_offline_mode():
@@ -0,0 +1,52 @@
+"""Position GiST indexes
+
+Revision ID: 9b1e6f3c2a47
+Revises: c75dc35baec6
+Create Date: 2026-10-18 09:00:12.418305
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b1e6f3c2a47"
+down_revision: str | None = "c75dc35baec6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+POS_INDEXED_TABLES = ("candidate", "known_pulsar")
+
+
+def _has_pg_sphere() -> bool:
+    return bool(
+        op.get_bind()
+        .execute(
+            sa.text("SELECT 1 FROM pg_extension WHERE extname = 'pg_sphere'"),
+        )
+        .scalar(),
+    )
+
+
+def upgrade() -> None:
+    """Add pgSphere GiST indexes on candidate and known pulsar positions."""
+    if not _has_pg_sphere():
+        return
+    for table in POS_INDEXED_TABLES:
+        op.create_index(
+            f"{table}_pos_idx",
+            table,
+            [sa.text("spoint(radians(ra), radians(dec))")],
+            unique=False,
+            postgresql_using="gist",
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Drop pgSphere GiST indexes on candidate and known pulsar positions."""
+    for table in reversed(POS_INDEXED_TABLES):
+        op.drop_index(f"{table}_pos_idx", table_name=table, if_exists=True)
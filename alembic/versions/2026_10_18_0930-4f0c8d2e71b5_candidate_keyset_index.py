@@ -0,0 +1,32 @@
+"""Candidate keyset index
+
+Revision ID: 4f0c8d2e71b5
+Revises: 9b1e6f3c2a47
+Create Date: 2026-10-18 09:30:41.106327
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4f0c8d2e71b5"
+down_revision: str | None = "9b1e6f3c2a47"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add (observed_at, id) index to candidate table."""
+    op.create_index(
+        "candidate_observed_at_id_idx",
+        "candidate",
+        ["observed_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop (observed_at, id) index from candidate table."""
+    op.drop_index("candidate_observed_at_id_idx", table_name="candidate")
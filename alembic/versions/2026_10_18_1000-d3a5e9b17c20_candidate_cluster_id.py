@@ -0,0 +1,38 @@
+"""Candidate cluster id
+
+Revision ID: d3a5e9b17c20
+Revises: 4f0c8d2e71b5
+Create Date: 2026-10-18 10:00:12.584203
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d3a5e9b17c20"
+down_revision: str | None = "4f0c8d2e71b5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add repeat source cluster id column to candidate table."""
+    op.add_column(
+        "candidate",
+        sa.Column("cluster_id", sa.Integer(), nullable=True),
+    )
+    op.create_index(
+        op.f("candidate_cluster_id_idx"),
+        "candidate",
+        ["cluster_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop repeat source cluster id column from candidate table."""
+    op.drop_index(op.f("candidate_cluster_id_idx"), table_name="candidate")
+    op.drop_column("candidate", "cluster_id")
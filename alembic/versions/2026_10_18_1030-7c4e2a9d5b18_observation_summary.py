@@ -0,0 +1,318 @@
+"""Observation summary
+
+Revision ID: 7c4e2a9d5b18
+Revises: d3a5e9b17c20
+Create Date: 2026-10-18 10:30:41.106372
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c4e2a9d5b18"
+down_revision: str | None = "d3a5e9b17c20"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# The SQL of this revision is fixed here, because later revisions change
+# how summaries are maintained.
+
+# Recomputes the summaries of the given beams. Beams without candidates
+# have no summary.
+CREATE_REFRESH_FUNCTION = """
+CREATE OR REPLACE FUNCTION refresh_observation_summary(beam_ids integer[])
+RETURNS void
+LANGUAGE sql
+AS $$
+    DELETE FROM observation_summary AS s
+    WHERE s.beam_id = ANY(beam_ids)
+        AND NOT EXISTS (
+            SELECT 1 FROM candidate AS c WHERE c.beam_id = s.beam_id
+        );
+
+    WITH labels AS (
+        SELECT
+            beam_id,
+            sum(n)::integer AS label_count,
+            jsonb_object_agg(type, n) AS label_counts
+        FROM (
+            SELECT c.beam_id, e.type::text AS type, count(*) AS n
+            FROM label AS l
+            JOIN candidate AS c ON c.id = l.candidate_id
+            JOIN entity AS e ON e.id = l.entity_id
+            WHERE c.beam_id = ANY(beam_ids)
+            GROUP BY c.beam_id, e.type
+        ) AS entity_counts
+        GROUP BY beam_id
+    )
+    INSERT INTO observation_summary (
+        beam_id,
+        observation_id,
+        candidate_count,
+        sp_candidate_count,
+        label_count,
+        label_counts,
+        snr_min,
+        snr_max,
+        snr_median,
+        snr_p90,
+        dm_min,
+        dm_max,
+        dm_median,
+        dm_p90,
+        observed_at_min,
+        observed_at_max,
+        refreshed_at
+    )
+    SELECT
+        c.beam_id,
+        b.observation_id,
+        count(c.id),
+        count(sp.id),
+        coalesce(l.label_count, 0),
+        coalesce(l.label_counts, '{}'::jsonb),
+        min(c.snr),
+        max(c.snr),
+        percentile_cont(0.5) WITHIN GROUP (ORDER BY c.snr),
+        percentile_cont(0.9) WITHIN GROUP (ORDER BY c.snr),
+        min(c.dm),
+        max(c.dm),
+        percentile_cont(0.5) WITHIN GROUP (ORDER BY c.dm),
+        percentile_cont(0.9) WITHIN GROUP (ORDER BY c.dm),
+        min(c.observed_at),
+        max(c.observed_at),
+        now()
+    FROM candidate AS c
+    JOIN beam AS b ON b.id = c.beam_id
+    LEFT JOIN sp_candidate AS sp ON sp.candidate_id = c.id
+    LEFT JOIN labels AS l ON l.beam_id = c.beam_id
+    WHERE c.beam_id = ANY(beam_ids)
+    GROUP BY c.beam_id, b.observation_id, l.label_count, l.label_counts
+    ON CONFLICT (beam_id) DO UPDATE SET
+        observation_id = EXCLUDED.observation_id,
+        candidate_count = EXCLUDED.candidate_count,
+        sp_candidate_count = EXCLUDED.sp_candidate_count,
+        label_count = EXCLUDED.label_count,
+        label_counts = EXCLUDED.label_counts,
+        snr_min = EXCLUDED.snr_min,
+        snr_max = EXCLUDED.snr_max,
+        snr_median = EXCLUDED.snr_median,
+        snr_p90 = EXCLUDED.snr_p90,
+        dm_min = EXCLUDED.dm_min,
+        dm_max = EXCLUDED.dm_max,
+        dm_median = EXCLUDED.dm_median,
+        dm_p90 = EXCLUDED.dm_p90,
+        observed_at_min = EXCLUDED.observed_at_min,
+        observed_at_max = EXCLUDED.observed_at_max,
+        refreshed_at = EXCLUDED.refreshed_at;
+$$
+"""
+
+# Candidate updates which don't change summarised attributes, such as
+# assigning candidates to clusters, don't refresh summaries.
+CREATE_CANDIDATE_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION candidate_observation_summary_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM refresh_observation_summary(
+            ARRAY(SELECT DISTINCT beam_id FROM new_rows)
+        );
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM refresh_observation_summary(
+            ARRAY(SELECT DISTINCT beam_id FROM old_rows)
+        );
+    ELSE
+        PERFORM refresh_observation_summary(
+            ARRAY(
+                SELECT DISTINCT unnest(ARRAY[n.beam_id, o.beam_id])
+                FROM new_rows AS n
+                JOIN old_rows AS o ON o.id = n.id
+                WHERE (n.beam_id, n.dm, n.snr, n.observed_at)
+                    IS DISTINCT FROM (o.beam_id, o.dm, o.snr, o.observed_at)
+            )
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+# Single pulse candidates and labels refresh the summaries of their
+# candidates' beams.
+CREATE_CANDIDATE_CHILD_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION candidate_child_observation_summary_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM refresh_observation_summary(
+            ARRAY(
+                SELECT DISTINCT c.beam_id
+                FROM new_rows AS r
+                JOIN candidate AS c ON c.id = r.candidate_id
+            )
+        );
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM refresh_observation_summary(
+            ARRAY(
+                SELECT DISTINCT c.beam_id
+                FROM old_rows AS r
+                JOIN candidate AS c ON c.id = r.candidate_id
+            )
+        );
+    ELSE
+        PERFORM refresh_observation_summary(
+            ARRAY(
+                SELECT DISTINCT c.beam_id
+                FROM (
+                    SELECT candidate_id FROM new_rows
+                    UNION
+                    SELECT candidate_id FROM old_rows
+                ) AS r
+                JOIN candidate AS c ON c.id = r.candidate_id
+            )
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+# Statement level triggers can only reference the transition tables of a
+# single event, so each table has one trigger per event.
+TRIGGER_EVENTS = {
+    "INSERT": "NEW TABLE AS new_rows",
+    "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "OLD TABLE AS old_rows",
+}
+
+TRIGGER_FUNCTIONS = {
+    "candidate": "candidate_observation_summary_trigger",
+    "sp_candidate": "candidate_child_observation_summary_trigger",
+    "label": "candidate_child_observation_summary_trigger",
+}
+
+
+def _trigger_name(table: str, event: str) -> str:
+    """Return the name of a table's observation summary trigger."""
+    return f"{table}_observation_summary_{event.lower()}"
+
+
+def _create_trigger_sql(table: str, event: str) -> str:
+    """Return SQL which creates a table's observation summary trigger for
+    an event.
+    """
+    return (
+        f"CREATE OR REPLACE TRIGGER {_trigger_name(table, event)} "
+        f"AFTER {event} ON {table} "
+        f"REFERENCING {TRIGGER_EVENTS[event]} "
+        "FOR EACH STATEMENT "
+        f"EXECUTE FUNCTION {TRIGGER_FUNCTIONS[table]}()"
+    )
+
+
+OBSERVATION_SUMMARY_SQL = (
+    CREATE_REFRESH_FUNCTION,
+    CREATE_CANDIDATE_TRIGGER_FUNCTION,
+    CREATE_CANDIDATE_CHILD_TRIGGER_FUNCTION,
+    *(
+        _create_trigger_sql(table, event)
+        for table in TRIGGER_FUNCTIONS
+        for event in TRIGGER_EVENTS
+    ),
+)
+
+# Refreshes the summary of every beam, e.g. after the table is created
+# for an existing database.
+REFRESH_ALL_SQL = (
+    "SELECT refresh_observation_summary(ARRAY(SELECT id FROM beam))"
+)
+
+
+def upgrade() -> None:
+    """Create observation summary table and the triggers which maintain
+    it, and summarise existing candidates.
+    """
+    op.create_table(
+        "observation_summary",
+        sa.Column("beam_id", sa.Integer(), nullable=False),
+        sa.Column("observation_id", sa.Integer(), nullable=False),
+        sa.Column("candidate_count", sa.Integer(), nullable=False),
+        sa.Column("sp_candidate_count", sa.Integer(), nullable=False),
+        sa.Column("label_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "label_counts",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=False,
+        ),
+        sa.Column("snr_min", sa.Float(), nullable=False),
+        sa.Column("snr_max", sa.Float(), nullable=False),
+        sa.Column("snr_median", sa.Float(), nullable=False),
+        sa.Column("snr_p90", sa.Float(), nullable=False),
+        sa.Column("dm_min", sa.Float(), nullable=False),
+        sa.Column("dm_max", sa.Float(), nullable=False),
+        sa.Column("dm_median", sa.Float(), nullable=False),
+        sa.Column("dm_p90", sa.Float(), nullable=False),
+        sa.Column("observed_at_min", sa.DateTime(), nullable=False),
+        sa.Column("observed_at_max", sa.DateTime(), nullable=False),
+        sa.Column(
+            "refreshed_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["beam_id"],
+            ["beam.id"],
+            name=op.f("observation_summary_beam_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["observation_id"],
+            ["observation.id"],
+            name=op.f("observation_summary_observation_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "beam_id",
+            name=op.f("observation_summary_pkey"),
+        ),
+    )
+    op.create_index(
+        op.f("observation_summary_observation_id_idx"),
+        "observation_summary",
+        ["observation_id"],
+        unique=False,
+    )
+    for statement in OBSERVATION_SUMMARY_SQL:
+        op.execute(statement)
+    op.execute(REFRESH_ALL_SQL)
+
+
+def downgrade() -> None:
+    """Drop observation summary triggers and table."""
+    for table in TRIGGER_FUNCTIONS:
+        for event in TRIGGER_EVENTS:
+            op.execute(
+                f"DROP TRIGGER IF EXISTS {_trigger_name(table, event)} "
+                f"ON {table}",
+            )
+    for function in (
+        *sorted(set(TRIGGER_FUNCTIONS.values())),
+        "refresh_observation_summary(integer[])",
+    ):
+        op.execute(f"DROP FUNCTION IF EXISTS {function}")
+    op.drop_index(
+        op.f("observation_summary_observation_id_idx"),
+        table_name="observation_summary",
+    )
+    op.drop_table("observation_summary")
@@ -0,0 +1,59 @@
+"""Filter indexes
+
+Revision ID: e1b7c4f2a6d9
+Revises: 7c4e2a9d5b18
+Create Date: 2026-10-18 11:00:27.319840
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e1b7c4f2a6d9"
+down_revision: str | None = "7c4e2a9d5b18"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add indexes for candidate, label and beam filters."""
+    op.create_index(
+        "candidate_beam_id_observed_at_idx",
+        "candidate",
+        ["beam_id", "observed_at"],
+        unique=False,
+    )
+    op.create_index(
+        "candidate_unclustered_id_idx",
+        "candidate",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("cluster_id IS NULL"),
+    )
+    op.create_index(
+        op.f("label_candidate_id_idx"),
+        "label",
+        ["candidate_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("beam_observation_id_idx"),
+        "beam",
+        ["observation_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop indexes for candidate, label and beam filters."""
+    op.drop_index(op.f("beam_observation_id_idx"), table_name="beam")
+    op.drop_index(op.f("label_candidate_id_idx"), table_name="label")
+    op.drop_index("candidate_unclustered_id_idx", table_name="candidate")
+    op.drop_index(
+        "candidate_beam_id_observed_at_idx",
+        table_name="candidate",
+    )
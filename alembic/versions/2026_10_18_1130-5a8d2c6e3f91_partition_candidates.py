@@ -0,0 +1,415 @@
+"""Partition candidates
+
+Revision ID: 5a8d2c6e3f91
+Revises: e1b7c4f2a6d9
+Create Date: 2026-10-18 11:30:52.604117
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5a8d2c6e3f91"
+down_revision: str | None = "e1b7c4f2a6d9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# The SQL of this revision is fixed here, because later revisions change
+# the partition and trigger functions.
+
+PARTITIONED_TABLES = ("candidate", "sp_candidate")
+
+# Creates the partitions of the month containing the given time. Partitions
+# are created as tables and then attached, which doesn't block queries of
+# the partitioned tables. A month whose rows were written to the default
+# partition before its partition existed keeps them there, because moving
+# them would block writes.
+CREATE_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION create_candidate_partitions(month_at timestamp)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    start_at timestamp := date_trunc('month', month_at);
+    end_at timestamp := date_trunc('month', month_at) + interval '1 month';
+    parent text;
+    partition_name text;
+    has_default_rows boolean;
+BEGIN
+    FOREACH parent IN ARRAY ARRAY['candidate', 'sp_candidate'] LOOP
+        partition_name := parent || '_' || to_char(start_at, 'YYYY_MM');
+        CONTINUE WHEN to_regclass(partition_name) IS NOT NULL;
+
+        EXECUTE format(
+            'SELECT EXISTS (SELECT 1 FROM %I '
+            'WHERE observed_at >= $1 AND observed_at < $2)',
+            parent || '_default'
+        ) INTO has_default_rows USING start_at, end_at;
+        CONTINUE WHEN has_default_rows;
+
+        EXECUTE format(
+            'CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS)',
+            partition_name,
+            parent
+        );
+        EXECUTE format(
+            'ALTER TABLE %I ATTACH PARTITION %I '
+            'FOR VALUES FROM (%L) TO (%L)',
+            parent,
+            partition_name,
+            start_at,
+            end_at
+        );
+    END LOOP;
+END;
+$$
+"""
+
+# Labels must reference an existing candidate, and candidates can't be
+# deleted while they are labelled. Violations raise the same error as a
+# foreign key constraint. Candidates moved to another partition by an
+# update are deleted and re-inserted, so deleted candidates are only
+# rejected if no candidate with the same id remains.
+CREATE_LABEL_CANDIDATE_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION label_candidate_reference_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM 1 FROM candidate WHERE id = NEW.candidate_id FOR KEY SHARE;
+    IF NOT FOUND THEN
+        RAISE foreign_key_violation USING
+            MESSAGE = format(
+                'label references non-existent candidate %s',
+                NEW.candidate_id
+            ),
+            CONSTRAINT = 'label_candidate_id_fkey';
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+CREATE_CANDIDATE_LABEL_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION candidate_label_reference_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM label WHERE candidate_id = OLD.id)
+        AND NOT EXISTS (SELECT 1 FROM candidate WHERE id = OLD.id)
+    THEN
+        RAISE foreign_key_violation USING
+            MESSAGE = format(
+                'candidate %s is still referenced by labels',
+                OLD.id
+            ),
+            CONSTRAINT = 'label_candidate_id_fkey';
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+# The (table, event, function) of each reference trigger
+REFERENCE_TRIGGERS = {
+    "label_candidate_reference": (
+        "label",
+        "INSERT OR UPDATE OF candidate_id",
+        "label_candidate_reference_trigger",
+    ),
+    "candidate_label_reference": (
+        "candidate",
+        "DELETE",
+        "candidate_label_reference_trigger",
+    ),
+}
+
+
+def _create_reference_trigger_sql(name: str) -> str:
+    """Return SQL which creates a label candidate reference trigger."""
+    table, event, function = REFERENCE_TRIGGERS[name]
+    return (
+        f"CREATE OR REPLACE TRIGGER {name} AFTER {event} ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION {function}()"
+    )
+
+
+CANDIDATE_PARTITION_SQL = (
+    CREATE_PARTITION_FUNCTION,
+    CREATE_LABEL_CANDIDATE_TRIGGER_FUNCTION,
+    CREATE_CANDIDATE_LABEL_TRIGGER_FUNCTION,
+    *(_create_reference_trigger_sql(name) for name in REFERENCE_TRIGGERS),
+)
+
+# Statement level triggers can only reference the transition tables of a
+# single event, so each table has one trigger per event.
+SUMMARY_TRIGGER_EVENTS = {
+    "INSERT": "NEW TABLE AS new_rows",
+    "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "OLD TABLE AS old_rows",
+}
+
+SUMMARY_TRIGGER_FUNCTIONS = {
+    "candidate": "candidate_observation_summary_trigger",
+    "sp_candidate": "candidate_child_observation_summary_trigger",
+}
+
+CANDIDATE_UNIQUE_COLUMNS = [
+    "dm",
+    "snr",
+    "width",
+    "ra",
+    "dec",
+    "observed_at",
+    "beam_id",
+]
+
+
+def _has_pg_sphere() -> bool:
+    return bool(
+        op.get_bind()
+        .execute(
+            sa.text("SELECT 1 FROM pg_extension WHERE extname = 'pg_sphere'"),
+        )
+        .scalar(),
+    )
+
+
+def _create_candidate_indexes() -> None:
+    op.create_index(
+        "candidate_observed_at_id_idx",
+        "candidate",
+        ["observed_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "candidate_beam_id_observed_at_idx",
+        "candidate",
+        ["beam_id", "observed_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("candidate_cluster_id_idx"),
+        "candidate",
+        ["cluster_id"],
+        unique=False,
+    )
+    op.create_index(
+        "candidate_unclustered_id_idx",
+        "candidate",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("cluster_id IS NULL"),
+    )
+    if _has_pg_sphere():
+        op.create_index(
+            "candidate_pos_idx",
+            "candidate",
+            [sa.text("spoint(radians(ra), radians(dec))")],
+            unique=False,
+            postgresql_using="gist",
+        )
+
+
+def _create_default_partition(table: str) -> None:
+    op.execute(
+        f"CREATE TABLE IF NOT EXISTS {table}_default "
+        f"PARTITION OF {table} DEFAULT",
+    )
+
+
+def _create_summary_triggers() -> None:
+    for table, function in SUMMARY_TRIGGER_FUNCTIONS.items():
+        for event, transition_tables in SUMMARY_TRIGGER_EVENTS.items():
+            op.execute(
+                "CREATE OR REPLACE TRIGGER "
+                f"{table}_observation_summary_{event.lower()} "
+                f"AFTER {event} ON {table} "
+                f"REFERENCING {transition_tables} "
+                "FOR EACH STATEMENT "
+                f"EXECUTE FUNCTION {function}()",
+            )
+
+
+def upgrade() -> None:
+    """Partition candidate and sp_candidate tables by month of observation
+    time.
+
+    The partitioned tables are created alongside the existing tables and
+    the existing rows are copied into them. Constraints and indexes are
+    created after the rows are copied.
+    """
+    op.drop_constraint(
+        op.f("label_candidate_id_fkey"),
+        "label",
+        type_="foreignkey",
+    )
+    op.drop_constraint(
+        op.f("sp_candidate_candidate_id_fkey"),
+        "sp_candidate",
+        type_="foreignkey",
+    )
+    op.rename_table("sp_candidate", "sp_candidate_unpartitioned")
+    op.rename_table("candidate", "candidate_unpartitioned")
+
+    op.execute(
+        "CREATE TABLE candidate "
+        "(LIKE candidate_unpartitioned INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (observed_at)",
+    )
+    op.execute(
+        "CREATE TABLE sp_candidate ("
+        "LIKE sp_candidate_unpartitioned INCLUDING DEFAULTS, "
+        "observed_at timestamp without time zone NOT NULL"
+        ") PARTITION BY RANGE (observed_at)",
+    )
+    for table in PARTITIONED_TABLES:
+        _create_default_partition(table)
+    for statement in CANDIDATE_PARTITION_SQL:
+        op.execute(statement)
+    op.execute(
+        "SELECT create_candidate_partitions(month) FROM ("
+        "SELECT DISTINCT date_trunc('month', observed_at) AS month "
+        "FROM candidate_unpartitioned "
+        "UNION SELECT date_trunc('month', now()::timestamp)"
+        ") AS months",
+    )
+
+    op.execute("INSERT INTO candidate SELECT * FROM candidate_unpartitioned")
+    op.execute(
+        "INSERT INTO sp_candidate "
+        "SELECT sp.*, c.observed_at "
+        "FROM sp_candidate_unpartitioned AS sp "
+        "JOIN candidate_unpartitioned AS c ON c.id = sp.candidate_id",
+    )
+    for table in PARTITIONED_TABLES:
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.drop_table("sp_candidate_unpartitioned")
+    op.drop_table("candidate_unpartitioned")
+
+    # Primary keys of partitioned tables must include the partition key, so
+    # ids are no longer constrained to be unique. They are unique because
+    # they are assigned by the tables' sequences.
+    op.create_primary_key(
+        op.f("candidate_pkey"),
+        "candidate",
+        ["id", "observed_at"],
+    )
+    op.create_unique_constraint(
+        op.f("candidate_dm_key"),
+        "candidate",
+        CANDIDATE_UNIQUE_COLUMNS,
+    )
+    op.create_foreign_key(
+        op.f("candidate_beam_id_fkey"),
+        "candidate",
+        "beam",
+        ["beam_id"],
+        ["id"],
+    )
+    _create_candidate_indexes()
+
+    op.create_primary_key(
+        op.f("sp_candidate_pkey"),
+        "sp_candidate",
+        ["id", "observed_at"],
+    )
+    op.create_unique_constraint(
+        op.f("sp_candidate_candidate_id_key"),
+        "sp_candidate",
+        ["candidate_id", "observed_at"],
+    )
+    op.create_unique_constraint(
+        op.f("sp_candidate_plot_path_key"),
+        "sp_candidate",
+        ["plot_path", "observed_at"],
+    )
+    op.create_foreign_key(
+        op.f("sp_candidate_candidate_id_fkey"),
+        "sp_candidate",
+        "candidate",
+        ["candidate_id", "observed_at"],
+        ["id", "observed_at"],
+        onupdate="CASCADE",
+    )
+    _create_summary_triggers()
+
+
+def downgrade() -> None:
+    """Copy partitioned candidates and single pulse candidates back into
+    unpartitioned tables.
+    """
+    for name, (table, _, function) in REFERENCE_TRIGGERS.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {function}()")
+
+    op.rename_table("sp_candidate", "sp_candidate_partitioned")
+    op.rename_table("candidate", "candidate_partitioned")
+    op.execute(
+        "CREATE TABLE candidate "
+        "(LIKE candidate_partitioned INCLUDING DEFAULTS)",
+    )
+    op.execute(
+        "CREATE TABLE sp_candidate "
+        "(LIKE sp_candidate_partitioned INCLUDING DEFAULTS)",
+    )
+    op.execute("INSERT INTO candidate SELECT * FROM candidate_partitioned")
+    op.execute(
+        "INSERT INTO sp_candidate SELECT * FROM sp_candidate_partitioned",
+    )
+    op.drop_column("sp_candidate", "observed_at")
+    for table in PARTITIONED_TABLES:
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    # Dropping the partitioned tables drops their partitions
+    op.drop_table("sp_candidate_partitioned")
+    op.drop_table("candidate_partitioned")
+    op.execute(
+        "DROP FUNCTION IF EXISTS create_candidate_partitions(timestamp)",
+    )
+
+    op.create_primary_key(op.f("candidate_pkey"), "candidate", ["id"])
+    op.create_unique_constraint(
+        op.f("candidate_dm_key"),
+        "candidate",
+        CANDIDATE_UNIQUE_COLUMNS,
+    )
+    op.create_foreign_key(
+        op.f("candidate_beam_id_fkey"),
+        "candidate",
+        "beam",
+        ["beam_id"],
+        ["id"],
+    )
+    _create_candidate_indexes()
+
+    op.create_primary_key(op.f("sp_candidate_pkey"), "sp_candidate", ["id"])
+    op.create_unique_constraint(
+        op.f("sp_candidate_candidate_id_key"),
+        "sp_candidate",
+        ["candidate_id"],
+    )
+    op.create_unique_constraint(
+        op.f("sp_candidate_plot_path_key"),
+        "sp_candidate",
+        ["plot_path"],
+    )
+    op.create_foreign_key(
+        op.f("sp_candidate_candidate_id_fkey"),
+        "sp_candidate",
+        "candidate",
+        ["candidate_id"],
+        ["id"],
+    )
+    op.create_foreign_key(
+        op.f("label_candidate_id_fkey"),
+        "label",
+        "candidate",
+        ["candidate_id"],
+        ["id"],
+    )
+    _create_summary_triggers()
@@ -0,0 +1,50 @@
+"""Observation notifications
+
+Revision ID: 9b3f6d1e8a47
+Revises: 5a8d2c6e3f91
+Create Date: 2026-10-18 12:00:17.382915
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b3f6d1e8a47"
+down_revision: str | None = "5a8d2c6e3f91"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+NOTIFY_TRIGGER = "observation_written_notify"
+
+OBSERVATION_NOTIFY_SQL = (
+    """
+CREATE OR REPLACE FUNCTION notify_observation_written()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_notify('observation_written', '');
+    RETURN NULL;
+END;
+$$
+""",
+    f"CREATE OR REPLACE TRIGGER {NOTIFY_TRIGGER} "
+    "AFTER INSERT OR UPDATE OF t_min OR DELETE ON observation "
+    "FOR EACH STATEMENT EXECUTE FUNCTION notify_observation_written()",
+)
+
+
+def upgrade() -> None:
+    """Create the trigger which notifies listeners of written
+    observations.
+    """
+    for statement in OBSERVATION_NOTIFY_SQL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Drop the observation notification trigger."""
+    op.execute(f"DROP TRIGGER IF EXISTS {NOTIFY_TRIGGER} ON observation")
+    op.execute("DROP FUNCTION IF EXISTS notify_observation_written()")
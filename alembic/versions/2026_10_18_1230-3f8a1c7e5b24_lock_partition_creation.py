@@ -0,0 +1,151 @@
+"""Lock candidate partition creation
+
+Revision ID: 3f8a1c7e5b24
+Revises: 9b3f6d1e8a47
+Create Date: 2026-10-18 12:30:41.917356
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f8a1c7e5b24"
+down_revision: str | None = "9b3f6d1e8a47"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# The number of upcoming months whose partitions are created by the upgrade
+UPCOMING_MONTHS = 2
+
+# The partition creation function of this revision
+CREATE_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION create_candidate_partitions(month_at timestamp)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    start_at timestamp := date_trunc('month', month_at);
+    end_at timestamp := date_trunc('month', month_at) + interval '1 month';
+    suffix text := to_char(date_trunc('month', month_at), 'YYYY_MM');
+    parent text;
+    partition_name text;
+    has_default_rows boolean;
+BEGIN
+    IF to_regclass('candidate_' || suffix) IS NOT NULL
+        AND to_regclass('sp_candidate_' || suffix) IS NOT NULL
+    THEN
+        RETURN;
+    END IF;
+
+    PERFORM pg_advisory_xact_lock(
+        hashtext('create_candidate_partitions'),
+        to_char(start_at, 'YYYYMM')::integer
+    );
+
+    FOREACH parent IN ARRAY ARRAY['candidate', 'sp_candidate'] LOOP
+        partition_name := parent || '_' || suffix;
+        CONTINUE WHEN to_regclass(partition_name) IS NOT NULL;
+
+        EXECUTE format(
+            'SELECT EXISTS (SELECT 1 FROM %I '
+            'WHERE observed_at >= $1 AND observed_at < $2)',
+            parent || '_default'
+        ) INTO has_default_rows USING start_at, end_at;
+        CONTINUE WHEN has_default_rows;
+
+        EXECUTE format(
+            'CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS)',
+            partition_name,
+            parent
+        );
+        EXECUTE format(
+            'ALTER TABLE %I ATTACH PARTITION %I '
+            'FOR VALUES FROM (%L) TO (%L)',
+            parent,
+            partition_name,
+            start_at,
+            end_at
+        );
+    END LOOP;
+END;
+$$
+"""
+# Creates the partitions of the current month and the given number of
+# upcoming months
+CREATE_UPCOMING_PARTITIONS = sa.text(
+    """
+    SELECT create_candidate_partitions(
+        CAST(
+            date_trunc('month', now() AT TIME ZONE 'UTC')
+            + make_interval(months => month_offset)
+            AS timestamp
+        )
+    )
+    FROM generate_series(0, :months) AS month_offset
+    """,
+)
+
+# The partition creation function before its creation was serialised
+UNLOCKED_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION create_candidate_partitions(month_at timestamp)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    start_at timestamp := date_trunc('month', month_at);
+    end_at timestamp := date_trunc('month', month_at) + interval '1 month';
+    parent text;
+    partition_name text;
+    has_default_rows boolean;
+BEGIN
+    FOREACH parent IN ARRAY ARRAY['candidate', 'sp_candidate'] LOOP
+        partition_name := parent || '_' || to_char(start_at, 'YYYY_MM');
+        CONTINUE WHEN to_regclass(partition_name) IS NOT NULL;
+
+        EXECUTE format(
+            'SELECT EXISTS (SELECT 1 FROM %I '
+            'WHERE observed_at >= $1 AND observed_at < $2)',
+            parent || '_default'
+        ) INTO has_default_rows USING start_at, end_at;
+        CONTINUE WHEN has_default_rows;
+
+        EXECUTE format(
+            'CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS)',
+            partition_name,
+            parent
+        );
+        EXECUTE format(
+            'ALTER TABLE %I ATTACH PARTITION %I '
+            'FOR VALUES FROM (%L) TO (%L)',
+            parent,
+            partition_name,
+            start_at,
+            end_at
+        );
+    END LOOP;
+END;
+$$
+"""
+
+
+def upgrade() -> None:
+    """Serialise the creation of a month's candidate partitions and create
+    the partitions of the current and upcoming months.
+    """
+    op.execute(CREATE_PARTITION_FUNCTION)
+    op.get_bind().execute(
+        CREATE_UPCOMING_PARTITIONS,
+        {"months": UPCOMING_MONTHS},
+    )
+
+
+def downgrade() -> None:
+    """Create candidate partitions without serialising their creation.
+
+    Created partitions are kept.
+    """
+    op.execute(UNLOCKED_PARTITION_FUNCTION)
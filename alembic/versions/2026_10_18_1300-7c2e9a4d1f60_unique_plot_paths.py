@@ -0,0 +1,67 @@
+"""Unique single pulse candidate plot paths
+
+Revision ID: 7c2e9a4d1f60
+Revises: 3f8a1c7e5b24
+Create Date: 2026-10-18 13:00:27.561403
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c2e9a4d1f60"
+down_revision: str | None = "3f8a1c7e5b24"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# The (name, function) of the plot path trigger
+PLOT_PATH_TRIGGER = (
+    "sp_candidate_plot_path_unique",
+    "sp_candidate_plot_path_unique_trigger",
+)
+
+PLOT_PATH_SQL = (
+    """
+CREATE OR REPLACE FUNCTION sp_candidate_plot_path_unique_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(
+        hashtext('sp_candidate_plot_path'),
+        hashtext(NEW.plot_path)
+    );
+    IF EXISTS (
+        SELECT 1 FROM sp_candidate
+        WHERE plot_path = NEW.plot_path AND id <> NEW.id
+    ) THEN
+        RAISE unique_violation USING
+            MESSAGE = format(
+                'sp candidate plot path %s already exists',
+                NEW.plot_path
+            ),
+            CONSTRAINT = 'sp_candidate_plot_path_key';
+    END IF;
+    RETURN NULL;
+END;
+$$
+""",
+    f"CREATE OR REPLACE TRIGGER {PLOT_PATH_TRIGGER[0]} "
+    "AFTER INSERT OR UPDATE OF plot_path ON sp_candidate "
+    f"FOR EACH ROW EXECUTE FUNCTION {PLOT_PATH_TRIGGER[1]}()",
+)
+
+
+def upgrade() -> None:
+    """Keep single pulse candidate plot paths unique across partitions."""
+    for statement in PLOT_PATH_SQL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Only enforce unique plot paths within a partition."""
+    name, function = PLOT_PATH_TRIGGER
+    op.execute(f"DROP TRIGGER IF EXISTS {name} ON sp_candidate")
+    op.execute(f"DROP FUNCTION IF EXISTS {function}()")
@@ -0,0 +1,608 @@
+"""Incremental observation summaries
+
+Revision ID: 4d9b2f7a6c13
+Revises: 7c2e9a4d1f60
+Create Date: 2026-10-18 13:30:12.840975
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4d9b2f7a6c13"
+down_revision: str | None = "7c2e9a4d1f60"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+PERCENTILE_COLUMNS = ("snr_median", "snr_p90", "dm_median", "dm_p90")
+
+# The summary functions before summaries were maintained incrementally,
+# which recompute the summaries of the written candidates' beams
+PREVIOUS_REFRESH_FUNCTION = """
+CREATE OR REPLACE FUNCTION refresh_observation_summary(beam_ids integer[])
+RETURNS void
+LANGUAGE sql
+AS $$
+    DELETE FROM observation_summary AS s
+    WHERE s.beam_id = ANY(beam_ids)
+        AND NOT EXISTS (
+            SELECT 1 FROM candidate AS c WHERE c.beam_id = s.beam_id
+        );
+
+    WITH labels AS (
+        SELECT
+            beam_id,
+            sum(n)::integer AS label_count,
+            jsonb_object_agg(type, n) AS label_counts
+        FROM (
+            SELECT c.beam_id, e.type::text AS type, count(*) AS n
+            FROM label AS l
+            JOIN candidate AS c ON c.id = l.candidate_id
+            JOIN entity AS e ON e.id = l.entity_id
+            WHERE c.beam_id = ANY(beam_ids)
+            GROUP BY c.beam_id, e.type
+        ) AS entity_counts
+        GROUP BY beam_id
+    )
+    INSERT INTO observation_summary (
+        beam_id,
+        observation_id,
+        candidate_count,
+        sp_candidate_count,
+        label_count,
+        label_counts,
+        snr_min,
+        snr_max,
+        snr_median,
+        snr_p90,
+        dm_min,
+        dm_max,
+        dm_median,
+        dm_p90,
+        observed_at_min,
+        observed_at_max,
+        refreshed_at
+    )
+    SELECT
+        c.beam_id,
+        b.observation_id,
+        count(c.id),
+        count(sp.id),
+        coalesce(l.label_count, 0),
+        coalesce(l.label_counts, '{}'::jsonb),
+        min(c.snr),
+        max(c.snr),
+        percentile_cont(0.5) WITHIN GROUP (ORDER BY c.snr),
+        percentile_cont(0.9) WITHIN GROUP (ORDER BY c.snr),
+        min(c.dm),
+        max(c.dm),
+        percentile_cont(0.5) WITHIN GROUP (ORDER BY c.dm),
+        percentile_cont(0.9) WITHIN GROUP (ORDER BY c.dm),
+        min(c.observed_at),
+        max(c.observed_at),
+        now()
+    FROM candidate AS c
+    JOIN beam AS b ON b.id = c.beam_id
+    LEFT JOIN sp_candidate AS sp ON sp.candidate_id = c.id
+    LEFT JOIN labels AS l ON l.beam_id = c.beam_id
+    WHERE c.beam_id = ANY(beam_ids)
+    GROUP BY c.beam_id, b.observation_id, l.label_count, l.label_counts
+    ON CONFLICT (beam_id) DO UPDATE SET
+        observation_id = EXCLUDED.observation_id,
+        candidate_count = EXCLUDED.candidate_count,
+        sp_candidate_count = EXCLUDED.sp_candidate_count,
+        label_count = EXCLUDED.label_count,
+        label_counts = EXCLUDED.label_counts,
+        snr_min = EXCLUDED.snr_min,
+        snr_max = EXCLUDED.snr_max,
+        snr_median = EXCLUDED.snr_median,
+        snr_p90 = EXCLUDED.snr_p90,
+        dm_min = EXCLUDED.dm_min,
+        dm_max = EXCLUDED.dm_max,
+        dm_median = EXCLUDED.dm_median,
+        dm_p90 = EXCLUDED.dm_p90,
+        observed_at_min = EXCLUDED.observed_at_min,
+        observed_at_max = EXCLUDED.observed_at_max,
+        refreshed_at = EXCLUDED.refreshed_at;
+$$
+"""
+
+PREVIOUS_CANDIDATE_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION candidate_observation_summary_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM refresh_observation_summary(
+            ARRAY(SELECT DISTINCT beam_id FROM new_rows)
+        );
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM refresh_observation_summary(
+            ARRAY(SELECT DISTINCT beam_id FROM old_rows)
+        );
+    ELSE
+        PERFORM refresh_observation_summary(
+            ARRAY(
+                SELECT DISTINCT unnest(ARRAY[n.beam_id, o.beam_id])
+                FROM new_rows AS n
+                JOIN old_rows AS o ON o.id = n.id
+                WHERE (n.beam_id, n.dm, n.snr, n.observed_at)
+                    IS DISTINCT FROM (o.beam_id, o.dm, o.snr, o.observed_at)
+            )
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+PREVIOUS_CANDIDATE_CHILD_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION candidate_child_observation_summary_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM refresh_observation_summary(
+            ARRAY(
+                SELECT DISTINCT c.beam_id
+                FROM new_rows AS r
+                JOIN candidate AS c ON c.id = r.candidate_id
+            )
+        );
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM refresh_observation_summary(
+            ARRAY(
+                SELECT DISTINCT c.beam_id
+                FROM old_rows AS r
+                JOIN candidate AS c ON c.id = r.candidate_id
+            )
+        );
+    ELSE
+        PERFORM refresh_observation_summary(
+            ARRAY(
+                SELECT DISTINCT c.beam_id
+                FROM (
+                    SELECT candidate_id FROM new_rows
+                    UNION
+                    SELECT candidate_id FROM old_rows
+                ) AS r
+                JOIN candidate AS c ON c.id = r.candidate_id
+            )
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+
+# The summary functions of this revision, which apply the changes made by
+# each statement to the summaries of the written candidates' beams
+REFRESH_FUNCTION = """
+CREATE OR REPLACE FUNCTION refresh_observation_summary(beam_ids integer[])
+RETURNS void
+LANGUAGE sql
+AS $$
+    DELETE FROM observation_summary AS s
+    WHERE s.beam_id = ANY(beam_ids)
+        AND NOT EXISTS (
+            SELECT 1 FROM candidate AS c WHERE c.beam_id = s.beam_id
+        );
+
+    WITH labels AS (
+        SELECT
+            beam_id,
+            sum(n)::integer AS label_count,
+            jsonb_object_agg(type, n) AS label_counts
+        FROM (
+            SELECT c.beam_id, e.type::text AS type, count(*) AS n
+            FROM label AS l
+            JOIN candidate AS c ON c.id = l.candidate_id
+            JOIN entity AS e ON e.id = l.entity_id
+            WHERE c.beam_id = ANY(beam_ids)
+            GROUP BY c.beam_id, e.type
+        ) AS entity_counts
+        GROUP BY beam_id
+    )
+    INSERT INTO observation_summary (
+        beam_id,
+        observation_id,
+        candidate_count,
+        sp_candidate_count,
+        label_count,
+        label_counts,
+        snr_min,
+        snr_max,
+        dm_min,
+        dm_max,
+        observed_at_min,
+        observed_at_max,
+        refreshed_at
+    )
+    SELECT
+        c.beam_id,
+        b.observation_id,
+        count(c.id),
+        count(sp.id),
+        coalesce(l.label_count, 0),
+        coalesce(l.label_counts, '{}'::jsonb),
+        min(c.snr),
+        max(c.snr),
+        min(c.dm),
+        max(c.dm),
+        min(c.observed_at),
+        max(c.observed_at),
+        now()
+    FROM candidate AS c
+    JOIN beam AS b ON b.id = c.beam_id
+    LEFT JOIN sp_candidate AS sp ON sp.candidate_id = c.id
+    LEFT JOIN labels AS l ON l.beam_id = c.beam_id
+    WHERE c.beam_id = ANY(beam_ids)
+    GROUP BY c.beam_id, b.observation_id, l.label_count, l.label_counts
+    ON CONFLICT (beam_id) DO UPDATE SET
+        observation_id = EXCLUDED.observation_id,
+        candidate_count = EXCLUDED.candidate_count,
+        sp_candidate_count = EXCLUDED.sp_candidate_count,
+        label_count = EXCLUDED.label_count,
+        label_counts = EXCLUDED.label_counts,
+        snr_min = EXCLUDED.snr_min,
+        snr_max = EXCLUDED.snr_max,
+        dm_min = EXCLUDED.dm_min,
+        dm_max = EXCLUDED.dm_max,
+        observed_at_min = EXCLUDED.observed_at_min,
+        observed_at_max = EXCLUDED.observed_at_max,
+        refreshed_at = EXCLUDED.refreshed_at;
+$$
+"""
+
+REFRESH_RANGES_FUNCTION = """
+CREATE OR REPLACE FUNCTION refresh_observation_summary_ranges(
+    beam_ids integer[]
+)
+RETURNS void
+LANGUAGE sql
+AS $$
+    UPDATE observation_summary AS s
+    SET
+        snr_min = r.snr_min,
+        snr_max = r.snr_max,
+        dm_min = r.dm_min,
+        dm_max = r.dm_max,
+        observed_at_min = r.observed_at_min,
+        observed_at_max = r.observed_at_max,
+        refreshed_at = now()
+    FROM (
+        SELECT
+            beam_id,
+            min(snr) AS snr_min,
+            max(snr) AS snr_max,
+            min(dm) AS dm_min,
+            max(dm) AS dm_max,
+            min(observed_at) AS observed_at_min,
+            max(observed_at) AS observed_at_max
+        FROM candidate
+        WHERE beam_id = ANY(beam_ids)
+        GROUP BY beam_id
+    ) AS r
+    WHERE s.beam_id = r.beam_id;
+$$
+"""
+
+CANDIDATE_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION candidate_observation_summary_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    moved_beam_ids integer[];
+    range_beam_ids integer[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO observation_summary AS s (
+            beam_id,
+            observation_id,
+            candidate_count,
+            sp_candidate_count,
+            label_count,
+            label_counts,
+            snr_min,
+            snr_max,
+            dm_min,
+            dm_max,
+            observed_at_min,
+            observed_at_max,
+            refreshed_at
+        )
+        SELECT
+            n.beam_id,
+            b.observation_id,
+            count(*),
+            0,
+            0,
+            '{}'::jsonb,
+            min(n.snr),
+            max(n.snr),
+            min(n.dm),
+            max(n.dm),
+            min(n.observed_at),
+            max(n.observed_at),
+            now()
+        FROM new_rows AS n
+        JOIN beam AS b ON b.id = n.beam_id
+        GROUP BY n.beam_id, b.observation_id
+        ON CONFLICT (beam_id) DO UPDATE SET
+            candidate_count = s.candidate_count + EXCLUDED.candidate_count,
+            snr_min = least(s.snr_min, EXCLUDED.snr_min),
+            snr_max = greatest(s.snr_max, EXCLUDED.snr_max),
+            dm_min = least(s.dm_min, EXCLUDED.dm_min),
+            dm_max = greatest(s.dm_max, EXCLUDED.dm_max),
+            observed_at_min = least(
+                s.observed_at_min,
+                EXCLUDED.observed_at_min
+            ),
+            observed_at_max = greatest(
+                s.observed_at_max,
+                EXCLUDED.observed_at_max
+            ),
+            refreshed_at = EXCLUDED.refreshed_at;
+    ELSIF TG_OP = 'DELETE' THEN
+        range_beam_ids := ARRAY(
+            SELECT DISTINCT o.beam_id
+            FROM old_rows AS o
+            JOIN observation_summary AS s ON s.beam_id = o.beam_id
+            WHERE o.snr IN (s.snr_min, s.snr_max)
+                OR o.dm IN (s.dm_min, s.dm_max)
+                OR o.observed_at IN (s.observed_at_min, s.observed_at_max)
+        );
+        UPDATE observation_summary AS s
+        SET candidate_count = s.candidate_count - d.n, refreshed_at = now()
+        FROM (
+            SELECT beam_id, count(*)::integer AS n
+            FROM old_rows
+            GROUP BY beam_id
+        ) AS d
+        WHERE s.beam_id = d.beam_id;
+        DELETE FROM observation_summary
+        WHERE beam_id IN (SELECT beam_id FROM old_rows)
+            AND candidate_count <= 0;
+        PERFORM refresh_observation_summary_ranges(range_beam_ids);
+    ELSE
+        moved_beam_ids := ARRAY(
+            SELECT DISTINCT unnest(ARRAY[n.beam_id, o.beam_id])
+            FROM new_rows AS n
+            JOIN old_rows AS o ON o.id = n.id
+            WHERE n.beam_id <> o.beam_id
+        );
+        range_beam_ids := ARRAY(
+            SELECT DISTINCT o.beam_id
+            FROM new_rows AS n
+            JOIN old_rows AS o ON o.id = n.id
+            JOIN observation_summary AS s ON s.beam_id = o.beam_id
+            WHERE n.beam_id = o.beam_id
+                AND (
+                    (n.snr <> o.snr AND o.snr IN (s.snr_min, s.snr_max))
+                    OR (n.dm <> o.dm AND o.dm IN (s.dm_min, s.dm_max))
+                    OR (
+                        n.observed_at <> o.observed_at
+                        AND o.observed_at IN (
+                            s.observed_at_min,
+                            s.observed_at_max
+                        )
+                    )
+                )
+        );
+        UPDATE observation_summary AS s
+        SET
+            snr_min = least(s.snr_min, r.snr_min),
+            snr_max = greatest(s.snr_max, r.snr_max),
+            dm_min = least(s.dm_min, r.dm_min),
+            dm_max = greatest(s.dm_max, r.dm_max),
+            observed_at_min = least(s.observed_at_min, r.observed_at_min),
+            observed_at_max = greatest(s.observed_at_max, r.observed_at_max),
+            refreshed_at = now()
+        FROM (
+            SELECT
+                n.beam_id,
+                min(n.snr) AS snr_min,
+                max(n.snr) AS snr_max,
+                min(n.dm) AS dm_min,
+                max(n.dm) AS dm_max,
+                min(n.observed_at) AS observed_at_min,
+                max(n.observed_at) AS observed_at_max
+            FROM new_rows AS n
+            JOIN old_rows AS o ON o.id = n.id
+            WHERE n.beam_id = o.beam_id
+                AND (n.dm, n.snr, n.observed_at)
+                    IS DISTINCT FROM (o.dm, o.snr, o.observed_at)
+            GROUP BY n.beam_id
+        ) AS r
+        WHERE s.beam_id = r.beam_id;
+        PERFORM refresh_observation_summary(moved_beam_ids);
+        PERFORM refresh_observation_summary_ranges(range_beam_ids);
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+CANDIDATE_CHILD_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION candidate_child_observation_summary_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    candidate_ids integer[] := '{}';
+    deltas integer[] := '{}';
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT candidate_ids || array_agg(candidate_id),
+            deltas || array_agg(1)
+        INTO candidate_ids, deltas
+        FROM new_rows;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        SELECT candidate_ids || array_agg(candidate_id),
+            deltas || array_agg(-1)
+        INTO candidate_ids, deltas
+        FROM old_rows;
+    END IF;
+
+    UPDATE observation_summary AS s
+    SET sp_candidate_count = s.sp_candidate_count + d.delta,
+        refreshed_at = now()
+    FROM (
+        SELECT c.beam_id, sum(r.delta)::integer AS delta
+        FROM unnest(candidate_ids, deltas) AS r(candidate_id, delta)
+        JOIN candidate AS c ON c.id = r.candidate_id
+        GROUP BY c.beam_id
+        HAVING sum(r.delta) <> 0
+    ) AS d
+    WHERE s.beam_id = d.beam_id;
+    RETURN NULL;
+END;
+$$
+"""
+
+LABEL_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION label_observation_summary_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    candidate_ids integer[] := '{}';
+    entity_ids integer[] := '{}';
+    deltas integer[] := '{}';
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT candidate_ids || array_agg(candidate_id),
+            entity_ids || array_agg(entity_id),
+            deltas || array_agg(1)
+        INTO candidate_ids, entity_ids, deltas
+        FROM new_rows;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        SELECT candidate_ids || array_agg(candidate_id),
+            entity_ids || array_agg(entity_id),
+            deltas || array_agg(-1)
+        INTO candidate_ids, entity_ids, deltas
+        FROM old_rows;
+    END IF;
+
+    WITH entity_deltas AS (
+        SELECT c.beam_id, e.type::text AS type, sum(r.delta) AS delta
+        FROM unnest(candidate_ids, entity_ids, deltas)
+            AS r(candidate_id, entity_id, delta)
+        JOIN candidate AS c ON c.id = r.candidate_id
+        JOIN entity AS e ON e.id = r.entity_id
+        GROUP BY c.beam_id, e.type
+        HAVING sum(r.delta) <> 0
+    ),
+    beam_deltas AS (
+        SELECT
+            beam_id,
+            sum(delta)::integer AS delta,
+            jsonb_object_agg(type, delta) AS deltas
+        FROM entity_deltas
+        GROUP BY beam_id
+    )
+    UPDATE observation_summary AS s
+    SET
+        label_count = s.label_count + d.delta,
+        label_counts = (
+            SELECT coalesce(jsonb_object_agg(type, n), '{}'::jsonb)
+            FROM (
+                SELECT type, sum(n) AS n
+                FROM (
+                    SELECT key AS type, value::integer AS n
+                    FROM jsonb_each_text(s.label_counts)
+                    UNION ALL
+                    SELECT key AS type, value::integer AS n
+                    FROM jsonb_each_text(d.deltas)
+                ) AS counts
+                GROUP BY type
+                HAVING sum(n) <> 0
+            ) AS totals
+        ),
+        refreshed_at = now()
+    FROM beam_deltas AS d
+    WHERE s.beam_id = d.beam_id;
+    RETURN NULL;
+END;
+$$
+"""
+
+# Statement level triggers can only reference the transition tables of a
+# single event, so each table has one trigger per event.
+TRIGGER_EVENTS = {
+    "INSERT": "NEW TABLE AS new_rows",
+    "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "OLD TABLE AS old_rows",
+}
+
+REFRESH_ALL_SQL = (
+    "SELECT refresh_observation_summary(ARRAY(SELECT id FROM beam))"
+)
+
+
+def _create_label_triggers(function: str) -> None:
+    """Create the label observation summary triggers with a function."""
+    for event, transition_tables in TRIGGER_EVENTS.items():
+        op.execute(
+            "CREATE OR REPLACE TRIGGER "
+            f"label_observation_summary_{event.lower()} "
+            f"AFTER {event} ON label "
+            f"REFERENCING {transition_tables} "
+            "FOR EACH STATEMENT "
+            f"EXECUTE FUNCTION {function}()",
+        )
+
+
+def upgrade() -> None:
+    """Maintain observation summaries from the rows written by each
+    statement and compute percentiles when summaries are read.
+    """
+    for statement in (
+        REFRESH_FUNCTION,
+        REFRESH_RANGES_FUNCTION,
+        CANDIDATE_TRIGGER_FUNCTION,
+        CANDIDATE_CHILD_TRIGGER_FUNCTION,
+        LABEL_TRIGGER_FUNCTION,
+    ):
+        op.execute(statement)
+    _create_label_triggers(function="label_observation_summary_trigger")
+    for column in PERCENTILE_COLUMNS:
+        op.drop_column("observation_summary", column)
+
+
+def downgrade() -> None:
+    """Recompute observation summaries, including percentiles, for each
+    written statement.
+    """
+    for column in PERCENTILE_COLUMNS:
+        op.add_column(
+            "observation_summary",
+            sa.Column(column, sa.Float(), nullable=True),
+        )
+    for statement in (
+        PREVIOUS_REFRESH_FUNCTION,
+        PREVIOUS_CANDIDATE_TRIGGER_FUNCTION,
+        PREVIOUS_CANDIDATE_CHILD_TRIGGER_FUNCTION,
+    ):
+        op.execute(statement)
+    _create_label_triggers(
+        function="candidate_child_observation_summary_trigger",
+    )
+    op.execute("DROP FUNCTION IF EXISTS label_observation_summary_trigger()")
+    op.execute(
+        "DROP FUNCTION IF EXISTS "
+        "refresh_observation_summary_ranges(integer[])",
+    )
+    op.execute(REFRESH_ALL_SQL)
+    for column in PERCENTILE_COLUMNS:
+        op.alter_column("observation_summary", column, nullable=False)
@@ -0,0 +1,475 @@
+"""Measure the throughput and latency of the candle, label and observation
+endpoints.
+
+The database configured by the MALTOPUFT_POSTGRES_* settings is seeded with
+synthetic observations, beams, known pulsars and candidates built from the
+test data generators. Each endpoint is then requested by concurrent clients
+of the application, which is served in the benchmark's process. Prints the
+throughput and latency percentiles of each endpoint as JSON::
+
+    AUTH_ENABLED=0 PYTHONPATH=. python benchmarks/endpoints.py \\
+        --seed --candidates 1000000 > results.json
+
+``--seed`` drops and recreates every table, so only benchmark a dedicated
+database, which must have the pgSphere extension. Later runs can benchmark
+the same data without ``--seed``. Labels created by the benchmark are
+deleted after they're measured.
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import json
+import random
+import statistics
+import subprocess
+import time
+from collections.abc import AsyncIterator, Callable
+from typing import Any, NamedTuple
+
+import httpx
+import sqlalchemy as sa
+from ska_src_maltopuft_backend.app.models import (
+    Base,
+    Beam,
+    Candidate,
+    Catalogue,
+    Entity,
+    KnownPulsar,
+    Label,
+    Observation,
+)
+from ska_src_maltopuft_backend.core.config import settings
+from ska_src_maltopuft_backend.core.database.database import (
+    engines,
+    session_scope,
+)
+from ska_src_maltopuft_backend.core.factory import Factory
+from ska_src_maltopuft_backend.core.server import app
+
+from tests.api.v1.datagen import (
+    candidate_data_generator,
+    entity_data_generator,
+    sp_candidate_data_generator,
+)
+from tests.catalogue.datagen import (
+    catalogue_data_generator,
+    pulsar_data_generator,
+)
+from tests.observation import datagen
+
+# Candidates are generated by varying this many generated candidates
+CANDIDATE_TEMPLATES = 1000
+
+# Beam offsets (degrees) from the observation's pointing
+BEAM_OFFSET = 0.5
+
+# Candidates are observed in the months before the benchmark epoch, so they
+# are written to several monthly partitions
+EPOCH = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+
+
+##############################################################################
+# Seeding ####################################################################
+##############################################################################
+
+
+def seed_metadata(
+    observations: int,
+    beams: int,
+    pulsars: int,
+) -> list[tuple[int, float, float]]:
+    """Create entities, observations, beams and known pulsars.
+
+    :return: The (id, ra, dec) of each beam.
+    """
+    engine = engines.engine
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    beam_positions = []
+    with engines.session_local() as db:
+        for type_ in ("RFI", "SINGLE_PULSE", "PERIODIC_PULSE"):
+            db.add(Entity(**entity_data_generator(type_=type_)))
+
+        sb = datagen.sb_data_generator(id=1)
+        cb = datagen.cb_config_data_generator(id=1)
+        host = datagen.host_data_generator(id=1)
+        catalogue = Catalogue(**catalogue_data_generator(id_=1))
+        db.add_all([sb, cb, host, catalogue])
+        db.flush()
+
+        for obs_id in range(1, observations + 1):
+            ra = round(random.uniform(0, 360), 5)  # noqa: S311
+            dec = round(random.uniform(-80, 30), 5)  # noqa: S311
+            db.add(
+                datagen.obs_data_generator(
+                    id=obs_id,
+                    schedule_block_id=sb.id,
+                    coherent_beam_config_id=cb.id,
+                    s_ra=ra,
+                    s_dec=dec,
+                ),
+            )
+            db.flush()
+            for number in range(beams):
+                beam_ra = round((ra + number * BEAM_OFFSET) % 360, 5)
+                beam = datagen.beam_data_generator(
+                    id=(obs_id - 1) * beams + number + 1,
+                    number=number,
+                    coherent=True,
+                    ra=beam_ra,
+                    dec=dec,
+                    host_id=host.id,
+                    observation_id=obs_id,
+                )
+                db.add(beam)
+                beam_positions.append((beam.id, beam_ra, dec))
+
+        for _ in range(pulsars):
+            _, ra, dec = random.choice(beam_positions)  # noqa: S311
+            db.add(
+                KnownPulsar(
+                    **pulsar_data_generator(
+                        ra=round(ra + random.uniform(-1, 1), 5)  # noqa: S311
+                        % 360,
+                        dec=dec,
+                        catalogue_id=catalogue.id,
+                    ),
+                ),
+            )
+        db.commit()
+    return beam_positions
+
+
+async def candidate_rows(
+    start: int,
+    count: int,
+    templates: list[dict[str, Any]],
+    beams: list[tuple[int, float, float]],
+    months: int,
+) -> AsyncIterator[tuple[Any, ...]]:
+    """Yield candidate rows in ``INGEST_COLUMNS`` order.
+
+    Rows vary the attributes of generated candidates, so that any number of
+    rows can be generated quickly. Candidates are positioned within a degree
+    of their beam and observed at random times in the months before the
+    epoch.
+    """
+    span = dt.timedelta(days=30 * months).total_seconds()
+    for i in range(start, start + count):
+        template = templates[i % len(templates)]
+        beam_id, beam_ra, beam_dec = random.choice(beams)  # noqa: S311
+        ra = round((beam_ra + random.uniform(-1, 1)) % 360, 5)  # noqa: S311
+        dec = round(
+            max(-90, min(90, beam_dec + random.uniform(-1, 1))),  # noqa: S311
+            5,
+        )
+        yield (
+            template["dm"] * random.uniform(0.5, 1.5),  # noqa: S311
+            template["snr"] * random.uniform(0.5, 1.5),  # noqa: S311
+            template["width"] * random.uniform(0.5, 1.5),  # noqa: S311
+            ra,
+            dec,
+            f"({ra},{dec})",
+            EPOCH
+            - dt.timedelta(seconds=random.uniform(0, span)),  # noqa: S311
+            beam_id,
+            f"{template['plot_path']}/{i}.png",
+        )
+
+
+async def seed_candidates(
+    candidates: int,
+    beams: list[tuple[int, float, float]],
+    months: int,
+    batch_size: int,
+) -> None:
+    """Ingest candidates and their single pulse candidates in batches."""
+    templates = [
+        {**candidate_data_generator(), **sp_candidate_data_generator()}
+        for _ in range(CANDIDATE_TEMPLATES)
+    ]
+    controller = Factory().get_candidate_controller()
+    for start in range(0, candidates, batch_size):
+        async with session_scope() as db:
+            await controller.ingest(
+                db=db,
+                rows=candidate_rows(
+                    start=start,
+                    count=min(batch_size, candidates - start),
+                    templates=templates,
+                    beams=beams,
+                    months=months,
+                ),
+            )
+
+    with engines.engine.connect() as conn:
+        conn.execute(sa.text("ANALYZE"))
+        conn.commit()
+
+
+##############################################################################
+# Measurement ################################################################
+##############################################################################
+
+
+class Scenario(NamedTuple):
+    """An endpoint request to measure.
+
+    ``request`` returns the keyword arguments of each request, and
+    ``on_response`` is called with each successful response.
+    """
+
+    name: str
+    request: Callable[[], dict[str, Any]]
+    on_response: Callable[[httpx.Response], None] | None = None
+
+
+def summarise(latencies: list[float]) -> dict[str, float]:
+    """Return the latency percentiles, mean and maximum in seconds."""
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "p50": percentiles[49],
+        "p99": percentiles[98],
+        "mean": statistics.mean(latencies),
+        "max": max(latencies),
+    }
+
+
+async def measure(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+) -> dict[str, Any]:
+    """Send requests from concurrent clients and time their responses."""
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def send() -> None:
+        nonlocal errors
+        for _ in remaining:
+            started_at = time.perf_counter()
+            response = await client.request(**scenario.request())
+            latencies.append(time.perf_counter() - started_at)
+            if response.is_error:
+                errors += 1
+            elif scenario.on_response is not None:
+                scenario.on_response(response)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(send() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+    return {
+        "requests": requests,
+        "errors": errors,
+        "requests_per_second": requests / elapsed,
+        "latency_seconds": summarise(latencies),
+    }
+
+
+def make_scenarios(
+    label_batch_size: int,
+    label_requests: int,
+    label_ids: list[int],
+) -> list[Scenario]:
+    """Return the endpoint requests to measure.
+
+    Bulk labels are created for distinct candidates, because each user can
+    only label a candidate once. The ids of created labels are appended to
+    ``label_ids``.
+    """
+    with engines.session_local() as db:
+        observations = db.execute(
+            sa.select(Observation.id, Observation.s_ra, Observation.s_dec),
+        ).all()
+        entity_ids = db.execute(sa.select(Entity.id)).scalars().all()
+        candidate_ids = iter(
+            db.execute(
+                sa.select(Candidate.id).limit(
+                    label_batch_size * label_requests,
+                ),
+            )
+            .scalars()
+            .all(),
+        )
+    observation_ids = [obs.id for obs in observations]
+
+    def cone_search() -> dict[str, Any]:
+        obs = random.choice(observations)  # noqa: S311
+        return {
+            "method": "GET",
+            "url": "/v1/candle/",
+            "params": {"ra": obs.s_ra, "dec": obs.s_dec, "radius": 0.5},
+        }
+
+    def bulk_labels() -> dict[str, Any]:
+        return {
+            "method": "POST",
+            "url": "/v1/labels/",
+            "json": [
+                {
+                    "candidate_id": candidate_id,
+                    "entity_id": random.choice(entity_ids),  # noqa: S311
+                }
+                for candidate_id, _ in zip(
+                    candidate_ids,
+                    range(label_batch_size),
+                )
+            ],
+        }
+
+    def observation_sources() -> dict[str, Any]:
+        return {
+            "method": "GET",
+            "url": "/v1/obs/sources",
+            "params": {
+                "id": random.sample(  # noqa: S311
+                    observation_ids,
+                    min(10, len(observation_ids)),
+                ),
+                "radius": 1.0,
+            },
+        }
+
+    return [
+        Scenario(
+            name="sp_candidates",
+            request=lambda: {"method": "GET", "url": "/v1/candle/sp"},
+        ),
+        Scenario(
+            name="sp_candidates_count",
+            request=lambda: {"method": "GET", "url": "/v1/candle/sp/count"},
+        ),
+        Scenario(
+            name="labels_bulk",
+            request=bulk_labels,
+            on_response=lambda response: label_ids.extend(
+                response.json()["ids"],
+            ),
+        ),
+        Scenario(name="cone_search", request=cone_search),
+        Scenario(name="observation_sources", request=observation_sources),
+    ]
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Measure each endpoint and return the results."""
+    label_ids: list[int] = []
+    scenarios = make_scenarios(
+        label_batch_size=args.label_batch_size,
+        label_requests=args.warmup + args.requests,
+        label_ids=label_ids,
+    )
+    results = {}
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://benchmark",
+            timeout=None,
+        ) as client,
+    ):
+        try:
+            for scenario in scenarios:
+                if args.warmup:
+                    await measure(client, scenario, args.warmup, 1)
+                results[scenario.name] = await measure(
+                    client,
+                    scenario,
+                    args.requests,
+                    args.concurrency,
+                )
+        finally:
+            with engines.session_local() as db:
+                db.execute(sa.delete(Label).where(Label.id.in_(label_ids)))
+                db.commit()
+    return results
+
+
+def git_revision() -> str | None:
+    """Return the checked out git commit, if any."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def count_rows() -> dict[str, int]:
+    """Return the number of seeded rows of each benchmarked table."""
+    with engines.session_local() as db:
+        return {
+            model.__tablename__: db.execute(
+                sa.select(sa.func.count()).select_from(model),
+            ).scalar_one()
+            for model in (Observation, Beam, KnownPulsar, Candidate, Label)
+        }
+
+
+def main() -> None:
+    """Seed the database, run the endpoint benchmark and print the
+    results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--seed",
+        action="store_true",
+        help="drop every table and seed the database before measuring",
+    )
+    parser.add_argument("--candidates", type=int, default=10_000)
+    parser.add_argument("--observations", type=int, default=20)
+    parser.add_argument("--beams", type=int, default=8)
+    parser.add_argument("--pulsars", type=int, default=1000)
+    parser.add_argument("--months", type=int, default=6)
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--label-batch-size", type=int, default=100)
+    parser.add_argument("--random-seed", type=int, default=0)
+    args = parser.parse_args()
+    if settings.AUTH_ENABLED:
+        parser.error("set AUTH_ENABLED=0 to benchmark without an authn-api")
+
+    random.seed(args.random_seed)
+    if args.seed:
+        beams = seed_metadata(
+            observations=args.observations,
+            beams=args.beams,
+            pulsars=args.pulsars,
+        )
+        asyncio.run(
+            seed_candidates(
+                candidates=args.candidates,
+                beams=beams,
+                months=args.months,
+                batch_size=args.batch_size,
+            ),
+        )
+
+    results = asyncio.run(run(args))
+    print(  # noqa: T201
+        json.dumps(
+            {
+                "recorded_at": dt.datetime.now(tz=dt.timezone.utc).isoformat(),
+                "git_revision": git_revision(),
+                "async_sessions": bool(settings.MALTOPUFT_POSTGRES_ASYNC),
+                "concurrency": args.concurrency,
+                "rows": count_rows(),
+                "endpoints": results,
+            },
+            indent=2,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
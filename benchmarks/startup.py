@@ -0,0 +1,100 @@
+"""Measure the time taken to import and start the application.
+
+Each run imports the application in a new Python process, so module
+import costs aren't hidden by modules imported by earlier runs. Prints the
+median, minimum and maximum seconds of each phase as JSON::
+
+    python benchmarks/startup.py --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any
+
+# Prints the seconds taken to import the application and to run its
+# lifespan startup, and whether importing the application initialised a
+# database engine
+RUN_STARTUP = """
+import asyncio
+import json
+import time
+
+started_at = time.perf_counter()
+from ska_src_maltopuft_backend.core.server import app
+imported_at = time.perf_counter()
+
+from ska_src_maltopuft_backend.core.database.database import engines
+import_engines = any(
+    engine is not None for engine in (engines._engine, engines._async_engine)
+)
+
+
+async def start() -> float:
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+
+
+ready_at = asyncio.run(start())
+print(json.dumps({
+    "import": imported_at - started_at,
+    "startup": ready_at - imported_at,
+    "import_engines": import_engines,
+}))
+"""
+
+
+def run_startup() -> dict[str, Any]:
+    """Import and start the application in a new process.
+
+    The latest observation listener is disabled because it connects to the
+    database in the background.
+    """
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", RUN_STARTUP],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={**os.environ, "OBSERVATION_LISTEN": "0"},
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarise(seconds: list[float]) -> dict[str, float]:
+    """Return the median, minimum and maximum of some timings."""
+    return {
+        "median": statistics.median(seconds),
+        "min": min(seconds),
+        "max": max(seconds),
+    }
+
+
+def main() -> None:
+    """Run the startup benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [run_startup() for _ in range(args.runs)]
+    print(  # noqa: T201
+        json.dumps(
+            {
+                "runs": args.runs,
+                "import_seconds": summarise([run["import"] for run in runs]),
+                "startup_seconds": summarise(
+                    [run["startup"] for run in runs],
+                ),
+                "engines_initialised_on_import": any(
+                    run["import_engines"] for run in runs
+                ),
+            },
+            indent=2,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
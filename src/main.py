@@ -5,14 +5,38 @@ import logging
 import uvicorn
 from ska_ser_logging import configure_logging
 
+from ska_src_maltopuft_backend.core.config import settings
+
+APP = "ska_src_maltopuft_backend.core.server:app"
+
+
+def run() -> None:
+    """Run the application server.
+
+    The development server reloads when source files change. Otherwise
+    each worker process imports the application, so workers never share
+    database connections.
+    """
+    if settings.SERVER_RELOAD:
+        uvicorn.run(
+            app=APP,
+            reload=True,
+            host=settings.SERVER_HOST,
+            port=settings.SERVER_PORT,
+        )
+        return
+
+    uvicorn.run(
+        app=APP,
+        workers=settings.SERVER_WORKER_COUNT,
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+    )
+
+
 if __name__ == "__main__":
     configure_logging(logging.INFO)
     logger = logging.getLogger(__name__)
     logger.info(f"Initialised logger for process {__name__}")
-
-    uvicorn.run(
-        app="ska_src_maltopuft_backend.core.server:app",
-        reload=True,
-        workers=1,
-        host="0.0.0.0",
-    )
+    run()
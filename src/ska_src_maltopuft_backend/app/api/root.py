@@ -1,6 +1,9 @@
 """REST endpoint paths for root ('/')."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Response, status
+
+from ska_src_maltopuft_backend.core.config import settings
+from ska_src_maltopuft_backend.core.metrics import CONTENT_TYPE, registry
 
 root_router = APIRouter()
 
@@ -9,3 +12,13 @@ root_router = APIRouter()
 async def read_root() -> dict:
     """Return a dummy response to the root path (/)."""
     return {"data": "Hello world!"}
+
+
+@root_router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Return the metrics of the worker process which handles the request
+    in the Prometheus text exposition format.
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
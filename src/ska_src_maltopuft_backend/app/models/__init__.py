@@ -14,6 +14,7 @@ from ska_src_maltopuft_backend.observation.models import (
     Host,
     MeerkatScheduleBlock,
     Observation,
+    ObservationSummary,
     ScheduleBlock,
     TilingConfig,
 )
@@ -30,6 +31,7 @@ __all__ = [
     "MeerkatScheduleBlock",
     "CoherentBeamConfig",
     "Observation",
+    "ObservationSummary",
     "TilingConfig",
     "Beam",
     "Host",
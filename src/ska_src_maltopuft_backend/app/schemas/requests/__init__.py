@@ -1,10 +1,18 @@
 """API request models and associated types."""
 
 from ska_src_maltopuft_backend.candle.requests import (
+    CandidateCrossMatchQueryParams,
+    CandidateGroup,
+    CandidateGroupQueryParams,
+    CandidateHistogramQueryParams,
+    CandidateParameter,
+    CandidateScatterQueryParams,
     CreateCandidate,
     CreateSPCandidate,
     GetCandidateQueryParams,
+    GetSPCandidatePageQueryParams,
     GetSPCandidateQueryParams,
+    IngestCandidate,
 )
 from ska_src_maltopuft_backend.catalogue.requests import (
     CreateKnownPulsar,
@@ -24,7 +32,15 @@ from ska_src_maltopuft_backend.user.requests import (
 __all__ = [
     "GetCandidateQueryParams",
     "CreateCandidate",
+    "IngestCandidate",
+    "CandidateCrossMatchQueryParams",
+    "CandidateParameter",
+    "CandidateGroup",
+    "CandidateHistogramQueryParams",
+    "CandidateGroupQueryParams",
+    "CandidateScatterQueryParams",
     "GetSPCandidateQueryParams",
+    "GetSPCandidatePageQueryParams",
     "CreateSPCandidate",
     "GetEntityQueryParams",
     "CreateEntity",
@@ -1,8 +1,22 @@
 """API response models and associated types."""
 
-from ska_src_maltopuft_backend.candle.responses import Candidate, SPCandidate
+from ska_src_maltopuft_backend.candle.responses import (
+    Candidate,
+    CandidateBulk,
+    CandidateClustering,
+    CandidateCrossMatch,
+    CandidateGroupCounts,
+    CandidateHistogram,
+    CandidateScatter,
+    SPCandidate,
+    SPCandidatePage,
+)
 from ska_src_maltopuft_backend.catalogue.responses import KnownPulsar
-from ska_src_maltopuft_backend.health.responses import Status, StatusEnum
+from ska_src_maltopuft_backend.health.responses import (
+    PoolStatus,
+    Status,
+    StatusEnum,
+)
 from ska_src_maltopuft_backend.label.responses import (
     Entity,
     EntityNames,
@@ -14,11 +28,19 @@ from ska_src_maltopuft_backend.user.responses import User
 __all__ = [
     "User",
     "Candidate",
+    "CandidateBulk",
+    "CandidateClustering",
+    "CandidateCrossMatch",
+    "CandidateHistogram",
+    "CandidateScatter",
+    "CandidateGroupCounts",
     "SPCandidate",
+    "SPCandidatePage",
     "Entity",
     "EntityNames",
     "Label",
     "LabelBulk",
+    "PoolStatus",
     "Status",
     "StatusEnum",
     "KnownPulsar",
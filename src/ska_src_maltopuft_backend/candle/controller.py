@@ -1,24 +1,46 @@
 """Data controller for the Candle models."""
 
 import logging
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 
 from ska_src_maltopuft_backend.app.models import Candidate, SPCandidate
 from ska_src_maltopuft_backend.app.schemas.requests import (
+    CandidateCrossMatchQueryParams,
+    CandidateGroup,
+    CandidateHistogramQueryParams,
+    CandidateParameter,
+    CandidateScatterQueryParams,
     CreateCandidate,
     CreateSPCandidate,
 )
+from ska_src_maltopuft_backend.app.schemas.responses import (
+    CandidateCrossMatch,
+    CandidateGroupCounts,
+    CandidateHistogram,
+    CandidateScatter,
+    KnownPulsar,
+)
 from ska_src_maltopuft_backend.candle.repository import (
     CandidateRepository,
     SPCandidateRepository,
 )
+from ska_src_maltopuft_backend.candle.responses import (
+    HistogramAxis,
+    ScatterPoints,
+    ScatterTiles,
+)
+from ska_src_maltopuft_backend.core.cache import TTLCache
 from ska_src_maltopuft_backend.core.controller import BaseController
+from ska_src_maltopuft_backend.core.exceptions import (
+    InvalidRowError,
+    ParentNotFoundError,
+)
 from ska_src_maltopuft_backend.core.schemas import CommonQueryParams
-from ska_src_maltopuft_backend.core.types import ModelT
+from ska_src_maltopuft_backend.core.types import DBSession, ModelT
 from ska_src_maltopuft_backend.observation.controller import (
     ObservationController,
 )
@@ -28,17 +50,323 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# The maximum number of unclustered candidates assigned to clusters in one
+# transaction
+CLUSTER_BATCH_SIZE = 1000
+
+LATEST_OBSERVATION_KEY = "latest"
+
+
+def _assign_clusters(
+    ids: list[int],
+    neighbours: Sequence["Row[tuple[int, int, int | None]]"],
+) -> tuple[dict[int, int], dict[int, set[int]]]:
+    """Group candidates with their neighbours into clusters.
+
+    Candidates and the existing clusters of their neighbours are linked in
+    a union-find forest, so that existing clusters linked by any candidate
+    are merged into one cluster. Neighbours which are unclustered and not
+    in ``ids`` are ignored. They are linked to the candidates when they are
+    clustered themselves.
+
+    :param ids: The ids of the candidates to cluster.
+    :param neighbours: (candidate id, neighbour id, neighbour cluster id)
+        rows.
+    :return: The cluster id of each candidate, and the existing cluster ids
+        to merge into each cluster id.
+    """
+    # Cluster ids are candidate ids, but never the id of an unclustered
+    # candidate, so candidates and clusters share one forest.
+    parents = {id_: id_ for id_ in ids}
+    existing: set[int] = set()
+
+    def find(id_: int) -> int:
+        while parents[id_] != id_:
+            parents[id_] = parents[parents[id_]]
+            id_ = parents[id_]
+        return id_
+
+    def union(id_: int, other_id: int) -> None:
+        root, other_root = find(id_), find(other_id)
+        parents[max(root, other_root)] = min(root, other_root)
+
+    for id_, neighbour_id, neighbour_cluster_id in neighbours:
+        if neighbour_cluster_id is not None:
+            existing.add(neighbour_cluster_id)
+            parents.setdefault(neighbour_cluster_id, neighbour_cluster_id)
+            union(id_, neighbour_cluster_id)
+        elif neighbour_id in parents:
+            union(id_, neighbour_id)
+
+    components: dict[int, list[int]] = {}
+    for id_ in parents:
+        components.setdefault(find(id_), []).append(id_)
+
+    cluster_ids: dict[int, int] = {}
+    merges: dict[int, set[int]] = {}
+    for root, nodes in components.items():
+        linked = existing.intersection(nodes)
+        cluster_id = min(linked) if linked else root
+        cluster_ids.update(
+            {id_: cluster_id for id_ in nodes if id_ not in linked},
+        )
+        if len(linked) > 1:
+            merges[cluster_id] = linked - {cluster_id}
+    return cluster_ids, merges
+
 
 class CandidateController(BaseController[Candidate, CreateCandidate, None]):
     """Data controller for the Candidate model."""
 
-    def __init__(self, repository: CandidateRepository) -> None:
-        """Initalise a CandidateController instance."""
+    def __init__(
+        self,
+        repository: CandidateRepository,
+        crossmatch_cache: TTLCache | None = None,
+    ) -> None:
+        """Initalise a CandidateController instance.
+
+        :param repository: The candidate repository.
+        :param crossmatch_cache: The cache of known pulsar cross-matches for
+            each observation. Cross-matches aren't cached if None.
+        """
         super().__init__(
             model=Candidate,
             repository=repository,
         )
         self.repository = repository
+        self.crossmatch_cache = crossmatch_cache
+
+    async def create_upcoming_partitions(
+        self,
+        db: DBSession,
+        months: int,
+    ) -> None:
+        """Create and commit the candidate partitions of the current month
+        and upcoming months, so that they exist before their candidates are
+        written.
+
+        :param db: The database session.
+        :param months: The number of upcoming months.
+        """
+        await self.repository.create_upcoming_partitions(db=db, months=months)
+        await self._commit(db=db)
+
+    def _invalidate_crossmatches(self) -> None:
+        """Clear cached cross-matches after candidates are written.
+
+        The observations of written candidates aren't known without a
+        query, so every observation's cross-matches are cleared.
+        """
+        if self.crossmatch_cache is not None:
+            self.crossmatch_cache.invalidate()
+
+    async def create(
+        self,
+        db: DBSession,
+        attributes: dict[str, Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Candidate:
+        """Creates a new candidate in the DB.
+
+        :param attributes: The attributes to create the candidate with.
+        :return: The created candidate.
+        """
+        candidate = await super().create(db, attributes, *args, **kwargs)
+        self._invalidate_crossmatches()
+        return candidate
+
+    async def create_many(
+        self,
+        db: DBSession,
+        objects: list[dict[str, Any]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> list[int]:
+        """Create a list of candidates."""
+        ids = await super().create_many(db, objects, *args, **kwargs)
+        self._invalidate_crossmatches()
+        return ids
+
+    async def delete(self, db: DBSession, id_: int) -> None:
+        """Deletes the candidate from the DB.
+
+        :param db: The database session.
+        :param id_: The id of the candidate to delete from the database.
+        """
+        await super().delete(db=db, id_=id_)
+        self._invalidate_crossmatches()
+
+    async def crossmatch(
+        self,
+        db: DBSession,
+        q: CandidateCrossMatchQueryParams,
+    ) -> list[CandidateCrossMatch]:
+        """Returns the known pulsars within a radius and DM tolerance of the
+        candidates in the given observations.
+
+        Cross-matches are cached for each observation, radius and DM
+        tolerance. Observations which aren't cached are cross-matched in
+        one query.
+
+        :param db: The database session.
+        :param q: The query parameters.
+        :return: The cross-matches ordered by observation id, candidate id
+            and separation.
+        """
+        matches: dict[int, list[CandidateCrossMatch]] = {}
+        uncached: list[int] = []
+        for observation_id in q.observation_id:
+            cached = None
+            if self.crossmatch_cache is not None:
+                cached = self.crossmatch_cache.get(
+                    self._crossmatch_cache_key(observation_id, q),
+                )
+            if cached is None:
+                uncached.append(observation_id)
+                continue
+            matches[observation_id] = cached
+
+        if uncached:
+            rows = await self.repository.crossmatch(
+                db=db,
+                observation_ids=uncached,
+                radius=q.radius,
+                dm_tolerance=q.dm_tolerance,
+            )
+            new_matches: dict[int, list[CandidateCrossMatch]] = {
+                observation_id: [] for observation_id in uncached
+            }
+            # Cross-matches are cached as response models rather than ORM
+            # objects, which would stay attached to this request's session
+            for row in rows:
+                new_matches[row.observation_id].append(
+                    CandidateCrossMatch(
+                        candidate_id=row.candidate_id,
+                        observation_id=row.observation_id,
+                        beam_id=row.beam_id,
+                        separation=max(row.separation, 0.0),
+                        dm_difference=row.dm_difference,
+                        known_pulsar=KnownPulsar.model_validate(
+                            row.KnownPulsar,
+                        ),
+                    ),
+                )
+            for observation_id, observation_matches in new_matches.items():
+                if self.crossmatch_cache is not None:
+                    self.crossmatch_cache.set(
+                        self._crossmatch_cache_key(observation_id, q),
+                        observation_matches,
+                    )
+            matches.update(new_matches)
+
+        beam_ids = set(q.beam_id)
+        return [
+            match
+            for observation_id in sorted(matches)
+            for match in matches[observation_id]
+            if not beam_ids or match.beam_id in beam_ids
+        ]
+
+    def _crossmatch_cache_key(
+        self,
+        observation_id: int,
+        q: CandidateCrossMatchQueryParams,
+    ) -> str:
+        return f"{observation_id}:{q.radius}:{q.dm_tolerance}"
+
+    async def ingest(
+        self,
+        db: DBSession,
+        rows: AsyncIterator[Sequence[Any]],
+    ) -> dict[str, Any]:
+        """Create candidates and their single pulse candidates in bulk.
+
+        :param db: The database session.
+        :param rows: The candidate attributes in ``INGEST_COLUMNS`` order.
+        :return: The number of candidates created and the candidate and
+            single pulse candidate ids of each row, in row order.
+        """
+        try:
+            created, ids = await self.repository.ingest(db=db, rows=rows)
+            await self._commit(db=db)
+            self._invalidate_crossmatches()
+        except IntegrityError as exc:
+            await self.rollback(db=db)
+            self._raise_integrity_error(exc=exc)
+            raise
+        except InvalidRowError:
+            # The invalid row aborted the copy and its transaction
+            await self.rollback(db=db)
+            raise
+        logger.info(
+            f"Ingested {len(ids)} {self.model_class} objects, created "
+            f"{created}.",
+        )
+        return {
+            "created": created,
+            "ids": [row[0] for row in ids],
+            "sp_candidate_ids": [row[1] for row in ids],
+        }
+
+    async def cluster_candidates(
+        self,
+        db: DBSession,
+        radius: float,
+        dm_tolerance: float,
+        batch_size: int = CLUSTER_BATCH_SIZE,
+    ) -> dict[str, int]:
+        """Assign unclustered candidates to repeat source clusters.
+
+        Candidates within a radius and DM tolerance of each other are
+        friends-of-friends clustered. Only candidates without a cluster id
+        are processed, so clusters are extended incrementally as new
+        candidates arrive. A cluster's id is the lowest id of the candidates
+        it was created from. Candidates which link existing clusters merge
+        them into the cluster with the lowest id.
+
+        :param db: The database session.
+        :param radius: The cone search radius in degrees.
+        :param dm_tolerance: The maximum absolute DM difference.
+        :param batch_size: The number of candidates clustered in each
+            transaction.
+        :return: The number of candidates clustered, the number of new
+            clusters and the number of clusters merged into others.
+        """
+        stats = {"clustered": 0, "clusters": 0, "merged": 0}
+        while True:
+            ids = await self.repository.get_unclustered_ids(
+                db=db,
+                limit=batch_size,
+            )
+            if not ids:
+                break
+            neighbours = await self.repository.get_neighbours(
+                db=db,
+                ids=ids,
+                radius=radius,
+                dm_tolerance=dm_tolerance,
+            )
+            cluster_ids, merges = _assign_clusters(ids, neighbours)
+            await self.repository.set_cluster_ids(
+                db=db,
+                cluster_ids=cluster_ids,
+            )
+            for target_id, merged_ids in merges.items():
+                await self.repository.merge_clusters(
+                    db=db,
+                    cluster_ids=merged_ids,
+                    target_id=target_id,
+                )
+            await self._commit(db=db)
+
+            stats["clustered"] += len(cluster_ids)
+            stats["clusters"] += sum(
+                id_ == cluster_id for id_, cluster_id in cluster_ids.items()
+            )
+            stats["merged"] += sum(len(ids_) for ids_ in merges.values())
+        logger.info(f"Clustered candidates: {stats}")
+        return stats
 
 
 class SPCandidateController(
@@ -50,13 +378,65 @@ class SPCandidateController(
         self,
         repository: SPCandidateRepository,
         observation_controller: ObservationController,
+        latest_observation_cache: TTLCache | None = None,
     ) -> None:
-        """Initalise a SPCandidateController instance."""
+        """Initalise a SPCandidateController instance.
+
+        :param repository: The single pulse candidate repository.
+        :param observation_controller: The observation controller.
+        :param latest_observation_cache: The cache of the latest
+            observation id. The latest observation isn't cached if None.
+        """
         super().__init__(model=SPCandidate, repository=repository)
         self.repository = repository
         self.observation_controller = observation_controller
+        self.latest_observation_cache = latest_observation_cache
+
+    async def create(
+        self,
+        db: DBSession,
+        attributes: dict[str, Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> SPCandidate:
+        """Creates a new single pulse candidate in the DB.
+
+        Single pulse candidates are partitioned by their candidate's
+        observation time, which is copied from the candidate.
+
+        :param attributes: The attributes to create the single pulse
+            candidate with.
+        :raises ParentNotFoundError: If the candidate doesn't exist.
+        :return: The created single pulse candidate.
+        """
+        candidate_id = attributes["candidate_id"]
+        observed_at = await self.repository.get_candidate_observed_at(
+            db=db,
+            candidate_ids=[candidate_id],
+        )
+        if candidate_id not in observed_at:
+            msg = f"Can't create object {self._type} with non-existent parent."
+            raise ParentNotFoundError(msg)
+        return await super().create(
+            db,
+            {**attributes, "observed_at": observed_at[candidate_id]},
+            *args,
+            **kwargs,
+        )
+
+    async def _get_latest_observation_id(self, db: DBSession) -> int | None:
+        """Return the id of the most recent observation, or None if there
+        are no observations.
+
+        The id is cached until observations are written or the cache's ttl
+        expires. None isn't cached, so the first observation is found as
+        soon as it's written.
+        """
+        if self.latest_observation_cache is not None:
+            cached = self.latest_observation_cache.get(LATEST_OBSERVATION_KEY)
+            if cached is not None:
+                return cached
 
-    async def _get_latest_observation_id(self, db: Session) -> int | None:
         latest_obs = await self.observation_controller.get_all(
             db=db,
             order_={"desc": ["t_min"]},
@@ -64,6 +444,11 @@ class SPCandidateController(
         )
         if len(latest_obs) == 0:
             return None
+        if self.latest_observation_cache is not None:
+            self.latest_observation_cache.set(
+                LATEST_OBSERVATION_KEY,
+                latest_obs[0].id,
+            )
         return latest_obs[0].id
 
     def _is_fetch_latest_observation(self, params: dict[str, Any]) -> bool:
@@ -71,7 +456,7 @@ class SPCandidateController(
 
     async def _prepare_query_parameters(
         self,
-        db: Session,
+        db: DBSession,
         params: list[BaseModel] | None = None,
     ) -> dict[str, Any]:
         _params = self._merge_query_parameters(params=params)
@@ -84,7 +469,7 @@ class SPCandidateController(
 
     async def count(
         self,
-        db: Session,
+        db: DBSession,
         join_: list[str] | None = None,
         q: list[BaseModel] | None = None,
     ) -> int:
@@ -98,12 +483,14 @@ class SPCandidateController(
             or 0
         )
 
-    async def get_all(
+    async def get_all(  # pylint: disable=R0913 # noqa: PLR0913
         self,
-        db: Session,
+        db: DBSession,
         join_: list[str] | None = None,
         order_: dict[str, list[str]] | None = None,
         q: list[BaseModel] | None = None,
+        keyset_: list[str] | None = None,
+        load_: list[str] | None = None,
     ) -> Sequence[ModelT]:
         """Returns a list of records based on query params.
 
@@ -113,18 +500,291 @@ class SPCandidateController(
         :param order_: Dict whose keys are sort order and values are lists of
             fields
         :param q: The query parameters.
+        :param keyset_: Unique list of fields to order and paginate records
+            by with the ``after`` cursor query parameter.
+        :param load_: The relationships to eagerly load.
         :return: A list of records.
         """
-        _params = await self._prepare_query_parameters(db=db, params=q)
-        if self._is_fetch_latest_observation(params=_params):
-            order_ = {"asc": ["candidate.observed_at"]}
         rows: Sequence[Row[ModelT]] = await self.repository.get_all(
             db=db,
             join_=join_,
             order_=order_,
-            q=_params,
+            q=await self._prepare_query_parameters(db=db, params=q),
+            keyset_=keyset_,
+            load_=load_,
         )
         logger.info(
             f"Database returned {len(rows)} {self.model_class} objects.",
         )
         return [row[0] for row in rows]
+
+    async def stream_all(
+        self,
+        db: DBSession,
+        join_: list[str] | None = None,
+        order_: dict[str, list[str]] | None = None,
+        q: list[BaseModel] | None = None,
+        load_: list[str] | None = None,
+    ) -> AsyncIterator[ModelT]:
+        """Yields every record matching the query params without loading
+        them all into memory. Pagination query params are ignored.
+
+        :param join_: The joins to make.
+        :param order_: Dict whose keys are sort order and values are lists of
+            fields
+        :param q: The query parameters.
+        :param load_: The relationships to eagerly load.
+        :return: An async iterator of records.
+        """
+        async for obj in self.repository.stream_all(
+            db=db,
+            join_=join_,
+            order_=order_,
+            q=await self._prepare_query_parameters(db=db, params=q),
+            load_=load_,
+        ):
+            yield obj
+
+    async def get_page(  # pylint: disable=R0913 # noqa: PLR0913
+        self,
+        db: DBSession,
+        join_: list[str] | None = None,
+        order_: dict[str, list[str]] | None = None,
+        q: list[BaseModel] | None = None,
+        keyset_: list[str] | None = None,
+        load_: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Returns a page of records and the count of all records matching
+        the query params.
+
+        If the ``estimate_count`` query parameter is true and no filters are
+        given, the count is estimated from planner statistics.
+
+        :param join_: The joins to make.
+        :param order_: Dict whose keys are sort order and values are lists of
+            fields
+        :param q: The query parameters.
+        :param keyset_: Unique list of fields to order and paginate records
+            by with the ``after`` cursor query parameter.
+        :param load_: The relationships to eagerly load.
+        :return: The count, whether it is estimated and the page of records.
+        """
+        _params = await self._prepare_query_parameters(db=db, params=q)
+        estimate_count = bool(_params.pop("estimate_count", False))
+        rows, total, estimated = await self.repository.get_all_with_count(
+            db=db,
+            join_=join_,
+            order_=order_,
+            q=_params,
+            keyset_=keyset_,
+            load_=load_,
+            estimate_count=estimate_count,
+        )
+        logger.info(
+            f"Database returned {len(rows)} of {total} {self.model_class} "
+            "objects.",
+        )
+        return {
+            "total": total,
+            "estimated": estimated,
+            "items": [row[0] for row in rows],
+        }
+
+    async def _resolve_axes(
+        self,
+        db: DBSession,
+        axes: list[tuple[CandidateParameter, int, float | None, float | None]],
+        join_: list[str] | None,
+        q: dict[str, Any],
+    ) -> list[HistogramAxis]:
+        """Returns binned axes over candidate parameters.
+
+        Axis ranges which aren't given are the range of the candidates
+        matching the query params, computed in one query. A range of the
+        candidates which is empty is widened to one unit.
+
+        :param axes: The (parameter, number of bins, min, max) of each axis.
+        :param join_: The joins to make.
+        :param q: The prepared query parameters.
+        """
+        missing = [
+            parameter.value
+            for parameter, _, min_, max_ in axes
+            if min_ is None or max_ is None
+        ]
+        ranges: dict[str, tuple[Any, Any]] = {}
+        if missing:
+            row = await self.repository.get_ranges(
+                db=db,
+                parameters=missing,
+                join_=join_,
+                q=q,
+            )
+            ranges = {
+                parameter: (row[2 * i], row[2 * i + 1])
+                for i, parameter in enumerate(missing)
+            }
+
+        resolved = []
+        for parameter, bins, min_, max_ in axes:
+            data_min, data_max = ranges.get(parameter.value, (None, None))
+            given = min_ is not None and max_ is not None
+            min_ = float(data_min or 0) if min_ is None else min_
+            max_ = float(data_max or 0) if max_ is None else max_
+            if not given and max_ <= min_:
+                # width_bucket needs a non-empty range
+                max_ = min_ + 1
+            resolved.append(
+                HistogramAxis(
+                    name=parameter.value,
+                    min=min_,
+                    max=max_,
+                    bins=bins,
+                ),
+            )
+        return resolved
+
+    async def histogram(
+        self,
+        db: DBSession,
+        params: CandidateHistogramQueryParams,
+        join_: list[str] | None = None,
+        q: list[BaseModel] | None = None,
+    ) -> CandidateHistogram:
+        """Returns a 1D or 2D histogram of the candidate parameters of the
+        single pulse candidates matching the query params.
+
+        Axis ranges which aren't given are the range of the matching
+        candidates.
+
+        :param params: The histogram axes.
+        :param join_: The joins to make.
+        :param q: The query parameters.
+        :return: The histogram axes and dense bin counts.
+        """
+        _params = await self._prepare_query_parameters(db=db, params=q)
+        axes = [(params.x, params.x_bins, params.x_min, params.x_max)]
+        if params.y is not None:
+            axes.append((params.y, params.y_bins, params.y_min, params.y_max))
+        histogram_axes = await self._resolve_axes(
+            db=db,
+            axes=axes,
+            join_=join_,
+            q=_params,
+        )
+        rows = await self.repository.histogram(
+            db=db,
+            axes=[
+                (axis.name, axis.min, axis.max, axis.bins)
+                for axis in histogram_axes
+            ],
+            join_=join_,
+            q=_params,
+        )
+        x_axis = histogram_axes[0]
+        if len(histogram_axes) == 1:
+            counts_1d = [0] * x_axis.bins
+            for x_bin, count in rows:
+                counts_1d[x_bin] = count
+            return CandidateHistogram(
+                total=sum(counts_1d),
+                x=x_axis,
+                counts=counts_1d,
+            )
+
+        y_axis = histogram_axes[1]
+        counts_2d = [[0] * y_axis.bins for _ in range(x_axis.bins)]
+        for x_bin, y_bin, count in rows:
+            counts_2d[x_bin][y_bin] = count
+        return CandidateHistogram(
+            total=sum(map(sum, counts_2d)),
+            x=x_axis,
+            y=y_axis,
+            counts=counts_2d,
+        )
+
+    async def scatter(
+        self,
+        db: DBSession,
+        params: CandidateScatterQueryParams,
+        join_: list[str] | None = None,
+        q: list[BaseModel] | None = None,
+    ) -> CandidateScatter:
+        """Returns a downsampled scatter plot of two candidate parameters of
+        the single pulse candidates matching the query params.
+
+        The plot is divided into tiles and the highest SNR candidates in
+        each tile are returned with the number of candidates in each tile,
+        so the number of points is bounded regardless of the number of
+        matching candidates while sparse regions keep every candidate.
+
+        :param params: The scatter plot axes and points per tile.
+        :param join_: The joins to make.
+        :param q: The query parameters.
+        :return: The scatter plot axes, points and tile counts.
+        """
+        _params = await self._prepare_query_parameters(db=db, params=q)
+        x_axis, y_axis = await self._resolve_axes(
+            db=db,
+            axes=[
+                (params.x, params.x_bins, params.x_min, params.x_max),
+                (params.y, params.y_bins, params.y_min, params.y_max),
+            ],
+            join_=join_,
+            q=_params,
+        )
+        rows = await self.repository.scatter(
+            db=db,
+            x=(x_axis.name, x_axis.min, x_axis.max, x_axis.bins),
+            y=(y_axis.name, y_axis.min, y_axis.max, y_axis.bins),
+            per_tile=params.per_tile,
+            join_=join_,
+            q=_params,
+        )
+        points: dict[str, list[Any]] = {
+            name: [] for name in ScatterPoints.model_fields
+        }
+        tiles: dict[str, list[int]] = {
+            name: [] for name in ScatterTiles.model_fields
+        }
+        for row in rows:
+            for name, values in points.items():
+                values.append(getattr(row, name))
+            if row.rank == 1:
+                tiles["x_bin"].append(row.x_bin)
+                tiles["y_bin"].append(row.y_bin)
+                tiles["count"].append(row.tile_count)
+        return CandidateScatter(
+            total=sum(tiles["count"]),
+            x=x_axis,
+            y=y_axis,
+            points=ScatterPoints(**points),
+            tiles=ScatterTiles(**tiles),
+        )
+
+    async def group_counts(
+        self,
+        db: DBSession,
+        by: CandidateGroup,
+        join_: list[str] | None = None,
+        q: list[BaseModel] | None = None,
+    ) -> CandidateGroupCounts:
+        """Returns the number of single pulse candidates matching the query
+        params in each beam, host, observation or label entity.
+
+        :param by: The attribute to group candidates by.
+        :param join_: The joins to make.
+        :param q: The query parameters.
+        :return: The groups and their counts.
+        """
+        rows = await self.repository.group_counts(
+            db=db,
+            by=by.value,
+            join_=join_,
+            q=await self._prepare_query_parameters(db=db, params=q),
+        )
+        return CandidateGroupCounts(
+            by=by.value,
+            keys=[row[0] for row in rows],
+            counts=[row[1] for row in rows],
+        )
@@ -0,0 +1,130 @@
+"""Parse candidates from bulk ingest request bodies.
+
+Request bodies are parsed line by line as they are received so that large
+bodies are never held in memory. CSV bodies must start with a header row
+naming the columns and rows must not contain line breaks.
+"""
+
+import csv
+import json
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+from ska_src_maltopuft_backend.core.exceptions import (
+    InvalidRowError,
+    UnsupportedMediaTypeError,
+)
+
+from .requests import IngestCandidate
+
+# The candidate attributes copied into the database, in copy order.
+INGEST_COLUMNS = (
+    "dm",
+    "snr",
+    "width",
+    "ra",
+    "dec",
+    "pos",
+    "observed_at",
+    "beam_id",
+    "plot_path",
+)
+
+RowParser = Callable[[AsyncIterator[str]], AsyncIterator[dict[str, Any]]]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a stream of bytes into lines of text."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode()
+    if buffer:
+        yield buffer.decode()
+
+
+async def iter_ndjson_rows(
+    lines: AsyncIterator[str],
+) -> AsyncIterator[dict[str, Any]]:
+    """Parse newline delimited JSON objects."""
+    async for line in lines:
+        if not line.strip():
+            continue
+        yield json.loads(line)
+
+
+async def iter_csv_rows(
+    lines: AsyncIterator[str],
+) -> AsyncIterator[dict[str, Any]]:
+    """Parse CSV rows into dicts keyed by the header row's column names.
+
+    Empty values are parsed as None.
+    """
+    header: list[str] | None = None
+    async for line in lines:
+        if not line.strip():
+            continue
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [column.strip() for column in values]
+            continue
+        yield {
+            column: value or None
+            for column, value in zip(header, values, strict=True)
+        }
+
+
+ROW_PARSERS: dict[str, RowParser] = {
+    "application/x-ndjson": iter_ndjson_rows,
+    "application/jsonl": iter_ndjson_rows,
+    "text/csv": iter_csv_rows,
+}
+
+
+def get_row_parser(content_type: str | None) -> RowParser:
+    """Return the row parser for a request body's media type.
+
+    :raises UnsupportedMediaTypeError: If the media type can't be parsed.
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    parser = ROW_PARSERS.get(media_type)
+    if parser is None:
+        msg = (
+            f"Unsupported media type {media_type!r}, expected one of "
+            f"{sorted(ROW_PARSERS)}."
+        )
+        raise UnsupportedMediaTypeError(msg)
+    return parser
+
+
+async def iter_ingest_rows(
+    parser: RowParser,
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[tuple[Any, ...]]:
+    """Validate candidates in a request body and yield their attributes in
+    ``INGEST_COLUMNS`` order.
+
+    :param parser: The request body row parser.
+    :param chunks: The request body stream.
+    :raises InvalidRowError: If a row can't be parsed or is invalid.
+    """
+    rows = parser(iter_lines(chunks))
+    row_number = 0
+    while True:
+        row_number += 1
+        try:
+            row = await anext(rows)
+        except StopAsyncIteration:
+            return
+        except ValueError as exc:
+            msg = f"Can't parse row {row_number}: {exc}"
+            raise InvalidRowError(msg) from exc
+
+        try:
+            candidate = IngestCandidate.model_validate(row).model_dump()
+        except ValueError as exc:
+            msg = f"Invalid row {row_number}: {exc}"
+            raise InvalidRowError(msg) from exc
+        yield tuple(candidate[column] for column in INGEST_COLUMNS)
@@ -0,0 +1,74 @@
+"""Scheduled maintenance of the candidate partitions."""
+
+import asyncio
+import logging
+
+import psycopg
+import sqlalchemy as sa
+
+from ska_src_maltopuft_backend.candle.controller import CandidateController
+from ska_src_maltopuft_backend.core.config import settings
+from ska_src_maltopuft_backend.core.database.database import (
+    psycopg_conninfo,
+    session_scope,
+)
+from ska_src_maltopuft_backend.core.factory import Factory
+
+logger = logging.getLogger(__name__)
+
+# The session level advisory lock held by the worker process which
+# maintains the candidate partitions
+MAINTENANCE_LOCK_SQL = (
+    "SELECT pg_try_advisory_lock(hashtext('maintain_candidate_partitions'))"
+)
+
+
+async def create_upcoming_partitions() -> None:
+    """Create the candidate partitions of the current and upcoming months
+    every CANDIDATE_PARTITION_INTERVAL seconds.
+
+    Every worker process runs the task, but only the worker which holds an
+    advisory lock creates partitions. The lock is held by a dedicated
+    connection, so it's released if the worker exits or loses the
+    connection. The other workers try to take the lock every interval, so
+    that one of them takes over.
+    """
+    candidate_controller = Factory().get_candidate_controller()
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(
+                psycopg_conninfo(),
+                autocommit=True,
+            ) as conn:
+                cursor = await conn.execute(MAINTENANCE_LOCK_SQL)
+                row = await cursor.fetchone()
+                while row is not None and row[0]:
+                    await _create_upcoming_partitions(
+                        candidate_controller=candidate_controller,
+                    )
+                    await asyncio.sleep(settings.CANDIDATE_PARTITION_INTERVAL)
+                    # Raises if the connection, and so the lock, was lost
+                    await conn.execute("SELECT 1")
+        except psycopg.OperationalError:
+            logger.exception(
+                "Lost candidate partition maintenance connection to "
+                f"{settings.MALTOPUFT_POSTGRES_INFO}, retrying in "
+                f"{settings.CANDIDATE_PARTITION_INTERVAL} seconds.",
+            )
+        await asyncio.sleep(settings.CANDIDATE_PARTITION_INTERVAL)
+
+
+async def _create_upcoming_partitions(
+    candidate_controller: CandidateController,
+) -> None:
+    try:
+        async with session_scope() as db:
+            await candidate_controller.create_upcoming_partitions(
+                db=db,
+                months=settings.CANDIDATE_PARTITION_MONTHS_AHEAD,
+            )
+    except sa.exc.SQLAlchemyError:
+        logger.exception(
+            "Failed to create upcoming candidate partitions, retrying in "
+            f"{settings.CANDIDATE_PARTITION_INTERVAL} seconds.",
+        )
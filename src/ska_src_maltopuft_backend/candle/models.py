@@ -8,8 +8,16 @@ import sqlalchemy as sa
 from sqlalchemy.orm import Mapped, deferred, mapped_column, relationship
 
 from ska_src_maltopuft_backend.core.database.base import Base
+from ska_src_maltopuft_backend.core.database.pgsphere import (
+    create_pos_index_ddl,
+)
 from ska_src_maltopuft_backend.core.mixins import TimestampMixin
 
+from .partitions import (
+    CANDIDATE_PARTITION_DDL,
+    create_default_partition_sql,
+)
+
 if TYPE_CHECKING:
     from ska_src_maltopuft_backend.app.models import Beam, Label
 
@@ -25,6 +33,12 @@ class Candidate(Base, TimestampMixin):
     same parent table facilitates identifying potential repeat candidates
     (e.g. by cross-matching dm, ra and dec between candidates, labels and
     known sources).
+
+    Candidates are partitioned by observation time, so the table's primary
+    key includes ``observed_at``. Candidate ids still identify candidates in
+    the ORM. They are unique because they are assigned by the table's
+    sequence, but no constraint enforces it, so ids must not be written
+    explicitly.
     """
 
     __tablename__ = "candidate"
@@ -42,7 +56,14 @@ class Candidate(Base, TimestampMixin):
         nullable=False,
     )
     pos: Mapped[str] = mapped_column(sa.String(), nullable=False)
-    observed_at: Mapped[dt.datetime] = mapped_column(nullable=False)
+    observed_at: Mapped[dt.datetime] = mapped_column(
+        primary_key=True,
+        nullable=False,
+    )
+
+    # The id of the first candidate in the candidate's repeat source
+    # cluster, or None if the candidate hasn't been clustered yet
+    cluster_id: Mapped[int | None] = mapped_column(nullable=True, index=True)
 
     # Foreign keys
     beam_id: Mapped[int] = mapped_column(
@@ -55,7 +76,10 @@ class Candidate(Base, TimestampMixin):
     sp_candidate: Mapped["SPCandidate"] = relationship(
         back_populates="candidate",
     )
-    labels: Mapped[list["Label"]] = relationship(back_populates="candidate")
+    labels: Mapped[list["Label"]] = relationship(
+        back_populates="candidate",
+        primaryjoin="Candidate.id == foreign(Label.candidate_id)",
+    )
 
     __table_args__ = (
         sa.UniqueConstraint(
@@ -67,7 +91,23 @@ class Candidate(Base, TimestampMixin):
             "observed_at",
             "beam_id",
         ),
+        # Keyset pagination order
+        sa.Index("candidate_observed_at_id_idx", "observed_at", "id"),
+        # Candidates of beams (and their observations) in time order
+        sa.Index(
+            "candidate_beam_id_observed_at_idx",
+            "beam_id",
+            "observed_at",
+        ),
+        # Candidates which haven't been clustered, in clustering order
+        sa.Index(
+            "candidate_unclustered_id_idx",
+            "id",
+            postgresql_where=sa.text("cluster_id IS NULL"),
+        ),
+        {"postgresql_partition_by": "RANGE (observed_at)"},
     )
+    __mapper_args__ = {"primary_key": [id]}  # noqa: RUF012
 
     def __repr__(self) -> str:
         """Candidate repr."""
@@ -83,6 +123,9 @@ class Candidate(Base, TimestampMixin):
         )
 
 
+sa.event.listen(Candidate.__table__, "after_create", create_pos_index_ddl())
+
+
 class SPCandidate(Base, TimestampMixin):
     """Single-pulse candidate database model.
 
@@ -90,25 +133,41 @@ class SPCandidate(Base, TimestampMixin):
     observations. The sp_candidate model must have exactly one parent
     candidate which records the observation metadata attributes shared
     with periodic candidates.
+
+    Single pulse candidates are partitioned by their candidate's
+    observation time, which is copied to ``observed_at``.
     """
 
     __tablename__ = "sp_candidate"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    plot_path: Mapped[str] = mapped_column(nullable=False, unique=True)
-
-    # Foreign keys
-    candidate_id: Mapped[int] = mapped_column(
-        sa.ForeignKey("candidate.id"),
-        unique=True,
+    plot_path: Mapped[str] = mapped_column(nullable=False)
+    observed_at: Mapped[dt.datetime] = mapped_column(
+        primary_key=True,
         nullable=False,
     )
 
+    # Foreign keys
+    candidate_id: Mapped[int] = mapped_column(nullable=False)
+
     # Relationships
     candidate: Mapped["Candidate"] = relationship(
         back_populates="sp_candidate",
     )
 
+    # Unique constraints must include the partition key
+    __table_args__ = (
+        sa.ForeignKeyConstraint(
+            ["candidate_id", "observed_at"],
+            ["candidate.id", "candidate.observed_at"],
+            onupdate="CASCADE",
+        ),
+        sa.UniqueConstraint("candidate_id", "observed_at"),
+        sa.UniqueConstraint("plot_path", "observed_at"),
+        {"postgresql_partition_by": "RANGE (observed_at)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}  # noqa: RUF012
+
     def __repr__(self) -> str:
         """SPCandidate repr."""
         return (
@@ -116,3 +175,13 @@ class SPCandidate(Base, TimestampMixin):
             f"plot_path={self.plot_path},"
             f"candidate_id={self.candidate_id}"
         )
+
+
+for model in (Candidate, SPCandidate):
+    sa.event.listen(
+        model.__table__,
+        "after_create",
+        sa.DDL(create_default_partition_sql(model.__tablename__)),
+    )
+for ddl in CANDIDATE_PARTITION_DDL:
+    sa.event.listen(Base.metadata, "after_create", ddl)
@@ -0,0 +1,268 @@
+"""Database functions which maintain the monthly partitions of the
+candidate and sp_candidate tables.
+
+Candidates and single pulse candidates are range partitioned by their
+observation time, with one partition per calendar month, e.g.
+``candidate_2024_06``. Single pulse candidates are partitioned by their
+candidate's observation time, so each candidate partition has a matching
+single pulse candidate partition.
+
+The partitions of the current and upcoming months are created in advance
+by a scheduled task, outside of the transactions which write candidates.
+Partitions of other months are created on demand before candidates are
+written. Attaching a partition locks the default partition, so queries
+which scan the default partition wait for the transaction writing the
+candidates to end. Rows outside of every monthly partition are held in the
+default partition.
+
+Old months are archived by detaching their partitions, single pulse
+candidates first because they reference candidates, e.g.::
+
+    ALTER TABLE sp_candidate DETACH PARTITION sp_candidate_2024_06;
+    ALTER TABLE candidate DETACH PARTITION candidate_2024_06;
+
+Labels can't reference the partitioned candidate table with a foreign key
+constraint, which must include the partition key, so the reference is
+checked by triggers instead. For the same reason, unique constraints on
+the partitioned tables are only enforced within a month, so single pulse
+candidate plot paths are kept unique across months by a trigger.
+"""
+
+import sqlalchemy as sa
+
+PARTITIONED_TABLES = ("candidate", "sp_candidate")
+
+
+def default_partition_name(table: str) -> str:
+    """Return the name of a table's default partition."""
+    return f"{table}_default"
+
+
+def create_default_partition_sql(table: str) -> str:
+    """Return SQL which creates a table's default partition."""
+    return (
+        "CREATE TABLE IF NOT EXISTS "
+        f"{default_partition_name(table)} PARTITION OF {table} DEFAULT"
+    )
+
+
+# Creates the partitions of the month containing the given time. Partitions
+# are created as tables and then attached, which takes a SHARE UPDATE
+# EXCLUSIVE lock on the partitioned tables, so they can still be queried,
+# but an ACCESS EXCLUSIVE lock on their default partitions until the
+# transaction ends. The creation of a month's partitions is serialised with
+# a transaction level advisory lock, so concurrent writers don't create the
+# same tables. Existing partitions are skipped without taking the lock. A
+# month whose rows were written to the default partition before its
+# partition existed keeps them there, because moving them would block
+# writes.
+CREATE_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION create_candidate_partitions(month_at timestamp)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    start_at timestamp := date_trunc('month', month_at);
+    end_at timestamp := date_trunc('month', month_at) + interval '1 month';
+    suffix text := to_char(date_trunc('month', month_at), 'YYYY_MM');
+    parent text;
+    partition_name text;
+    has_default_rows boolean;
+BEGIN
+    IF to_regclass('candidate_' || suffix) IS NOT NULL
+        AND to_regclass('sp_candidate_' || suffix) IS NOT NULL
+    THEN
+        RETURN;
+    END IF;
+
+    PERFORM pg_advisory_xact_lock(
+        hashtext('create_candidate_partitions'),
+        to_char(start_at, 'YYYYMM')::integer
+    );
+
+    FOREACH parent IN ARRAY ARRAY['candidate', 'sp_candidate'] LOOP
+        partition_name := parent || '_' || suffix;
+        CONTINUE WHEN to_regclass(partition_name) IS NOT NULL;
+
+        EXECUTE format(
+            'SELECT EXISTS (SELECT 1 FROM %I '
+            'WHERE observed_at >= $1 AND observed_at < $2)',
+            parent || '_default'
+        ) INTO has_default_rows USING start_at, end_at;
+        CONTINUE WHEN has_default_rows;
+
+        EXECUTE format(
+            'CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS)',
+            partition_name,
+            parent
+        );
+        EXECUTE format(
+            'ALTER TABLE %I ATTACH PARTITION %I '
+            'FOR VALUES FROM (%L) TO (%L)',
+            parent,
+            partition_name,
+            start_at,
+            end_at
+        );
+    END LOOP;
+END;
+$$
+"""
+
+# Labels must reference an existing candidate, and candidates can't be
+# deleted while they are labelled. Violations raise the same error as a
+# foreign key constraint. Candidates moved to another partition by an
+# update are deleted and re-inserted, so deleted candidates are only
+# rejected if no candidate with the same id remains.
+CREATE_LABEL_CANDIDATE_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION label_candidate_reference_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM 1 FROM candidate WHERE id = NEW.candidate_id FOR KEY SHARE;
+    IF NOT FOUND THEN
+        RAISE foreign_key_violation USING
+            MESSAGE = format(
+                'label references non-existent candidate %s',
+                NEW.candidate_id
+            ),
+            CONSTRAINT = 'label_candidate_id_fkey';
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+CREATE_CANDIDATE_LABEL_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION candidate_label_reference_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM label WHERE candidate_id = OLD.id)
+        AND NOT EXISTS (SELECT 1 FROM candidate WHERE id = OLD.id)
+    THEN
+        RAISE foreign_key_violation USING
+            MESSAGE = format(
+                'candidate %s is still referenced by labels',
+                OLD.id
+            ),
+            CONSTRAINT = 'label_candidate_id_fkey';
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+# The (table, event, function) of each reference trigger
+REFERENCE_TRIGGERS = {
+    "label_candidate_reference": (
+        "label",
+        "INSERT OR UPDATE OF candidate_id",
+        "label_candidate_reference_trigger",
+    ),
+    "candidate_label_reference": (
+        "candidate",
+        "DELETE",
+        "candidate_label_reference_trigger",
+    ),
+}
+
+
+def create_reference_trigger_sql(name: str) -> str:
+    """Return SQL which creates a label candidate reference trigger."""
+    table, event, function = REFERENCE_TRIGGERS[name]
+    return (
+        f"CREATE OR REPLACE TRIGGER {name} AFTER {event} ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION {function}()"
+    )
+
+
+CANDIDATE_PARTITION_SQL = (
+    CREATE_PARTITION_FUNCTION,
+    CREATE_LABEL_CANDIDATE_TRIGGER_FUNCTION,
+    CREATE_CANDIDATE_LABEL_TRIGGER_FUNCTION,
+    *(create_reference_trigger_sql(name) for name in REFERENCE_TRIGGERS),
+)
+
+# Single pulse candidate plot paths must be unique across every partition.
+# Violations raise the same error as a unique constraint. Checks of the
+# same plot path are serialised with a transaction level advisory lock, so
+# concurrent writers see each other's candidates once they are committed.
+# The trigger runs after each row is written, so duplicates within a
+# single statement are also rejected.
+CREATE_PLOT_PATH_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION sp_candidate_plot_path_unique_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(
+        hashtext('sp_candidate_plot_path'),
+        hashtext(NEW.plot_path)
+    );
+    IF EXISTS (
+        SELECT 1 FROM sp_candidate
+        WHERE plot_path = NEW.plot_path AND id <> NEW.id
+    ) THEN
+        RAISE unique_violation USING
+            MESSAGE = format(
+                'sp candidate plot path %s already exists',
+                NEW.plot_path
+            ),
+            CONSTRAINT = 'sp_candidate_plot_path_key';
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+# The (name, function) of the plot path trigger
+PLOT_PATH_TRIGGER = (
+    "sp_candidate_plot_path_unique",
+    "sp_candidate_plot_path_unique_trigger",
+)
+
+CREATE_PLOT_PATH_TRIGGER = (
+    f"CREATE OR REPLACE TRIGGER {PLOT_PATH_TRIGGER[0]} "
+    "AFTER INSERT OR UPDATE OF plot_path ON sp_candidate "
+    f"FOR EACH ROW EXECUTE FUNCTION {PLOT_PATH_TRIGGER[1]}()"
+)
+
+PLOT_PATH_SQL = (
+    CREATE_PLOT_PATH_TRIGGER_FUNCTION,
+    CREATE_PLOT_PATH_TRIGGER,
+)
+
+# DDL statements are %-formatted, so format() placeholders are escaped
+CANDIDATE_PARTITION_DDL = tuple(
+    sa.DDL(statement.replace("%", "%%"))
+    for statement in (*CANDIDATE_PARTITION_SQL, *PLOT_PATH_SQL)
+)
+
+# Creates the partitions of the current month and the given number of
+# upcoming months
+CREATE_UPCOMING_PARTITIONS = sa.text(
+    """
+    SELECT create_candidate_partitions(
+        CAST(
+            date_trunc('month', now() AT TIME ZONE 'UTC')
+            + make_interval(months => month_offset)
+            AS timestamp
+        )
+    )
+    FROM generate_series(0, :months) AS month_offset
+    """,
+)
+
+# Creates the partitions of each month of the given observation times
+CREATE_PARTITIONS = sa.text(
+    """
+    SELECT create_candidate_partitions(month)
+    FROM (
+        SELECT DISTINCT date_trunc('month', observed_at) AS month
+        FROM unnest(CAST(:observed_at AS timestamp[])) AS observed_at
+    ) AS months
+    """,
+)
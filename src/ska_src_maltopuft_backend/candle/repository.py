@@ -1,12 +1,790 @@
 """Database CRUD operations for the Candidate model."""
 
-from ska_src_maltopuft_backend.app.models import Candidate, SPCandidate
+import datetime as dt
+from collections.abc import AsyncIterator, Iterable, Sequence
+from typing import Any, ClassVar
+
+import sqlalchemy as sa
+from sqlalchemy import ColumnElement, Row, Select, select, update
+from sqlalchemy.orm import aliased
+
+from ska_src_maltopuft_backend.app.models import (
+    Beam,
+    Candidate,
+    Entity,
+    KnownPulsar,
+    Label,
+    ObservationSummary,
+    SPCandidate,
+)
+from ska_src_maltopuft_backend.core.database.pgsphere import (
+    cone_search,
+    separation,
+)
+from ska_src_maltopuft_backend.core.pagination import decode_cursor
 from ska_src_maltopuft_backend.core.repository import BaseRepository
+from ska_src_maltopuft_backend.core.types import DBSession
+
+from .ingest import INGEST_COLUMNS
+from .partitions import CREATE_PARTITIONS, CREATE_UPCOMING_PARTITIONS
+
+INGEST_STAGING_TABLE = "candidate_staging"
+
+# The staging table is dropped once the staged candidates are merged, or
+# when the ingest transaction ends if an error occurs. The observed_at
+# timezone is handled in the same way as the ORM by casting to
+# timestamp when candidates are merged.
+CREATE_STAGING_TABLE = sa.text(
+    f"""
+    CREATE TEMPORARY TABLE {INGEST_STAGING_TABLE} (
+        row_number bigint GENERATED ALWAYS AS IDENTITY,
+        dm double precision,
+        snr double precision,
+        width double precision,
+        ra numeric(8, 5),
+        dec numeric(8, 5),
+        pos varchar,
+        observed_at timestamptz,
+        beam_id integer,
+        plot_path varchar,
+        candidate_id integer
+    ) ON COMMIT DROP
+    """,
+)
+
+CREATE_STAGED_PARTITIONS = sa.text(
+    f"""
+    SELECT create_candidate_partitions(month)
+    FROM (
+        SELECT DISTINCT date_trunc('month', observed_at::timestamp) AS month
+        FROM {INGEST_STAGING_TABLE}
+    ) AS months
+    """,
+)
+
+MERGE_CANDIDATES = sa.text(
+    f"""
+    INSERT INTO candidate (
+        dm, snr, width, ra, dec, pos, observed_at, beam_id
+    )
+    SELECT dm, snr, width, ra, dec, pos, observed_at::timestamp, beam_id
+    FROM {INGEST_STAGING_TABLE}
+    ORDER BY row_number
+    ON CONFLICT (dm, snr, width, ra, dec, observed_at, beam_id) DO NOTHING
+    """,
+)
+
+RESOLVE_CANDIDATE_IDS = sa.text(
+    f"""
+    UPDATE {INGEST_STAGING_TABLE} AS s
+    SET candidate_id = c.id
+    FROM candidate AS c
+    WHERE c.dm = s.dm
+        AND c.snr = s.snr
+        AND c.width = s.width
+        AND c.ra = s.ra
+        AND c.dec = s.dec
+        AND c.observed_at = s.observed_at::timestamp
+        AND c.beam_id = s.beam_id
+    """,
+)
+
+# Plot paths are unique across partitions, which ON CONFLICT can't infer
+# from a unique index, so candidates with an existing plot path are skipped
+MERGE_SP_CANDIDATES = sa.text(
+    f"""
+    INSERT INTO sp_candidate (plot_path, candidate_id, observed_at)
+    SELECT s.plot_path, s.candidate_id, s.observed_at::timestamp
+    FROM {INGEST_STAGING_TABLE} AS s
+    WHERE s.plot_path IS NOT NULL
+        AND NOT EXISTS (
+            SELECT 1 FROM sp_candidate AS sp WHERE sp.plot_path = s.plot_path
+        )
+    ORDER BY s.row_number
+    ON CONFLICT DO NOTHING
+    """,
+)
+
+SELECT_INGESTED_IDS = sa.text(
+    f"""
+    SELECT s.candidate_id, sp.id
+    FROM {INGEST_STAGING_TABLE} AS s
+    LEFT JOIN sp_candidate AS sp ON sp.candidate_id = s.candidate_id
+    ORDER BY s.row_number
+    """,
+)
+
+DROP_STAGING_TABLE = sa.text(f"DROP TABLE {INGEST_STAGING_TABLE}")
+
+# Aggregated candidate parameters. Observation times are aggregated as
+# POSIX timestamps.
+PARAMETER_COLUMNS: dict[str, Any] = {
+    "dm": Candidate.dm,
+    "snr": Candidate.snr,
+    "width": Candidate.width,
+    "observed_at": sa.extract("epoch", Candidate.observed_at),
+}
+
+GROUP_COLUMNS: dict[str, Any] = {
+    "beam": Candidate.beam_id,
+    "host": Beam.host_id,
+    "observation": Beam.observation_id,
+    "entity": Entity.type,
+}
+
+
+def _summary_bound(
+    aggregate: Any,
+    summary_column: Any,
+    unbounded: str,
+    criteria: list[ColumnElement[bool]],
+) -> sa.ScalarSelect:
+    """Return a scalar subquery which aggregates an observation time bound of
+    the filtered beams' summaries.
+
+    :param aggregate: The aggregate function, e.g. ``sa.func.min``.
+    :param summary_column: The summary column to aggregate.
+    :param unbounded: The bound of a beam without a summary, ``-infinity``
+        or ``infinity``.
+    :param criteria: The beam filters.
+    """
+    return (
+        select(
+            aggregate(
+                sa.func.coalesce(
+                    summary_column,
+                    sa.literal_column(f"'{unbounded}'"),
+                ),
+            ),
+        )
+        .select_from(Beam)
+        .outerjoin(ObservationSummary, ObservationSummary.beam_id == Beam.id)
+        .where(*criteria)
+        # Beam is also joined by candidate queries
+        .correlate(None)
+        .scalar_subquery()
+    )
+
+
+def _apply_partition_bounds(
+    query: Select,
+    column: Any,
+    q: dict[str, Any] | None,
+) -> Select:
+    """Bound the observation times of candidates filtered by observation or
+    beam, so that only the partitions of those observations are scanned.
+
+    The bounds are selected from the observation summaries of the filtered
+    beams, so partitions are pruned when the query is executed. Summaries
+    are written with their beams' candidates, but a filtered beam without a
+    summary leaves the observation times unbounded, so that its candidates
+    are never excluded.
+
+    :param query: The query to bound.
+    :param column: The partitioned ``observed_at`` column.
+    :param q: The query parameters.
+    :return: The bounded query.
+    """
+    if not q:
+        return query
+    criteria = []
+    if q.get("observation_id"):
+        criteria.append(Beam.observation_id.in_(q["observation_id"]))
+    if q.get("beam_id"):
+        criteria.append(Beam.id.in_(q["beam_id"]))
+    if not criteria:
+        return query
+    return query.where(
+        column.between(
+            _summary_bound(
+                aggregate=sa.func.min,
+                summary_column=ObservationSummary.observed_at_min,
+                unbounded="-infinity",
+                criteria=criteria,
+            ),
+            _summary_bound(
+                aggregate=sa.func.max,
+                summary_column=ObservationSummary.observed_at_max,
+                unbounded="infinity",
+                criteria=criteria,
+            ),
+        ),
+    )
+
+
+def _bin(
+    parameter: str,
+    min_: float,
+    max_: float,
+    bins: int,
+) -> ColumnElement[int]:
+    """Return the zero based index of a candidate parameter's bin.
+
+    Values equal to the maximum are in the last bin.
+    """
+    bucket = sa.func.width_bucket(
+        PARAMETER_COLUMNS[parameter],
+        min_,
+        max_,
+        bins,
+    )
+    return sa.func.least(bucket, bins) - 1
+
+
+def _in_range(
+    parameter: str,
+    min_: float,
+    max_: float,
+) -> ColumnElement[bool]:
+    """Return whether a candidate parameter is in a bin range."""
+    return PARAMETER_COLUMNS[parameter].between(min_, max_)
 
 
 class CandidateRepository(BaseRepository[Candidate]):
     """Database CRUD operations for the Candidate model."""
 
+    foreign_key_map: ClassVar = {
+        **BaseRepository.foreign_key_map,
+        "cluster_id": (Candidate, "cluster_id"),
+    }
+
+    async def create(
+        self,
+        db: DBSession,
+        attributes: dict[str, Any],
+    ) -> Candidate:
+        """Creates a candidate in its observation time's partition.
+
+        :param db: The database session.
+        :param attributes: The attributes to create the candidate with.
+        :return: The created candidate.
+        """
+        await self.create_partitions(
+            db=db,
+            observed_at=[attributes["observed_at"]],
+        )
+        return await super().create(db=db, attributes=attributes)
+
+    async def create_many(
+        self,
+        db: DBSession,
+        objects: list[dict[str, Any]],
+    ) -> Sequence[Row[tuple[int]]]:
+        """Create candidates in their observation times' partitions.
+
+        :param db: The database session.
+        :param objects: The candidates to create.
+        :return: The created candidate ids.
+        """
+        await self.create_partitions(
+            db=db,
+            observed_at=[obj["observed_at"] for obj in objects],
+        )
+        return await super().create_many(db=db, objects=objects)
+
+    async def create_partitions(
+        self,
+        db: DBSession,
+        observed_at: Iterable[dt.datetime],
+    ) -> None:
+        """Create the candidate and single pulse candidate partitions of
+        the months of the given observation times if they don't exist.
+
+        :param db: The database session.
+        :param observed_at: The observation times.
+        """
+        months = sorted(set(observed_at))
+        if not months:
+            return
+        await self._execute(
+            db=db,
+            query=CREATE_PARTITIONS,
+            params={"observed_at": months},
+        )
+
+    async def create_upcoming_partitions(
+        self,
+        db: DBSession,
+        months: int,
+    ) -> None:
+        """Create the candidate and single pulse candidate partitions of the
+        current month and upcoming months if they don't exist.
+
+        :param db: The database session.
+        :param months: The number of upcoming months.
+        """
+        await self._execute(
+            db=db,
+            query=CREATE_UPCOMING_PARTITIONS,
+            params={"months": months},
+        )
+
+    def _apply_filters(
+        self,
+        query: Select,
+        q: dict[str, Any] | None,
+    ) -> Select:
+        query = _apply_partition_bounds(
+            query=query,
+            column=Candidate.observed_at,
+            q=q,
+        )
+        return super()._apply_filters(query=query, q=q)
+
+    async def get_unclustered_ids(
+        self,
+        db: DBSession,
+        limit: int,
+    ) -> list[int]:
+        """Returns the ids of the oldest candidates which haven't been
+        assigned to a cluster.
+
+        :param db: The database session.
+        :param limit: The maximum number of ids to return.
+        :return: The candidate ids in ascending order.
+        """
+        query = (
+            select(Candidate.id)
+            .where(Candidate.cluster_id.is_(None))
+            .order_by(Candidate.id)
+            .limit(limit)
+        )
+        return list((await self._execute(db=db, query=query)).scalars())
+
+    async def get_neighbours(
+        self,
+        db: DBSession,
+        ids: list[int],
+        radius: float,
+        dm_tolerance: float,
+    ) -> Sequence[Row[tuple[int, int, int | None]]]:
+        """Returns the candidates within a radius and DM tolerance of each
+        of the given candidates.
+
+        Neighbours are found in a single spatial self-join, which can use
+        the candidate position index.
+
+        :param db: The database session.
+        :param ids: The ids of the candidates to find neighbours of.
+        :param radius: The cone search radius in degrees.
+        :param dm_tolerance: The maximum absolute DM difference.
+        :return: (candidate id, neighbour id, neighbour cluster id) rows.
+        """
+        neighbour = aliased(Candidate, name="neighbour")
+        query = (
+            select(
+                Candidate.id,
+                neighbour.id.label("neighbour_id"),
+                neighbour.cluster_id.label("neighbour_cluster_id"),
+            )
+            .join(
+                neighbour,
+                sa.and_(
+                    cone_search(
+                        ra_column=neighbour.ra,
+                        dec_column=neighbour.dec,
+                        ra=Candidate.ra,
+                        dec=Candidate.dec,
+                        radius=radius,
+                    ),
+                    neighbour.dm.between(
+                        Candidate.dm - dm_tolerance,
+                        Candidate.dm + dm_tolerance,
+                    ),
+                    neighbour.id != Candidate.id,
+                ),
+            )
+            .where(Candidate.id.in_(ids))
+        )
+        return await self._execute_all(db=db, query=query)
+
+    async def set_cluster_ids(
+        self,
+        db: DBSession,
+        cluster_ids: dict[int, int],
+    ) -> None:
+        """Assign candidates to clusters.
+
+        :param db: The database session.
+        :param cluster_ids: The cluster id of each candidate id.
+        """
+        if not cluster_ids:
+            return
+        # Candidates are updated by id, which is only part of the
+        # partitioned table's primary key, so the ORM's bulk update by
+        # primary key can't be used
+        table = Candidate.__table__
+        query = (
+            update(table)
+            .where(table.c.id == sa.bindparam("candidate_id"))
+            .values(cluster_id=sa.bindparam("new_cluster_id"))
+        )
+        await self._execute(
+            db=db,
+            query=query,
+            params=[
+                {"candidate_id": id_, "new_cluster_id": cluster_id}
+                for id_, cluster_id in cluster_ids.items()
+            ],
+        )
+
+    async def merge_clusters(
+        self,
+        db: DBSession,
+        cluster_ids: set[int],
+        target_id: int,
+    ) -> int:
+        """Move every candidate in the given clusters to a target cluster.
+
+        :param db: The database session.
+        :param cluster_ids: The ids of the clusters to merge.
+        :param target_id: The id of the cluster to merge into.
+        :return: The number of candidates moved.
+        """
+        query = (
+            update(Candidate)
+            .where(Candidate.cluster_id.in_(cluster_ids))
+            .values(cluster_id=target_id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._execute(db=db, query=query)
+        return result.rowcount
+
+    async def ingest(
+        self,
+        db: DBSession,
+        rows: AsyncIterator[Sequence[Any]],
+    ) -> tuple[int, Sequence[Row[tuple[int, int | None]]]]:
+        """Create candidates and their single pulse candidates in bulk.
+
+        Rows are streamed into a temporary staging table with ``COPY`` and
+        merged into the candidate and sp_candidate tables. Rows which
+        duplicate an existing candidate or single pulse candidate are
+        skipped.
+
+        :param db: The database session.
+        :param rows: The candidate attributes in ``INGEST_COLUMNS`` order.
+        :return: The number of candidates created and the (candidate id,
+            sp candidate id) of each row, in row order.
+        """
+        await self._execute(db=db, query=CREATE_STAGING_TABLE)
+        await self._copy_rows(
+            db=db,
+            table=INGEST_STAGING_TABLE,
+            columns=INGEST_COLUMNS,
+            rows=rows,
+        )
+        await self._execute(db=db, query=CREATE_STAGED_PARTITIONS)
+        created = await self._execute(db=db, query=MERGE_CANDIDATES)
+        await self._execute(db=db, query=RESOLVE_CANDIDATE_IDS)
+        await self._execute(db=db, query=MERGE_SP_CANDIDATES)
+        ids = (await self._execute(db=db, query=SELECT_INGESTED_IDS)).all()
+        await self._execute(db=db, query=DROP_STAGING_TABLE)
+        return created.rowcount, ids
+
+    async def crossmatch(
+        self,
+        db: DBSession,
+        observation_ids: list[int],
+        radius: float,
+        dm_tolerance: float,
+    ) -> Sequence[Row[tuple[int, int, int, KnownPulsar, float, float]]]:
+        """Returns the known pulsars within a radius and DM tolerance of each
+        candidate in the given observations.
+
+        Candidates are cross-matched with known pulsars in a single spatial
+        join, which can use the known pulsar position index. Known pulsars
+        without a DM are not matched.
+
+        :param db: The database session.
+        :param observation_ids: The ids of the observations whose
+            candidates are cross-matched.
+        :param radius: The cone search radius in degrees.
+        :param dm_tolerance: The maximum absolute DM difference.
+        :return: (candidate id, observation id, beam id, known pulsar,
+            separation, DM difference) rows ordered by observation id,
+            candidate id and separation.
+        """
+        separation_ = separation(
+            Candidate.ra,
+            Candidate.dec,
+            KnownPulsar.ra,
+            KnownPulsar.dec,
+        )
+        query = (
+            select(
+                Candidate.id.label("candidate_id"),
+                Beam.observation_id,
+                Candidate.beam_id,
+                KnownPulsar,
+                separation_.label("separation"),
+                (Candidate.dm - KnownPulsar.dm).label("dm_difference"),
+            )
+            .join(Beam, Candidate.beam_id == Beam.id)
+            .join(
+                KnownPulsar,
+                sa.and_(
+                    cone_search(
+                        ra_column=KnownPulsar.ra,
+                        dec_column=KnownPulsar.dec,
+                        ra=Candidate.ra,
+                        dec=Candidate.dec,
+                        radius=radius,
+                    ),
+                    KnownPulsar.dm.between(
+                        Candidate.dm - dm_tolerance,
+                        Candidate.dm + dm_tolerance,
+                    ),
+                ),
+            )
+            .where(Beam.observation_id.in_(observation_ids))
+            .order_by(Beam.observation_id, Candidate.id, separation_)
+        )
+        return await self._execute_all(db=db, query=query)
+
 
 class SPCandidateRepository(BaseRepository[SPCandidate]):
     """Database CRUD operations for the SPCandidate model."""
+
+    # Single pulse candidates are filtered by their candidate's cluster
+    foreign_key_map: ClassVar = {
+        **BaseRepository.foreign_key_map,
+        "cluster_id": (Candidate, "cluster_id"),
+    }
+
+    async def get_candidate_observed_at(
+        self,
+        db: DBSession,
+        candidate_ids: list[int],
+    ) -> dict[int, dt.datetime]:
+        """Returns the observation times of candidates, which their single
+        pulse candidates are partitioned by.
+
+        :param db: The database session.
+        :param candidate_ids: The candidate ids.
+        :return: The observation time of each existing candidate id.
+        """
+        query = select(Candidate.id, Candidate.observed_at).where(
+            Candidate.id.in_(candidate_ids),
+        )
+        rows = await self._execute_all(db=db, query=query)
+        return {row.id: row.observed_at for row in rows}
+
+    def _apply_filters(
+        self,
+        query: Select,
+        q: dict[str, Any] | None,
+    ) -> Select:
+        query = _apply_partition_bounds(
+            query=query,
+            column=SPCandidate.observed_at,
+            q=q,
+        )
+        return super()._apply_filters(query=query, q=q)
+
+    def _apply_keyset_pagination(
+        self,
+        query: Select,
+        keyset_: list[str],
+        after: str,
+    ) -> Select:
+        """Select the rows following a cursor in keyset order.
+
+        Single pulse candidates have their candidate's observation time, so
+        pages in candidate observation time order are also bounded by the
+        single pulse candidates' observation time to prune their partitions.
+
+        :param query: The query ordered by the keyset.
+        :param keyset_: The keyset attributes.
+        :param after: The cursor of the last row of the previous page.
+        :return: The query with the keyset predicate.
+        """
+        query = super()._apply_keyset_pagination(
+            query=query,
+            keyset_=keyset_,
+            after=after,
+        )
+        columns = [self._get_order_class_attr(attr_=attr) for attr in keyset_]
+        if columns[0] is not Candidate.observed_at:
+            return query
+        observed_at = decode_cursor(token=after, columns=columns)[0]
+        return query.where(
+            SPCandidate.observed_at
+            >= sa.literal(observed_at, type_=SPCandidate.observed_at.type),
+        )
+
+    def _filtered_query(
+        self,
+        query: Select,
+        join_: list[str] | None,
+        q: dict[str, Any] | None,
+    ) -> Select:
+        """Select from single pulse candidates with the given joins and
+        query parameter filters in the same way as ``count``.
+        """
+        if q is not None:
+            query = self._apply_filters(query=query, q=dict(q))
+        query = query.select_from(self.model_class)
+        return self._apply_joins(query=query, join_=join_)
+
+    async def get_ranges(
+        self,
+        db: DBSession,
+        parameters: list[str],
+        join_: list[str] | None = None,
+        q: dict[str, Any] | None = None,
+    ) -> Row[tuple[Any, ...]]:
+        """Returns the minimum and maximum of candidate parameters.
+
+        :param db: The database session.
+        :param parameters: The names of the ``PARAMETER_COLUMNS``.
+        :param join_: The joins to make.
+        :param q: The query parameters.
+        :return: The (min, max) of each parameter, flattened in parameter
+            order. Values are None if no candidates match.
+        """
+        columns = []
+        for parameter in parameters:
+            column = PARAMETER_COLUMNS[parameter]
+            columns.extend((sa.func.min(column), sa.func.max(column)))
+        query = self._filtered_query(select(*columns), join_=join_, q=q)
+        return (await self._execute(db=db, query=query)).one()
+
+    async def histogram(
+        self,
+        db: DBSession,
+        axes: list[tuple[str, float, float, int]],
+        join_: list[str] | None = None,
+        q: dict[str, Any] | None = None,
+    ) -> Sequence[Row[tuple[int, ...]]]:
+        """Returns candidate counts in bins of candidate parameters.
+
+        Bins are computed with ``width_bucket``. Candidates outside an
+        axis range are not counted and candidates at the maximum of an axis
+        are counted in its last bin.
+
+        :param db: The database session.
+        :param axes: The (``PARAMETER_COLUMNS`` name, min, max, number of
+            bins) of each axis.
+        :param join_: The joins to make.
+        :param q: The query parameters.
+        :return: (bin index of each axis, count) rows of non-empty bins.
+            Bin indices start at zero.
+        """
+        buckets = [
+            _bin(*axis).label(f"bin_{i}") for i, axis in enumerate(axes)
+        ]
+        query = self._filtered_query(
+            select(*buckets, sa.func.count()),  # pylint: disable=E1102
+            join_=join_,
+            q=q,
+        )
+        # Grouped by output column name because the bin expressions have
+        # bound parameters
+        query = query.where(
+            *(_in_range(*axis[:3]) for axis in axes),
+        ).group_by(*(sa.literal_column(bucket.name) for bucket in buckets))
+        return await self._execute_all(db=db, query=query)
+
+    async def scatter(  # pylint: disable=R0913 # noqa: PLR0913
+        self,
+        db: DBSession,
+        x: tuple[str, float, float, int],
+        y: tuple[str, float, float, int],
+        per_tile: int,
+        join_: list[str] | None = None,
+        q: dict[str, Any] | None = None,
+    ) -> Sequence[Row[tuple[Any, ...]]]:
+        """Returns the highest SNR candidates in each tile of a grid over two
+        candidate parameters, and the number of candidates in each tile.
+
+        Candidates are ranked within tiles with window functions, so only
+        the returned candidates are sent from the database.
+
+        :param db: The database session.
+        :param x: The (``PARAMETER_COLUMNS`` name, min, max, number of bins)
+            of the x axis.
+        :param y: The (``PARAMETER_COLUMNS`` name, min, max, number of bins)
+            of the y axis.
+        :param per_tile: The maximum number of candidates returned from each
+            tile.
+        :param join_: The joins to make.
+        :param q: The query parameters.
+        :return: (sp candidate id, candidate id, dm, snr, width, observed_at,
+            x bin, y bin, rank, tile count) rows ordered by tile and rank.
+            Ranks start at one.
+        """
+        binned = self._filtered_query(
+            select(
+                self.model_class.id.label("sp_candidate_id"),
+                Candidate.id.label("candidate_id"),
+                Candidate.dm,
+                Candidate.snr,
+                Candidate.width,
+                Candidate.observed_at,
+                _bin(*x).label("x_bin"),
+                _bin(*y).label("y_bin"),
+            ),
+            join_=join_,
+            q=q,
+        )
+        binned = binned.where(_in_range(*x[:3]), _in_range(*y[:3])).subquery()
+        tile = (binned.c.x_bin, binned.c.y_bin)
+        ranked = select(
+            binned,
+            sa.func.row_number()
+            .over(
+                partition_by=tile,
+                order_by=(binned.c.snr.desc(), binned.c.sp_candidate_id),
+            )
+            .label("rank"),
+            sa.func.count()  # pylint: disable=E1102
+            .over(partition_by=tile)
+            .label("tile_count"),
+        ).subquery()
+        query = (
+            select(ranked)
+            .where(ranked.c.rank <= per_tile)
+            .order_by(ranked.c.x_bin, ranked.c.y_bin, ranked.c.rank)
+        )
+        return await self._execute_all(db=db, query=query)
+
+    async def group_counts(
+        self,
+        db: DBSession,
+        by: str,
+        join_: list[str] | None = None,
+        q: dict[str, Any] | None = None,
+    ) -> Sequence[Row[tuple[Any, int]]]:
+        """Returns the number of single pulse candidates in each group.
+
+        Candidates are grouped by the entity type of their labels with an
+        outer join, so unlabelled candidates are counted in a null group
+        and candidates with several labels are counted in each of their
+        labels' groups.
+
+        :param db: The database session.
+        :param by: The name of the ``GROUP_COLUMNS`` to group by.
+        :param join_: The joins to make. Must include the candidate and beam
+            tables.
+        :param q: The query parameters.
+        :return: (group, count) rows ordered by group.
+        """
+        group = GROUP_COLUMNS[by]
+        query = self._filtered_query(
+            select(
+                group,
+                sa.func.count(  # pylint: disable=E1102
+                    sa.distinct(self.model_class.id),
+                ),
+            ),
+            join_=join_,
+            q=q,
+        )
+        if by == "entity":
+            query = query.outerjoin(
+                Label,
+                Label.candidate_id == Candidate.id,
+            ).outerjoin(Entity, Entity.id == Label.entity_id)
+        query = query.group_by(group).order_by(group)
+        return await self._execute_all(db=db, query=query)
@@ -1,26 +1,35 @@
 """Candidate request schemas."""
 
-from typing import Annotated
+from enum import Enum
+from typing import Annotated, Self
 
 from fastapi import Query
 from pydantic import (
     BaseModel,
     Field,
+    NonNegativeFloat,
     PastDatetime,
     PositiveFloat,
     PositiveInt,
     StringConstraints,
+    model_validator,
 )
 
+from ska_src_maltopuft_backend.core.exceptions import InvalidRangeError
 from ska_src_maltopuft_backend.core.schemas import (
     CommonQueryParams,
+    KeysetPaginationQueryParams,
     RaDecPositionBase,
     RaDecPositionQueryParameters,
 )
 from ska_src_maltopuft_backend.core.types import PositiveList
 
 
-class GetCandidateQueryParams(CommonQueryParams, RaDecPositionQueryParameters):
+class GetCandidateQueryParams(
+    CommonQueryParams,
+    KeysetPaginationQueryParams,
+    RaDecPositionQueryParameters,
+):
     """Query parameters for Candidate model HTTP GET requests."""
 
     dm: Annotated[PositiveList[float], None] = Field(Query(default=[]))
@@ -28,6 +37,7 @@ class GetCandidateQueryParams(CommonQueryParams, RaDecPositionQueryParameters):
     width: Annotated[PositiveList[float], None] = Field(Query(default=[]))
     observed_at: list[Annotated[PastDatetime, None]] = Field(Query(default=[]))
     beam_id: Annotated[PositiveList[int], None] = Field(Query(default=[]))
+    cluster_id: Annotated[PositiveList[int], None] = Field(Query(default=[]))
 
 
 class CreateCandidate(RaDecPositionBase):
@@ -40,7 +50,131 @@ class CreateCandidate(RaDecPositionBase):
     beam_id: PositiveInt
 
 
-class GetSPCandidateQueryParams(CommonQueryParams):
+class IngestCandidate(CreateCandidate):
+    """Schema for a row of a bulk candidate ingest request body.
+
+    A single pulse candidate is created for the candidate if the row has a
+    ``plot_path``.
+    """
+
+    plot_path: (
+        Annotated[str, StringConstraints(strip_whitespace=True)] | None
+    ) = None
+
+
+class CandidateCrossMatchQueryParams(BaseModel):
+    """Query parameters for candidate known pulsar cross-match HTTP GET
+    requests.
+    """
+
+    observation_id: Annotated[PositiveList[int], None] = Field(Query())
+    beam_id: Annotated[PositiveList[int], None] = Field(Query(default=[]))
+    # Cone search radius in degrees
+    radius: PositiveFloat = Field(Query(default=0.1))
+    # Maximum absolute DM difference in pc cm^-3
+    dm_tolerance: NonNegativeFloat = Field(Query(default=5.0))
+
+
+class CandidateParameter(str, Enum):
+    """Candidate parameters which can be aggregated."""
+
+    DM = "dm"
+    SNR = "snr"
+    WIDTH = "width"
+    OBSERVED_AT = "observed_at"
+
+
+class CandidateGroup(str, Enum):
+    """Attributes which candidates can be grouped by."""
+
+    BEAM = "beam"
+    HOST = "host"
+    OBSERVATION = "observation"
+    ENTITY = "entity"
+
+
+class CandidateAxesQueryParams(BaseModel):
+    """Base class for query parameters of candidate plots with x and y
+    axis ranges, which subclasses define as ``x_min``, ``x_max``,
+    ``y_min`` and ``y_max`` fields.
+    """
+
+    @model_validator(mode="after")
+    def validate_axis_ranges(self) -> Self:
+        """Validates that the maximum of each axis is greater than its
+        minimum if both are given.
+        """
+        for axis in ("x", "y"):
+            min_ = getattr(self, f"{axis}_min")
+            max_ = getattr(self, f"{axis}_max")
+            if min_ is not None and max_ is not None and max_ <= min_:
+                msg = f"{axis}_max must be greater than {axis}_min."
+                raise InvalidRangeError(msg)
+        return self
+
+
+# The maximum number of histogram bins along each axis
+MAX_HISTOGRAM_BINS = 500
+
+
+class CandidateHistogramQueryParams(CandidateAxesQueryParams):
+    """Query parameters for candidate histogram HTTP GET requests.
+
+    The y axis is optional. Axis ranges default to the range of the
+    filtered candidates. ``observed_at`` ranges are POSIX timestamps.
+    """
+
+    x: CandidateParameter = Field(Query(default=CandidateParameter.DM))
+    x_bins: PositiveInt = Field(Query(default=100, le=MAX_HISTOGRAM_BINS))
+    x_min: float | None = Field(Query(default=None))
+    x_max: float | None = Field(Query(default=None))
+    y: CandidateParameter | None = Field(Query(default=None))
+    y_bins: PositiveInt = Field(Query(default=100, le=MAX_HISTOGRAM_BINS))
+    y_min: float | None = Field(Query(default=None))
+    y_max: float | None = Field(Query(default=None))
+
+
+# The maximum number of scatter plot tiles along each axis, and points in
+# each tile
+MAX_SCATTER_BINS = 100
+MAX_SCATTER_POINTS_PER_TILE = 10
+
+
+class CandidateScatterQueryParams(CandidateAxesQueryParams):
+    """Query parameters for downsampled candidate scatter plot HTTP GET
+    requests.
+
+    The plot is divided into ``x_bins`` by ``y_bins`` tiles. Axis ranges
+    default to the range of the filtered candidates. ``observed_at``
+    ranges are POSIX timestamps.
+    """
+
+    x: CandidateParameter = Field(
+        Query(default=CandidateParameter.OBSERVED_AT),
+    )
+    x_bins: PositiveInt = Field(Query(default=100, le=MAX_SCATTER_BINS))
+    x_min: float | None = Field(Query(default=None))
+    x_max: float | None = Field(Query(default=None))
+    y: CandidateParameter = Field(Query(default=CandidateParameter.DM))
+    y_bins: PositiveInt = Field(Query(default=50, le=MAX_SCATTER_BINS))
+    y_min: float | None = Field(Query(default=None))
+    y_max: float | None = Field(Query(default=None))
+    # The number of highest SNR candidates returned from each tile
+    per_tile: PositiveInt = Field(
+        Query(default=5, le=MAX_SCATTER_POINTS_PER_TILE),
+    )
+
+
+class CandidateGroupQueryParams(BaseModel):
+    """Query parameters for grouped candidate count HTTP GET requests."""
+
+    by: CandidateGroup = Field(Query(default=CandidateGroup.BEAM))
+
+
+class GetSPCandidateQueryParams(
+    CommonQueryParams,
+    KeysetPaginationQueryParams,
+):
     """Query parameters for SPCandidate model HTTP Get requests."""
 
     plot_path: list[
@@ -48,10 +182,17 @@ class GetSPCandidateQueryParams(CommonQueryParams):
     ] = Field(Query(default=[]))
 
     candidate_id: Annotated[PositiveList[int], None] = Field(Query(default=[]))
+    cluster_id: Annotated[PositiveList[int], None] = Field(Query(default=[]))
 
     latest: bool | None = False
 
 
+class GetSPCandidatePageQueryParams(GetSPCandidateQueryParams):
+    """Query parameters for paged SPCandidate HTTP GET requests."""
+
+    estimate_count: bool | None = False
+
+
 class CreateSPCandidate(BaseModel):
     """Schema for SPCandidate model HTTP POST requests."""
 
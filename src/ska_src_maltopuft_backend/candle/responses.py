@@ -3,11 +3,14 @@
 from pydantic import (
     BaseModel,
     ConfigDict,
+    NonNegativeFloat,
+    NonNegativeInt,
     PastDatetime,
     PositiveFloat,
     PositiveInt,
 )
 
+from ska_src_maltopuft_backend.catalogue.responses import KnownPulsar
 from ska_src_maltopuft_backend.core.types import (
     DeclinationDegrees,
     RightAscensionDegrees,
@@ -29,6 +32,7 @@ class Candidate(BaseModel):
     dec: DeclinationDegrees
     observed_at: PastDatetime
     beam_id: PositiveInt
+    cluster_id: PositiveInt | None = None
     created_at: PastDatetime
     updated_at: PastDatetime
 
@@ -55,3 +59,124 @@ class SPCandidateNested(SPCandidate):
     """Nest candidate under single pulse candidate."""
 
     candidate: Candidate
+
+
+class SPCandidatePage(BaseModel):
+    """Response model for paged single pulse candidate HTTP GET requests."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    total: NonNegativeInt
+    estimated: bool
+    items: list[SPCandidateNested]
+
+
+class CandidateBulk(BaseModel):
+    """Response model for bulk candidate ingest requests.
+
+    ``ids`` and ``sp_candidate_ids`` are in request body row order. Rows
+    which duplicate an existing candidate return the existing candidate's
+    id.
+    """
+
+    created: NonNegativeInt
+    ids: list[PositiveInt]
+    sp_candidate_ids: list[PositiveInt | None]
+
+
+class CandidateCrossMatch(BaseModel):
+    """Response model for candidate known pulsar cross-match HTTP GET
+    requests.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    candidate_id: PositiveInt
+    observation_id: PositiveInt
+    beam_id: PositiveInt
+    # Angular separation in degrees
+    separation: NonNegativeFloat
+    # Candidate DM minus known pulsar DM
+    dm_difference: float
+    known_pulsar: KnownPulsar
+
+
+class CandidateClustering(BaseModel):
+    """Response model for candidate clustering HTTP POST requests."""
+
+    clustered: NonNegativeInt
+    clusters: NonNegativeInt
+    merged: NonNegativeInt
+
+
+class HistogramAxis(BaseModel):
+    """A histogram axis of ``bins`` equal width bins between ``min`` and
+    ``max``.
+    """
+
+    name: str
+    min: float
+    max: float
+    bins: PositiveInt
+
+
+class CandidateHistogram(BaseModel):
+    """Response model for candidate histogram HTTP GET requests.
+
+    ``counts[i]`` is the count of the i-th x bin for 1D histograms, and
+    ``counts[i][j]`` the count of the i-th x bin and j-th y bin for 2D
+    histograms.
+    """
+
+    total: NonNegativeInt
+    x: HistogramAxis
+    y: HistogramAxis | None = None
+    counts: list[NonNegativeInt] | list[list[NonNegativeInt]]
+
+
+class ScatterPoints(BaseModel):
+    """Single pulse candidates as arrays of attributes. The i-th element of
+    each array is an attribute of the i-th candidate.
+    """
+
+    sp_candidate_id: list[PositiveInt]
+    candidate_id: list[PositiveInt]
+    dm: list[float]
+    snr: list[float]
+    width: list[float]
+    observed_at: list[PastDatetime]
+
+
+class ScatterTiles(BaseModel):
+    """The number of candidates in each non-empty scatter plot tile."""
+
+    x_bin: list[NonNegativeInt]
+    y_bin: list[NonNegativeInt]
+    count: list[PositiveInt]
+
+
+class CandidateScatter(BaseModel):
+    """Response model for downsampled candidate scatter plot HTTP GET
+    requests.
+
+    Points are the highest SNR candidates in each tile, ordered by tile and
+    descending SNR. Tile counts include candidates which aren't returned.
+    """
+
+    total: NonNegativeInt
+    x: HistogramAxis
+    y: HistogramAxis
+    points: ScatterPoints
+    tiles: ScatterTiles
+
+
+class CandidateGroupCounts(BaseModel):
+    """Response model for grouped candidate count HTTP GET requests.
+
+    ``counts[i]`` is the count of candidates in group ``keys[i]``.
+    Unlabelled candidates are counted in the null entity group.
+    """
+
+    by: str
+    keys: list[int | str | None]
+    counts: list[NonNegativeInt]
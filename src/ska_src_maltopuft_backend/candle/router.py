@@ -3,71 +3,109 @@
 import logging
 from typing import Any
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import PositiveInt
-from sqlalchemy.orm import Session
 
-from ska_src_maltopuft_backend.core.database.database import get_db
+from ska_src_maltopuft_backend.core.config import settings
+from ska_src_maltopuft_backend.core.database.database import get_session
+from ska_src_maltopuft_backend.core.export import (
+    ExportQueryParams,
+    export_response,
+)
 from ska_src_maltopuft_backend.core.factory import Factory
+from ska_src_maltopuft_backend.core.pagination import (
+    NEXT_CURSOR_HEADER,
+    next_cursor,
+)
 from ska_src_maltopuft_backend.core.schemas import (
     ForeignKeyQueryParams,
     RaDecPositionQueryParameters,
 )
+from ska_src_maltopuft_backend.core.types import DBSession
 
 from .controller import CandidateController, SPCandidateController
+from .ingest import get_row_parser, iter_ingest_rows
 from .requests import (
+    CandidateCrossMatchQueryParams,
+    CandidateGroupQueryParams,
+    CandidateHistogramQueryParams,
+    CandidateScatterQueryParams,
     CreateCandidate,
     CreateSPCandidate,
     GetCandidateQueryParams,
+    GetSPCandidatePageQueryParams,
     GetSPCandidateQueryParams,
 )
 from .responses import (
     Candidate,
+    CandidateBulk,
+    CandidateClustering,
+    CandidateCrossMatch,
+    CandidateGroupCounts,
+    CandidateHistogram,
     CandidateNested,
+    CandidateScatter,
     SPCandidate,
     SPCandidateNested,
+    SPCandidatePage,
 )
 
 logger = logging.getLogger(__name__)
 candle_router = APIRouter()
 
+# Candidates are paginated in observation time order. The id breaks ties
+# between candidates observed at the same time.
+CANDIDATE_KEYSET = ["candidate.observed_at", "candidate.id"]
+
 
 @candle_router.get(
     "/sp",
     response_model=list[SPCandidateNested],
 )
-async def get_sp_candidates(
+async def get_sp_candidates(  # pylint: disable=R0913 # noqa: PLR0913
+    response: Response,
     q: GetSPCandidateQueryParams = Depends(),
     q_foreign_key: ForeignKeyQueryParams = Depends(),
     q_pos: RaDecPositionQueryParameters = Depends(),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     sp_candidate_controller: SPCandidateController = Depends(
         Factory().get_sp_candidate_controller,
     ),
 ) -> Any:
     """Get all single pulse candidates.
 
-    When no query parameters are specified, the default behaviour is to fetch
-    single pulse candidates from the earliest observation in ascending time
-    order.
-
-    If query parameters are specified, those single pulse candidates are
-    selected and ordered by descending observeration time in order to return
-    the *most recent* candidates to users by default.
+    Single pulse candidates matching the query parameters are returned in
+    ascending observation time order, starting from the earliest
+    observation. Candidates observed at the same time are ordered by id.
 
     If the ``latest`` query parameter is set to true, only candidates from
-    the most recent observation are returned (in ascending time order).
+    the most recent observation are returned.
+
+    If there may be more candidates than the page returned, the cursor of
+    the next page is returned in the ``X-Next-Cursor`` response header. Pass
+    it as the ``after`` query parameter to fetch the next page without the
+    cost of skipping the previous pages.
     """
     params = [q, q_foreign_key, q_pos]
     logger.info(
         f"Getting all single pulse candidates with query parameters {params}",
     )
-    return await sp_candidate_controller.get_all(
+    sp_candidates = await sp_candidate_controller.get_all(
         db=db,
         join_=["candidate", "beam", "host", "observation", "schedule_block"],
-        order_={"asc": ["candidate.observed_at"]},
         q=params,
+        keyset_=CANDIDATE_KEYSET,
+        load_=["candidate"],
     )
+    cursor = next_cursor(
+        objects=sp_candidates,
+        keyset_=CANDIDATE_KEYSET,
+        limit=q.limit,
+    )
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return sp_candidates
 
 
 @candle_router.get("/sp/count", response_model=int)
@@ -75,7 +113,7 @@ async def get_sp_candidates_count(
     q: GetSPCandidateQueryParams = Depends(),
     q_foreign_key: ForeignKeyQueryParams = Depends(),
     q_pos: RaDecPositionQueryParameters = Depends(),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     sp_candidate_controller: SPCandidateController = Depends(
         Factory().get_sp_candidate_controller,
     ),
@@ -88,13 +126,179 @@ async def get_sp_candidates_count(
     )
 
 
+@candle_router.get("/sp/histogram", response_model=CandidateHistogram)
+async def get_sp_candidates_histogram(  # pylint: disable=R0913 # noqa: PLR0913
+    histogram: CandidateHistogramQueryParams = Depends(),
+    q: GetSPCandidateQueryParams = Depends(),
+    q_foreign_key: ForeignKeyQueryParams = Depends(),
+    q_pos: RaDecPositionQueryParameters = Depends(),
+    db: DBSession = Depends(get_session),
+    sp_candidate_controller: SPCandidateController = Depends(
+        Factory().get_sp_candidate_controller,
+    ),
+) -> Any:
+    """Get a 1D or 2D histogram of the DM, SNR, width or observation time of
+    the single pulse candidates matching the query parameters.
+
+    Candidates are filtered with the same query parameters as ``GET /sp``
+    and binned in the database, so the response size only depends on the
+    number of bins. Pagination query parameters are ignored.
+    """
+    params = [q, q_foreign_key, q_pos]
+    logger.info(
+        f"Getting single pulse candidate histogram {histogram} with query "
+        f"parameters {params}",
+    )
+    return await sp_candidate_controller.histogram(
+        db=db,
+        params=histogram,
+        join_=["candidate", "beam", "host", "observation", "schedule_block"],
+        q=params,
+    )
+
+
+@candle_router.get("/sp/scatter", response_model=CandidateScatter)
+async def get_sp_candidates_scatter(  # pylint: disable=R0913 # noqa: PLR0913
+    scatter: CandidateScatterQueryParams = Depends(),
+    q: GetSPCandidateQueryParams = Depends(),
+    q_foreign_key: ForeignKeyQueryParams = Depends(),
+    q_pos: RaDecPositionQueryParameters = Depends(),
+    db: DBSession = Depends(get_session),
+    sp_candidate_controller: SPCandidateController = Depends(
+        Factory().get_sp_candidate_controller,
+    ),
+) -> Any:
+    """Get a downsampled scatter plot (by default of DM against observation
+    time) of the single pulse candidates matching the query parameters.
+
+    The plot is divided into ``x_bins`` by ``y_bins`` tiles. The
+    ``per_tile`` highest SNR candidates in each tile are returned with the
+    number of candidates in each tile, so at most
+    ``x_bins * y_bins * per_tile`` candidates are returned. Candidates are
+    filtered with the same query parameters as ``GET /sp``. Pagination query
+    parameters are ignored.
+    """
+    params = [q, q_foreign_key, q_pos]
+    logger.info(
+        f"Getting single pulse candidate scatter plot {scatter} with query "
+        f"parameters {params}",
+    )
+    return await sp_candidate_controller.scatter(
+        db=db,
+        params=scatter,
+        join_=["candidate", "beam", "host", "observation", "schedule_block"],
+        q=params,
+    )
+
+
+@candle_router.get("/sp/groups", response_model=CandidateGroupCounts)
+async def get_sp_candidate_groups(  # pylint: disable=R0913 # noqa: PLR0913
+    group: CandidateGroupQueryParams = Depends(),
+    q: GetSPCandidateQueryParams = Depends(),
+    q_foreign_key: ForeignKeyQueryParams = Depends(),
+    q_pos: RaDecPositionQueryParameters = Depends(),
+    db: DBSession = Depends(get_session),
+    sp_candidate_controller: SPCandidateController = Depends(
+        Factory().get_sp_candidate_controller,
+    ),
+) -> Any:
+    """Count the single pulse candidates matching the query parameters in
+    each beam, host, observation or label entity.
+
+    Candidates are filtered with the same query parameters as ``GET /sp``.
+    Pagination query parameters are ignored.
+    """
+    params = [q, q_foreign_key, q_pos]
+    logger.info(
+        f"Counting single pulse candidates by {group.by} with query "
+        f"parameters {params}",
+    )
+    return await sp_candidate_controller.group_counts(
+        db=db,
+        by=group.by,
+        join_=["candidate", "beam", "host", "observation", "schedule_block"],
+        q=params,
+    )
+
+
+@candle_router.get("/sp/page", response_model=SPCandidatePage)
+async def get_sp_candidates_page(
+    q: GetSPCandidatePageQueryParams = Depends(),
+    q_foreign_key: ForeignKeyQueryParams = Depends(),
+    q_pos: RaDecPositionQueryParameters = Depends(),
+    db: DBSession = Depends(get_session),
+    sp_candidate_controller: SPCandidateController = Depends(
+        Factory().get_sp_candidate_controller,
+    ),
+) -> Any:
+    """Get a page of single pulse candidates and the total count of single
+    pulse candidates matching the query parameters in a single query.
+
+    Candidates are returned in the same order as ``GET /sp``. If the
+    ``estimate_count`` query parameter is true and no filters are given,
+    the total is estimated from database statistics rather than counted.
+    """
+    params = [q, q_foreign_key, q_pos]
+    logger.info(
+        "Getting page of single pulse candidates with query parameters "
+        f"{params}",
+    )
+    return await sp_candidate_controller.get_page(
+        db=db,
+        join_=["candidate", "beam", "host", "observation", "schedule_block"],
+        q=params,
+        keyset_=CANDIDATE_KEYSET,
+        load_=["candidate"],
+    )
+
+
+@candle_router.get(
+    "/sp/export",
+    response_class=StreamingResponse,
+)
+async def export_sp_candidates(  # pylint: disable=R0913 # noqa: PLR0913
+    q: GetSPCandidateQueryParams = Depends(),
+    q_foreign_key: ForeignKeyQueryParams = Depends(),
+    q_pos: RaDecPositionQueryParameters = Depends(),
+    q_export: ExportQueryParams = Depends(),
+    db: DBSession = Depends(get_session),
+    sp_candidate_controller: SPCandidateController = Depends(
+        Factory().get_sp_candidate_controller,
+    ),
+) -> StreamingResponse:
+    """Export all single pulse candidates matching the query parameters as
+    newline delimited JSON or CSV, in ascending observation time order.
+
+    Candidates are streamed from the database as the response is sent, so
+    the pagination query parameters are ignored.
+    """
+    params = [q, q_foreign_key, q_pos]
+    logger.info(
+        f"Exporting single pulse candidates with query parameters {params}",
+    )
+    sp_candidates = sp_candidate_controller.stream_all(
+        db=db,
+        join_=["candidate", "beam", "host", "observation", "schedule_block"],
+        order_={"asc": CANDIDATE_KEYSET},
+        q=params,
+        load_=["candidate"],
+    )
+    return export_response(
+        db=db,
+        objects=sp_candidates,
+        schema=SPCandidateNested,
+        format_=q_export.format,
+        filename="sp_candidates",
+    )
+
+
 @candle_router.get(
     "/sp/{sp_candidate_id}",
     response_model=SPCandidate,
 )
 async def get_sp_candidate(
     sp_candidate_id: PositiveInt,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     sp_candidate_controller: SPCandidateController = Depends(
         Factory().get_sp_candidate_controller,
     ),
@@ -111,7 +315,7 @@ async def get_sp_candidate(
 )
 async def post_sp_candidate(
     sp_candidate: CreateSPCandidate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     sp_candidate_controller: SPCandidateController = Depends(
         Factory().get_sp_candidate_controller,
     ),
@@ -133,7 +337,7 @@ async def post_sp_candidate(
 )
 async def delete_sp_candidate(
     sp_candidate_id: PositiveInt,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     sp_candidate_controller: SPCandidateController = Depends(
         Factory().get_sp_candidate_controller,
     ),
@@ -148,15 +352,90 @@ async def delete_sp_candidate(
     response_model=list[CandidateNested],
 )
 async def get_candidates(
+    response: Response,
     q: GetCandidateQueryParams = Depends(),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     candidate_controller: CandidateController = Depends(
         Factory().get_candidate_controller,
     ),
 ) -> Any:
-    """Get all candidates."""
+    """Get all candidates in ascending observation time order.
+
+    If there may be more candidates than the page returned, the cursor of
+    the next page is returned in the ``X-Next-Cursor`` response header. Pass
+    it as the ``after`` query parameter to fetch the next page.
+    """
     logger.info(f"Getting all candidates with query parameters {q}")
-    return await candidate_controller.get_all(db=db, q=[q])
+    candidates = await candidate_controller.get_all(
+        db=db,
+        q=[q],
+        keyset_=CANDIDATE_KEYSET,
+        load_=["sp_candidate"],
+    )
+    cursor = next_cursor(
+        objects=candidates,
+        keyset_=CANDIDATE_KEYSET,
+        limit=q.limit,
+    )
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return candidates
+
+
+@candle_router.get(
+    "/export",
+    response_class=StreamingResponse,
+)
+async def export_candidates(
+    q: GetCandidateQueryParams = Depends(),
+    q_export: ExportQueryParams = Depends(),
+    db: DBSession = Depends(get_session),
+    candidate_controller: CandidateController = Depends(
+        Factory().get_candidate_controller,
+    ),
+) -> StreamingResponse:
+    """Export all candidates matching the query parameters as newline
+    delimited JSON or CSV, in ascending observation time order.
+
+    Candidates are streamed from the database as the response is sent, so
+    the pagination query parameters are ignored.
+    """
+    logger.info(f"Exporting candidates with query parameters {q}")
+    candidates = candidate_controller.stream_all(
+        db=db,
+        order_={"asc": CANDIDATE_KEYSET},
+        q=[q],
+        load_=["sp_candidate"],
+    )
+    return export_response(
+        db=db,
+        objects=candidates,
+        schema=CandidateNested,
+        format_=q_export.format,
+        filename="candidates",
+    )
+
+
+@candle_router.get(
+    "/crossmatch",
+    response_model=list[CandidateCrossMatch],
+)
+async def get_candidate_crossmatches(
+    q: CandidateCrossMatchQueryParams = Depends(),
+    db: DBSession = Depends(get_session),
+    candidate_controller: CandidateController = Depends(
+        Factory().get_candidate_controller,
+    ),
+) -> Any:
+    """Get the known pulsars within a radius (degrees) and DM tolerance of
+    the candidates in the given observations, optionally restricted to the
+    given beams.
+
+    Each candidate may match several known pulsars, which are ordered by
+    increasing separation.
+    """
+    logger.info(f"Cross-matching candidates with query parameters {q}")
+    return await candidate_controller.crossmatch(db=db, q=q)
 
 
 @candle_router.get(
@@ -165,7 +444,7 @@ async def get_candidates(
 )
 async def get_candidate(
     candidate_id: PositiveInt,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     candidate_controller: CandidateController = Depends(
         Factory().get_candidate_controller,
     ),
@@ -182,7 +461,7 @@ async def get_candidate(
 )
 async def post_candidate(
     candidate: CreateCandidate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     candidate_controller: CandidateController = Depends(
         Factory().get_candidate_controller,
     ),
@@ -195,13 +474,72 @@ async def post_candidate(
     )
 
 
+@candle_router.post(
+    "/bulk",
+    response_model=CandidateBulk,
+    status_code=status.HTTP_201_CREATED,
+)
+async def post_candidates_bulk(
+    request: Request,
+    db: DBSession = Depends(get_session),
+    candidate_controller: CandidateController = Depends(
+        Factory().get_candidate_controller,
+    ),
+) -> CandidateBulk:
+    """Create candidates and their single pulse candidates in bulk.
+
+    The request body is either newline delimited JSON
+    (``application/x-ndjson``) or CSV with a header row (``text/csv``),
+    where each row has the candidate attributes and an optional single pulse
+    candidate ``plot_path``. Rows are streamed into the database as they
+    are received.
+
+    Rows which duplicate an existing candidate return the existing
+    candidate's id rather than raising an error, so failed ingests can be
+    retried.
+    """
+    parser = get_row_parser(request.headers.get("content-type"))
+    logger.info("Ingesting candidates")
+    ingested = await candidate_controller.ingest(
+        db=db,
+        rows=iter_ingest_rows(parser=parser, chunks=request.stream()),
+    )
+    return CandidateBulk(**ingested)
+
+
+@candle_router.post(
+    "/clusters",
+    response_model=CandidateClustering,
+)
+async def post_candidate_clusters(
+    db: DBSession = Depends(get_session),
+    candidate_controller: CandidateController = Depends(
+        Factory().get_candidate_controller,
+    ),
+) -> Any:
+    """Assign candidates which haven't been clustered yet to repeat source
+    clusters.
+
+    Candidates within ``CANDIDATE_CLUSTER_RADIUS`` degrees and
+    ``CANDIDATE_CLUSTER_DM_TOLERANCE`` of each other are grouped into the
+    same cluster. Single pulse candidates can be filtered by cluster with
+    the ``cluster_id`` query parameter.
+    """
+    logger.info("Clustering candidates")
+    return await candidate_controller.cluster_candidates(
+        db=db,
+        radius=settings.CANDIDATE_CLUSTER_RADIUS,
+        dm_tolerance=settings.CANDIDATE_CLUSTER_DM_TOLERANCE,
+    )
+
+
 @candle_router.delete(
     "/{candidate_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
 async def delete_candidate(
     candidate_id: PositiveInt,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     candidate_controller: CandidateController = Depends(
         Factory().get_candidate_controller,
     ),
@@ -7,6 +7,9 @@ import sqlalchemy as sa
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ska_src_maltopuft_backend.core.database.base import Base
+from ska_src_maltopuft_backend.core.database.pgsphere import (
+    create_pos_index_ddl,
+)
 from ska_src_maltopuft_backend.core.mixins import TimestampMixin
 
 
@@ -119,3 +122,10 @@ class KnownPulsar(Base, TimestampMixin):
             f"period={self.period},"
             f"catalogue_id={self.catalogue_id},"
         )
+
+
+sa.event.listen(
+    KnownPulsar.__table__,
+    "after_create",
+    create_pos_index_ddl(),
+)
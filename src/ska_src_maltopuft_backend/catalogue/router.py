@@ -4,10 +4,10 @@ import logging
 from typing import Any
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
 
-from ska_src_maltopuft_backend.core.database.database import get_db
+from ska_src_maltopuft_backend.core.database.database import get_session
 from ska_src_maltopuft_backend.core.factory import Factory
+from ska_src_maltopuft_backend.core.types import DBSession
 
 from .controller import KnownPulsarController
 from .requests import GetKnownPulsarQueryParams
@@ -23,7 +23,7 @@ catalogue_router = APIRouter()
 )
 async def get_known_pulsars(
     q: GetKnownPulsarQueryParams = Depends(),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     pulsar_controller: KnownPulsarController = Depends(
         Factory().get_known_pulsar_controller,
     ),
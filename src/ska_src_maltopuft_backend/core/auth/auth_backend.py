@@ -1,14 +1,17 @@
 """Middleware to verify user authorisation."""
 
+import asyncio
 import logging
-from typing import Any
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any, NamedTuple
 
 import httpx
 import jwt
 import sqlalchemy as sa
 from fastapi import status
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
 from starlette.authentication import (
     AuthCredentials,
     AuthenticationBackend,
@@ -17,15 +20,34 @@ from starlette.authentication import (
 from starlette.requests import HTTPConnection
 
 from ska_src_maltopuft_backend.app.schemas.requests import CreateUser
+from ska_src_maltopuft_backend.core.cache import TTLCache
 from ska_src_maltopuft_backend.core.config import settings
-from ska_src_maltopuft_backend.core.exceptions import MaltopuftError
+from ska_src_maltopuft_backend.core.database.database import session_scope
+from ska_src_maltopuft_backend.core.exceptions import (
+    AlreadyExistsError,
+    MaltopuftError,
+)
 from ska_src_maltopuft_backend.core.factory import Factory
+from ska_src_maltopuft_backend.core.metrics import AUTH_EXCHANGE_DURATION
+from ska_src_maltopuft_backend.core.types import DBSession
 
 from .exceptions import InvalidAudienceError
 from .schemas import AccessToken, AuthenticatedUser, UserGroups
+from .token_cache import hash_token
 
 logger = logging.getLogger(__name__)
 
+# Cache key of the test admin user injected when authentication is disabled
+TEST_ADMIN_CACHE_KEY = "test-admin"
+
+
+class CachedAuth(NamedTuple):
+    """Authentication result cached for a bearer token."""
+
+    groups: list[str]
+    user: dict[str, Any]
+    expires_at: int
+
 
 class BearerTokenAuthBackend(AuthenticationBackend):
     """Injects authenticated user information into the HTTP request.
@@ -37,16 +59,99 @@ class BearerTokenAuthBackend(AuthenticationBackend):
     If the AUTH_ENABLED environment variable is set to False, then a test
     admin user is created and injected into the request. This setting should
     not be used in production.
+
+    The groups and user resolved for a token are cached by the token's hash
+    until the exchanged token expires (or AUTH_TOKEN_CACHE_TTL seconds have
+    passed), so repeated requests with the same token don't exchange the
+    token or query the database.
+
+    Users are looked up in a short-lived session drawn from the connection
+    pool, so concurrent requests don't share a session and connections are
+    only held while a user is being resolved.
     """
 
     # pylint: disable=R0903
 
-    def __init__(self, db: Session) -> None:
-        """Initialises the transactional database connection and user
-        controller.
+    def __init__(self, db: DBSession | None = None) -> None:
+        """Initialises the user controller.
+
+        :param db: A database session to use for every user lookup instead
+            of a short-lived session per lookup, e.g. a test session.
         """
         self.db = db
         self.user_controller = Factory().get_user_controller()
+        self.token_cache = TTLCache(
+            name="auth_token",
+            ttl=settings.AUTH_TOKEN_CACHE_TTL,
+            max_size=settings.AUTH_TOKEN_CACHE_MAX_SIZE,
+        )
+        self._http_client: httpx.AsyncClient | None = None
+        self._http_client_loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the HTTP client used to exchange tokens.
+
+        The client keeps connections to the authn-api alive between requests.
+        A new client is created if the event loop has changed, because
+        connections can't be shared between event loops.
+        """
+        loop = asyncio.get_running_loop()
+        if self._http_client is None or self._http_client_loop is not loop:
+            self._http_client = httpx.AsyncClient()
+            self._http_client_loop = loop
+        return self._http_client
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[DBSession]:
+        """Return a database session for a user lookup."""
+        if self.db is not None:
+            yield self.db
+            return
+        async with session_scope() as db:
+            yield db
+
+    async def _get_or_create_user(
+        self,
+        field: str,
+        value: Any,
+        user_data: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Get the user whose field matches value, otherwise create the user
+        from user_data.
+
+        :return: The user's column attributes.
+        """
+        async with self._session() as db:
+            user = await self.user_controller.repository.get_unique_by(
+                db=db,
+                field=field,
+                value=value,
+            )
+            if not user:
+                try:
+                    user = await self.user_controller.create(
+                        db=db,
+                        attributes=CreateUser(**user_data).model_dump(),
+                    )
+                except AlreadyExistsError:
+                    # The user was created by a concurrent request
+                    await self.user_controller.rollback(db=db)
+                    user = await self.user_controller.repository.get_unique_by(
+                        db=db,
+                        field=field,
+                        value=value,
+                    )
+            return {
+                c.key: getattr(user, c.key)
+                for c in sa.inspect(user).mapper.column_attrs
+            }
+
+    async def aclose(self) -> None:
+        """Close the HTTP client used to exchange tokens."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+            self._http_client_loop = None
 
     def _get_token_from_header(self, auth_header: str) -> str:
         """Extract bearer token from Authorization header.
@@ -74,7 +179,7 @@ class BearerTokenAuthBackend(AuthenticationBackend):
             raise AuthenticationError(msg)
         return token
 
-    def _do_exchange_token(self, token: str) -> str:
+    async def _do_exchange_token(self, token: str) -> str:
         """Exchange a token with authn-api audience for one with maltopuft-api
         audience.
         """
@@ -83,10 +188,21 @@ class BearerTokenAuthBackend(AuthenticationBackend):
             "/token/exchange"
             f"/{settings.MALTOPUFT_AUDIENCE}"
         )
-        response = httpx.get(
-            exchange_uri,
-            params={"access_token": token},
-        )
+        started_at = time.perf_counter()
+        outcome = "failure"
+        try:
+            response = await self._get_http_client().get(
+                exchange_uri,
+                params={"access_token": token},
+            )
+            if response.status_code == status.HTTP_200_OK:
+                outcome = "success"
+        finally:
+            AUTH_EXCHANGE_DURATION.observe(
+                time.perf_counter() - started_at,
+                outcome=outcome,
+            )
+
         if response.status_code != status.HTTP_200_OK:
             msg = "Attempt to exchange auth token failed."
             raise AuthenticationError(msg)
@@ -108,24 +224,14 @@ class BearerTokenAuthBackend(AuthenticationBackend):
 
     async def _get_or_create_test_admin_user(self) -> dict[str, Any]:
         """Get or create a test user."""
-        user = await self.user_controller.repository.get_unique_by(
-            db=self.db,
+        return await self._get_or_create_user(
             field="username",
             value="admin",
-        )
-        if not user:
-            user_data = {
+            user_data={
                 "username": "admin",
                 "is_admin": True,
-            }
-            user = await self.user_controller.create(
-                db=self.db,
-                attributes=CreateUser(**user_data).model_dump(),
-            )
-        return {
-            c.key: getattr(user, c.key)
-            for c in sa.inspect(user).mapper.column_attrs
-        }
+            },
+        )
 
     async def _get_or_create_token_user(
         self,
@@ -134,25 +240,15 @@ class BearerTokenAuthBackend(AuthenticationBackend):
         """Get the request user in the access token if it exists, otherwise
         create the request user.
         """
-        user = await self.user_controller.repository.get_unique_by(
-            db=self.db,
+        return await self._get_or_create_user(
             field="uuid",
             value=token.sub,
-        )
-        if not user:
-            user_data = {
+            user_data={
                 "uuid": token.sub,
                 "username": token.preferred_username,
                 "is_admin": UserGroups.MALTOPUFT_ADMIN in token.groups,
-            }
-            user = await self.user_controller.create(
-                db=self.db,
-                attributes=CreateUser(**user_data).model_dump(),
-            )
-        return {
-            c.key: getattr(user, c.key)
-            for c in sa.inspect(user).mapper.column_attrs
-        }
+            },
+        )
 
     async def authenticate(
         self,
@@ -178,7 +274,10 @@ class BearerTokenAuthBackend(AuthenticationBackend):
         """
         if not settings.AUTH_ENABLED:
             # Inject test admin user into request
-            user = await self._get_or_create_test_admin_user()
+            user = self.token_cache.get(TEST_ADMIN_CACHE_KEY)
+            if user is None:
+                user = await self._get_or_create_test_admin_user()
+                self.token_cache.set(TEST_ADMIN_CACHE_KEY, user)
             return (
                 AuthCredentials(UserGroups.MALTOPUFT_ADMIN),
                 AuthenticatedUser(**user),
@@ -190,20 +289,44 @@ class BearerTokenAuthBackend(AuthenticationBackend):
             # Inject UnauthenticatedUser into request
             return None
 
-        # Exchange token
         token = self._get_token_from_header(auth_header=auth_header)
-        token = self._do_exchange_token(token=token)
+        cache_key = hash_token(token)
+        cached: CachedAuth | None = self.token_cache.get(cache_key)
+        if cached is None:
+            cached = await self._authenticate_token(token=token)
+            self.token_cache.set(
+                cache_key,
+                cached,
+                expires_at=cached.expires_at,
+            )
+
+        # Inject authenticated user information into request
+        return (
+            AuthCredentials(cached.groups),
+            AuthenticatedUser(**cached.user),
+        )
+
+    async def _authenticate_token(self, token: str) -> CachedAuth:
+        """Exchange a bearer token, verify the exchanged token and resolve
+        the token user.
+
+        :param token: The bearer token from the Authorization header.
+        :raises InvalidAudienceError: If the exchanged token has the wrong
+            audience.
+        :return: The token's groups and user.
+        """
+        exchanged_token = await self._do_exchange_token(token=token)
 
         # Verify exchanged token audience
-        decoded_token = self._decode_jwt(token=token)
+        decoded_token = self._decode_jwt(token=exchanged_token)
         if decoded_token.aud != settings.MALTOPUFT_AUDIENCE:
             raise InvalidAudienceError
 
         user = await self._get_or_create_token_user(token=decoded_token)
-        # Inject authenticated user information into request
-        return (
-            AuthCredentials(decoded_token.groups),
-            AuthenticatedUser(**user),
+        return CachedAuth(
+            groups=decoded_token.groups,
+            user=user,
+            expires_at=decoded_token.exp,
         )
 
     def on_auth_error(
@@ -0,0 +1,12 @@
+"""Cache keys for authenticated bearer tokens."""
+
+import hashlib
+
+
+def hash_token(token: str) -> str:
+    """Return the SHA-256 hex digest of a token.
+
+    Tokens are cached by their digest so that bearer tokens aren't held in
+    memory as cache keys.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
@@ -0,0 +1,92 @@
+"""In-memory caches."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from ska_src_maltopuft_backend.core.metrics import CACHE_HITS, CACHE_MISSES
+
+
+class TTLCache:
+    """A size bounded cache whose entries expire at a given time.
+
+    Entries are evicted in least recently used order when the cache is full.
+    Hits and misses are counted to monitor the cache's effectiveness, and
+    exported as metrics labelled with the cache's name.
+    """
+
+    def __init__(self, name: str, ttl: float, max_size: int) -> None:
+        """Initialise a TTLCache instance.
+
+        :param name: The name of the cache in its metrics.
+        :param ttl: The maximum number of seconds an entry is cached for. The
+            cache is disabled if ttl is 0.
+        :param max_size: The maximum number of entries in the cache.
+        """
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for a key, or None if the key isn't cached
+        or its entry has expired.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                CACHE_MISSES.inc(cache=self.name)
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            CACHE_HITS.inc(cache=self.name)
+            return entry[1]
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        expires_at: float | None = None,
+    ) -> None:
+        """Cache a value until the earlier of expires_at (a UNIX timestamp)
+        and the cache's ttl.
+        """
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        now = time.time()
+        expiry = now + self.ttl
+        if expires_at is not None:
+            expiry = min(expiry, expires_at)
+        if expiry <= now:
+            return
+
+        with self._lock:
+            self._entries[key] = (expiry, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Remove a key from the cache, or every key if key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                return
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        """Return the cache size and hit/miss counts."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -1,5 +1,6 @@
 """Application configuration."""
 
+import os
 from typing import Any
 
 from pydantic import Field, PostgresDsn, computed_field
@@ -19,6 +20,46 @@ class Settings(BaseSettings):
     RELEASE_VERSION: str = "0.1.0"
     DEBUG: int = 0
 
+    # Server settings. The server reloads when source files change if
+    # SERVER_RELOAD is enabled, which is only suitable for development.
+    # Otherwise SERVER_WORKERS processes serve requests, one per CPU if 0.
+    SERVER_HOST: str = Field(
+        default="0.0.0.0",  # noqa: S104
+        json_schema_extra={"env": "SERVER_HOST"},
+    )
+    SERVER_PORT: int = Field(
+        default=8000,
+        json_schema_extra={"env": "SERVER_PORT"},
+    )
+    SERVER_RELOAD: int = Field(
+        default=0,
+        json_schema_extra={"env": "SERVER_RELOAD"},
+    )
+    SERVER_WORKERS: int = Field(
+        default=0,
+        ge=0,
+        json_schema_extra={"env": "SERVER_WORKERS"},
+    )
+    # Seconds to wait for requests to complete when a worker is stopped
+    SERVER_GRACEFUL_TIMEOUT: int = Field(
+        default=30,
+        ge=0,
+        json_schema_extra={"env": "SERVER_GRACEFUL_TIMEOUT"},
+    )
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def SERVER_WORKER_COUNT(self) -> int:  # noqa: N802
+        """The number of server worker processes."""
+        return self.SERVER_WORKERS or os.cpu_count() or 1
+
+    # Serve request, database query, connection pool and auth token exchange
+    # metrics of each worker process at /metrics if enabled
+    METRICS_ENABLED: int = Field(
+        default=1,
+        json_schema_extra={"env": "METRICS_ENABLED"},
+    )
+
     # Database settings
     MALTOPUFT_POSTGRES_USER: str = Field(
         ...,
@@ -40,6 +81,65 @@ class Settings(BaseSettings):
         ...,
         json_schema_extra={"env": "MALTOPUFT_POSTGRES_DB_NAME"},
     )
+    MALTOPUFT_POSTGRES_ASYNC: int = Field(
+        default=0,
+        json_schema_extra={"env": "MALTOPUFT_POSTGRES_ASYNC"},
+    )
+
+    # Database connection pool settings
+    MALTOPUFT_POSTGRES_POOL_SIZE: int = Field(
+        default=5,
+        ge=1,
+        json_schema_extra={"env": "MALTOPUFT_POSTGRES_POOL_SIZE"},
+    )
+    MALTOPUFT_POSTGRES_MAX_OVERFLOW: int = Field(
+        default=10,
+        ge=0,
+        json_schema_extra={"env": "MALTOPUFT_POSTGRES_MAX_OVERFLOW"},
+    )
+    MALTOPUFT_POSTGRES_POOL_TIMEOUT: float = Field(
+        default=30,
+        gt=0,
+        json_schema_extra={"env": "MALTOPUFT_POSTGRES_POOL_TIMEOUT"},
+    )
+    MALTOPUFT_POSTGRES_POOL_RECYCLE: int = Field(
+        default=1800,
+        json_schema_extra={"env": "MALTOPUFT_POSTGRES_POOL_RECYCLE"},
+    )
+    MALTOPUFT_POSTGRES_POOL_PRE_PING: int = Field(
+        default=1,
+        json_schema_extra={"env": "MALTOPUFT_POSTGRES_POOL_PRE_PING"},
+    )
+    # Server-side statement timeout in milliseconds, disabled if 0
+    MALTOPUFT_POSTGRES_STATEMENT_TIMEOUT: int = Field(
+        default=0,
+        ge=0,
+        json_schema_extra={"env": "MALTOPUFT_POSTGRES_STATEMENT_TIMEOUT"},
+    )
+
+    # Statements which take at least SLOW_QUERY_THRESHOLD milliseconds are
+    # recorded in a log of the latest SLOW_QUERY_LOG_SIZE slow statements,
+    # with an EXPLAIN (ANALYZE, BUFFERS) plan of select statements at most
+    # once every SLOW_QUERY_EXPLAIN_INTERVAL seconds per statement. A plan
+    # is captured by executing the slow statement again, in a savepoint on
+    # the connection of the request which executed it, so that request
+    # waits for the slow statement twice. Plans are disabled if the interval
+    # is 0. Slow statements aren't recorded if the threshold is 0.
+    SLOW_QUERY_THRESHOLD: float = Field(
+        default=0,
+        ge=0,
+        json_schema_extra={"env": "SLOW_QUERY_THRESHOLD"},
+    )
+    SLOW_QUERY_LOG_SIZE: int = Field(
+        default=100,
+        ge=1,
+        json_schema_extra={"env": "SLOW_QUERY_LOG_SIZE"},
+    )
+    SLOW_QUERY_EXPLAIN_INTERVAL: float = Field(
+        default=60,
+        ge=0,
+        json_schema_extra={"env": "SLOW_QUERY_EXPLAIN_INTERVAL"},
+    )
 
     @computed_field  # type: ignore[misc]
     @property
@@ -86,6 +186,88 @@ class Settings(BaseSettings):
         ...,
         json_schema_extra={"env": "AUTHN_API_URL"},
     )
+    # Seconds to cache exchanged tokens and their users for, capped by the
+    # token expiry. Disabled if 0.
+    AUTH_TOKEN_CACHE_TTL: int = Field(
+        default=300,
+        ge=0,
+        json_schema_extra={"env": "AUTH_TOKEN_CACHE_TTL"},
+    )
+    AUTH_TOKEN_CACHE_MAX_SIZE: int = Field(
+        default=1024,
+        ge=0,
+        json_schema_extra={"env": "AUTH_TOKEN_CACHE_MAX_SIZE"},
+    )
+
+    # Seconds to cache candidate known pulsar cross-matches for each
+    # observation. Disabled if 0. Each worker process has its own cache, so
+    # writing candidates only invalidates the cache of the worker which
+    # wrote them, and other workers serve their cached cross-matches until
+    # they expire.
+    CROSSMATCH_CACHE_TTL: int = Field(
+        default=600,
+        ge=0,
+        json_schema_extra={"env": "CROSSMATCH_CACHE_TTL"},
+    )
+    CROSSMATCH_CACHE_MAX_SIZE: int = Field(
+        default=256,
+        ge=0,
+        json_schema_extra={"env": "CROSSMATCH_CACHE_MAX_SIZE"},
+    )
+
+    # Seconds to cache label entities for. The cache is also invalidated
+    # when an entity is created through the API. Disabled if 0.
+    ENTITY_CACHE_TTL: int = Field(
+        default=3600,
+        ge=0,
+        json_schema_extra={"env": "ENTITY_CACHE_TTL"},
+    )
+
+    # Seconds to cache the latest observation id for. The cache is also
+    # invalidated when observations are written if OBSERVATION_LISTEN is
+    # enabled. Disabled if 0.
+    LATEST_OBSERVATION_CACHE_TTL: int = Field(
+        default=60,
+        ge=0,
+        json_schema_extra={"env": "LATEST_OBSERVATION_CACHE_TTL"},
+    )
+    OBSERVATION_LISTEN: int = Field(
+        default=1,
+        json_schema_extra={"env": "OBSERVATION_LISTEN"},
+    )
+    OBSERVATION_LISTEN_RETRY_INTERVAL: float = Field(
+        default=5,
+        gt=0,
+        json_schema_extra={"env": "OBSERVATION_LISTEN_RETRY_INTERVAL"},
+    )
+
+    # Candidates are clustered into repeat sources with other candidates
+    # within this radius (degrees) and DM tolerance (pc cm^-3).
+    CANDIDATE_CLUSTER_RADIUS: float = Field(
+        default=0.1,
+        gt=0,
+        json_schema_extra={"env": "CANDIDATE_CLUSTER_RADIUS"},
+    )
+    CANDIDATE_CLUSTER_DM_TOLERANCE: float = Field(
+        default=2.0,
+        ge=0,
+        json_schema_extra={"env": "CANDIDATE_CLUSTER_DM_TOLERANCE"},
+    )
+
+    # The partitions of the current month and this many upcoming months are
+    # created every CANDIDATE_PARTITION_INTERVAL seconds, so that candidate
+    # partitions are rarely created while candidates are written. Disabled
+    # if the interval is 0.
+    CANDIDATE_PARTITION_MONTHS_AHEAD: int = Field(
+        default=2,
+        ge=0,
+        json_schema_extra={"env": "CANDIDATE_PARTITION_MONTHS_AHEAD"},
+    )
+    CANDIDATE_PARTITION_INTERVAL: float = Field(
+        default=3600,
+        ge=0,
+        json_schema_extra={"env": "CANDIDATE_PARTITION_INTERVAL"},
+    )
 
     MALTOPUFT_ENTITIES: list[dict[str, Any]] = Field(
         ...,
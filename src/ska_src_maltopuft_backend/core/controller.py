@@ -1,14 +1,14 @@
 """Base class for data controllers."""
 
 import logging
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 from typing import Any, Generic
 
 from psycopg import errors as psycopgexc
 from pydantic import BaseModel
 from sqlalchemy import Row
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ska_src_maltopuft_backend.core.exceptions import (
     AlreadyExistsError,
@@ -19,6 +19,7 @@ from ska_src_maltopuft_backend.core.exceptions import (
 from ska_src_maltopuft_backend.core.repository import BaseRepository
 from ska_src_maltopuft_backend.core.types import (
     CreateModelT,
+    DBSession,
     ModelT,
     UpdateModelT,
 )
@@ -45,6 +46,45 @@ class BaseController(Generic[ModelT, CreateModelT, UpdateModelT]):
     ) -> list[int]:
         return [id_[0] for id_ in returned_ids]
 
+    async def _commit(self, db: DBSession) -> None:
+        """Commit the session's transaction."""
+        if isinstance(db, AsyncSession):
+            await db.commit()
+            return
+        db.commit()
+
+    async def rollback(self, db: DBSession) -> None:
+        """Roll back the session's transaction."""
+        if isinstance(db, AsyncSession):
+            await db.rollback()
+            return
+        db.rollback()
+
+    async def _refresh(self, db: DBSession, db_obj: ModelT) -> None:
+        """Reload the object's attributes from the database."""
+        if isinstance(db, AsyncSession):
+            await db.refresh(db_obj)
+            return
+        db.refresh(db_obj)
+
+    def _raise_integrity_error(self, exc: IntegrityError) -> None:
+        """Raise the MALTOPUFT exception corresponding to an integrity error
+        raised while creating objects.
+        """
+        logger.exception("Error encountered:")
+        if isinstance(exc.orig, psycopgexc.ForeignKeyViolation):
+            msg = f"Can't create object {self._type} with non-existent parent."
+            raise ParentNotFoundError(msg) from exc
+        if isinstance(exc.orig, psycopgexc.UniqueViolation):
+            msg = f"Can't create object {self._type} with duplicate attribute."
+            raise AlreadyExistsError(msg) from exc
+        if isinstance(exc.orig, psycopgexc.NotNullViolation):
+            msg = (
+                f"Can't create object {self._type} with missing required "
+                "attributes."
+            )
+            raise MissingRequiredAttributeError(msg) from exc
+
     def _merge_query_parameters(
         self,
         params: list[BaseModel] | None = None,
@@ -69,14 +109,16 @@ class BaseController(Generic[ModelT, CreateModelT, UpdateModelT]):
 
     async def get_by_id(
         self,
-        db: Session,
+        db: DBSession,
         id_: int,
         join_: list[str] | None = None,
+        load_: list[str] | None = None,
     ) -> ModelT:
         """Returns the model instance matching the id.
 
         :param id_: The id to match.
         :param join_: The joins to make.
+        :param load_: The relationships to eagerly load.
         :return: The model instance.
         """
         db_obj: ModelT | None = await self.repository.get_unique_by(
@@ -84,6 +126,7 @@ class BaseController(Generic[ModelT, CreateModelT, UpdateModelT]):
             field="id",
             value=id_,
             join_=join_,
+            load_=load_,
         )
         logger.debug(f"Database returned object: {db_obj}")
 
@@ -95,7 +138,7 @@ class BaseController(Generic[ModelT, CreateModelT, UpdateModelT]):
 
     async def get_by_id_multi(
         self,
-        db: Session,
+        db: DBSession,
         ids_: list[int],
     ) -> Sequence[Row[ModelT]]:
         """Returns the model instances matching the ids.
@@ -112,7 +155,7 @@ class BaseController(Generic[ModelT, CreateModelT, UpdateModelT]):
 
     async def count(
         self,
-        db: Session,
+        db: DBSession,
         join_: list[str] | None = None,
         q: list[BaseModel] | None = None,
     ) -> int:
@@ -126,12 +169,14 @@ class BaseController(Generic[ModelT, CreateModelT, UpdateModelT]):
             or 0
         )
 
-    async def get_all(
+    async def get_all(  # pylint: disable=R0913 # noqa: PLR0913
         self,
-        db: Session,
+        db: DBSession,
         join_: list[str] | None = None,
         order_: dict[str, list[str]] | None = None,
         q: list[BaseModel] | None = None,
+        keyset_: list[str] | None = None,
+        load_: list[str] | None = None,
     ) -> Sequence[ModelT]:
         """Returns a list of records based on query params.
 
@@ -141,6 +186,9 @@ class BaseController(Generic[ModelT, CreateModelT, UpdateModelT]):
         :param order_: Dict whose keys are sort order and values are lists of
             fields
         :param q: The query parameters.
+        :param keyset_: Unique list of fields to order and paginate records
+            by with the ``after`` cursor query parameter.
+        :param load_: The relationships to eagerly load.
         :return: A list of records.
         """
         rows: Sequence[Row[ModelT]] = await self.repository.get_all(
@@ -148,15 +196,44 @@ class BaseController(Generic[ModelT, CreateModelT, UpdateModelT]):
             join_=join_,
             order_=order_,
             q=self._merge_query_parameters(params=q),
+            keyset_=keyset_,
+            load_=load_,
         )
         logger.info(
             f"Database returned {len(rows)} {self.model_class} objects.",
         )
         return [row[0] for row in rows]
 
+    async def stream_all(
+        self,
+        db: DBSession,
+        join_: list[str] | None = None,
+        order_: dict[str, list[str]] | None = None,
+        q: list[BaseModel] | None = None,
+        load_: list[str] | None = None,
+    ) -> AsyncIterator[ModelT]:
+        """Yields every record matching the query params without loading
+        them all into memory. Pagination query params are ignored.
+
+        :param join_: The joins to make.
+        :param order_: Dict whose keys are sort order and values are lists of
+            fields
+        :param q: The query parameters.
+        :param load_: The relationships to eagerly load.
+        :return: An async iterator of records.
+        """
+        async for obj in self.repository.stream_all(
+            db=db,
+            join_=join_,
+            order_=order_,
+            q=self._merge_query_parameters(params=q),
+            load_=load_,
+        ):
+            yield obj
+
     async def create(
         self,  # pylint: disable=unused-argument
-        db: Session,
+        db: DBSession,
         attributes: dict[str, Any],
         *args: Any,  # noqa: ARG002
         **kwargs: Any,  # noqa: ARG002
@@ -172,32 +249,19 @@ class BaseController(Generic[ModelT, CreateModelT, UpdateModelT]):
         )
 
         try:
-            db.commit()
+            await self._commit(db=db)
         except IntegrityError as exc:
-            logger.exception("Error encountered:")
-            if isinstance(exc.orig, psycopgexc.ForeignKeyViolation):
-                msg = (
-                    f"Can't create object {self._type} with non-existent "
-                    "parent."
-                )
-                raise ParentNotFoundError(msg) from exc
-            if isinstance(exc.orig, psycopgexc.UniqueViolation):
-                msg = (
-                    f"Can't create object {self._type} with duplicate "
-                    "attribute."
-                )
-                raise AlreadyExistsError(msg) from exc
-            if isinstance(exc.orig, psycopgexc.NotNullViolation):
-                msg = (
-                    f"Can't create object {self._type} with missing "
-                    "required attributes."
-                )
-                raise MissingRequiredAttributeError(msg) from exc
+            self._raise_integrity_error(exc=exc)
+
+        if isinstance(db, AsyncSession):
+            # Load server-generated defaults (e.g. created_at) while the
+            # session can still issue queries.
+            await self._refresh(db=db, db_obj=created_object)
         return created_object
 
     async def create_many(
         self,  # pylint: disable=unused-argument
-        db: Session,
+        db: DBSession,
         objects: list[dict[str, Any]],
         *args: Any,  # noqa: ARG002
         **kwargs: Any,  # noqa: ARG002
@@ -208,31 +272,13 @@ class BaseController(Generic[ModelT, CreateModelT, UpdateModelT]):
                 db=db,
                 objects=objects,
             )
-            db.commit()
+            await self._commit(db=db)
         except IntegrityError as exc:
-            logger.exception("Error encountered:")
-            if isinstance(exc.orig, psycopgexc.ForeignKeyViolation):
-                msg = (
-                    f"Can't create object {self._type} with non-existent "
-                    "parent."
-                )
-                raise ParentNotFoundError(msg) from exc
-            if isinstance(exc.orig, psycopgexc.UniqueViolation):
-                msg = (
-                    f"Can't create object {self._type} with duplicate "
-                    "attribute."
-                )
-                raise AlreadyExistsError(msg) from exc
-            if isinstance(exc.orig, psycopgexc.NotNullViolation):
-                msg = (
-                    f"Can't create object {self._type} with missing "
-                    "required attributes."
-                )
-                raise MissingRequiredAttributeError(msg) from exc
+            self._raise_integrity_error(exc=exc)
         logger.info(f"Created {len(created_ids)} {self.model_class} objects")
         return self._flatten_ids(created_ids)
 
-    async def delete(self, db: Session, id_: int) -> None:
+    async def delete(self, db: DBSession, id_: int) -> None:
         """Deletes the Object from the DB.
 
         :param db: The database session.
@@ -241,11 +287,11 @@ class BaseController(Generic[ModelT, CreateModelT, UpdateModelT]):
         """
         db_obj: ModelT = await self.get_by_id(db=db, id_=id_)
         await self.repository.delete(db=db, db_obj=db_obj)
-        db.commit()
+        await self._commit(db=db)
 
     async def update(
         self,
-        db: Session,
+        db: DBSession,
         db_obj: ModelT,
         update_obj: UpdateModelT,
     ) -> ModelT:
@@ -267,6 +313,6 @@ class BaseController(Generic[ModelT, CreateModelT, UpdateModelT]):
             db_obj=db_obj,
             update_obj=update_obj.model_dump(exclude_unset=True),
         )
-        db.commit()
-        db.refresh(db_obj)
+        await self._commit(db=db)
+        await self._refresh(db=db, db_obj=db_obj)
         return updated_object
@@ -1,25 +1,73 @@
 """Initialises the database connection pool."""
 
 import logging
-from collections.abc import Generator
+import os
+from collections.abc import AsyncGenerator, AsyncIterator, Generator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
 
 import sqlalchemy as sa
 from fastapi import HTTPException
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
 
 from ska_src_maltopuft_backend.core.config import settings
+from ska_src_maltopuft_backend.core.types import DBSession
+
+from .pool import TimedAsyncAdaptedQueuePool, TimedQueuePool, pool_status
+from .slow_queries import slow_query_log
 
 logger = logging.getLogger(__name__)
 
 
+def engine_options() -> dict[str, Any]:
+    """Connection pool and connection options shared by database engines."""
+    connect_args: dict[str, Any] = {}
+    if settings.MALTOPUFT_POSTGRES_STATEMENT_TIMEOUT:
+        connect_args["options"] = (
+            "-c statement_timeout="
+            f"{settings.MALTOPUFT_POSTGRES_STATEMENT_TIMEOUT}"
+        )
+
+    return {
+        "pool_size": settings.MALTOPUFT_POSTGRES_POOL_SIZE,
+        "max_overflow": settings.MALTOPUFT_POSTGRES_MAX_OVERFLOW,
+        "pool_timeout": settings.MALTOPUFT_POSTGRES_POOL_TIMEOUT,
+        "pool_recycle": settings.MALTOPUFT_POSTGRES_POOL_RECYCLE,
+        "pool_pre_ping": bool(settings.MALTOPUFT_POSTGRES_POOL_PRE_PING),
+        "connect_args": connect_args,
+    }
+
+
+def psycopg_conninfo() -> str:
+    """Return the database connection string without the SQLAlchemy driver
+    name, for connections opened with psycopg rather than an engine.
+    """
+    return str(settings.MALTOPUFT_POSTGRES_URI).replace(
+        "postgresql+psycopg://",
+        "postgresql://",
+        1,
+    )
+
+
 def init_engine() -> sa.engine.base.Engine:
     """Initialise the database engine."""
     logger.info(
         f"Initialising database engine for {settings.MALTOPUFT_POSTGRES_INFO}",
     )
 
-    engine_ = create_engine(str(settings.MALTOPUFT_POSTGRES_URI))
+    engine_ = create_engine(
+        str(settings.MALTOPUFT_POSTGRES_URI),
+        poolclass=TimedQueuePool,
+        **engine_options(),
+    )
+    slow_query_log.register(engine_)
 
     logger.info(
         "Successfully initialised engine for "
@@ -28,13 +76,144 @@ def init_engine() -> sa.engine.base.Engine:
     return engine_
 
 
-engine = init_engine()
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def init_async_engine() -> AsyncEngine:
+    """Initialise the asyncio database engine.
+
+    The psycopg (v3) driver used by the synchronous engine also implements
+    an asyncio interface, so both engines share the same connection string.
+    """
+    logger.info(
+        "Initialising async database engine for "
+        f"{settings.MALTOPUFT_POSTGRES_INFO}",
+    )
+
+    engine_ = create_async_engine(
+        str(settings.MALTOPUFT_POSTGRES_URI),
+        poolclass=TimedAsyncAdaptedQueuePool,
+        **engine_options(),
+    )
+    slow_query_log.register(engine_.sync_engine)
+
+    logger.info(
+        "Successfully initialised async engine for "
+        f"{settings.MALTOPUFT_POSTGRES_INFO}",
+    )
+    return engine_
+
+
+class DatabaseEngines:
+    """The database engines and session factories of a process.
+
+    Engines are initialised when they are first used, or when the
+    application starts, so importing the application doesn't create
+    connection pools.
+    """
+
+    def __init__(self) -> None:
+        """Initialise a DatabaseEngines instance without any engines."""
+        self._engine: sa.engine.base.Engine | None = None
+        self._session_local: sessionmaker[Session] | None = None
+        self._async_engine: AsyncEngine | None = None
+        self._async_session_local: async_sessionmaker[AsyncSession] | None = (
+            None
+        )
+
+    @property
+    def engine(self) -> sa.engine.base.Engine:
+        """The database engine."""
+        if self._engine is None:
+            self._engine = init_engine()
+        return self._engine
+
+    @property
+    def session_local(self) -> sessionmaker[Session]:
+        """The database session factory."""
+        if self._session_local is None:
+            self._session_local = sessionmaker(
+                autocommit=False,
+                autoflush=False,
+                bind=self.engine,
+            )
+        return self._session_local
+
+    @property
+    def async_engine(self) -> AsyncEngine:
+        """The asyncio database engine."""
+        if self._async_engine is None:
+            self._async_engine = init_async_engine()
+        return self._async_engine
+
+    @property
+    def async_session_local(self) -> async_sessionmaker[AsyncSession]:
+        """The asyncio database session factory.
+
+        Objects are not expired on commit because expired attributes can't
+        be lazily refreshed outside of the asyncio session's greenlet
+        context.
+        """
+        if self._async_session_local is None:
+            self._async_session_local = async_sessionmaker(
+                autocommit=False,
+                autoflush=False,
+                expire_on_commit=False,
+                bind=self.async_engine,
+            )
+        return self._async_session_local
+
+    def pools(self) -> dict[str, sa.pool.Pool]:
+        """Return the connection pools of the engines which have been
+        initialised, by engine name.
+        """
+        pools = {}
+        if self._engine is not None:
+            pools["sync"] = self._engine.pool
+        if self._async_engine is not None:
+            pools["async"] = self._async_engine.sync_engine.pool
+        return pools
+
+    def init(self) -> None:
+        """Initialise the engine and session factory of the configured
+        session type, which doesn't connect to the database.
+
+        The other engine is still initialised when it is first used, e.g.
+        by a database health check.
+        """
+        if settings.MALTOPUFT_POSTGRES_ASYNC:
+            _ = self.async_session_local
+            return
+        _ = self.session_local
+
+    async def dispose(self) -> None:
+        """Close every pooled connection and discard the engines."""
+        if self._engine is not None:
+            self._engine.dispose()
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+        self._engine, self._session_local = None, None
+        self._async_engine, self._async_session_local = None, None
+
+    def dispose_after_fork(self) -> None:
+        """Discard the connection pools inherited by a forked worker
+        process.
+
+        Servers which fork workers after importing the application would
+        otherwise share the parent's connections between processes. The
+        parent's connections aren't closed because the parent still owns
+        them.
+        """
+        if self._engine is not None:
+            self._engine.dispose(close=False)
+        if self._async_engine is not None:
+            self._async_engine.sync_engine.dispose(close=False)
+
+
+engines = DatabaseEngines()
+os.register_at_fork(after_in_child=engines.dispose_after_fork)
 
 
 def get_db() -> Generator[Session, None, None]:
     """Initialise a database session."""
-    db = SessionLocal()
+    db = engines.session_local()
     try:
         yield db
     except sa.exc.OperationalError as e:
@@ -49,10 +228,68 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Initialise an asyncio database session."""
+    async with engines.async_session_local() as db:
+        try:
+            yield db
+        except sa.exc.OperationalError as e:
+            logger.exception(
+                f"Failed to connect to {settings.MALTOPUFT_POSTGRES_INFO}. ",
+            )
+            raise HTTPException(
+                status_code=503,
+                detail="Database unavailable.",
+            ) from e
+
+
+async def get_session() -> AsyncGenerator[DBSession, None]:
+    """Initialise a database session for a request.
+
+    Yields an ``AsyncSession`` if the MALTOPUFT_POSTGRES_ASYNC setting is
+    enabled, otherwise the synchronous ``Session`` from ``get_db``. Only the
+    engine of the session type in use is initialised.
+    """
+    if settings.MALTOPUFT_POSTGRES_ASYNC:
+        async with asynccontextmanager(get_async_db)() as async_db:
+            yield async_db
+        return
+
+    with contextmanager(get_db)() as db:
+        yield db
+
+
+async def close_session(db: DBSession) -> None:
+    """Close a synchronous or asyncio database session."""
+    if isinstance(db, AsyncSession):
+        await db.close()
+        return
+    db.close()
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[DBSession]:
+    """Open a short-lived database session outside of a request.
+
+    Yields an ``AsyncSession`` if the MALTOPUFT_POSTGRES_ASYNC setting is
+    enabled, otherwise a synchronous ``Session``. The session's connection
+    is returned to the pool when the context exits.
+    """
+    if settings.MALTOPUFT_POSTGRES_ASYNC:
+        async with engines.async_session_local() as async_db:
+            yield async_db
+        return
+
+    with engines.session_local() as db:
+        yield db
+
+
 def ping_db(
-    db_engine: sa.engine.base.Engine = engine,
+    db_engine: sa.engine.base.Engine | None = None,
 ) -> sa.engine.cursor.Result:
     """Database readiness check."""
+    if db_engine is None:
+        db_engine = engines.engine
     try:
         with db_engine.connect() as conn:
             return conn.execute(sa.text("SELECT 1"))
@@ -78,3 +315,15 @@ def ping_db_from_pool(db: Session) -> sa.engine.cursor.Result:
             status_code=503,
             detail="Database unavailable.",
         ) from e
+
+
+def get_pool_status() -> list[dict[str, Any]]:
+    """Return the usage and checkout statistics of the engine pools.
+
+    Only engines which have been initialised are reported, so that checking
+    the pools doesn't create them.
+    """
+    return [
+        {"name": name, **pool_status(pool)}
+        for name, pool in engines.pools().items()
+    ]
@@ -0,0 +1,98 @@
+"""pgSphere spherical geometry expressions and indexes.
+
+Positions are indexed with a GiST index on the expression
+``spoint(radians(ra), radians(dec))`` rather than a pgSphere-typed column so
+that the application schema can still be created on PostgreSQL servers
+without the pg_sphere extension. Cone searches must use the same expression
+(see ``spoint``) for the planner to use the index.
+"""
+
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.elements import ColumnElement
+
+# The index name follows the naming convention in core.database.base
+POS_INDEX_NAME = "%(table)s_pos_idx"
+
+
+def spoint(ra: Any, dec: Any) -> ColumnElement:
+    """Return a pgSphere point from right ascension and declination in
+    degrees.
+
+    :param ra: The right ascension column or value in degrees.
+    :param dec: The declination column or value in degrees.
+    """
+    return sa.func.spoint(sa.func.radians(ra), sa.func.radians(dec))
+
+
+def scircle(ra: Any, dec: Any, radius: float) -> ColumnElement:
+    """Return a pgSphere circle centred on (ra, dec) in degrees with a radius
+    in degrees. The centre may be given as columns or values.
+    """
+    return sa.func.scircle(spoint(ra, dec), sa.func.radians(radius))
+
+
+def cone_search(
+    ra_column: Any,
+    dec_column: Any,
+    ra: Any,
+    dec: Any,
+    radius: float,
+) -> ColumnElement[bool]:
+    """Return a predicate which is true for positions within radius degrees
+    of (ra, dec).
+
+    The centre (ra, dec) may be columns of another table to cross-match two
+    tables in a join.
+    """
+    return spoint(ra_column, dec_column).op("@", is_comparison=True)(
+        scircle(ra, dec, radius),
+    )
+
+
+def separation(
+    ra_1: Any,
+    dec_1: Any,
+    ra_2: Any,
+    dec_2: Any,
+) -> ColumnElement[float]:
+    """Return the angular separation in degrees between two positions in
+    degrees.
+    """
+    distance = spoint(ra_1, dec_1).op("<->", return_type=sa.Float)(
+        spoint(ra_2, dec_2),
+    )
+    return sa.func.degrees(distance, type_=sa.Float)
+
+
+def has_pg_sphere(
+    ddl: sa.ExecutableDDLElement,  # noqa: ARG001
+    target: sa.Table,  # noqa: ARG001
+    bind: Connection,
+    **kwargs: Any,  # noqa: ARG001
+) -> bool:
+    """Check whether the pg_sphere extension is installed in the database.
+
+    Used to conditionally execute pgSphere DDL statements.
+    """
+    # pylint: disable=unused-argument
+    return bool(
+        bind.execute(
+            sa.text(
+                "SELECT 1 FROM pg_extension WHERE extname = 'pg_sphere'",
+            ),
+        ).scalar(),
+    )
+
+
+def create_pos_index_ddl(ra: str = "ra", dec: str = "dec") -> sa.DDL:
+    """Return DDL which creates a GiST index on a table's (ra, dec) position.
+
+    The DDL is only executed if the pg_sphere extension is installed.
+    """
+    return sa.DDL(
+        f"CREATE INDEX IF NOT EXISTS {POS_INDEX_NAME} ON %(table)s "
+        f"USING gist (spoint(radians({ra}), radians({dec})))",
+    ).execute_if(callable_=has_pg_sphere)
@@ -0,0 +1,142 @@
+"""Database connection pools which record checkout statistics."""
+
+import threading
+import time
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    QueuePool,
+)
+
+from ska_src_maltopuft_backend.core.metrics import (
+    POOL_TIMEOUTS,
+    POOL_WAIT_DURATION,
+)
+
+
+class PoolStatistics:
+    """Cumulative connection checkout statistics for a connection pool.
+
+    Wait time is the time spent waiting for the pool to hand out a
+    connection, which includes opening a new connection if the pool has not
+    yet reached its size limit.
+    """
+
+    def __init__(self) -> None:
+        """Initialise a PoolStatistics instance."""
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def record_checkout(self, wait_time: float) -> None:
+        """Record a successful connection checkout."""
+        with self._lock:
+            self.checkouts += 1
+            self.wait_time_total += wait_time
+            self.wait_time_max = max(self.wait_time_max, wait_time)
+
+    def record_timeout(self, wait_time: float) -> None:
+        """Record a connection checkout which timed out."""
+        with self._lock:
+            self.timeouts += 1
+            self.wait_time_total += wait_time
+            self.wait_time_max = max(self.wait_time_max, wait_time)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a snapshot of the statistics."""
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_time_total": self.wait_time_total,
+                "wait_time_mean": (
+                    self.wait_time_total / attempts if attempts else 0.0
+                ),
+                "wait_time_max": self.wait_time_max,
+            }
+
+
+class _TimedPoolMixin:
+    """Times connection checkouts from a queue pool."""
+
+    # pylint: disable=too-few-public-methods
+
+    stats: PoolStatistics
+    # The pool label of the pool's metrics
+    metrics_name: str
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()  # type: ignore[misc]
+        except sa.exc.TimeoutError:
+            wait_time = time.perf_counter() - start
+            self.stats.record_timeout(wait_time)
+            POOL_WAIT_DURATION.observe(wait_time, pool=self.metrics_name)
+            POOL_TIMEOUTS.inc(pool=self.metrics_name)
+            raise
+        wait_time = time.perf_counter() - start
+        self.stats.record_checkout(wait_time)
+        POOL_WAIT_DURATION.observe(wait_time, pool=self.metrics_name)
+        return conn
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    """QueuePool which records connection checkout statistics."""
+
+    metrics_name = "sync"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialise a TimedQueuePool instance."""
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStatistics()
+
+    def recreate(self) -> "TimedQueuePool":
+        """Recreate the pool, keeping the existing statistics."""
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool  # type: ignore[return-value]
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool which records connection checkout statistics."""
+
+    metrics_name = "async"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialise a TimedAsyncAdaptedQueuePool instance."""
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStatistics()
+
+    def recreate(self) -> "TimedAsyncAdaptedQueuePool":
+        """Recreate the pool, keeping the existing statistics."""
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool  # type: ignore[return-value]
+
+
+def pool_status(pool: sa.pool.Pool) -> dict[str, Any]:
+    """Return the current usage and checkout statistics of a pool."""
+    # pylint: disable=protected-access
+    status: dict[str, Any] = {}
+    if isinstance(pool, QueuePool):
+        max_overflow = pool._max_overflow  # noqa: SLF001
+        status.update(
+            {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": max_overflow,
+            },
+        )
+    stats = getattr(pool, "stats", None)
+    if isinstance(stats, PoolStatistics):
+        status.update(stats.as_dict())
+    return status
@@ -0,0 +1,301 @@
+"""A log of slow database statements and their query plans.
+
+Repository queries are built from request parameters, so statements
+executed by the same endpoint can have very different plans. Statements
+which take longer than a threshold are recorded with the shape of their
+parameters, the route and repository method which executed them and, for
+select statements, a sample ``EXPLAIN (ANALYZE, BUFFERS)`` plan.
+
+The log is kept in the memory of each worker process.
+"""
+
+import contextvars
+import datetime as dt
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, NamedTuple
+
+import sqlalchemy as sa
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ska_src_maltopuft_backend.core.config import settings
+from ska_src_maltopuft_backend.core.metrics import current_query_source
+
+logger = logging.getLogger(__name__)
+
+# Name of the savepoint which isolates EXPLAIN statements from the
+# transaction of the slow statement
+EXPLAIN_SAVEPOINT = "slow_query_explain"
+
+# The ASGI scope of the request being handled
+_request_scope: contextvars.ContextVar[Scope | None] = contextvars.ContextVar(
+    "request_scope",
+    default=None,
+)
+
+
+class SlowQuery(NamedTuple):
+    """A slow database statement."""
+
+    recorded_at: dt.datetime
+    duration_ms: float
+    statement: str
+    parameters: Any
+    route: str | None
+    repository: str
+    method: str
+    plan: str | None
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """Return the types of bound parameters without their values.
+
+    Sequence values are described with their length, because the number of
+    values bound to e.g. an ``IN`` clause can change the statement's plan.
+    """
+    if isinstance(parameters, dict):
+        return {key: _value_shape(value) for key, value in parameters.items()}
+    if isinstance(parameters, list):
+        # Parameters of an executemany() call
+        return [parameter_shape(params) for params in parameters[:1]] + (
+            [f"... {len(parameters)} parameter sets"]
+            if len(parameters) > 1
+            else []
+        )
+    if isinstance(parameters, tuple):
+        return [_value_shape(value) for value in parameters]
+    return _value_shape(parameters)
+
+
+def _value_shape(value: Any) -> str:
+    if isinstance(value, list | tuple | set):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def _route(scope: Scope | None) -> str | None:
+    """Return the method and route template of a request."""
+    if scope is None:
+        return None
+    route = scope.get("route")
+    return f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+
+
+class SlowQueryLog:
+    """A ring buffer of the latest slow database statements."""
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        max_size: int,
+        explain_interval: float,
+    ) -> None:
+        """Initialise a SlowQueryLog instance.
+
+        :param threshold_ms: Statements which take at least this many
+            milliseconds are recorded. Statements aren't recorded if 0.
+        :param max_size: The number of slow statements to keep.
+        :param explain_interval: The minimum number of seconds between
+            query plans of the same statement. Plans aren't captured if 0.
+        """
+        self.threshold_ms = threshold_ms
+        self.explain_interval = explain_interval
+        self._lock = threading.Lock()
+        self._entries: deque[SlowQuery] = deque(maxlen=max_size)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether slow statements are recorded."""
+        return self.threshold_ms > 0
+
+    def entries(self) -> list[SlowQuery]:
+        """Return the recorded slow statements, latest first."""
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        """Discard the recorded slow statements."""
+        with self._lock:
+            self._entries.clear()
+
+    def register(self, engine: sa.engine.Engine) -> None:
+        """Record the slow statements executed by an engine.
+
+        :param engine: The engine, or the ``sync_engine`` of an asyncio
+            engine.
+        """
+        if not self.enabled:
+            return
+        sa.event.listen(
+            engine,
+            "before_cursor_execute",
+            self._before_cursor_execute,
+        )
+        sa.event.listen(
+            engine,
+            "after_cursor_execute",
+            self._after_cursor_execute,
+        )
+
+    def _before_cursor_execute(  # pylint: disable=R0913 # noqa: PLR0913
+        self,
+        conn: sa.engine.Connection,  # noqa: ARG002
+        cursor: Any,  # noqa: ARG002
+        statement: str,  # noqa: ARG002
+        parameters: Any,  # noqa: ARG002
+        context: Any,
+        executemany: bool,  # noqa: ARG002, FBT001
+    ) -> None:
+        # The start time is kept on the statement's execution context, which
+        # is discarded with it if the statement raises.
+        context.slow_query_started_at = time.perf_counter()
+
+    def _after_cursor_execute(  # pylint: disable=R0913 # noqa: PLR0913
+        self,
+        conn: sa.engine.Connection,
+        cursor: Any,  # noqa: ARG002
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,  # noqa: FBT001
+    ) -> None:
+        started_at = context.slow_query_started_at
+        duration_ms = (time.perf_counter() - started_at) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        plan = None
+        if (
+            not executemany
+            and self._is_select(context=context)
+            and self._should_explain(statement=statement)
+        ):
+            plan = self._explain(
+                conn=conn,
+                statement=statement,
+                parameters=parameters,
+            )
+
+        repository, method = current_query_source()
+        slow_query = SlowQuery(
+            recorded_at=dt.datetime.now(tz=dt.timezone.utc),
+            duration_ms=duration_ms,
+            statement=statement,
+            parameters=parameter_shape(parameters),
+            route=_route(_request_scope.get()),
+            repository=repository,
+            method=method,
+            plan=plan,
+        )
+        with self._lock:
+            self._entries.append(slow_query)
+        logger.warning(
+            f"Slow statement ({duration_ms:.1f} ms) executed by "
+            f"{repository}.{method} for {slow_query.route}: {statement}",
+        )
+
+    def _is_select(self, context: Any) -> bool:
+        """Whether a statement was compiled from a select construct, which
+        can be explained without side effects.
+        """
+        compiled = getattr(context, "compiled", None)
+        return compiled is not None and isinstance(
+            compiled.statement,
+            sa.Select | sa.CompoundSelect,
+        )
+
+    def _should_explain(self, statement: str) -> bool:
+        """Whether a statement hasn't been explained within the explain
+        interval.
+        """
+        if self.explain_interval <= 0:
+            return False
+        cutoff = dt.datetime.now(tz=dt.timezone.utc) - dt.timedelta(
+            seconds=self.explain_interval,
+        )
+        with self._lock:
+            return not any(
+                entry.statement == statement
+                and entry.plan is not None
+                and entry.recorded_at >= cutoff
+                for entry in self._entries
+            )
+
+    def _explain(
+        self,
+        conn: sa.engine.Connection,
+        statement: str,
+        parameters: Any,
+    ) -> str | None:
+        """Return the plan of a statement, or None if it couldn't be
+        explained.
+
+        The statement is explained with the connection which executed it,
+        so that it sees the same transaction. The EXPLAIN statement is
+        executed in a savepoint which is rolled back, so that locks it takes
+        are released and errors don't abort the transaction.
+
+        EXPLAIN ANALYZE executes the statement again before the request can
+        continue, so the request which executed a slow statement waits for
+        it twice.
+        """
+        dbapi_conn = conn.connection.dbapi_connection
+        in_transaction = not getattr(dbapi_conn, "autocommit", False)
+        plan = None
+        cursor = conn.connection.cursor()
+        try:
+            if in_transaction:
+                cursor.execute(f"SAVEPOINT {EXPLAIN_SAVEPOINT}")
+            try:
+                cursor.execute(
+                    f"EXPLAIN (ANALYZE, BUFFERS) {statement}",
+                    parameters,
+                )
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+            except conn.dialect.loaded_dbapi.Error:
+                logger.exception("Failed to explain slow statement.")
+            finally:
+                if in_transaction:
+                    cursor.execute(
+                        f"ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}",
+                    )
+                    cursor.execute(f"RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}")
+        finally:
+            cursor.close()
+        return plan
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD,
+    max_size=settings.SLOW_QUERY_LOG_SIZE,
+    explain_interval=settings.SLOW_QUERY_EXPLAIN_INTERVAL,
+)
+
+
+class SlowQueryMiddleware:
+    """Makes the request being handled available to the slow query log, so
+    that slow statements are recorded with their route.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialise a SlowQueryMiddleware instance."""
+        self.app = app
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Handle a request with its scope in the request context."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_scope.reset(token)
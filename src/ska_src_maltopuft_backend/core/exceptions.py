@@ -57,3 +57,33 @@ class InvalidAudienceError(MaltopuftError):
 
     status_code = status.HTTP_401_UNAUTHORIZED
     message = "Invalid audience."
+
+
+class InvalidCursorError(MaltopuftError):
+    """HTTP 400 (bad request) error for malformed pagination cursors."""
+
+    status_code = status.HTTP_400_BAD_REQUEST
+    message = "Invalid pagination cursor."
+
+
+class UnsupportedMediaTypeError(MaltopuftError):
+    """HTTP 415 (unsupported media type) error."""
+
+    status_code = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+    message = "Unsupported request body media type."
+
+
+class InvalidRowError(MaltopuftError):
+    """HTTP 422 error for invalid rows in bulk request bodies."""
+
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    message = "Invalid row in request body."
+
+
+class InvalidRangeError(MaltopuftError):
+    """HTTP 422 error for query parameter ranges whose maximum isn't greater
+    than their minimum.
+    """
+
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    message = "Range maximum must be greater than its minimum."
@@ -0,0 +1,155 @@
+"""Stream query results as newline delimited JSON or CSV."""
+
+import csv
+import io
+import types
+from collections.abc import AsyncIterator
+from enum import Enum
+from typing import Any, Union, get_args, get_origin
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from .database.database import close_session
+from .types import DBSession
+
+
+class ExportFormat(str, Enum):
+    """Export file formats."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+# Serialised rows are sent in chunks of at least this many characters
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+class ExportQueryParams(BaseModel):
+    """Query parameters for export HTTP GET requests."""
+
+    format: ExportFormat = ExportFormat.NDJSON
+
+
+def _nested_model(annotation: Any) -> type[BaseModel] | None:
+    """Return the model class of a (possibly optional) nested model field."""
+    if get_origin(annotation) in (Union, types.UnionType):
+        for arg in get_args(annotation):
+            model = _nested_model(arg)
+            if model is not None:
+                return model
+        return None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    return None
+
+
+def csv_columns(schema: type[BaseModel], prefix: str = "") -> list[str]:
+    """Return the CSV column names of a response model.
+
+    Nested model attributes are flattened into dot separated column names,
+    e.g. ``candidate.dm``.
+    """
+    columns = []
+    for name, field in schema.model_fields.items():
+        nested = _nested_model(field.annotation)
+        if nested is None:
+            columns.append(f"{prefix}{name}")
+            continue
+        columns.extend(csv_columns(nested, prefix=f"{prefix}{name}."))
+    return columns
+
+
+def flatten(data: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    """Flatten nested dicts into dot separated keys."""
+    flat = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, prefix=f"{prefix}{key}."))
+            continue
+        flat[f"{prefix}{key}"] = value
+    return flat
+
+
+async def iter_ndjson(
+    objects: AsyncIterator[Any],
+    schema: type[BaseModel],
+) -> AsyncIterator[str]:
+    """Serialise objects as newline delimited JSON."""
+    async for obj in objects:
+        yield schema.model_validate(obj).model_dump_json() + "\n"
+
+
+async def iter_csv(
+    objects: AsyncIterator[Any],
+    schema: type[BaseModel],
+) -> AsyncIterator[str]:
+    """Serialise objects as CSV rows preceded by a header row."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=csv_columns(schema))
+
+    def pop_buffer() -> str:
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
+
+    writer.writeheader()
+    yield pop_buffer()
+    async for obj in objects:
+        data = schema.model_validate(obj).model_dump(mode="json")
+        writer.writerow(flatten(data))
+        yield pop_buffer()
+
+
+def export_response(
+    db: DBSession,
+    objects: AsyncIterator[Any],
+    schema: type[BaseModel],
+    format_: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """Return a response which streams objects serialised with a response
+    model as they are read from the database.
+
+    The request's database session is closed once the response has been
+    streamed, because the session dependency may have exited before the
+    response body is sent.
+
+    :param db: The database session the objects are read with.
+    :param objects: The objects to export.
+    :param schema: The response model to serialise objects with.
+    :param format_: The export file format.
+    :param filename: The name of the exported file, without an extension.
+    """
+    serialiser = iter_csv if format_ == ExportFormat.CSV else iter_ndjson
+
+    async def content() -> AsyncIterator[str]:
+        chunks: list[str] = []
+        size = 0
+        try:
+            async for chunk in serialiser(objects=objects, schema=schema):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= EXPORT_CHUNK_SIZE:
+                    yield "".join(chunks)
+                    chunks, size = [], 0
+            if chunks:
+                yield "".join(chunks)
+        finally:
+            await close_session(db=db)
+
+    return StreamingResponse(
+        content(),
+        media_type=EXPORT_MEDIA_TYPES[format_],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{filename}.{format_.value}"'
+            ),
+        },
+    )
@@ -3,6 +3,8 @@
 from functools import partial
 
 from ska_src_maltopuft_backend.app import controllers, models, repositories
+from ska_src_maltopuft_backend.core.cache import TTLCache
+from ska_src_maltopuft_backend.core.config import settings
 
 
 class Factory:
@@ -31,6 +33,23 @@ class Factory:
         models.KnownPulsar,
     )
 
+    # Caches shared by every controller instance
+    crossmatch_cache = TTLCache(
+        name="crossmatch",
+        ttl=settings.CROSSMATCH_CACHE_TTL,
+        max_size=settings.CROSSMATCH_CACHE_MAX_SIZE,
+    )
+    latest_observation_cache = TTLCache(
+        name="latest_observation",
+        ttl=settings.LATEST_OBSERVATION_CACHE_TTL,
+        max_size=1,
+    )
+    entity_cache = TTLCache(
+        name="entity",
+        ttl=settings.ENTITY_CACHE_TTL,
+        max_size=1,
+    )
+
     def get_user_controller(self) -> controllers.UserController:
         """UserController factory."""
         return controllers.UserController(repository=self.user_repository())
@@ -46,6 +65,7 @@ class Factory:
         """CandidateController factory."""
         return controllers.CandidateController(
             repository=self.candidate_repository(),
+            crossmatch_cache=self.crossmatch_cache,
         )
 
     def get_sp_candidate_controller(self) -> controllers.SPCandidateController:
@@ -53,12 +73,14 @@ class Factory:
         return controllers.SPCandidateController(
             repository=self.sp_candidate_repository(),
             observation_controller=self.get_observation_controller(),
+            latest_observation_cache=self.latest_observation_cache,
         )
 
     def get_entity_controller(self) -> controllers.EntityController:
         """EntityController factory."""
         return controllers.EntityController(
             repository=self.entity_repository(),
+            entity_cache=self.entity_cache,
         )
 
     def get_label_controller(self) -> controllers.LabelController:
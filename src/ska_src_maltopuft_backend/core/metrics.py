@@ -0,0 +1,432 @@
+"""Application metrics in the Prometheus text exposition format.
+
+Metrics are recorded in the memory of each worker process. Every sample is
+labelled with the ``worker`` process id, so that the series of each worker
+only ever increase, however requests to /metrics are distributed between
+workers. A worker's series end when it exits, and a restarted worker
+starts new series.
+"""
+
+import bisect
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+import sqlalchemy as sa
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Upper bounds (seconds) of the buckets of duration histograms
+DURATION_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+MetricT = TypeVar("MetricT", "Counter", "Histogram")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    """Return labels formatted as a Prometheus label set."""
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape_label_value(value)}"'
+        for name, value in labels.items()
+    )
+    return f"{{{pairs}}}"
+
+
+def _escape_label_value(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Counter:
+    """A cumulative count of events."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        """Initialise a Counter instance.
+
+        :param name: The metric name.
+        :param description: The metric's help text.
+        :param labelnames: The names of the labels of each count.
+        """
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increase the count with the given labels."""
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def reset(self) -> None:
+        """Discard every count."""
+        with self._lock:
+            self._values.clear()
+
+    def collect(
+        self,
+        const_labels: dict[str, str] | None = None,
+    ) -> Iterator[str]:
+        """Yield the metric's exposition lines.
+
+        :param const_labels: Labels added to every sample.
+        """
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            values = dict(self._values)
+        for key, value in values.items():
+            labels = _format_labels(
+                {**dict(zip(self.labelnames, key)), **(const_labels or {})},
+            )
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class Histogram:
+    """Counts of observed values in cumulative buckets, with their sum."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DURATION_BUCKETS,
+    ) -> None:
+        """Initialise a Histogram instance.
+
+        :param name: The metric name.
+        :param description: The metric's help text.
+        :param labelnames: The names of the labels of each histogram.
+        :param buckets: The ascending upper bounds of the buckets. Values
+            above the last bound are only counted by the +Inf bucket.
+        """
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # Label values -> (bucket counts, sum, count)
+        self._values: dict[tuple[str, ...], tuple[list[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record an observed value with the given labels."""
+        key = tuple(labels[name] for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total, count = self._values.get(
+                key,
+                ([0] * len(self.buckets), 0.0, 0),
+            )
+            if index < len(counts):
+                counts[index] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    def reset(self) -> None:
+        """Discard every observed value."""
+        with self._lock:
+            self._values.clear()
+
+    def collect(
+        self,
+        const_labels: dict[str, str] | None = None,
+    ) -> Iterator[str]:
+        """Yield the metric's exposition lines.
+
+        :param const_labels: Labels added to every sample.
+        """
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            values = {
+                key: (list(counts), total, count)
+                for key, (counts, total, count) in self._values.items()
+            }
+        for key, (counts, total, count) in values.items():
+            labels = {
+                **dict(zip(self.labelnames, key)),
+                **(const_labels or {}),
+            }
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels(
+                    {**labels, "le": _format_value(bound)},
+                )
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            bucket_labels = _format_labels({**labels, "le": "+Inf"})
+            yield f"{self.name}_bucket{bucket_labels} {count}"
+            yield f"{self.name}_sum{_format_labels(labels)} {total!r}"
+            yield f"{self.name}_count{_format_labels(labels)} {count}"
+
+
+class MetricsRegistry:
+    """The metrics exposed by the application."""
+
+    def __init__(self) -> None:
+        """Initialise an empty MetricsRegistry instance."""
+        self._metrics: list[Counter | Histogram] = []
+
+    def register(self, metric: MetricT) -> MetricT:
+        """Register a metric and return it."""
+        self._metrics.append(metric)
+        return metric
+
+    def reset(self) -> None:
+        """Discard the values of every metric."""
+        for metric in self._metrics:
+            metric.reset()
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format,
+        labelled with the process id of the worker.
+        """
+        const_labels = {"worker": str(os.getpid())}
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.collect(const_labels=const_labels))
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+# Forked workers don't report the metrics of the process they were forked
+# from under their own process id
+os.register_at_fork(after_in_child=registry.reset)
+
+REQUEST_DURATION = registry.register(
+    Histogram(
+        "maltopuft_http_request_duration_seconds",
+        "Time taken to respond to HTTP requests.",
+        labelnames=("method", "route", "status"),
+    ),
+)
+QUERY_DURATION = registry.register(
+    Histogram(
+        "maltopuft_db_query_duration_seconds",
+        "Time taken to execute database statements, by the repository "
+        "method which executed them.",
+        labelnames=("repository", "method"),
+    ),
+)
+POOL_WAIT_DURATION = registry.register(
+    Histogram(
+        "maltopuft_db_pool_wait_seconds",
+        "Time spent waiting to check out a database connection.",
+        labelnames=("pool",),
+    ),
+)
+POOL_TIMEOUTS = registry.register(
+    Counter(
+        "maltopuft_db_pool_timeouts_total",
+        "Database connection checkouts which timed out.",
+        labelnames=("pool",),
+    ),
+)
+AUTH_EXCHANGE_DURATION = registry.register(
+    Histogram(
+        "maltopuft_auth_token_exchange_duration_seconds",
+        "Time taken to exchange access tokens with the authn-api.",
+        labelnames=("outcome",),
+    ),
+)
+CACHE_HITS = registry.register(
+    Counter(
+        "maltopuft_cache_hits_total",
+        "Lookups of unexpired cache entries.",
+        labelnames=("cache",),
+    ),
+)
+CACHE_MISSES = registry.register(
+    Counter(
+        "maltopuft_cache_misses_total",
+        "Lookups of missing or expired cache entries.",
+        labelnames=("cache",),
+    ),
+)
+
+##############################################################################
+# Database statements ########################################################
+##############################################################################
+
+# The (repository, method) executing database statements
+_query_source: contextvars.ContextVar[tuple[str, str]] = (
+    contextvars.ContextVar("query_source", default=("none", "none"))
+)
+
+
+def current_query_source() -> tuple[str, str]:
+    """Return the (repository, method) executing database statements."""
+    return _query_source.get()
+
+
+@contextmanager
+def query_source(repository: str, method: str) -> Iterator[None]:
+    """Attribute database statements executed in the context to a
+    repository method.
+    """
+    token = _query_source.set((repository, method))
+    try:
+        yield
+    finally:
+        _query_source.reset(token)
+
+
+def instrument_repository(cls: type) -> None:
+    """Attribute the statements executed by each public method defined by a
+    repository class to the method.
+
+    Methods are attributed to the class of the repository instance, so
+    inherited methods are attributed to the subclass which called them.
+    """
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_"):
+            continue
+        if inspect.isasyncgenfunction(method):
+            setattr(cls, name, _instrument_async_generator(method))
+        elif inspect.iscoroutinefunction(method):
+            setattr(cls, name, _instrument_coroutine(method))
+
+
+def _instrument_coroutine(method: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(method)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        with query_source(type(self).__name__, method.__name__):
+            return await method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _instrument_async_generator(
+    method: Callable[..., AsyncIterator[Any]],
+) -> Callable[..., AsyncIterator[Any]]:
+    # The source is only set while the generator runs, because it would
+    # otherwise leak into the caller between items.
+    @functools.wraps(method)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        items = method(self, *args, **kwargs)
+        while True:
+            with query_source(type(self).__name__, method.__name__):
+                try:
+                    item = await anext(items)
+                except StopAsyncIteration:
+                    return
+            yield item
+
+    return wrapper
+
+
+@sa.event.listens_for(sa.engine.Engine, "before_cursor_execute")
+def _before_cursor_execute(  # pylint: disable=R0913 # noqa: PLR0913
+    conn: sa.engine.Connection,  # noqa: ARG001
+    cursor: Any,  # noqa: ARG001
+    statement: str,  # noqa: ARG001
+    parameters: Any,  # noqa: ARG001
+    context: Any,
+    executemany: bool,  # noqa: ARG001, FBT001
+) -> None:
+    # The start time is kept on the statement's execution context, which is
+    # discarded with it if the statement raises.
+    context.query_started_at = time.perf_counter()
+
+
+@sa.event.listens_for(sa.engine.Engine, "after_cursor_execute")
+def _after_cursor_execute(  # pylint: disable=R0913 # noqa: PLR0913
+    conn: sa.engine.Connection,  # noqa: ARG001
+    cursor: Any,  # noqa: ARG001
+    statement: str,  # noqa: ARG001
+    parameters: Any,  # noqa: ARG001
+    context: Any,
+    executemany: bool,  # noqa: ARG001, FBT001
+) -> None:
+    started_at = context.query_started_at
+    repository, method = current_query_source()
+    QUERY_DURATION.observe(
+        time.perf_counter() - started_at,
+        repository=repository,
+        method=method,
+    )
+
+
+##############################################################################
+# HTTP requests ##############################################################
+##############################################################################
+
+
+class MetricsMiddleware:
+    """Records the duration of HTTP requests by route.
+
+    Requests are labelled with the route's path template rather than the
+    requested path, so that path parameters don't create a label per
+    object. Requests which don't match a route are labelled "unmatched".
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialise a MetricsMiddleware instance."""
+        self.app = app
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Time a request until its response has been sent."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = "500"
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = str(message["status"])
+            await send(message)
+
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            REQUEST_DURATION.observe(
+                time.perf_counter() - started_at,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status_code,
+            )
@@ -0,0 +1,103 @@
+"""Keyset (cursor) pagination.
+
+Keyset pagination orders results by a unique set of columns (the keyset) and
+selects the rows after the last row of the previous page, e.g.
+``WHERE (candidate.observed_at, candidate.id) > (:observed_at, :id)``. Unlike
+``OFFSET``, the database doesn't have to scan and discard earlier rows, so
+every page costs the same as the first when the keyset is indexed.
+
+Cursors are the keyset values of the last row of a page, serialised as an
+opaque URL-safe token.
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+
+from .database.base import Base
+from .exceptions import InvalidCursorError
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Serialise keyset values to a cursor token.
+
+    :param values: The keyset values of the last row in a page.
+    :return: The cursor token.
+    """
+    payload = json.dumps(jsonable_encoder(list(values)), separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(
+    token: str,
+    columns: Sequence[InstrumentedAttribute],
+) -> tuple[Any, ...]:
+    """Deserialise a cursor token to keyset values.
+
+    :param token: The cursor token.
+    :param columns: The keyset columns, used to validate the type of each
+        value in the cursor.
+    :raises InvalidCursorError: If the token can't be decoded to a value
+        for each keyset column.
+    :return: The keyset values.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError from exc
+
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise InvalidCursorError
+
+    try:
+        return tuple(
+            TypeAdapter(column.type.python_type).validate_python(value)
+            for column, value in zip(columns, values, strict=True)
+        )
+    except ValidationError as exc:
+        raise InvalidCursorError from exc
+
+
+def keyset_values(obj: Base, keyset_: Sequence[str]) -> list[Any]:
+    """Return the keyset values of a model instance.
+
+    Keyset attributes are given as ``attr`` or ``table_name.attr``. Attributes
+    of other tables are read from the instance relationship of the same name.
+
+    :param obj: The model instance.
+    :param keyset_: The keyset attributes.
+    :return: The keyset values.
+    """
+    values = []
+    for key in keyset_:
+        table_name, _, attr = key.rpartition(".")
+        source = obj
+        if table_name and table_name != obj.__tablename__:
+            source = getattr(obj, table_name)
+        values.append(getattr(source, attr))
+    return values
+
+
+def next_cursor(
+    objects: Sequence[Base],
+    keyset_: Sequence[str],
+    limit: int,
+) -> str | None:
+    """Return the cursor of the page following a page of results.
+
+    :param objects: The page of results.
+    :param keyset_: The keyset attributes the results are ordered by.
+    :param limit: The page size.
+    :return: The cursor, or None if the page is the last page.
+    """
+    if not objects or len(objects) < limit:
+        return None
+    return encode_cursor(keyset_values(obj=objects[-1], keyset_=keyset_))
@@ -2,20 +2,31 @@
 
 import datetime as dt
 import logging
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 from typing import Any, ClassVar, Generic
 
+import sqlalchemy as sa
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import Row, Select, text
-from sqlalchemy.orm import Session
+from psycopg import sql as psycopg_sql
+from sqlalchemy import Executable, Result, Row, Select, literal, tuple_
+from sqlalchemy.dialects.postgresql import REGCLASS
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
 from sqlalchemy.orm.attributes import InstrumentedAttribute
+from sqlalchemy.orm.strategy_options import Load
 from sqlalchemy.sql.expression import func, insert, select
 
 from .database.base import Base
-from .types import ModelT
+from .database.pgsphere import cone_search
+from .metrics import instrument_repository
+from .pagination import decode_cursor
+from .types import DBSession, ModelT
 
 logger = logging.getLogger(__name__)
 
+# The default number of rows fetched at a time when streaming results
+STREAM_BATCH_SIZE = 1000
+
 
 class BaseRepository(Generic[ModelT]):
     """Base class for data repositories."""
@@ -29,13 +40,30 @@ class BaseRepository(Generic[ModelT]):
         for table_name, table_class in table_name_class_map.items()
     }
 
+    loader_strategies: ClassVar = {
+        "contains_eager": contains_eager,
+        "joinedload": joinedload,
+        "selectinload": selectinload,
+    }
+
+    # Scalar relationship paths which are loaded with selectinload instead
+    # of joinedload, because many rows are related to a few distinct rows
+    selectin_loads: ClassVar[frozenset[str]] = frozenset()
+
     def __init__(self, model: type[ModelT]) -> None:
         """Initialise a BaseRepository instance."""
         self.model_class: type[ModelT] = model
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Attribute the statements executed by repository methods to the
+        method in query metrics.
+        """
+        super().__init_subclass__(**kwargs)
+        instrument_repository(cls)
+
     async def create(
         self,
-        db: Session,
+        db: DBSession,
         attributes: dict[str, Any],
     ) -> ModelT:
         """Creates the model instance.
@@ -50,7 +78,7 @@ class BaseRepository(Generic[ModelT]):
 
     async def create_many(
         self,
-        db: Session,
+        db: DBSession,
         objects: list[ModelT],
     ) -> Sequence[Row[tuple[int]]]:
         """Create multiple model instances.
@@ -62,11 +90,16 @@ class BaseRepository(Generic[ModelT]):
         bulk_insert_stmt = insert(self.model_class).returning(
             self.model_class.id,
         )
-        return db.execute(bulk_insert_stmt, params=objects).fetchall()
+        result = await self._execute(
+            db=db,
+            query=bulk_insert_stmt,
+            params=objects,
+        )
+        return result.fetchall()
 
     async def count(
         self,
-        db: Session,
+        db: DBSession,
         join_: list[str] | None = None,
         q: dict[str, Any] | None = None,
     ) -> int | None:
@@ -86,14 +119,17 @@ class BaseRepository(Generic[ModelT]):
 
         query = query.select_from(self.model_class)
         query = self._apply_joins(query=query, join_=join_)
-        return db.execute(query).scalar()
+        result = await self._execute(db=db, query=query)
+        return result.scalar()
 
-    async def get_all(
+    async def get_all(  # pylint: disable=R0913 # noqa: PLR0913
         self,
-        db: Session,
+        db: DBSession,
         join_: list[str] | None = None,
         order_: dict[str, list[str]] | None = None,
         q: dict[str, Any] | None = None,
+        keyset_: list[str] | None = None,
+        load_: list[str] | None = None,
     ) -> Sequence[Row[ModelT]]:
         """Returns a list of model instances.
 
@@ -101,21 +137,136 @@ class BaseRepository(Generic[ModelT]):
         :param join_: The joins to make.
         :param order_: The order of the results. (e.g desc, asc)
         :param q: The query parameters.
+        :param keyset_: Unique set of attributes to order results by in
+            ascending order after order_. If given, the ``after`` query
+            parameter selects the page of results following a cursor
+            instead of skipping rows.
+        :param load_: The relationships to eagerly load.
         :return: A list of model instances.
         """
-        query = self._build_query(join_=join_, order_=order_)
+        query = self._build_query(join_=join_, order_=order_, load_=load_)
+        if keyset_:
+            query = self._apply_ordering(query=query, order_={"asc": keyset_})
         if q is not None:
             query = self._apply_filters(query=query, q=q)
-            query = self._apply_pagination(query=query, q=q)
+            query = self._apply_pagination(query=query, q=q, keyset_=keyset_)
         return await self._execute_all(db=db, query=query)
 
+    async def stream_all(  # pylint: disable=R0913 # noqa: PLR0913
+        self,
+        db: DBSession,
+        join_: list[str] | None = None,
+        order_: dict[str, list[str]] | None = None,
+        q: dict[str, Any] | None = None,
+        load_: list[str] | None = None,
+        yield_per: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[ModelT]:
+        """Yields every model instance matching the query parameters.
+
+        Rows are fetched from a server-side cursor in batches of yield_per
+        rows, so memory use doesn't grow with the number of results.
+        Pagination query parameters are ignored.
+
+        :param db: The database session.
+        :param join_: The joins to make.
+        :param order_: The order of the results. (e.g desc, asc)
+        :param q: The query parameters.
+        :param load_: The relationships to eagerly load. Collections can't
+            be loaded with joinedload.
+        :param yield_per: The number of rows fetched from the cursor at a
+            time.
+        :return: An async iterator of model instances.
+        """
+        query = self._build_query(join_=join_, order_=order_, load_=load_)
+        if q is not None:
+            query = self._apply_filters(query=query, q=q)
+        query = query.execution_options(yield_per=yield_per)
+
+        if isinstance(db, AsyncSession):
+            async_result = await db.stream(query)
+            try:
+                async for partition in async_result.partitions():
+                    for row in partition:
+                        yield row[0]
+            finally:
+                await async_result.close()
+            return
+
+        result = db.execute(query)
+        try:
+            for partition in result.partitions():
+                for row in partition:
+                    yield row[0]
+        finally:
+            result.close()
+
+    async def get_all_with_count(  # pylint: disable=R0913 # noqa: PLR0913
+        self,
+        db: DBSession,
+        join_: list[str] | None = None,
+        order_: dict[str, list[str]] | None = None,
+        q: dict[str, Any] | None = None,
+        keyset_: list[str] | None = None,
+        load_: list[str] | None = None,
+        *,
+        estimate_count: bool = False,
+    ) -> tuple[Sequence[Row[ModelT]], int, bool]:
+        """Returns a page of model instances and the count of all model
+        instances matching the query parameters in one query.
+
+        The count is selected alongside each row with ``count(*) OVER ()``.
+        If estimate_count is true and there are no filters, the count is
+        instead estimated from the table's planner statistics, avoiding a
+        scan of every row.
+
+        If the ``after`` keyset cursor is given, the count is the number of
+        model instances after the cursor.
+
+        :param db: The database session.
+        :param join_: The joins to make.
+        :param order_: The order of the results. (e.g desc, asc)
+        :param q: The query parameters.
+        :param keyset_: Unique set of attributes to order results by in
+            ascending order after order_.
+        :param load_: The relationships to eagerly load.
+        :param estimate_count: Whether to estimate the count of unfiltered
+            queries.
+        :return: The page of model instances, the count and whether the
+            count is an estimate.
+        """
+        q = dict(q or {})
+        count_q = dict(q)
+        estimated = estimate_count and not self._has_filters(q=q)
+        total_column = (
+            self._estimated_count()
+            if estimated
+            else func.count().over()  # pylint: disable=E1102
+        )
+
+        query = self._build_query(join_=join_, order_=order_, load_=load_)
+        query = query.add_columns(total_column.label("total"))
+        if keyset_:
+            query = self._apply_ordering(query=query, order_={"asc": keyset_})
+        query = self._apply_filters(query=query, q=q)
+        query = self._apply_pagination(query=query, q=q, keyset_=keyset_)
+        rows = await self._execute_all(db=db, query=query)
+
+        total = rows[0].total if rows else None
+        if total is None or total < 0:
+            # The page is empty (e.g. skipped past the last row) or the
+            # table hasn't been analysed, so count separately.
+            total = await self.count(db=db, join_=join_, q=count_q) or 0
+            estimated = False
+        return rows, total, estimated
+
     async def get_by(  # pylint: disable=R0913 # noqa: PLR0913
         self,
-        db: Session,
+        db: DBSession,
         field: str,
         value: Any,
         join_: list[str] | None = None,
         order_: dict[str, dict[str, str]] | None = None,
+        load_: list[str] | None = None,
     ) -> Sequence[Row[ModelT]]:
         """Returns the model instance matching the field and value.
 
@@ -124,19 +275,21 @@ class BaseRepository(Generic[ModelT]):
         :param value: The value to match.
         :param join_: The joins to make.
         :param order_: The order of the results. (e.g desc, asc)
+        :param load_: The relationships to eagerly load.
         :return: The model instance.
         """
-        query = self._build_query(join_=join_, order_=order_)
+        query = self._build_query(join_=join_, order_=order_, load_=load_)
         query = self._filter_by(query=query, field=field, value=value)
         return await self._execute_all(db=db, query=query)
 
     async def get_unique_by(  # pylint: disable=R0913 # noqa: PLR0913
         self,
-        db: Session,
+        db: DBSession,
         field: str,
         value: Any,
         join_: list[str] | None = None,
         order_: dict[str, dict[str, str]] | None = None,
+        load_: list[str] | None = None,
     ) -> ModelT | None:
         """Returns the model instance matching the field and value.
 
@@ -145,19 +298,21 @@ class BaseRepository(Generic[ModelT]):
         :param value: The value to match.
         :param join_: The joins to make.
         :param order_: The order of the results. (e.g desc, asc)
+        :param load_: The relationships to eagerly load.
         :return: The model instance.
         """
-        query = self._build_query(join_=join_, order_=order_)
+        query = self._build_query(join_=join_, order_=order_, load_=load_)
         query = self._filter_by(query=query, field=field, value=value)
         return await self._execute_one(db=db, query=query)
 
     async def get_by_value_multi(  # pylint: disable=R0913 # noqa: PLR0913
         self,
-        db: Session,
+        db: DBSession,
         field: str,
         values: list[Any],
         join_: list[str] | None = None,
         order_: dict[str, dict[str, str]] | None = None,
+        load_: list[str] | None = None,
     ) -> Sequence[Row[ModelT]]:
         """Returns the model instances matching the field and values.
 
@@ -166,25 +321,29 @@ class BaseRepository(Generic[ModelT]):
         :param value: The value to match.
         :param join_: The joins to make.
         :param order_: The order of the results. (e.g desc, asc)
+        :param load_: The relationships to eagerly load.
         :return: The model instances.
         """
-        query = self._build_query(join_=join_, order_=order_)
+        query = self._build_query(join_=join_, order_=order_, load_=load_)
         query = self._apply_filters(query=query, q={field: values})
         return await self._execute_all(db=db, query=query)
 
-    async def delete(self, db: Session, db_obj: ModelT) -> ModelT:
+    async def delete(self, db: DBSession, db_obj: ModelT) -> ModelT:
         """Deletes the model.
 
         :param db: The database session.
         :param id: The model id to delete.
         :return: The deleted model instance
         """
-        db.delete(db_obj)
+        if isinstance(db, AsyncSession):
+            await db.delete(db_obj)
+        else:
+            db.delete(db_obj)
         return db_obj
 
     async def update(
         self,
-        db: Session,
+        db: DBSession,
         *,
         db_obj: ModelT,
         update_obj: dict[str, Any],
@@ -325,12 +484,13 @@ class BaseRepository(Generic[ModelT]):
             return query
 
         if self._has_pos_filter_params(q):
-            _, _ = q.pop("ra"), q.pop("dec")
-            pos, radius = q.pop("pos"), q.pop("radius")
-            if pos is not None and radius is not None:
+            ra, dec = q.pop("ra"), q.pop("dec")
+            _, radius = q.pop("pos"), q.pop("radius")
+            if ra is not None and dec is not None and radius is not None:
                 query = self._apply_pos_filter(
                     query=query,
-                    pos=pos,
+                    ra=ra,
+                    dec=dec,
                     radius=radius,
                 )
 
@@ -349,29 +509,251 @@ class BaseRepository(Generic[ModelT]):
                 query = self._filter_by(query, k, v)
         return query
 
-    def _apply_pagination(self, query: Select, q: dict[str, Any]) -> Select:
+    def _apply_pagination(
+        self,
+        query: Select,
+        q: dict[str, Any],
+        keyset_: list[str] | None = None,
+    ) -> Select:
         skip = q.pop("skip", 0)
         limit = q.pop("limit", 100)
+        after = q.pop("after", None)
+        if keyset_ and after is not None:
+            return self._apply_keyset_pagination(
+                query=query,
+                keyset_=keyset_,
+                after=after,
+            ).limit(limit)
         return query.offset(skip).limit(limit)
 
+    def _apply_keyset_pagination(
+        self,
+        query: Select,
+        keyset_: list[str],
+        after: str,
+    ) -> Select:
+        """Select the rows following a cursor in keyset order.
+
+        :param query: The query ordered by the keyset.
+        :param keyset_: The keyset attributes.
+        :param after: The cursor of the last row of the previous page.
+        :return: The query with the keyset predicate.
+        """
+        columns = [self._get_order_class_attr(attr_=attr) for attr in keyset_]
+        values = decode_cursor(token=after, columns=columns)
+        # Bind values with the column types so that the row comparison can
+        # use the keyset index
+        bound_values = [
+            literal(value, type_=column.type)
+            for column, value in zip(columns, values, strict=True)
+        ]
+        # The redundant bound on the leading column lets the database prune
+        # partitions, which it can't do with a row comparison
+        return query.where(
+            tuple_(*columns) > tuple_(*bound_values),
+            columns[0] >= bound_values[0],
+        )
+
+    def _estimated_count(self) -> sa.ScalarSelect:
+        """Returns a scalar subquery which estimates the number of rows in
+        the model's table from planner statistics.
+
+        The rows of a partitioned table are estimated from the statistics of
+        its partitions. Partitions which have never been analysed aren't
+        counted. The estimate is -1 if no partition of the table has been
+        analysed.
+        """
+        pg_class = sa.table(
+            "pg_class",
+            sa.column("oid"),
+            sa.column("relkind"),
+            sa.column("reltuples"),
+        )
+        table_oid = sa.cast(self.model_class.__tablename__, REGCLASS)
+        partitions = select(
+            sa.column("relid"),
+        ).select_from(sa.func.pg_partition_tree(table_oid))
+        return (
+            select(
+                sa.case(
+                    (func.max(pg_class.c.reltuples) < 0, -1),
+                    else_=func.sum(
+                        func.greatest(pg_class.c.reltuples, 0),
+                    ),
+                ).cast(sa.BigInteger),
+            )
+            .where(
+                sa.or_(
+                    pg_class.c.oid == table_oid,
+                    pg_class.c.oid.in_(partitions),
+                ),
+                # Partitioned tables have no rows of their own
+                pg_class.c.relkind != sa.literal_column("'p'"),
+            )
+            .scalar_subquery()
+        )
+
     def _build_query(
         self,
         join_: list[str] | None = None,
         order_: dict | None = None,
+        load_: list[str] | None = None,
     ) -> Select:
         """Returns a callable that can be used to query the model.
 
         :param join_: The joins to make.
         :param order_: The order of the results. (e.g desc, asc)
+        :param load_: The relationships to eagerly load.
         :return: A callable that can be used to query the model.
         """
         query = select(self.model_class)
         query = self._apply_joins(query=query, join_=join_)
+        query = self._apply_load_options(query=query, join_=join_, load_=load_)
         return self._apply_ordering(query=query, order_=order_)
 
+    def _apply_load_options(
+        self,
+        query: Select,
+        join_: list[str] | None = None,
+        load_: list[str] | None = None,
+    ) -> Select:
+        """Returns the query with the given relationships eagerly loaded.
+
+        Relationships are given as dot separated paths from the model, e.g.
+        ``["candidate", "candidate.sp_candidate"]``. Each relationship in a
+        path is loaded with:
+
+        * ``contains_eager`` if it is a scalar relationship to a table in
+          join_ (and its parent is also loaded from the join), so the
+          columns already selected by the join are reused.
+        * ``joinedload`` if it is a scalar relationship to a table which
+          isn't joined.
+        * ``selectinload`` if it is a collection or in selectin_loads, so
+          that one additional query loads the related rows of every row.
+
+        :param query: The query to add loader options to.
+        :param join_: The joins made in the query.
+        :param load_: The relationship paths to eagerly load.
+        :return: The query with loader options.
+        """
+        if not load_:
+            return query
+
+        joined_tables = set(join_ or [])
+        for path in load_:
+            query = query.options(
+                self._get_loader_option(
+                    path=path,
+                    joined_tables=joined_tables,
+                ),
+            )
+        return query
+
+    def _get_loader_option(self, path: str, joined_tables: set[str]) -> Load:
+        """Returns the loader option chain for a relationship path.
+
+        :param path: The dot separated relationship path.
+        :param joined_tables: The names of the tables joined in the query.
+        :raises ValueError: If the path contains an attribute which isn't a
+            relationship.
+        :return: The loader option.
+        """
+        option: Any = None
+        parent_class: Any = self.model_class
+        parent_is_joined = True
+        attr_names = path.split(".")
+        for depth, attr_name in enumerate(attr_names, start=1):
+            attr = getattr(parent_class, attr_name, None)
+            prop = getattr(attr, "property", None)
+            if not hasattr(prop, "mapper"):
+                msg = f"Invalid relationship '{attr_name}' in path '{path}'"
+                raise ValueError(msg)
+
+            target_class = prop.mapper.class_
+            if (
+                prop.uselist
+                or ".".join(attr_names[:depth]) in self.selectin_loads
+            ):
+                strategy = "selectinload"
+                parent_is_joined = False
+            elif (
+                parent_is_joined
+                and target_class.__tablename__ in joined_tables
+            ):
+                strategy = "contains_eager"
+            else:
+                strategy = "joinedload"
+                parent_is_joined = False
+
+            loader = (
+                self.loader_strategies[strategy]
+                if option is None
+                else getattr(option, strategy)
+            )
+            option = loader(attr)
+            parent_class = target_class
+        return option
+
+    async def _execute(
+        self,
+        db: DBSession,
+        query: Executable,
+        params: list[dict[str, Any]] | dict[str, Any] | None = None,
+    ) -> Result:
+        """Execute a statement with a synchronous or asyncio session.
+
+        :param db: The database session.
+        :param query: The statement to execute.
+        :param params: Bound parameters for the statement.
+        :return: The buffered statement result.
+        """
+        if isinstance(db, AsyncSession):
+            return await db.execute(query, params=params)
+        return db.execute(query, params=params)
+
+    async def _copy_rows(
+        self,
+        db: DBSession,
+        table: str,
+        columns: Sequence[str],
+        rows: AsyncIterator[Sequence[Any]],
+    ) -> int:
+        """Stream rows into a table with ``COPY ... FROM STDIN`` in the
+        session's transaction.
+
+        :param db: The database session.
+        :param table: The name of the table to copy rows into.
+        :param columns: The table columns, in row value order.
+        :param rows: The rows to copy.
+        :return: The number of rows copied.
+        """
+        statement = psycopg_sql.SQL("COPY {} ({}) FROM STDIN").format(
+            psycopg_sql.Identifier(table),
+            psycopg_sql.SQL(", ").join(map(psycopg_sql.Identifier, columns)),
+        )
+        count = 0
+        if isinstance(db, AsyncSession):
+            conn = await db.connection()
+            raw_conn = (await conn.get_raw_connection()).driver_connection
+            async with (
+                raw_conn.cursor() as cursor,
+                cursor.copy(statement) as copy,
+            ):
+                async for row in rows:
+                    await copy.write_row(row)
+                    count += 1
+            return count
+
+        raw_conn = db.connection().connection.driver_connection
+        with raw_conn.cursor() as cursor, cursor.copy(statement) as copy:
+            async for row in rows:
+                copy.write_row(row)
+                count += 1
+        return count
+
     async def _execute_all(
         self,
-        db: Session,
+        db: DBSession,
         query: Select,
     ) -> Sequence[Row[ModelT]]:
         """Returns all results from the query.
@@ -380,11 +762,12 @@ class BaseRepository(Generic[ModelT]):
         :param query: The query to execute.
         :return: A list of model instances.
         """
-        return db.execute(query).all()
+        result = await self._execute(db=db, query=query)
+        return result.all()
 
     async def _execute_one(
         self,
-        db: Session,
+        db: DBSession,
         query: Select,
     ) -> ModelT | None:
         """Returns the first result from the query if it exists.
@@ -392,7 +775,8 @@ class BaseRepository(Generic[ModelT]):
         :param query: The query to execute.
         :return: The first model instance.
         """
-        obj = db.execute(query).first()
+        result = await self._execute(db=db, query=query)
+        obj = result.first()
         if not obj:
             return None
         if isinstance(obj, Row) and len(obj) == 0:
@@ -401,7 +785,18 @@ class BaseRepository(Generic[ModelT]):
 
     def _is_pagination_param(self, key: str) -> bool:
         """Check if the key is a pagination parameter."""
-        return key in ("skip", "limit")
+        return key in ("skip", "limit", "after")
+
+    def _has_filters(self, q: dict[str, Any]) -> bool:
+        """Check if the query parameters contain any valid filters."""
+        for k, v in q.items():
+            if self._is_pagination_param(k) or self._is_invalid_filter(v):
+                continue
+            if k == "pos":
+                # Computed from ra and dec, which are checked separately
+                continue
+            return True
+        return False
 
     def _is_invalid_filter(self, value: Any) -> bool:
         """Check if the filter value is invalid (None or empty list)."""
@@ -468,11 +863,25 @@ class BaseRepository(Generic[ModelT]):
     def _apply_pos_filter(
         self,
         query: Select,
-        pos: str,
+        ra: float,
+        dec: float,
         radius: float,
     ) -> Select:
         """Adds a where clause to a query that implements a cone search in a
-        radius (radius) about point (pos).
+        radius (radius) about point (ra, dec), all in degrees.
+
+        The predicate matches the expression indexed by the model's pgSphere
+        GiST position index so that cone searches are index lookups.
         """
-        pos_filter = text(f"spoint(pos) @ scircle '<{pos},{radius}d>'")
-        return query.where(pos_filter)
+        return query.where(
+            cone_search(
+                ra_column=self.model_class.ra,
+                dec_column=self.model_class.dec,
+                ra=ra,
+                dec=dec,
+                radius=radius,
+            ),
+        )
+
+
+instrument_repository(BaseRepository)
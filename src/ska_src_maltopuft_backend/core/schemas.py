@@ -79,6 +79,12 @@ class CommonQueryParams(BaseModel):
     updated_at: list[Annotated[PastDatetime, None]] = Field(Query(default=[]))
 
 
+class KeysetPaginationQueryParams(BaseModel):
+    """Query parameters for keyset (cursor) paginated listings."""
+
+    after: Annotated[str | None, None] = Field(Query(default=None))
+
+
 class ForeignKeyQueryParams(BaseModel):
     """Foreign key parameters that can be queried in joins."""
 
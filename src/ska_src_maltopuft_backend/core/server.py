@@ -1,5 +1,10 @@
 """Create a FastAPI application."""
 
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware import Middleware
 from fastapi.middleware.cors import CORSMiddleware
@@ -7,10 +12,22 @@ from fastapi.responses import JSONResponse
 from starlette.middleware.authentication import AuthenticationMiddleware
 
 from ska_src_maltopuft_backend.app.api import router
+from ska_src_maltopuft_backend.candle.maintenance import (
+    create_upcoming_partitions,
+)
 from ska_src_maltopuft_backend.core.auth import BearerTokenAuthBackend
+from ska_src_maltopuft_backend.core.config import settings
+from ska_src_maltopuft_backend.core.database.database import engines
+from ska_src_maltopuft_backend.core.database.slow_queries import (
+    SlowQueryMiddleware,
+    slow_query_log,
+)
 from ska_src_maltopuft_backend.core.exceptions import MaltopuftError
-
-from .database.database import get_db
+from ska_src_maltopuft_backend.core.factory import Factory
+from ska_src_maltopuft_backend.core.metrics import MetricsMiddleware
+from ska_src_maltopuft_backend.observation.notifications import (
+    listen_for_observations,
+)
 
 
 def init_routers(app_: FastAPI) -> None:
@@ -35,14 +52,26 @@ def init_listeners(app_: FastAPI) -> None:
         )
 
 
-def make_middleware() -> list[Middleware]:
+def make_middleware(
+    auth_backend: BearerTokenAuthBackend | None = None,
+) -> list[Middleware]:
     """Return an ordered list of "middleware" used by the Fast API
     application.
 
     Ordered means that earlier list elements take priority over later list
     elements.
     """
+    if auth_backend is None:
+        auth_backend = BearerTokenAuthBackend()
+    metrics_middleware = (
+        [Middleware(MetricsMiddleware)] if settings.METRICS_ENABLED else []
+    )
+    slow_query_middleware = (
+        [Middleware(SlowQueryMiddleware)] if slow_query_log.enabled else []
+    )
     return [
+        *metrics_middleware,
+        *slow_query_middleware,
         Middleware(
             CORSMiddleware,
             allow_origins=["*"],
@@ -53,15 +82,52 @@ def make_middleware() -> list[Middleware]:
         ),
         Middleware(
             AuthenticationMiddleware,
-            backend=BearerTokenAuthBackend(db=next(get_db())),
+            backend=auth_backend,
             on_error=BearerTokenAuthBackend.on_auth_error,
         ),
     ]
 
 
+def make_lifespan(
+    auth_backend: BearerTokenAuthBackend,
+) -> Callable[[FastAPI], AbstractAsyncContextManager[None]]:
+    """Return the Fast API application lifespan, which initialises the
+    database engines on startup, listens for written observations and
+    creates upcoming candidate partitions while the application runs and
+    releases resources held by the application on shutdown.
+    """
+
+    @asynccontextmanager
+    async def lifespan(
+        app_: FastAPI,  # pylint: disable=W0613 # noqa: ARG001
+    ) -> AsyncIterator[None]:
+        engines.init()
+        cache = Factory.latest_observation_cache
+        tasks = []
+        if settings.OBSERVATION_LISTEN and cache.ttl > 0:
+            tasks.append(
+                asyncio.create_task(listen_for_observations(cache=cache)),
+            )
+        if settings.CANDIDATE_PARTITION_INTERVAL > 0:
+            tasks.append(asyncio.create_task(create_upcoming_partitions()))
+        yield
+        for task in tasks:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await auth_backend.aclose()
+        await engines.dispose()
+
+    return lifespan
+
+
 def create_app() -> FastAPI:
     """Create a Fast API application."""
-    app_ = FastAPI(middleware=make_middleware())
+    auth_backend = BearerTokenAuthBackend()
+    app_ = FastAPI(
+        middleware=make_middleware(auth_backend=auth_backend),
+        lifespan=make_lifespan(auth_backend=auth_backend),
+    )
     init_routers(app_=app_)
     init_listeners(app_=app_)
     return app_
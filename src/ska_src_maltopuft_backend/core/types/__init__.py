@@ -2,6 +2,7 @@
 
 from .types import (
     CreateModelT,
+    DBSession,
     DeclinationDegrees,
     ModelT,
     PositiveList,
@@ -16,4 +17,5 @@ __all__ = [
     "CreateModelT",
     "UpdateModelT",
     "PositiveList",
+    "DBSession",
 ]
@@ -4,6 +4,8 @@ from typing import Annotated, TypeVar
 
 from annotated_types import Ge, Gt, Le
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from ska_src_maltopuft_backend.core.database.base import Base
 
@@ -17,3 +19,5 @@ PositiveList = list[Annotated[T, Gt(0)]]
 ModelT = TypeVar("ModelT", bound=Base)
 CreateModelT = TypeVar("CreateModelT", bound=BaseModel | None)
 UpdateModelT = TypeVar("UpdateModelT", bound=BaseModel | None)
+
+DBSession = Session | AsyncSession
@@ -1,6 +1,8 @@
 """Health endpoint response models."""
 
+import datetime as dt
 from enum import Enum
+from typing import Any
 
 from pydantic import BaseModel
 
@@ -17,3 +19,40 @@ class Status(BaseModel):
 
     name: str
     status: StatusEnum
+
+
+class PoolStatus(BaseModel):
+    """Database connection pool status response model.
+
+    Wait times are reported in seconds.
+    """
+
+    name: str
+    size: int = 0
+    checked_out: int = 0
+    idle: int = 0
+    overflow: int = 0
+    max_overflow: int = 0
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_time_total: float = 0
+    wait_time_mean: float = 0
+    wait_time_max: float = 0
+
+
+class SlowQuery(BaseModel):
+    """Slow database statement response model.
+
+    Parameters are described by their types, without their values. The plan
+    is the EXPLAIN (ANALYZE, BUFFERS) output of select statements, if it was
+    sampled.
+    """
+
+    recorded_at: dt.datetime
+    duration_ms: float
+    statement: str
+    parameters: Any
+    route: str | None
+    repository: str
+    method: str
+    plan: str | None
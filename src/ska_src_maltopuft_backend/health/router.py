@@ -1,5 +1,7 @@
 """Routers for health check endpoints."""
 
+from typing import Any
+
 import fastapi
 from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.orm import Session
@@ -11,9 +13,18 @@ from ska_src_maltopuft_backend.core.auth import (
 from ska_src_maltopuft_backend.core.config import settings
 from ska_src_maltopuft_backend.core.database.database import (
     get_db,
+    get_pool_status,
     ping_db_from_pool,
 )
-from ska_src_maltopuft_backend.health.responses import Status, StatusEnum
+from ska_src_maltopuft_backend.core.database.slow_queries import (
+    slow_query_log,
+)
+from ska_src_maltopuft_backend.health.responses import (
+    PoolStatus,
+    SlowQuery,
+    Status,
+    StatusEnum,
+)
 
 health_router = APIRouter()
 
@@ -65,3 +76,39 @@ async def health_db(db: Session = Depends(get_db)) -> Status:
         name=settings.MALTOPUFT_POSTGRES_HOST,
         status=db_status,
     )
+
+
+@health_router.get(
+    "/health/db/pool",
+    response_model=list[PoolStatus],
+    dependencies=[
+        Depends(AuthorizationChecker([UserGroups.MALTOPUFT_ADMIN])),
+    ],
+)
+async def health_db_pool() -> list[dict[str, Any]]:
+    """Return the usage and checkout statistics of the database connection
+    pools.
+
+    Only the pools of engines which have been initialised are reported.
+    Checked out, idle and overflow counts are the current state of each
+    pool. Checkout counts and wait times are cumulative since the pool was
+    created.
+    """
+    return get_pool_status()
+
+
+@health_router.get(
+    "/health/db/slow-queries",
+    response_model=list[SlowQuery],
+    dependencies=[
+        Depends(AuthorizationChecker([UserGroups.MALTOPUFT_ADMIN])),
+    ],
+)
+async def health_db_slow_queries() -> list[dict[str, Any]]:
+    """Return the latest slow database statements recorded by the worker
+    process which handles the request, latest first.
+
+    Slow statements are only recorded if the SLOW_QUERY_THRESHOLD setting is
+    enabled.
+    """
+    return [entry._asdict() for entry in slow_query_log.entries()]
@@ -1,10 +1,14 @@
 """Data controller for the Label service models."""
 
+from collections.abc import Sequence
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from sqlalchemy.orm import make_transient_to_detached
 
+from ska_src_maltopuft_backend.core.cache import TTLCache
 from ska_src_maltopuft_backend.core.controller import BaseController
+from ska_src_maltopuft_backend.core.types import DBSession
 from ska_src_maltopuft_backend.label.repository import (
     EntityRepository,
     LabelRepository,
@@ -16,6 +20,8 @@ from .requests import CreateEntity, CreateLabel, UpdateLabel
 if TYPE_CHECKING:
     from fastapi import Request
 
+ENTITIES_KEY = "entities"
+
 
 class LabelController(BaseController[Label, CreateLabel, UpdateLabel]):
     """Data controller for the Label model."""
@@ -30,7 +36,7 @@ class LabelController(BaseController[Label, CreateLabel, UpdateLabel]):
 
     async def create(
         self,
-        db: Session,
+        db: DBSession,
         attributes: dict[str, Any],
         *args: Any,  # noqa: ARG002, pylint: disable=unused-argument
         **kwargs: Any,
@@ -51,7 +57,7 @@ class LabelController(BaseController[Label, CreateLabel, UpdateLabel]):
 
     async def create_many(
         self,
-        db: Session,
+        db: DBSession,
         objects: list[dict[str, Any]],
         *args: Any,  # noqa: ARG002, pylint: disable=unused-argument
         **kwargs: Any,
@@ -78,10 +84,125 @@ class LabelController(BaseController[Label, CreateLabel, UpdateLabel]):
 class EntityController(BaseController[Entity, CreateEntity, None]):
     """Data controller for the Entity model."""
 
-    def __init__(self, repository: EntityRepository) -> None:
-        """Initalise a EntityController instance."""
+    def __init__(
+        self,
+        repository: EntityRepository,
+        entity_cache: TTLCache | None = None,
+    ) -> None:
+        """Initalise a EntityController instance.
+
+        :param repository: The entity repository.
+        :param entity_cache: The cache of every entity. Entities aren't
+            cached if None.
+        """
         super().__init__(
             model=Entity,
             repository=repository,
         )
         self.repository = repository
+        self.entity_cache = entity_cache
+
+    async def get_entities(self, db: DBSession) -> dict[int, Entity]:
+        """Returns every entity by id.
+
+        Entities are cached until an entity is created or the cache's ttl
+        expires. Cached entities are detached from any session.
+
+        :param db: The database session.
+        :return: Detached copies of every entity by id.
+        """
+        if self.entity_cache is not None:
+            cached = self.entity_cache.get(ENTITIES_KEY)
+            if cached is not None:
+                return cached
+
+        rows = await self.repository.get_all(db=db, order_={"asc": ["id"]})
+        entities = {row[0].id: self._detached_copy(row[0]) for row in rows}
+        if self.entity_cache is not None:
+            self.entity_cache.set(ENTITIES_KEY, entities)
+        return entities
+
+    def _detached_copy(self, entity: Entity) -> Entity:
+        """Return a copy of an entity's columns which isn't attached to the
+        session the entity was loaded in.
+        """
+        copy = Entity(
+            **{
+                column.key: getattr(entity, column.key)
+                for column in Entity.__table__.columns
+            },
+        )
+        make_transient_to_detached(copy)
+        return copy
+
+    def invalidate(self) -> None:
+        """Clear cached entities."""
+        if self.entity_cache is not None:
+            self.entity_cache.invalidate()
+
+    async def get_by_id(
+        self,
+        db: DBSession,
+        id_: int,
+        join_: list[str] | None = None,
+        load_: list[str] | None = None,
+    ) -> Entity:
+        """Returns the entity matching the id from the entity cache, or from
+        the database if it isn't cached.
+        """
+        if not join_ and not load_:
+            entity = (await self.get_entities(db=db)).get(id_)
+            if entity is not None:
+                return entity
+        return await super().get_by_id(
+            db=db,
+            id_=id_,
+            join_=join_,
+            load_=load_,
+        )
+
+    async def get_all(  # pylint: disable=R0913 # noqa: PLR0913
+        self,
+        db: DBSession,
+        join_: list[str] | None = None,
+        order_: dict[str, list[str]] | None = None,
+        q: list[BaseModel] | None = None,
+        keyset_: list[str] | None = None,
+        load_: list[str] | None = None,
+    ) -> Sequence[Entity]:
+        """Returns a list of entities based on query params.
+
+        Unfiltered entities are listed from the entity cache in id order.
+        """
+        params = self._merge_query_parameters(params=q)
+        skip, limit = params.pop("skip", 0), params.pop("limit", 100)
+        if (
+            any(params.values())
+            or join_
+            or order_
+            or keyset_
+            or load_
+            or self.entity_cache is None
+        ):
+            return await super().get_all(
+                db=db,
+                join_=join_,
+                order_=order_,
+                q=q,
+                keyset_=keyset_,
+                load_=load_,
+            )
+        entities = list((await self.get_entities(db=db)).values())
+        return entities[skip : skip + limit]
+
+    async def create(
+        self,
+        db: DBSession,
+        attributes: dict[str, Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Entity:
+        """Creates a new entity in the DB and clears cached entities."""
+        entity = await super().create(db, attributes, *args, **kwargs)
+        self.invalidate()
+        return entity
@@ -26,10 +26,10 @@ class Label(Base, TimestampMixin):
         sa.ForeignKey("user.id"),
         nullable=False,
     )
-    candidate_id: Mapped[int] = mapped_column(
-        sa.ForeignKey("candidate.id"),
-        nullable=False,
-    )
+    # Labels are filtered by labeller with the (labeller_id, candidate_id)
+    # unique constraint's index. The candidate reference is checked by
+    # triggers because candidates are partitioned.
+    candidate_id: Mapped[int] = mapped_column(nullable=False, index=True)
     entity_id: Mapped[int] = mapped_column(
         sa.ForeignKey("entity.id"),
         nullable=False,
@@ -37,7 +37,10 @@ class Label(Base, TimestampMixin):
 
     # Relationships
     labeller: Mapped["User"] = relationship(back_populates="labels")
-    candidate: Mapped["Candidate"] = relationship(back_populates="labels")
+    candidate: Mapped["Candidate"] = relationship(
+        back_populates="labels",
+        primaryjoin="foreign(Label.candidate_id) == Candidate.id",
+    )
     entity: Mapped["Entity"] = relationship(back_populates="labels")
 
     __table_args__ = (sa.UniqueConstraint("labeller_id", "candidate_id"),)
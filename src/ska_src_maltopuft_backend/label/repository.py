@@ -2,11 +2,34 @@
 
 from ska_src_maltopuft_backend.app.models import Entity, Label
 from ska_src_maltopuft_backend.core.repository import BaseRepository
+from sqlalchemy import Select
 
 
 class LabelRepository(BaseRepository[Label]):
     """Database CRUD operations for the Label model."""
 
+    # Labels are related to a handful of entities, so each entity is loaded
+    # once instead of being joined to every label
+    selectin_loads = frozenset({"entity"})
+
+    def _add_joins_to_query(self, query: Select, join_: list[str]) -> Select:
+        """Add the given joins to a query.
+
+        Labels don't have a foreign key constraint on the partitioned
+        candidate table, so candidates are joined by the label's candidate
+        relationship.
+
+        :param query: The query that joins are added to.
+        :param join_: The list of table names to join.
+        :return: The query with the given joins applied.
+        """
+        if "candidate" in join_:
+            query = query.join(Label.candidate)
+        return super()._add_joins_to_query(
+            query=query,
+            join_=[table for table in join_ if table != "candidate"],
+        )
+
 
 class EntityRepository(BaseRepository[Entity]):
     """Database CRUD operations for the Entity model."""
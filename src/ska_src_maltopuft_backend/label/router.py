@@ -4,12 +4,17 @@ import logging
 from typing import Any
 
 from fastapi import APIRouter, Depends, Request, status
+from fastapi.responses import StreamingResponse
 from pydantic import PositiveInt
-from sqlalchemy.orm import Session
 
 from ska_src_maltopuft_backend.core.auth.authenticated import Authenticated
-from ska_src_maltopuft_backend.core.database.database import get_db
+from ska_src_maltopuft_backend.core.database.database import get_session
+from ska_src_maltopuft_backend.core.export import (
+    ExportQueryParams,
+    export_response,
+)
 from ska_src_maltopuft_backend.core.factory import Factory
+from ska_src_maltopuft_backend.core.types import DBSession
 
 from .controller import EntityController, LabelController
 from .requests import (
@@ -24,6 +29,9 @@ from .responses import Entity, Label, LabelBulk
 logger = logging.getLogger(__name__)
 label_router = APIRouter()
 
+# Relationships nested in Label responses
+LABEL_LOAD = ["candidate", "candidate.sp_candidate", "entity", "labeller"]
+
 
 @label_router.get(
     "/entity",
@@ -31,7 +39,7 @@ label_router = APIRouter()
 )
 async def get_entities(
     q: GetEntityQueryParams = Depends(),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     entity_controller: EntityController = Depends(
         Factory().get_entity_controller,
     ),
@@ -47,7 +55,7 @@ async def get_entities(
 )
 async def get_entity(
     entity_id: PositiveInt,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     entity_controller: EntityController = Depends(
         Factory().get_entity_controller,
     ),
@@ -64,7 +72,7 @@ async def get_entity(
 )
 async def post_entity(
     entity: CreateEntity,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     entity_controller: EntityController = Depends(
         Factory().get_entity_controller,
     ),
@@ -83,14 +91,54 @@ async def post_entity(
 )
 async def get_labels(
     q: GetLabelQueryParams = Depends(),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     label_controller: LabelController = Depends(
         Factory().get_label_controller,
     ),
 ) -> Any:
     """Get all labels."""
     logger.info(f"Getting all Labels with query parameters {q}")
-    return await label_controller.get_all(db=db, join_=["candidate"], q=[q])
+    return await label_controller.get_all(
+        db=db,
+        join_=["candidate"],
+        q=[q],
+        load_=LABEL_LOAD,
+    )
+
+
+@label_router.get(
+    "/export",
+    response_class=StreamingResponse,
+)
+async def export_labels(
+    q: GetLabelQueryParams = Depends(),
+    q_export: ExportQueryParams = Depends(),
+    db: DBSession = Depends(get_session),
+    label_controller: LabelController = Depends(
+        Factory().get_label_controller,
+    ),
+) -> StreamingResponse:
+    """Export all labels matching the query parameters as newline delimited
+    JSON or CSV.
+
+    Labels are streamed from the database as the response is sent, so the
+    pagination query parameters are ignored.
+    """
+    logger.info(f"Exporting Labels with query parameters {q}")
+    labels = label_controller.stream_all(
+        db=db,
+        join_=["candidate"],
+        order_={"asc": ["label.id"]},
+        q=[q],
+        load_=LABEL_LOAD,
+    )
+    return export_response(
+        db=db,
+        objects=labels,
+        schema=Label,
+        format_=q_export.format,
+        filename="labels",
+    )
 
 
 @label_router.get(
@@ -99,14 +147,18 @@ async def get_labels(
 )
 async def get_label(
     label_id: PositiveInt,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     label_controller: LabelController = Depends(
         Factory().get_label_controller,
     ),
 ) -> Label:
     """Get label by id."""
     logger.info(f"Getting Label with id={label_id}")
-    return await label_controller.get_by_id(db=db, id_=label_id)
+    return await label_controller.get_by_id(
+        db=db,
+        id_=label_id,
+        load_=LABEL_LOAD,
+    )
 
 
 @label_router.post(
@@ -118,7 +170,7 @@ async def get_label(
 async def post_labels(
     request: Request,
     labels: CreateLabel | list[CreateLabel],
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     label_controller: LabelController = Depends(
         Factory().get_label_controller,
     ),
@@ -135,26 +187,36 @@ async def post_labels(
         return LabelBulk(ids=created_label_ids)
 
     logger.info(f"Creating Label with candidate_id={labels.candidate_id}")
-    return await label_controller.create(
+    label = await label_controller.create(
         db=db,
         attributes=labels.model_dump(),
         request=request,
     )
+    return await label_controller.get_by_id(
+        db=db,
+        id_=label.id,
+        load_=LABEL_LOAD,
+    )
 
 
 @label_router.put("/{label_id}", response_model=Label)
 async def update_item(
     label_id: PositiveInt,
     label: UpdateLabel,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     label_controller: LabelController = Depends(
         Factory().get_label_controller,
     ),
 ) -> Any:
     """Update a label."""
     existing_label = await label_controller.get_by_id(db=db, id_=label_id)
-    return await label_controller.update(
+    updated_label = await label_controller.update(
         db=db,
         db_obj=existing_label,
         update_obj=label,
     )
+    return await label_controller.get_by_id(
+        db=db,
+        id_=updated_label.id,
+        load_=LABEL_LOAD,
+    )
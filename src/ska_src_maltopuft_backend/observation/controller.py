@@ -2,18 +2,15 @@
 
 from typing import Any
 
-from sqlalchemy.orm import Session
-
-from ska_src_maltopuft_backend.app.schemas.requests import (
-    GetKnownPulsarQueryParams,
-)
 from ska_src_maltopuft_backend.catalogue.controller import (
     KnownPulsarController,
 )
 from ska_src_maltopuft_backend.core.controller import BaseController
+from ska_src_maltopuft_backend.core.types import DBSession
 
 from .models import Observation
 from .repository import ObservationRepository
+from .responses import BeamSummary, ObservationSummary
 
 
 class ObservationController(BaseController[Observation, None, None]):
@@ -34,33 +31,65 @@ class ObservationController(BaseController[Observation, None, None]):
 
     async def get_sources_by_id(
         self,
-        db: Session,
+        db: DBSession,
         ids_: list[int],
         radius: float,
-    ) -> list[dict[str, Any | list[dict[str, Any]]]]:
-        """Returns known sources within a radius of list of observation ids."""
-        db_obj = await self.get_by_id_multi(
+    ) -> list[dict[str, Any | list[Any]]]:
+        """Returns known sources within a radius of list of observation ids.
+
+        Every observation is cross-matched with the known sources in one
+        query.
+        """
+        rows = await self.repository.get_sources(
             db=db,
             ids_=ids_,
+            radius=radius,
         )
 
-        res: list[dict[str, Any | list[dict[str, Any]]]] = []
-        for obs in db_obj:
-            params = GetKnownPulsarQueryParams(
-                ra=obs.s_ra,
-                dec=obs.s_dec,
-                radius=radius,
+        res: dict[int, dict[str, Any | list[Any]]] = {}
+        for obs, pulsar in rows:
+            results_dict = res.setdefault(
+                obs.id,
+                {"observation": obs, "sources": []},
             )
-            results_dict: dict[str, Any | list[dict[str, Any]]] = {}
-            obs_dict = obs.__dict__
-            pulsars = await self.pulsar_controller.get_all(db=db, q=[params])
-            observation_pulsars: list[dict[str, Any]] = []
-            for ps in pulsars:
-                ps_dict = ps.__dict__
-                observation_pulsars.append(ps_dict)
+            if pulsar is not None:
+                results_dict["sources"].append(pulsar)
+        return list(res.values())
 
-            results_dict["observation"] = obs_dict
-            results_dict["sources"] = observation_pulsars
-            res.append(results_dict)
+    async def get_summary(self, db: DBSession, id_: int) -> ObservationSummary:
+        """Returns candidate and label statistics of an observation and
+        each of its beams.
 
-        return res
+        Observation statistics are aggregated from the beam summaries.
+
+        :param db: The database session.
+        :param id_: The observation id.
+        :raises NotFoundError: If the observation doesn't exist.
+        """
+        beams = [
+            BeamSummary.model_validate(beam)
+            for beam in await self.repository.get_summaries(db=db, id_=id_)
+        ]
+        if not beams:
+            # Raises if the observation doesn't exist
+            await self.get_by_id(db=db, id_=id_)
+            return ObservationSummary(observation_id=id_)
+
+        label_counts: dict[str, int] = {}
+        for beam in beams:
+            for entity, count in beam.label_counts.items():
+                label_counts[entity] = label_counts.get(entity, 0) + count
+        return ObservationSummary(
+            observation_id=id_,
+            candidate_count=sum(beam.candidate_count for beam in beams),
+            sp_candidate_count=sum(beam.sp_candidate_count for beam in beams),
+            label_count=sum(beam.label_count for beam in beams),
+            label_counts=label_counts,
+            snr_min=min(beam.snr_min for beam in beams),
+            snr_max=max(beam.snr_max for beam in beams),
+            dm_min=min(beam.dm_min for beam in beams),
+            dm_max=max(beam.dm_max for beam in beams),
+            observed_at_min=min(beam.observed_at_min for beam in beams),
+            observed_at_max=max(beam.observed_at_max for beam in beams),
+            beams=beams,
+        )
@@ -5,11 +5,15 @@ from decimal import Decimal
 from typing import TYPE_CHECKING
 
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, deferred, mapped_column, relationship
 
 from ska_src_maltopuft_backend.core.database.base import Base
 from ska_src_maltopuft_backend.core.mixins import TimestampMixin
 
+from .notifications import OBSERVATION_NOTIFY_DDL
+from .summary import OBSERVATION_SUMMARY_DDL
+
 if TYPE_CHECKING:
     from ska_src_maltopuft_backend.app.models import Candidate
 
@@ -279,6 +283,7 @@ class Beam(Base, TimestampMixin):
     observation_id: Mapped[int] = mapped_column(
         sa.ForeignKey("observation.id"),
         nullable=False,
+        index=True,
     )
 
     # Relationships
@@ -351,3 +356,62 @@ class Host(Base, TimestampMixin):
             f"hostname={self.hostname},"
             f"port={self.port},"
         )
+
+
+class ObservationSummary(Base):
+    """Candidate and label statistics for each beam of an observation.
+
+    Rows are maintained by database triggers on the candidate,
+    sp_candidate and label tables, which apply the changes made by each
+    statement to the summaries of the beams whose candidates or labels were
+    written. Percentiles are computed when summaries are read.
+    """
+
+    __tablename__ = "observation_summary"
+
+    beam_id: Mapped[int] = mapped_column(
+        sa.ForeignKey("beam.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    observation_id: Mapped[int] = mapped_column(
+        sa.ForeignKey("observation.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    candidate_count: Mapped[int] = mapped_column(nullable=False)
+    sp_candidate_count: Mapped[int] = mapped_column(nullable=False)
+    label_count: Mapped[int] = mapped_column(nullable=False)
+    # The number of labels of each entity type
+    label_counts: Mapped[dict[str, int]] = mapped_column(
+        JSONB,
+        nullable=False,
+    )
+
+    snr_min: Mapped[float] = mapped_column(nullable=False)
+    snr_max: Mapped[float] = mapped_column(nullable=False)
+    dm_min: Mapped[float] = mapped_column(nullable=False)
+    dm_max: Mapped[float] = mapped_column(nullable=False)
+    observed_at_min: Mapped[dt.datetime] = mapped_column(nullable=False)
+    observed_at_max: Mapped[dt.datetime] = mapped_column(nullable=False)
+
+    refreshed_at: Mapped[dt.datetime] = mapped_column(
+        nullable=False,
+        server_default=sa.func.now(),
+    )
+
+    def __repr__(self) -> str:
+        """ObservationSummary repr."""
+        return (
+            "<ObservationSummary: "
+            f"beam_id={self.beam_id},"
+            f"observation_id={self.observation_id},"
+            f"candidate_count={self.candidate_count},"
+            f"label_count={self.label_count},"
+        )
+
+
+for ddl in OBSERVATION_SUMMARY_DDL:
+    sa.event.listen(Base.metadata, "after_create", ddl)
+for ddl in OBSERVATION_NOTIFY_DDL:
+    sa.event.listen(Observation.__table__, "after_create", ddl)
@@ -0,0 +1,76 @@
+"""Notifications of written observations.
+
+Observations are written by the ingest pipeline rather than through the
+API, so a trigger notifies listeners of every statement which writes
+observations. The API listens for notifications to invalidate its cache of
+the latest observation.
+"""
+
+import asyncio
+import logging
+
+import psycopg
+import sqlalchemy as sa
+
+from ska_src_maltopuft_backend.core.cache import TTLCache
+from ska_src_maltopuft_backend.core.config import settings
+from ska_src_maltopuft_backend.core.database.database import psycopg_conninfo
+
+logger = logging.getLogger(__name__)
+
+OBSERVATION_CHANNEL = "observation_written"
+
+CREATE_NOTIFY_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION notify_observation_written()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_notify('{OBSERVATION_CHANNEL}', '');
+    RETURN NULL;
+END;
+$$
+"""
+
+NOTIFY_TRIGGER = "observation_written_notify"
+
+CREATE_NOTIFY_TRIGGER = (
+    f"CREATE OR REPLACE TRIGGER {NOTIFY_TRIGGER} "
+    "AFTER INSERT OR UPDATE OF t_min OR DELETE ON observation "
+    "FOR EACH STATEMENT EXECUTE FUNCTION notify_observation_written()"
+)
+
+OBSERVATION_NOTIFY_SQL = (CREATE_NOTIFY_FUNCTION, CREATE_NOTIFY_TRIGGER)
+
+OBSERVATION_NOTIFY_DDL = tuple(
+    sa.DDL(statement) for statement in OBSERVATION_NOTIFY_SQL
+)
+
+
+async def listen_for_observations(cache: TTLCache) -> None:
+    """Invalidate a cache whenever observations are written.
+
+    The listening connection is reopened if it's lost. The cache is
+    invalidated whenever the connection is (re)opened, because
+    notifications sent while disconnected are missed.
+
+    :param cache: The cache to invalidate.
+    """
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(
+                psycopg_conninfo(),
+                autocommit=True,
+            ) as conn:
+                await conn.execute(f"LISTEN {OBSERVATION_CHANNEL}")
+                cache.invalidate()
+                async for _ in conn.notifies():
+                    cache.invalidate()
+        except psycopg.OperationalError:
+            logger.exception(
+                "Lost observation notification connection to "
+                f"{settings.MALTOPUFT_POSTGRES_INFO}, reconnecting in "
+                f"{settings.OBSERVATION_LISTEN_RETRY_INTERVAL} seconds.",
+            )
+            cache.invalidate()
+            await asyncio.sleep(settings.OBSERVATION_LISTEN_RETRY_INTERVAL)
@@ -1,9 +1,110 @@
 """Database CRUD operations for the Observation metadata models."""
 
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy import Row, select
+
+from ska_src_maltopuft_backend.candle.models import Candidate
+from ska_src_maltopuft_backend.catalogue.models import KnownPulsar
+from ska_src_maltopuft_backend.core.database.pgsphere import cone_search
 from ska_src_maltopuft_backend.core.repository import BaseRepository
+from ska_src_maltopuft_backend.core.types import DBSession
+
+from .models import Beam, Observation, ObservationSummary
 
-from .models import Observation
+# The percentiles of candidate parameters in each beam summary
+SUMMARY_PERCENTILES = {
+    "snr_median": (Candidate.snr, 0.5),
+    "snr_p90": (Candidate.snr, 0.9),
+    "dm_median": (Candidate.dm, 0.5),
+    "dm_p90": (Candidate.dm, 0.9),
+}
 
 
 class ObservationRepository(BaseRepository[Observation]):
     """Database CRUD operations for the Observation model."""
+
+    async def get_sources(
+        self,
+        db: DBSession,
+        ids_: list[int],
+        radius: float,
+    ) -> Sequence[Row[tuple[Observation, KnownPulsar | None]]]:
+        """Returns observations and the known pulsars within a radius of
+        each observation's centre.
+
+        Observations are cross-matched with known pulsars in a single query
+        by joining on a cone search about each observation's position, which
+        can use the known pulsar position index.
+
+        :param db: The database session.
+        :param ids_: The observation ids. All observations are cross-matched
+            if the list is empty.
+        :param radius: The cone search radius in degrees.
+        :return: (observation, known pulsar) rows ordered by observation id.
+            The known pulsar is None for observations with no known pulsars
+            within the radius.
+        """
+        query = (
+            select(Observation, KnownPulsar)
+            .outerjoin(
+                KnownPulsar,
+                cone_search(
+                    ra_column=KnownPulsar.ra,
+                    dec_column=KnownPulsar.dec,
+                    ra=Observation.s_ra,
+                    dec=Observation.s_dec,
+                    radius=radius,
+                ),
+            )
+            .order_by(Observation.id, KnownPulsar.id)
+        )
+        if ids_:
+            query = query.where(Observation.id.in_(ids_))
+        return await self._execute_all(db=db, query=query)
+
+    async def get_summaries(
+        self,
+        db: DBSession,
+        id_: int,
+    ) -> Sequence[Row]:
+        """Returns the summary of each beam of an observation.
+
+        Summaries are maintained as candidates are written, except for
+        percentiles of candidate parameters, which are computed from the
+        observation's candidates.
+
+        :param db: The database session.
+        :param id_: The observation id.
+        :return: The beam summary columns and the percentiles of candidate
+            parameters, ordered by beam id.
+        """
+        percentiles = (
+            select(
+                Candidate.beam_id,
+                *(
+                    sa.func.percentile_cont(fraction)
+                    .within_group(column)
+                    .label(name)
+                    for name, (column, fraction) in SUMMARY_PERCENTILES.items()
+                ),
+            )
+            .join(Beam, Beam.id == Candidate.beam_id)
+            .where(Beam.observation_id == id_)
+            .group_by(Candidate.beam_id)
+            .subquery()
+        )
+        query = (
+            select(
+                *ObservationSummary.__table__.columns,
+                *(percentiles.c[name] for name in SUMMARY_PERCENTILES),
+            )
+            .join(
+                percentiles,
+                percentiles.c.beam_id == ObservationSummary.beam_id,
+            )
+            .where(ObservationSummary.observation_id == id_)
+            .order_by(ObservationSummary.beam_id)
+        )
+        return await self._execute_all(db=db, query=query)
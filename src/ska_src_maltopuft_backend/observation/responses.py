@@ -1,6 +1,15 @@
 """Observation service response schemas."""
 
-from pydantic import BaseModel, ConfigDict, PastDatetime, PositiveInt
+import datetime as dt
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    NonNegativeInt,
+    PastDatetime,
+    PositiveInt,
+)
 
 from ska_src_maltopuft_backend.app.schemas.responses import KnownPulsar
 from ska_src_maltopuft_backend.core.types import (
@@ -43,3 +52,52 @@ class ObservationSources(BaseModel):
 
     observation: Observation
     sources: list[KnownPulsar]
+
+
+class BeamSummary(BaseModel):
+    """Candidate and label statistics of an observation beam."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    beam_id: PositiveInt
+
+    candidate_count: NonNegativeInt
+    sp_candidate_count: NonNegativeInt
+    label_count: NonNegativeInt
+    label_counts: dict[str, NonNegativeInt]
+
+    snr_min: float
+    snr_max: float
+    snr_median: float
+    snr_p90: float
+    dm_min: float
+    dm_max: float
+    dm_median: float
+    dm_p90: float
+    observed_at_min: dt.datetime
+    observed_at_max: dt.datetime
+
+    refreshed_at: dt.datetime
+
+
+class ObservationSummary(BaseModel):
+    """Response model for observation summary HTTP GET requests.
+
+    Percentiles are only available for each beam.
+    """
+
+    observation_id: PositiveInt
+
+    candidate_count: NonNegativeInt = 0
+    sp_candidate_count: NonNegativeInt = 0
+    label_count: NonNegativeInt = 0
+    label_counts: dict[str, NonNegativeInt] = Field(default_factory=dict)
+
+    snr_min: float | None = None
+    snr_max: float | None = None
+    dm_min: float | None = None
+    dm_max: float | None = None
+    observed_at_min: dt.datetime | None = None
+    observed_at_max: dt.datetime | None = None
+
+    beams: list[BeamSummary] = Field(default_factory=list)
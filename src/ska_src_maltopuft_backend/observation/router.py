@@ -4,15 +4,16 @@ import logging
 from typing import Any
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from pydantic import PositiveInt
 
-from ska_src_maltopuft_backend.core.database.database import get_db
+from ska_src_maltopuft_backend.core.database.database import get_session
 from ska_src_maltopuft_backend.core.factory import Factory
 from ska_src_maltopuft_backend.core.schemas import CommonQueryParams
+from ska_src_maltopuft_backend.core.types import DBSession
 
 from .controller import ObservationController
 from .requests import GetObservationQueryParams
-from .responses import Observation, ObservationSources
+from .responses import Observation, ObservationSources, ObservationSummary
 
 logger = logging.getLogger(__name__)
 observation_router = APIRouter()
@@ -24,7 +25,7 @@ observation_router = APIRouter()
 )
 async def get_observations(
     q: GetObservationQueryParams = Depends(),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     observation_controller: ObservationController = Depends(
         Factory().get_observation_controller,
     ),
@@ -44,7 +45,7 @@ async def get_observations(
 async def get_observation_sources(
     radius: float,
     q: CommonQueryParams = Depends(),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     observation_controller: ObservationController = Depends(
         Factory().get_observation_controller,
     ),
@@ -55,3 +56,27 @@ async def get_observation_sources(
         ids_=q.id,
         radius=radius,
     )
+
+
+@observation_router.get(
+    "/{observation_id}/summary",
+    response_model=ObservationSummary,
+)
+async def get_observation_summary(
+    observation_id: PositiveInt,
+    db: DBSession = Depends(get_session),
+    observation_controller: ObservationController = Depends(
+        Factory().get_observation_controller,
+    ),
+) -> Any:
+    """Get candidate counts, label counts by entity and SNR/DM ranges of an
+    observation and each of its beams.
+
+    Summaries are maintained by the database as candidates and labels are
+    written.
+    """
+    logger.info(f"Getting summary of observation with id={observation_id}")
+    return await observation_controller.get_summary(
+        db=db,
+        id_=observation_id,
+    )
@@ -0,0 +1,438 @@
+"""Database functions and triggers which maintain the observation_summary
+table.
+
+Each statement which writes candidates, single pulse candidates or labels
+applies the changes in counts and parameter ranges of the written rows to
+the summaries of their beams, so writes don't rescan the beams'
+candidates. Percentiles can't be maintained in this way, so they are
+computed when summaries are read.
+"""
+
+import sqlalchemy as sa
+
+# Recomputes the summaries of the given beams. Beams without candidates
+# have no summary.
+CREATE_REFRESH_FUNCTION = """
+CREATE OR REPLACE FUNCTION refresh_observation_summary(beam_ids integer[])
+RETURNS void
+LANGUAGE sql
+AS $$
+    DELETE FROM observation_summary AS s
+    WHERE s.beam_id = ANY(beam_ids)
+        AND NOT EXISTS (
+            SELECT 1 FROM candidate AS c WHERE c.beam_id = s.beam_id
+        );
+
+    WITH labels AS (
+        SELECT
+            beam_id,
+            sum(n)::integer AS label_count,
+            jsonb_object_agg(type, n) AS label_counts
+        FROM (
+            SELECT c.beam_id, e.type::text AS type, count(*) AS n
+            FROM label AS l
+            JOIN candidate AS c ON c.id = l.candidate_id
+            JOIN entity AS e ON e.id = l.entity_id
+            WHERE c.beam_id = ANY(beam_ids)
+            GROUP BY c.beam_id, e.type
+        ) AS entity_counts
+        GROUP BY beam_id
+    )
+    INSERT INTO observation_summary (
+        beam_id,
+        observation_id,
+        candidate_count,
+        sp_candidate_count,
+        label_count,
+        label_counts,
+        snr_min,
+        snr_max,
+        dm_min,
+        dm_max,
+        observed_at_min,
+        observed_at_max,
+        refreshed_at
+    )
+    SELECT
+        c.beam_id,
+        b.observation_id,
+        count(c.id),
+        count(sp.id),
+        coalesce(l.label_count, 0),
+        coalesce(l.label_counts, '{}'::jsonb),
+        min(c.snr),
+        max(c.snr),
+        min(c.dm),
+        max(c.dm),
+        min(c.observed_at),
+        max(c.observed_at),
+        now()
+    FROM candidate AS c
+    JOIN beam AS b ON b.id = c.beam_id
+    LEFT JOIN sp_candidate AS sp ON sp.candidate_id = c.id
+    LEFT JOIN labels AS l ON l.beam_id = c.beam_id
+    WHERE c.beam_id = ANY(beam_ids)
+    GROUP BY c.beam_id, b.observation_id, l.label_count, l.label_counts
+    ON CONFLICT (beam_id) DO UPDATE SET
+        observation_id = EXCLUDED.observation_id,
+        candidate_count = EXCLUDED.candidate_count,
+        sp_candidate_count = EXCLUDED.sp_candidate_count,
+        label_count = EXCLUDED.label_count,
+        label_counts = EXCLUDED.label_counts,
+        snr_min = EXCLUDED.snr_min,
+        snr_max = EXCLUDED.snr_max,
+        dm_min = EXCLUDED.dm_min,
+        dm_max = EXCLUDED.dm_max,
+        observed_at_min = EXCLUDED.observed_at_min,
+        observed_at_max = EXCLUDED.observed_at_max,
+        refreshed_at = EXCLUDED.refreshed_at;
+$$
+"""
+
+# Recomputes the candidate parameter ranges of the given beams' summaries,
+# e.g. after candidates at the edge of a range are deleted.
+CREATE_REFRESH_RANGES_FUNCTION = """
+CREATE OR REPLACE FUNCTION refresh_observation_summary_ranges(
+    beam_ids integer[]
+)
+RETURNS void
+LANGUAGE sql
+AS $$
+    UPDATE observation_summary AS s
+    SET
+        snr_min = r.snr_min,
+        snr_max = r.snr_max,
+        dm_min = r.dm_min,
+        dm_max = r.dm_max,
+        observed_at_min = r.observed_at_min,
+        observed_at_max = r.observed_at_max,
+        refreshed_at = now()
+    FROM (
+        SELECT
+            beam_id,
+            min(snr) AS snr_min,
+            max(snr) AS snr_max,
+            min(dm) AS dm_min,
+            max(dm) AS dm_max,
+            min(observed_at) AS observed_at_min,
+            max(observed_at) AS observed_at_max
+        FROM candidate
+        WHERE beam_id = ANY(beam_ids)
+        GROUP BY beam_id
+    ) AS r
+    WHERE s.beam_id = r.beam_id;
+$$
+"""
+
+# Candidate counts are maintained from the written rows. Inserted
+# candidates widen their beams' parameter ranges, which are only
+# recomputed if a deleted or updated candidate was at the edge of a range.
+# Candidates moved to another beam take their single pulse candidates and
+# labels with them, so both beams are recomputed. Candidate updates which
+# don't change summarised attributes, such as assigning candidates to
+# clusters, don't write summaries.
+CREATE_CANDIDATE_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION candidate_observation_summary_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    moved_beam_ids integer[];
+    range_beam_ids integer[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO observation_summary AS s (
+            beam_id,
+            observation_id,
+            candidate_count,
+            sp_candidate_count,
+            label_count,
+            label_counts,
+            snr_min,
+            snr_max,
+            dm_min,
+            dm_max,
+            observed_at_min,
+            observed_at_max,
+            refreshed_at
+        )
+        SELECT
+            n.beam_id,
+            b.observation_id,
+            count(*),
+            0,
+            0,
+            '{}'::jsonb,
+            min(n.snr),
+            max(n.snr),
+            min(n.dm),
+            max(n.dm),
+            min(n.observed_at),
+            max(n.observed_at),
+            now()
+        FROM new_rows AS n
+        JOIN beam AS b ON b.id = n.beam_id
+        GROUP BY n.beam_id, b.observation_id
+        ON CONFLICT (beam_id) DO UPDATE SET
+            candidate_count = s.candidate_count + EXCLUDED.candidate_count,
+            snr_min = least(s.snr_min, EXCLUDED.snr_min),
+            snr_max = greatest(s.snr_max, EXCLUDED.snr_max),
+            dm_min = least(s.dm_min, EXCLUDED.dm_min),
+            dm_max = greatest(s.dm_max, EXCLUDED.dm_max),
+            observed_at_min = least(
+                s.observed_at_min,
+                EXCLUDED.observed_at_min
+            ),
+            observed_at_max = greatest(
+                s.observed_at_max,
+                EXCLUDED.observed_at_max
+            ),
+            refreshed_at = EXCLUDED.refreshed_at;
+    ELSIF TG_OP = 'DELETE' THEN
+        range_beam_ids := ARRAY(
+            SELECT DISTINCT o.beam_id
+            FROM old_rows AS o
+            JOIN observation_summary AS s ON s.beam_id = o.beam_id
+            WHERE o.snr IN (s.snr_min, s.snr_max)
+                OR o.dm IN (s.dm_min, s.dm_max)
+                OR o.observed_at IN (s.observed_at_min, s.observed_at_max)
+        );
+        UPDATE observation_summary AS s
+        SET candidate_count = s.candidate_count - d.n, refreshed_at = now()
+        FROM (
+            SELECT beam_id, count(*)::integer AS n
+            FROM old_rows
+            GROUP BY beam_id
+        ) AS d
+        WHERE s.beam_id = d.beam_id;
+        DELETE FROM observation_summary
+        WHERE beam_id IN (SELECT beam_id FROM old_rows)
+            AND candidate_count <= 0;
+        PERFORM refresh_observation_summary_ranges(range_beam_ids);
+    ELSE
+        moved_beam_ids := ARRAY(
+            SELECT DISTINCT unnest(ARRAY[n.beam_id, o.beam_id])
+            FROM new_rows AS n
+            JOIN old_rows AS o ON o.id = n.id
+            WHERE n.beam_id <> o.beam_id
+        );
+        range_beam_ids := ARRAY(
+            SELECT DISTINCT o.beam_id
+            FROM new_rows AS n
+            JOIN old_rows AS o ON o.id = n.id
+            JOIN observation_summary AS s ON s.beam_id = o.beam_id
+            WHERE n.beam_id = o.beam_id
+                AND (
+                    (n.snr <> o.snr AND o.snr IN (s.snr_min, s.snr_max))
+                    OR (n.dm <> o.dm AND o.dm IN (s.dm_min, s.dm_max))
+                    OR (
+                        n.observed_at <> o.observed_at
+                        AND o.observed_at IN (
+                            s.observed_at_min,
+                            s.observed_at_max
+                        )
+                    )
+                )
+        );
+        UPDATE observation_summary AS s
+        SET
+            snr_min = least(s.snr_min, r.snr_min),
+            snr_max = greatest(s.snr_max, r.snr_max),
+            dm_min = least(s.dm_min, r.dm_min),
+            dm_max = greatest(s.dm_max, r.dm_max),
+            observed_at_min = least(s.observed_at_min, r.observed_at_min),
+            observed_at_max = greatest(s.observed_at_max, r.observed_at_max),
+            refreshed_at = now()
+        FROM (
+            SELECT
+                n.beam_id,
+                min(n.snr) AS snr_min,
+                max(n.snr) AS snr_max,
+                min(n.dm) AS dm_min,
+                max(n.dm) AS dm_max,
+                min(n.observed_at) AS observed_at_min,
+                max(n.observed_at) AS observed_at_max
+            FROM new_rows AS n
+            JOIN old_rows AS o ON o.id = n.id
+            WHERE n.beam_id = o.beam_id
+                AND (n.dm, n.snr, n.observed_at)
+                    IS DISTINCT FROM (o.dm, o.snr, o.observed_at)
+            GROUP BY n.beam_id
+        ) AS r
+        WHERE s.beam_id = r.beam_id;
+        PERFORM refresh_observation_summary(moved_beam_ids);
+        PERFORM refresh_observation_summary_ranges(range_beam_ids);
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+# Single pulse candidates are counted by the beams of their candidates.
+# Inserted rows are counted once and deleted rows minus once, so an update
+# which moves a single pulse candidate to another candidate moves its
+# count.
+CREATE_CANDIDATE_CHILD_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION candidate_child_observation_summary_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    candidate_ids integer[] := '{}';
+    deltas integer[] := '{}';
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT candidate_ids || array_agg(candidate_id),
+            deltas || array_agg(1)
+        INTO candidate_ids, deltas
+        FROM new_rows;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        SELECT candidate_ids || array_agg(candidate_id),
+            deltas || array_agg(-1)
+        INTO candidate_ids, deltas
+        FROM old_rows;
+    END IF;
+
+    UPDATE observation_summary AS s
+    SET sp_candidate_count = s.sp_candidate_count + d.delta,
+        refreshed_at = now()
+    FROM (
+        SELECT c.beam_id, sum(r.delta)::integer AS delta
+        FROM unnest(candidate_ids, deltas) AS r(candidate_id, delta)
+        JOIN candidate AS c ON c.id = r.candidate_id
+        GROUP BY c.beam_id
+        HAVING sum(r.delta) <> 0
+    ) AS d
+    WHERE s.beam_id = d.beam_id;
+    RETURN NULL;
+END;
+$$
+"""
+
+# Labels are counted by the beams of their candidates and their entity
+# types, in the same way as single pulse candidates. Entity types without
+# labels are removed from the label counts.
+CREATE_LABEL_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION label_observation_summary_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    candidate_ids integer[] := '{}';
+    entity_ids integer[] := '{}';
+    deltas integer[] := '{}';
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT candidate_ids || array_agg(candidate_id),
+            entity_ids || array_agg(entity_id),
+            deltas || array_agg(1)
+        INTO candidate_ids, entity_ids, deltas
+        FROM new_rows;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        SELECT candidate_ids || array_agg(candidate_id),
+            entity_ids || array_agg(entity_id),
+            deltas || array_agg(-1)
+        INTO candidate_ids, entity_ids, deltas
+        FROM old_rows;
+    END IF;
+
+    WITH entity_deltas AS (
+        SELECT c.beam_id, e.type::text AS type, sum(r.delta) AS delta
+        FROM unnest(candidate_ids, entity_ids, deltas)
+            AS r(candidate_id, entity_id, delta)
+        JOIN candidate AS c ON c.id = r.candidate_id
+        JOIN entity AS e ON e.id = r.entity_id
+        GROUP BY c.beam_id, e.type
+        HAVING sum(r.delta) <> 0
+    ),
+    beam_deltas AS (
+        SELECT
+            beam_id,
+            sum(delta)::integer AS delta,
+            jsonb_object_agg(type, delta) AS deltas
+        FROM entity_deltas
+        GROUP BY beam_id
+    )
+    UPDATE observation_summary AS s
+    SET
+        label_count = s.label_count + d.delta,
+        label_counts = (
+            SELECT coalesce(jsonb_object_agg(type, n), '{}'::jsonb)
+            FROM (
+                SELECT type, sum(n) AS n
+                FROM (
+                    SELECT key AS type, value::integer AS n
+                    FROM jsonb_each_text(s.label_counts)
+                    UNION ALL
+                    SELECT key AS type, value::integer AS n
+                    FROM jsonb_each_text(d.deltas)
+                ) AS counts
+                GROUP BY type
+                HAVING sum(n) <> 0
+            ) AS totals
+        ),
+        refreshed_at = now()
+    FROM beam_deltas AS d
+    WHERE s.beam_id = d.beam_id;
+    RETURN NULL;
+END;
+$$
+"""
+
+# Statement level triggers can only reference the transition tables of a
+# single event, so each table has one trigger per event.
+TRIGGER_EVENTS = {
+    "INSERT": "NEW TABLE AS new_rows",
+    "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "OLD TABLE AS old_rows",
+}
+
+TRIGGER_FUNCTIONS = {
+    "candidate": "candidate_observation_summary_trigger",
+    "sp_candidate": "candidate_child_observation_summary_trigger",
+    "label": "label_observation_summary_trigger",
+}
+
+
+def trigger_name(table: str, event: str) -> str:
+    """Return the name of a table's observation summary trigger."""
+    return f"{table}_observation_summary_{event.lower()}"
+
+
+def create_trigger_sql(table: str, event: str) -> str:
+    """Return SQL which creates a table's observation summary trigger for
+    an event.
+    """
+    return (
+        f"CREATE OR REPLACE TRIGGER {trigger_name(table, event)} "
+        f"AFTER {event} ON {table} "
+        f"REFERENCING {TRIGGER_EVENTS[event]} "
+        "FOR EACH STATEMENT "
+        f"EXECUTE FUNCTION {TRIGGER_FUNCTIONS[table]}()"
+    )
+
+
+OBSERVATION_SUMMARY_SQL = (
+    CREATE_REFRESH_FUNCTION,
+    CREATE_REFRESH_RANGES_FUNCTION,
+    CREATE_CANDIDATE_TRIGGER_FUNCTION,
+    CREATE_CANDIDATE_CHILD_TRIGGER_FUNCTION,
+    CREATE_LABEL_TRIGGER_FUNCTION,
+    *(
+        create_trigger_sql(table, event)
+        for table in TRIGGER_FUNCTIONS
+        for event in TRIGGER_EVENTS
+    ),
+)
+
+# Refreshes the summary of every beam, e.g. after the table is created
+# for an existing database.
+REFRESH_ALL_SQL = (
+    "SELECT refresh_observation_summary(ARRAY(SELECT id FROM beam))"
+)
+
+OBSERVATION_SUMMARY_DDL = tuple(
+    sa.DDL(statement) for statement in OBSERVATION_SUMMARY_SQL
+)
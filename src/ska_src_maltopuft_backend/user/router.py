@@ -5,10 +5,10 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, status
 from pydantic import PositiveInt
-from sqlalchemy.orm import Session
 
-from ska_src_maltopuft_backend.core.database.database import get_db
+from ska_src_maltopuft_backend.core.database.database import get_session
 from ska_src_maltopuft_backend.core.factory import Factory
+from ska_src_maltopuft_backend.core.types import DBSession
 
 from .controller import UserController
 from .requests import CreateUser, GetUserQueryParams
@@ -24,7 +24,7 @@ user_router = APIRouter()
 )
 async def get_users(
     q: GetUserQueryParams = Depends(),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     user_controller: UserController = Depends(Factory().get_user_controller),
 ) -> Any:
     """Get all users."""
@@ -35,7 +35,7 @@ async def get_users(
 @user_router.get("/{user_id}", response_model=User)
 async def get_user(
     user_id: PositiveInt,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     user_controller: UserController = Depends(Factory().get_user_controller),
 ) -> User:
     """Get user by id."""
@@ -49,7 +49,7 @@ async def get_user(
 )
 async def post_user(
     user: CreateUser,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     user_controller: UserController = Depends(Factory().get_user_controller),
 ) -> User:
     """Create a new user."""
@@ -59,7 +59,7 @@ async def post_user(
 @user_router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(
     user_id: PositiveInt,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     user_controller: UserController = Depends(Factory().get_user_controller),
 ) -> None:
     """Delete user by id."""
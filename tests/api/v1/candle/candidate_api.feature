@@ -71,6 +71,25 @@ Feature: Candidate service
         Then an error response should be returned
         And the status code should be HTTP 404
 
+    Scenario: Paginate candidates with a cursor
+        Given observation metadata exists in the database
+        And a candidate
+        And the candidate exists in the database
+        And a candidate
+        And the candidate exists in the database
+        And a candidate
+        And the candidate exists in the database
+        When the query parameters ("limit",) have values (2,)
+        And candidates are retrieved from the database
+        Then a response should be returned
+        And the response data should contain 2 candidates
+        And the response should contain a next page cursor
+        When the next page of candidates is retrieved from the database
+        Then a response should be returned
+        And the response data should contain 1 candidates
+        And the response should not contain a next page cursor
+        And the status code should be HTTP 200
+
     @skip-ci
     Scenario: Cone search with point inside circle bounds
         Given observation metadata exists in the database
@@ -92,3 +111,104 @@ Feature: Candidate service
         Then a response should be returned
         And the response data should contain 0 candidates
         And the status code should be HTTP 200
+
+    Scenario: Bulk ingest candidates from NDJSON
+        Given observation metadata exists in the database
+        And 3 candidates with single pulse candidates
+        When the candidates are ingested as NDJSON
+        Then a response should be returned
+        And the status code should be HTTP 201
+        And the response should report 3 created of 3 ingested candidates
+        When candidates are retrieved from the database
+        Then a response should be returned
+        And the response data should contain 3 candidates
+
+    Scenario: Bulk ingest candidates from CSV
+        Given observation metadata exists in the database
+        And 3 candidates with single pulse candidates
+        When the candidates are ingested as CSV
+        Then a response should be returned
+        And the status code should be HTTP 201
+        And the response should report 3 created of 3 ingested candidates
+
+    Scenario: Bulk ingest duplicate candidates
+        Given observation metadata exists in the database
+        And 3 candidates with single pulse candidates
+        When the candidates are ingested as NDJSON
+        Then a response should be returned
+        And the response should report 3 created of 3 ingested candidates
+        When the candidates are ingested as NDJSON
+        Then a response should be returned
+        And the status code should be HTTP 201
+        And the response should report 0 created of 3 ingested candidates
+        And the ingested ids should be unchanged
+
+    Scenario: Bulk ingest candidates with an invalid row
+        Given observation metadata exists in the database
+        And 3 candidates with single pulse candidates
+        And the candidates include a candidate with negative DM
+        When the candidates are ingested as NDJSON
+        Then an error response should be returned
+        And the status code should be HTTP 422
+        When candidates are retrieved from the database
+        Then a response should be returned
+        And the response data should contain 0 candidates
+
+    Scenario: Bulk ingest candidates with unsupported media type
+        Given observation metadata exists in the database
+        And 3 candidates with single pulse candidates
+        When the candidates are ingested as JSON
+        Then an error response should be returned
+        And the status code should be HTTP 415
+
+    Scenario Outline: Export candidates
+        Given observation metadata exists in the database
+        And a candidate
+        And the candidate exists in the database
+        And a candidate
+        And the candidate exists in the database
+        When the query parameters ("limit",) have values (1,)
+        And candidates are exported as <format>
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the response should contain 2 exported <format> rows
+
+        Examples:
+            | format |
+            | ndjson |
+            | csv    |
+
+    @skip-ci
+    Scenario: Cross-match candidates with known pulsars
+        Given observation metadata exists in the database
+        And a candidate where ("ra","dec","dm",) is (90.75270833,-40.05644444,100.0,)
+        And the candidate exists in the database
+        And a candidate where ("ra","dec","dm",) is (10.0,10.0,100.0,)
+        And the candidate exists in the database
+        And a known pulsar where ("ra","dec","dm",) is (90.76,-40.05,101.0,)
+        And a known pulsar where ("ra","dec","dm",) is (90.76,-40.05,200.0,)
+        When the query parameters ("observation_id","radius","dm_tolerance",) have values (1,0.5,5,)
+        And candidates are cross-matched with known pulsars
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the response data should contain 1 cross-matches
+
+    @skip-ci
+    Scenario: Cluster candidates into repeat sources
+        Given observation metadata exists in the database
+        And a candidate where ("ra","dec","dm",) is (90.75270833,-40.05644444,100.0,)
+        And the candidate exists in the database
+        And a candidate where ("ra","dec","dm",) is (90.76,-40.05,101.0,)
+        And the candidate exists in the database
+        And a candidate where ("ra","dec","dm",) is (10.0,10.0,100.0,)
+        And the candidate exists in the database
+        When candidates are clustered
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the response should report 3 candidates clustered into 2 clusters
+        When the candidates in the largest cluster are retrieved
+        Then a response should be returned
+        And the response data should contain 2 candidates
+        When candidates are clustered
+        Then a response should be returned
+        And the response should report 0 candidates clustered into 0 clusters
@@ -3,7 +3,8 @@
 from typing import Any
 
 from fastapi.testclient import TestClient
-from pytest_bdd import given
+from pytest_bdd import given, then
+from ska_src_maltopuft_backend.core.pagination import NEXT_CURSOR_HEADER
 
 from tests.api.v1.datagen import (
     candidate_data_generator,
@@ -40,3 +41,23 @@ def sp_candidate_and_parent_data(
 def sp_candidate_exists(result: dict[str, Any], client: TestClient) -> None:
     """Take sp candidate from the 'result' fixture and create it."""
     client.post(url="/v1/candle/sp", json=result.get("sp_candidate"))
+
+
+@then("the response should contain a next page cursor")
+def response_has_next_cursor(result: dict[str, Any]) -> None:
+    """Verify the response has a next page cursor and store it in the
+    'result' fixture.
+    """
+    response = result.get("response")
+    assert response is not None
+    cursor = response.headers.get(NEXT_CURSOR_HEADER)
+    assert cursor is not None
+    result["cursor"] = cursor
+
+
+@then("the response should not contain a next page cursor")
+def response_has_no_next_cursor(result: dict[str, Any]) -> None:
+    """Verify the response doesn't have a next page cursor."""
+    response = result.get("response")
+    assert response is not None
+    assert NEXT_CURSOR_HEADER not in response.headers
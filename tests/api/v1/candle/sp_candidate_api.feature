@@ -17,6 +17,15 @@ Feature: Single pulse candidate service
         And the response data should contain 1 sp candidates
         And the status code should be HTTP 201
 
+    Scenario: Create sp candidate with a plot path from another month
+        Given observation metadata exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        And a sp candidate with the same plot path observed in another month
+        When an attempt is made to create the sp candidate
+        Then an error response should be returned
+        And the status code should be HTTP 409
+
     Scenario: Create sp candidate with null parent
         Given an empty database
         And a sp candidate with null parent candidate attribute
@@ -144,6 +153,18 @@ Feature: Single pulse candidate service
         And the response data should contain 3 sp candidates
         And the status code should be HTTP 200
 
+    Scenario: Get sp candidates of an observation without summaries
+        Given observation metadata exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        And the observation summaries are deleted
+        When sp candidates are retrieved from the database by observation id
+        Then a response should be returned
+        And the response data should contain 2 sp candidates
+        And the status code should be HTTP 200
+
     Scenario: Get sp candidates with invalid observation metadata filter
         Given observation metadata exists in the database
         And a sp candidate
@@ -156,3 +177,173 @@ Feature: Single pulse candidate service
         Then a response should be returned
         And the response data should contain an empty list
         And the status code should be HTTP 200
+
+    Scenario: Paginate sp candidates with a cursor
+        Given observation metadata exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        When the query parameters ("limit",) have values (2,)
+        And sp candidates are retrieved from the database
+        Then a response should be returned
+        And the response data should contain 2 sp candidates
+        And the response should contain a next page cursor
+        When the next page of sp candidates is retrieved from the database
+        Then a response should be returned
+        And the response data should contain 1 sp candidates
+        And the response should not contain a next page cursor
+        And the status code should be HTTP 200
+
+    Scenario: Get sp candidates with invalid cursor
+        Given an empty database
+        When the query parameters ("after",) have values ("not-a-cursor",)
+        And sp candidates are retrieved from the database
+        Then an error response should be returned
+        And the status code should be HTTP 400
+
+    Scenario: Get page of sp candidates with total count
+        Given observation metadata exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        When the query parameters ("limit",) have values (2,)
+        And a page of sp candidates is retrieved from the database
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the response page should contain 2 of 3 sp candidates
+
+    Scenario: Get page of sp candidates past the last candidate
+        Given observation metadata exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        When the query parameters ("skip",) have values (5,)
+        And a page of sp candidates is retrieved from the database
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the response page should contain 0 of 1 sp candidates
+
+    Scenario: Get page of sp candidates with estimated count
+        Given observation metadata exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        When the query parameters ("estimate_count",) have values (True,)
+        And a page of sp candidates is retrieved from the database
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the response page should contain 1 sp candidates
+
+    Scenario Outline: Export sp candidates
+        Given observation metadata exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        When the query parameters ("limit",) have values (1,)
+        And sp candidates are exported as <format>
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the response should contain 3 exported <format> rows
+
+        Examples:
+            | format |
+            | ndjson |
+            | csv    |
+
+    Scenario Outline: Get histogram of sp candidates
+        Given observation metadata exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        When the query parameters <attributes> have values <values>
+        And a histogram of sp candidates is retrieved from the database
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the histogram should count 3 sp candidates in <shape> bins
+
+        Examples:
+            | attributes                      | values                  | shape   |
+            | ("x","x_bins",)                 | ("dm",10,)              | (10,)   |
+            | ("x","x_bins","y","y_bins",)    | ("dm",10,"snr",5,)      | (10, 5) |
+            | ("x","x_bins","beam_id",)       | ("observed_at",4,1,)    | (4,)    |
+
+    Scenario: Get histogram of sp candidates with too many bins
+        Given an empty database
+        When the query parameters ("x_bins",) have values (100000,)
+        And a histogram of sp candidates is retrieved from the database
+        Then a validation error response should be returned
+
+    Scenario Outline: Get histogram of sp candidates with an empty range
+        Given an empty database
+        When the query parameters <attributes> have values <values>
+        And a histogram of sp candidates is retrieved from the database
+        Then an error response should be returned
+        And the status code should be HTTP 422
+
+        Examples:
+            | attributes             | values       |
+            | ("x_min","x_max",)     | (10,1,)      |
+            | ("y","y_min","y_max",) | ("snr",5,5,) |
+
+    Scenario: Get histogram of sp candidates with a single value
+        Given observation metadata exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        When the query parameters ("x","x_bins",) have values ("dm",10,)
+        And a histogram of sp candidates is retrieved from the database
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the histogram should count 1 sp candidates in (10,) bins
+
+    Scenario: Count sp candidates by beam
+        Given observation metadata exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        When the query parameters ("by",) have values ("beam",)
+        And sp candidates are counted by group
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the group counts should be ([1], [2])
+
+    Scenario: Count unlabelled sp candidates by entity
+        Given observation metadata exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        When the query parameters ("by",) have values ("entity",)
+        And sp candidates are counted by group
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the group counts should be ([None], [1])
+
+    Scenario: Get downsampled scatter plot of sp candidates
+        Given observation metadata exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        And a sp candidate
+        And the sp candidate exists in the database
+        When the query parameters ("x_bins","y_bins","per_tile",) have values (1,1,2,)
+        And a scatter plot of sp candidates is retrieved from the database
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the scatter plot should contain 2 of 3 sp candidates in 1 tiles
+
+    Scenario: Get scatter plot of sp candidates with an empty range
+        Given an empty database
+        When the query parameters ("y_min","y_max",) have values (100,50,)
+        And a scatter plot of sp candidates is retrieved from the database
+        Then an error response should be returned
+        And the status code should be HTTP 422
@@ -3,13 +3,32 @@
 # ruff: noqa: D103
 
 import ast
+import csv
+import io
+import json
 from typing import Any
 
 from fastapi.testclient import TestClient
 from pytest_bdd import given, parsers, scenarios, then, when
-from ska_src_maltopuft_backend.app.schemas.responses import Candidate
+from ska_src_maltopuft_backend.app.models import (
+    Candidate as CandidateModel,
+)
+from ska_src_maltopuft_backend.app.models import Catalogue, KnownPulsar
+from ska_src_maltopuft_backend.app.schemas.responses import (
+    Candidate,
+    CandidateCrossMatch,
+)
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
 
-from tests.api.v1.datagen import candidate_data_generator
+from tests.api.v1.datagen import (
+    candidate_data_generator,
+    sp_candidate_data_generator,
+)
+from tests.catalogue.datagen import (
+    catalogue_data_generator,
+    pulsar_data_generator,
+)
 
 scenarios("./candidate_api.feature")
 
@@ -45,6 +64,51 @@ def candidate_with_attributes(
     result["candidate"] = candidate_data_generator(**cand_attributes)
 
 
+@given(parsers.parse("{num:d} candidates with single pulse candidates"))
+def candidates_with_sp_candidates(result: dict[str, Any], num: int) -> None:
+    result["candidates"] = [
+        {
+            **candidate_data_generator(),
+            "plot_path": sp_candidate_data_generator()["plot_path"],
+        }
+        for _ in range(num)
+    ]
+
+
+@given("the candidates include a candidate with negative DM")
+def candidates_include_invalid_dm(result: dict[str, Any]) -> None:
+    result["candidates"].append(
+        candidate_data_generator(dm=-1),  # type: ignore[arg-type]
+    )
+
+
+@given(parsers.parse("a known pulsar where {attributes} is {values}"))
+def known_pulsar_with_attributes(
+    db: Session,
+    attributes: str,
+    values: Any,
+) -> None:
+    pulsar_attributes = dict(
+        zip(
+            ast.literal_eval(attributes),
+            ast.literal_eval(values),
+            strict=False,
+        ),
+    )
+    catalogue = Catalogue(**catalogue_data_generator())
+    db.add(catalogue)
+    db.commit()
+    db.add(
+        KnownPulsar(
+            **pulsar_data_generator(
+                **pulsar_attributes,
+                catalogue_id=catalogue.id,  # type: ignore[arg-type]
+            ),
+        ),
+    )
+    db.commit()
+
+
 @when("candidates are retrieved from the database")
 def do_get_candidates(
     client: TestClient,
@@ -53,6 +117,15 @@ def do_get_candidates(
     result["result"] = client.get(url="/v1/candle", params=result.get("q"))
 
 
+@when("the next page of candidates is retrieved from the database")
+def do_get_next_candidates_page(
+    client: TestClient,
+    result: dict[str, Any],
+) -> None:
+    q = {**result.get("q", {}), "after": result.get("cursor")}
+    result["result"] = client.get(url="/v1/candle", params=q)
+
+
 @when("an attempt is made to create the candidate")
 def do_create_candidate(
     client: TestClient,
@@ -64,6 +137,85 @@ def do_create_candidate(
     )
 
 
+@when(parsers.parse("candidates are exported as {format_}"))
+def do_export_candidates(
+    client: TestClient,
+    result: dict[str, Any],
+    format_: str,
+) -> None:
+    result["result"] = client.get(
+        url="/v1/candle/export",
+        params={**result.get("q", {}), "format": format_},
+    )
+
+
+@when("candidates are cross-matched with known pulsars")
+def do_crossmatch_candidates(
+    client: TestClient,
+    result: dict[str, Any],
+) -> None:
+    result["result"] = client.get(
+        url="/v1/candle/crossmatch",
+        params=result.get("q"),
+    )
+
+
+@when("candidates are clustered")
+def do_cluster_candidates(
+    client: TestClient,
+    result: dict[str, Any],
+) -> None:
+    result["result"] = client.post(url="/v1/candle/clusters")
+
+
+@when("the candidates in the largest cluster are retrieved")
+def do_get_largest_cluster_candidates(
+    client: TestClient,
+    db: Session,
+    result: dict[str, Any],
+) -> None:
+    cluster_id = db.execute(
+        select(CandidateModel.cluster_id)
+        .group_by(CandidateModel.cluster_id)
+        .order_by(func.count().desc())
+        .limit(1),
+    ).scalar_one()
+    result["result"] = client.get(
+        url="/v1/candle",
+        params={"cluster_id": cluster_id},
+    )
+
+
+@when(parsers.parse("the candidates are ingested as {format_}"))
+def do_ingest_candidates(
+    client: TestClient,
+    result: dict[str, Any],
+    format_: str,
+) -> None:
+    candidates = result.get("candidates", [])
+    if format_ == "CSV":
+        content_type = "text/csv"
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(candidates[0]))
+        writer.writeheader()
+        writer.writerows(candidates)
+        content = buffer.getvalue()
+    else:
+        content_type = {
+            "NDJSON": "application/x-ndjson",
+            "JSON": "application/json",
+        }[format_]
+        content = "\n".join(json.dumps(cand) for cand in candidates)
+
+    if result.get("result") is not None:
+        result["previous_response"] = result["result"]
+    result["result"] = client.post(
+        url="/v1/candle/bulk",
+        content=content,
+        headers={"Content-Type": content_type},
+    )
+
+
 @when("the candidate is retrieved from the database by id")
 def do_get_candidate_by_id(
     client: TestClient,
@@ -94,3 +246,64 @@ def response_data_has_num_cand(result: dict[str, Any], num: int) -> None:
     for d in data:
         cand = Candidate(**d)
         assert cand.id is not None
+
+
+@then(
+    parsers.parse(
+        "the response should report {created:d} created of {num:d} "
+        "ingested candidates",
+    ),
+)
+def response_reports_ingested(
+    result: dict[str, Any],
+    created: int,
+    num: int,
+) -> None:
+    response = result.get("response")
+    assert response is not None
+    data = response.json()
+    assert data.get("created") == created
+    assert len(data.get("ids")) == num
+    assert len(data.get("sp_candidate_ids")) == num
+    assert all(id_ is not None for id_ in data.get("sp_candidate_ids"))
+
+
+@then(
+    parsers.parse(
+        "the response should report {num:d} candidates clustered into "
+        "{clusters:d} clusters",
+    ),
+)
+def response_reports_clustered(
+    result: dict[str, Any],
+    num: int,
+    clusters: int,
+) -> None:
+    response = result.get("response")
+    assert response is not None
+    data = response.json()
+    assert data.get("clustered") == num
+    assert data.get("clusters") == clusters
+
+
+@then("the ingested ids should be unchanged")
+def ingested_ids_unchanged(result: dict[str, Any]) -> None:
+    previous = result.get("previous_response")
+    response = result.get("response")
+    assert previous is not None
+    assert response is not None
+    for key in ("ids", "sp_candidate_ids"):
+        assert previous.json().get(key) == response.json().get(key)
+
+
+@then(parsers.parse("the response data should contain {num:d} cross-matches"))
+def response_data_has_num_crossmatches(
+    result: dict[str, Any],
+    num: int,
+) -> None:
+    response = result.get("response")
+    assert response is not None
+    data = [CandidateCrossMatch(**d) for d in response.json()]
+    assert len(data) == num
+    for match in data:
+        assert abs(match.dm_difference) <= 5  # noqa: PLR2004
@@ -2,13 +2,27 @@
 
 # ruff: noqa: D103, PLR2004
 
+import ast
+import datetime as dt
 from typing import Any
 
+import sqlalchemy as sa
 from fastapi.testclient import TestClient
 from pytest_bdd import given, parsers, scenarios, then, when
-from ska_src_maltopuft_backend.app.schemas.responses import SPCandidate
+from ska_src_maltopuft_backend.app.models import ObservationSummary
+from ska_src_maltopuft_backend.app.schemas.responses import (
+    CandidateGroupCounts,
+    CandidateHistogram,
+    CandidateScatter,
+    SPCandidate,
+    SPCandidatePage,
+)
+from sqlalchemy.orm import Session
 
-from tests.api.v1.datagen import sp_candidate_data_generator
+from tests.api.v1.datagen import (
+    candidate_data_generator,
+    sp_candidate_data_generator,
+)
 
 scenarios("./sp_candidate_api.feature")
 
@@ -25,6 +39,32 @@ def sp_candidate_invalid_parent_data(result: dict[str, Any]) -> None:
     result["sp_candidate"] = sp_candidate_data_generator(candidate_id=999)
 
 
+@given("a sp candidate with the same plot path observed in another month")
+def sp_candidate_other_month_data(
+    result: dict[str, Any],
+    client: TestClient,
+) -> None:
+    """Generate fake sp candidate data with the plot path of the existing sp
+    candidate and a parent candidate observed in an earlier month.
+    """
+    observed_at = dt.datetime.fromisoformat(
+        result["candidate"]["observed_at"],
+    ) - dt.timedelta(days=32)
+    candidate = candidate_data_generator(observed_at=observed_at.isoformat())
+    cand = client.post(url="/v1/candle", json=candidate)
+    assert cand.status_code == 201
+    result["sp_candidate"] = sp_candidate_data_generator(
+        candidate_id=cand.json().get("id"),
+        plot_path=result["sp_candidate"]["plot_path"],
+    )
+
+
+@given("the observation summaries are deleted")
+def delete_observation_summaries(db: Session) -> None:
+    db.execute(sa.delete(ObservationSummary))
+    db.commit()
+
+
 @when("sp candidates are retrieved from the database")
 def do_get_sp_candidates(
     client: TestClient,
@@ -33,6 +73,71 @@ def do_get_sp_candidates(
     result["result"] = client.get(url="/v1/candle/sp", params=result.get("q"))
 
 
+@when("the next page of sp candidates is retrieved from the database")
+def do_get_next_sp_candidates_page(
+    client: TestClient,
+    result: dict[str, Any],
+) -> None:
+    q = {**result.get("q", {}), "after": result.get("cursor")}
+    result["result"] = client.get(url="/v1/candle/sp", params=q)
+
+
+@when("a page of sp candidates is retrieved from the database")
+def do_get_sp_candidates_page(
+    client: TestClient,
+    result: dict[str, Any],
+) -> None:
+    result["result"] = client.get(
+        url="/v1/candle/sp/page",
+        params=result.get("q"),
+    )
+
+
+@when("a histogram of sp candidates is retrieved from the database")
+def do_get_sp_candidates_histogram(
+    client: TestClient,
+    result: dict[str, Any],
+) -> None:
+    result["result"] = client.get(
+        url="/v1/candle/sp/histogram",
+        params=result.get("q"),
+    )
+
+
+@when("a scatter plot of sp candidates is retrieved from the database")
+def do_get_sp_candidates_scatter(
+    client: TestClient,
+    result: dict[str, Any],
+) -> None:
+    result["result"] = client.get(
+        url="/v1/candle/sp/scatter",
+        params=result.get("q"),
+    )
+
+
+@when("sp candidates are counted by group")
+def do_get_sp_candidate_groups(
+    client: TestClient,
+    result: dict[str, Any],
+) -> None:
+    result["result"] = client.get(
+        url="/v1/candle/sp/groups",
+        params=result.get("q"),
+    )
+
+
+@when(parsers.parse("sp candidates are exported as {format_}"))
+def do_export_sp_candidates(
+    client: TestClient,
+    result: dict[str, Any],
+    format_: str,
+) -> None:
+    result["result"] = client.get(
+        url="/v1/candle/sp/export",
+        params={**result.get("q", {}), "format": format_},
+    )
+
+
 @when("an attempt is made to create the sp candidate")
 def do_create_sp_candidate(
     client: TestClient,
@@ -140,3 +245,86 @@ def response_data_is_num(result: dict[str, Any], num: int) -> None:
     assert response is not None
     data = response.json()
     assert data == num
+
+
+@then(
+    parsers.parse(
+        "the response page should contain {num:d} of {total:d} sp candidates",
+    ),
+)
+def response_page_has_num_of_total(
+    result: dict[str, Any],
+    num: int,
+    total: int,
+) -> None:
+    response = result.get("response")
+    assert response is not None
+    page = SPCandidatePage(**response.json())
+    assert len(page.items) == num
+    assert page.total == total
+    assert not page.estimated
+
+
+@then(parsers.parse("the response page should contain {num:d} sp candidates"))
+def response_page_has_num(result: dict[str, Any], num: int) -> None:
+    response = result.get("response")
+    assert response is not None
+    page = SPCandidatePage(**response.json())
+    assert len(page.items) == num
+    assert page.total >= 0
+
+
+@then(
+    parsers.parse(
+        "the histogram should count {num:d} sp candidates in {shape} bins",
+    ),
+)
+def response_histogram_has_num(
+    result: dict[str, Any],
+    num: int,
+    shape: str,
+) -> None:
+    response = result.get("response")
+    assert response is not None
+    histogram = CandidateHistogram(**response.json())
+    shape_ = ast.literal_eval(shape)
+    assert histogram.total == num
+    assert len(histogram.counts) == shape_[0]
+    if len(shape_) == 1:
+        assert histogram.y is None
+        assert sum(histogram.counts) == num  # type: ignore[arg-type]
+        return
+    assert histogram.y is not None
+    assert all(len(row) == shape_[1] for row in histogram.counts)
+    assert sum(map(sum, histogram.counts)) == num  # type: ignore[arg-type]
+
+
+@then(
+    parsers.parse(
+        "the scatter plot should contain {num:d} of {total:d} sp candidates "
+        "in {tiles:d} tiles",
+    ),
+)
+def response_scatter_has_num_of_total(
+    result: dict[str, Any],
+    num: int,
+    total: int,
+    tiles: int,
+) -> None:
+    response = result.get("response")
+    assert response is not None
+    scatter = CandidateScatter(**response.json())
+    assert len(scatter.points.sp_candidate_id) == num
+    assert scatter.total == total
+    assert len(scatter.tiles.count) == tiles
+    assert sorted(scatter.points.snr, reverse=True) == scatter.points.snr
+
+
+@then(parsers.parse("the group counts should be {groups}"))
+def response_group_counts_are(result: dict[str, Any], groups: str) -> None:
+    response = result.get("response")
+    assert response is not None
+    group_counts = CandidateGroupCounts(**response.json())
+    keys, counts = ast.literal_eval(groups)
+    assert group_counts.keys == keys
+    assert group_counts.counts == counts
@@ -20,3 +20,8 @@ Feature: Health check
         Given a database is unavailable
         When the /health/db endpoint is called from client to unavailable DB
         Then a successful response with unhealthy status is returned
+
+    Scenario: /health/db/pool endpoint returns connection pool statistics
+        Given a database is available
+        When the /health/db/pool endpoint is called
+        Then a successful response with connection pool statistics is returned
@@ -9,7 +9,10 @@ import pytest
 from fastapi.testclient import TestClient
 from httpx import Response
 from pytest_bdd import given, scenarios, then, when
-from ska_src_maltopuft_backend.app.schemas.responses import Status
+from ska_src_maltopuft_backend.app.schemas.responses import (
+    PoolStatus,
+    Status,
+)
 from ska_src_maltopuft_backend.core.config import settings
 from ska_src_maltopuft_backend.core.database.database import ping_db
 
@@ -72,6 +75,14 @@ def do_health_db_unavailable(
     result["result"] = one_off_test_client.get("/v1/health/db")
 
 
+@when("the /health/db/pool endpoint is called")
+def do_health_db_pool(
+    client: TestClient,
+    result: dict[str, Response | None],
+) -> None:
+    result["result"] = client.get("/v1/health/db/pool")
+
+
 ##############################################################################
 # Then steps #################################################################
 ##############################################################################
@@ -128,3 +139,19 @@ def successful_unhealthy_db_response(result: dict[str, Response]) -> None:
     content = Status(**json_content)
     assert content.name == settings.MALTOPUFT_POSTGRES_HOST
     assert content.status == "UNAVAILABLE"
+
+
+@then("a successful response with connection pool statistics is returned")
+def successful_pool_status_response(result: dict[str, Response]) -> None:
+    response = result.get("result")
+    assert isinstance(response, Response)
+    assert response.status_code == fastapi.status.HTTP_200_OK
+
+    json_content = response.json()
+    assert isinstance(json_content, list)
+
+    pools = [PoolStatus(**pool) for pool in json_content]
+    assert {pool.name for pool in pools} == {"sync", "async"}
+    for pool in pools:
+        assert pool.size == settings.MALTOPUFT_POSTGRES_POOL_SIZE
+        assert pool.max_overflow == settings.MALTOPUFT_POSTGRES_MAX_OVERFLOW
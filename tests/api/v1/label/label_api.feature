@@ -110,3 +110,19 @@ Feature: Label service
         When the label is retrieved from the database by id
         Then a response should be returned
         And the response data should contain the updated data
+
+    Scenario Outline: Export labels
+        Given observation metadata exists in the database
+        And a label
+        And the label exists in the database
+        And a label
+        And the label exists in the database
+        When labels are exported as <format>
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the response should contain 2 exported <format> rows
+
+        Examples:
+            | format |
+            | ndjson |
+            | csv    |
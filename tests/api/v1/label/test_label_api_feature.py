@@ -98,6 +98,18 @@ def do_get_sp_candidates(
     result["result"] = client.get(url="/v1/labels", params=result.get("q"))
 
 
+@when(parsers.parse("labels are exported as {format_}"))
+def do_export_labels(
+    client: TestClient,
+    result: dict[str, Any],
+    format_: str,
+) -> None:
+    result["result"] = client.get(
+        url="/v1/labels/export",
+        params={**result.get("q", {}), "format": format_},
+    )
+
+
 @when("an attempt is made to create the label")
 def do_create_label(
     client: TestClient,
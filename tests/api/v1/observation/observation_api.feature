@@ -33,3 +33,96 @@ Feature: Observation service
         Then a response should be returned
         And the response data should contain 2 observations
         And the status code should be HTTP 200
+
+    @skip-ci
+    Scenario: Get observation sources
+        Given an observation
+        And the observation exists in the database
+        And an observation where ("s_ra", "s_dec") is (200.0, -60.0)
+        And the observation exists in the database
+        And a known pulsar at (80.2875, 16.63944)
+        And a known pulsar at (80.3, 16.6)
+        And a known pulsar at (0.0, 0.0)
+        When the known sources within 1 degree of the observations are retrieved
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the observations should have (2, 0) sources
+
+    Scenario: Get observation summary
+        Given observation metadata exists in the database
+        And 3 candidates with single pulse candidates exist in the database
+        When the summary of observation 1 is retrieved
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the summary should count 3 candidates in 1 beams
+
+    Scenario: Get summary of labelled observation
+        Given observation metadata exists in the database
+        And candidates with SNRs (6, 7, 8, 9, 10) exist in the database
+        And the candidates are labelled as ("RFI", "RFI", "SINGLE_PULSE")
+        When the summary of observation 1 is retrieved
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the summary should count 5 candidates in 1 beams
+        And the summary should count labels {"RFI": 2, "SINGLE_PULSE": 1}
+        And the summary SNRs should range over (6, 10) with median 8 and 90th percentile 9.6
+
+    Scenario: Get summary after labels are changed and deleted
+        Given observation metadata exists in the database
+        And 3 candidates with single pulse candidates exist in the database
+        And the candidates are labelled as ("RFI", "RFI", "RFI")
+        When the label of candidate 1 is changed to SINGLE_PULSE
+        And the label of candidate 2 is deleted
+        And the summary of observation 1 is retrieved
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the summary should count labels {"RFI": 1, "SINGLE_PULSE": 1}
+
+    Scenario Outline: Get summary after a candidate is updated
+        Given observation metadata exists in the database
+        And candidates with SNRs (6, 7, 8, 9, 10) exist in the database
+        When the SNR of candidate 5 is changed to <snr>
+        And the summary of observation 1 is retrieved
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the summary should count 5 candidates in 1 beams
+        And the summary SNRs should range over <range> with median <median> and 90th percentile <p90>
+
+        Examples:
+        | snr | range   | median | p90  |
+        | 20  | (6, 20) | 8      | 15.6 |
+        | 7   | (6, 9)  | 7      | 8.6  |
+
+    Scenario: Get summary after a candidate is deleted
+        Given observation metadata exists in the database
+        And candidates with SNRs (6, 7, 8, 9, 10) exist in the database
+        And the candidates are labelled as ("RFI",)
+        When candidate 5 is deleted
+        And the summary of observation 1 is retrieved
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the summary should count 4 candidates in 1 beams
+        And the summary should count labels {"RFI": 1}
+        And the summary SNRs should range over (6, 9) with median 7.5 and 90th percentile 8.7
+
+    Scenario: Get summary after every candidate is deleted
+        Given observation metadata exists in the database
+        And candidates with SNRs (6,) exist in the database
+        When candidate 1 is deleted
+        And the summary of observation 1 is retrieved
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the summary should count 0 candidates in 0 beams
+
+    Scenario: Get summary of observation without candidates
+        Given observation metadata exists in the database
+        When the summary of observation 1 is retrieved
+        Then a response should be returned
+        And the status code should be HTTP 200
+        And the summary should count 0 candidates in 0 beams
+
+    Scenario: Get summary of non-existent observation
+        Given an empty database
+        When the summary of observation 1 is retrieved
+        Then an error response should be returned
+        And the status code should be HTTP 404
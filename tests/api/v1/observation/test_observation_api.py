@@ -2,14 +2,241 @@
 
 # ruff: noqa: D103, PLR2004
 
+import ast
+import json
 from typing import Any
 
-from pytest_bdd import parsers, scenarios, then
-from ska_src_maltopuft_backend.observation.responses import Observation
+import pytest
+import sqlalchemy as sa
+from fastapi.testclient import TestClient
+from pytest_bdd import given, parsers, scenarios, then, when
+from ska_src_maltopuft_backend.app.models import (
+    Candidate,
+    Catalogue,
+    KnownPulsar,
+    Label,
+)
+from ska_src_maltopuft_backend.observation.responses import (
+    Observation,
+    ObservationSources,
+    ObservationSummary,
+)
+from sqlalchemy.orm import Session
+
+from tests.api.v1.datagen import (
+    candidate_data_generator,
+    entity_data_generator,
+    label_data_generator,
+    sp_candidate_data_generator,
+    user_data_generator,
+)
+from tests.catalogue.datagen import (
+    catalogue_data_generator,
+    pulsar_data_generator,
+)
 
 scenarios("./observation_api.feature")
 
 
+@given(parsers.parse("a known pulsar at {position}"))
+def known_pulsar_at_position(db: Session, position: str) -> None:
+    ra, dec = ast.literal_eval(position)
+    catalogue = Catalogue(**catalogue_data_generator())
+    db.add(catalogue)
+    db.commit()
+    db.add(
+        KnownPulsar(
+            **pulsar_data_generator(
+                ra=ra,  # type: ignore[arg-type]
+                dec=dec,  # type: ignore[arg-type]
+                catalogue_id=catalogue.id,  # type: ignore[arg-type]
+            ),
+        ),
+    )
+    db.commit()
+
+
+def create_candidates(
+    client: TestClient,
+    result: dict[str, Any],
+    candidates: list[dict[str, Any]],
+) -> None:
+    """Create candidates with single pulse candidates in bulk and store
+    their ids in the 'result' fixture.
+    """
+    response = client.post(
+        url="/v1/candle/bulk",
+        content="\n".join(
+            json.dumps(
+                {
+                    **cand,
+                    "plot_path": sp_candidate_data_generator()["plot_path"],
+                },
+            )
+            for cand in candidates
+        ),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 201
+    assert response.json()["created"] == len(candidates)
+    result["candidate_ids"] = response.json()["ids"]
+    result["sp_candidate_ids"] = response.json()["sp_candidate_ids"]
+
+
+def entity_id(
+    client: TestClient,
+    result: dict[str, Any],
+    type_: str,
+) -> int:
+    """Return the id of an entity type, creating the entity if it doesn't
+    exist.
+    """
+    entity_ids = result.setdefault("entity_ids", {})
+    if type_ not in entity_ids:
+        response = client.post(
+            url="/v1/labels/entity",
+            json=entity_data_generator(type_=type_),
+        )
+        assert response.status_code == 201
+        entity_ids[type_] = response.json()["id"]
+    return entity_ids[type_]
+
+
+@given(
+    parsers.parse(
+        "{num:d} candidates with single pulse candidates exist in the "
+        "database",
+    ),
+)
+def candidates_exist(
+    client: TestClient,
+    result: dict[str, Any],
+    num: int,
+) -> None:
+    create_candidates(
+        client=client,
+        result=result,
+        candidates=[candidate_data_generator() for _ in range(num)],
+    )
+
+
+@given(parsers.parse("candidates with SNRs {snrs} exist in the database"))
+def candidates_with_snrs_exist(
+    client: TestClient,
+    result: dict[str, Any],
+    snrs: str,
+) -> None:
+    create_candidates(
+        client=client,
+        result=result,
+        candidates=[
+            candidate_data_generator(snr=snr)
+            for snr in ast.literal_eval(snrs)
+        ],
+    )
+
+
+@given(parsers.parse("the candidates are labelled as {entities}"))
+def candidates_are_labelled(
+    client: TestClient,
+    result: dict[str, Any],
+    entities: str,
+) -> None:
+    client.post(url="/v1/users", json=user_data_generator())
+    labels = [
+        label_data_generator(
+            candidate_id=candidate_id,
+            entity_id=entity_id(client=client, result=result, type_=type_),
+        )
+        for candidate_id, type_ in zip(
+            result["candidate_ids"],
+            ast.literal_eval(entities),
+            strict=False,
+        )
+    ]
+    response = client.post(url="/v1/labels", json=labels)
+    assert response.status_code == 201
+    result["label_ids"] = response.json()["ids"]
+
+
+@when(parsers.parse("the summary of observation {id_:d} is retrieved"))
+def do_get_obs_summary(
+    client: TestClient,
+    result: dict[str, Any],
+    id_: int,
+) -> None:
+    result["result"] = client.get(url=f"/v1/obs/{id_}/summary")
+
+
+@when(
+    parsers.parse("the label of candidate {num:d} is changed to {type_}"),
+)
+def do_change_label(
+    client: TestClient,
+    result: dict[str, Any],
+    num: int,
+    type_: str,
+) -> None:
+    response = client.put(
+        url=f"/v1/labels/{result['label_ids'][num - 1]}",
+        json={
+            "entity_id": entity_id(client=client, result=result, type_=type_),
+        },
+    )
+    assert response.status_code == 200
+
+
+@when(parsers.parse("the label of candidate {num:d} is deleted"))
+def do_delete_label(db: Session, result: dict[str, Any], num: int) -> None:
+    label_id = result["label_ids"][num - 1]
+    db.execute(sa.delete(Label).where(Label.id == label_id))
+    db.commit()
+
+
+@when(parsers.parse("the SNR of candidate {num:d} is changed to {snr:g}"))
+def do_change_candidate_snr(
+    db: Session,
+    result: dict[str, Any],
+    num: int,
+    snr: float,
+) -> None:
+    db.execute(
+        sa.update(Candidate)
+        .where(Candidate.id == result["candidate_ids"][num - 1])
+        .values(snr=snr),
+    )
+    db.commit()
+
+
+@when(parsers.parse("candidate {num:d} is deleted"))
+def do_delete_candidate(
+    client: TestClient,
+    result: dict[str, Any],
+    num: int,
+) -> None:
+    sp_candidate_id = result["sp_candidate_ids"][num - 1]
+    candidate_id = result["candidate_ids"][num - 1]
+    assert client.delete(url=f"/v1/candle/sp/{sp_candidate_id}").is_success
+    assert client.delete(url=f"/v1/candle/{candidate_id}").is_success
+
+
+@when(
+    parsers.parse(
+        "the known sources within {radius:g} degree of the observations are "
+        "retrieved",
+    ),
+)
+def do_get_obs_sources(
+    client: TestClient,
+    result: dict[str, Any],
+    radius: float,
+) -> None:
+    result["result"] = client.get(
+        url="/v1/obs/sources",
+        params={"radius": radius},
+    )
+
+
 @then(parsers.parse("the response data should contain {num:d} observations"))
 def response_data_has_num_obs(result: dict[str, Any], num: int) -> None:
     response = result.get("response")
@@ -24,3 +251,66 @@ def response_data_has_num_obs(result: dict[str, Any], num: int) -> None:
     for d in data:
         obs = Observation(**d)
         assert obs.id is not None
+
+
+@then(parsers.parse("the observations should have {counts} sources"))
+def response_obs_have_num_sources(result: dict[str, Any], counts: str) -> None:
+    response = result.get("response")
+    assert response is not None
+    data = [ObservationSources(**d) for d in response.json()]
+    assert [len(d.sources) for d in data] == list(ast.literal_eval(counts))
+
+
+@then(
+    parsers.parse(
+        "the summary should count {num:d} candidates in {beams:d} beams",
+    ),
+)
+def response_summary_has_num_candidates(
+    result: dict[str, Any],
+    num: int,
+    beams: int,
+) -> None:
+    response = result.get("response")
+    assert response is not None
+    summary = ObservationSummary(**response.json())
+    assert summary.candidate_count == num
+    assert summary.sp_candidate_count == num
+    assert len(summary.beams) == beams
+    assert sum(beam.candidate_count for beam in summary.beams) == num
+
+
+@then(parsers.parse("the summary should count labels {counts}"))
+def response_summary_has_label_counts(
+    result: dict[str, Any],
+    counts: str,
+) -> None:
+    response = result.get("response")
+    assert response is not None
+    summary = ObservationSummary(**response.json())
+    label_counts = ast.literal_eval(counts)
+    assert summary.label_counts == label_counts
+    assert summary.label_count == sum(label_counts.values())
+
+
+@then(
+    parsers.parse(
+        "the summary SNRs should range over {range_} with median {median:g} "
+        "and 90th percentile {p90:g}",
+    ),
+)
+def response_summary_has_snr_statistics(
+    result: dict[str, Any],
+    range_: str,
+    median: float,
+    p90: float,
+) -> None:
+    response = result.get("response")
+    assert response is not None
+    summary = ObservationSummary(**response.json())
+    assert (summary.snr_min, summary.snr_max) == pytest.approx(
+        ast.literal_eval(range_),
+    )
+    [beam] = summary.beams
+    assert beam.snr_median == pytest.approx(median)
+    assert beam.snr_p90 == pytest.approx(p90)
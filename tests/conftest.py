@@ -8,11 +8,12 @@ import ast
 import datetime as dt
 import os
 import uuid
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from typing import Any
 from unittest.mock import AsyncMock
 
 import pytest
+import pytest_asyncio
 import sqlalchemy as sa
 from fastapi import status
 from fastapi.testclient import TestClient
@@ -29,9 +30,13 @@ from ska_src_maltopuft_backend.core.auth import (
 from ska_src_maltopuft_backend.core.database.base import Base
 from ska_src_maltopuft_backend.core.database.database import (
     get_db,
+    get_session,
+    init_async_engine,
     init_engine,
 )
+from ska_src_maltopuft_backend.core.factory import Factory
 from ska_src_maltopuft_backend.core.server import app
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, sessionmaker
 from starlette.authentication import AuthCredentials
 
@@ -48,6 +53,19 @@ def pytest_bdd_apply_tag(tag: str, function: pytest.Item) -> bool | None:
     return None
 
 
+@pytest.fixture(autouse=True)
+def clear_caches() -> Generator[None, None, None]:
+    """Clear the caches shared by controllers after each test.
+
+    Test transactions are rolled back, so cached values could refer to rows
+    which no longer exist and writes never notify the cache's listeners.
+    """
+    yield
+    Factory.crossmatch_cache.invalidate()
+    Factory.latest_observation_cache.invalidate()
+    Factory.entity_cache.invalidate()
+
+
 @pytest.fixture()
 def engine() -> Generator[sa.engine.base.Engine, None, None]:
     """Create a test database engine.
@@ -102,14 +120,37 @@ def db(
             transaction.rollback()
 
 
+@pytest_asyncio.fixture()
+async def async_db(
+    engine: sa.engine.base.Engine,
+) -> AsyncGenerator[AsyncSession, None]:
+    """Create an asyncio database session with transaction rollback.
+
+    The asyncio equivalent of the `db` fixture. The `engine` fixture is
+    requested to (re-)create the database schema before the test.
+    """
+    async_engine = init_async_engine()
+    async with async_engine.connect() as conn:
+        transaction = await conn.begin()
+        db = AsyncSession(bind=conn, expire_on_commit=False)
+
+        try:
+            yield db
+        finally:
+            await db.close()
+            await transaction.rollback()
+    await async_engine.dispose()
+
+
 @pytest.fixture(scope="session")
 def client_with_auth(db: Session) -> Generator[TestClient, None, None]:
     """Create a Fast API test client.
 
-    Overrides `get_db` in the Fast API test client with the `db` fixture which
-    rolls back test transactions. The auth middleware is enabled in the test client.
+    Overrides `get_db` and `get_session` in the Fast API test client with the
+    `db` fixture which rolls back test transactions. The auth middleware is enabled in the test client.
     """
     app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_session] = lambda: db
     with TestClient(app) as c:
         yield c
 
@@ -171,8 +212,8 @@ def client(
 ) -> Generator[TestClient, None, None]:
     """Create a Fast API test client with auth disabled.
 
-    Overrides `get_db` in the Fast API test client with the `db` fixture which
-    rolls back test transactions.
+    Overrides `get_db` and `get_session` in the Fast API test client with the
+    `db` fixture which rolls back test transactions.
 
     The BearerTokenAuthMiddleware is overridden by passing the
     `_mock_authenticate` MockerFixture to the client. Additionally, the
@@ -183,6 +224,7 @@ def client(
     app.dependency_overrides[AuthorizationChecker] = lambda: None
 
     app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_session] = lambda: db
 
     with TestClient(app) as c:
         yield c
@@ -221,6 +263,7 @@ def one_off_test_client(
             db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session] = override_get_db
     app.dependency_overrides[Authenticated] = lambda: None
     app.dependency_overrides[AuthorizationChecker] = lambda: None
 
@@ -366,6 +409,26 @@ def response_data_is_not_empty(result: dict[str, Any]) -> None:
     assert response.json() is not None
 
 
+@then(
+    parsers.parse(
+        "the response should contain {num:d} exported {format_} rows",
+    ),
+)
+def response_has_num_exported_rows(
+    result: dict[str, Any],
+    num: int,
+    format_: str,
+) -> None:
+    """Verify the number of rows in an exported NDJSON or CSV response."""
+    response = result.get("response")
+    assert response is not None
+    lines = response.text.splitlines()
+    if format_ == "csv":
+        # Skip the header row
+        lines = lines[1:]
+    assert len(lines) == num
+
+
 @then("the status code should be HTTP 200")
 def response_status_code_200(result: dict[str, Any]) -> None:
     """Verify the API response has status code 200."""
@@ -390,6 +453,14 @@ def response_status_code_204(result: dict[str, Any]) -> None:
     assert response.status_code == status.HTTP_204_NO_CONTENT
 
 
+@then("the status code should be HTTP 400")
+def response_status_code_400(result: dict[str, Any]) -> None:
+    """Verify the API response has status code 400."""
+    response = result.get("response")
+    assert response is not None
+    assert response.get("status_code") == status.HTTP_400_BAD_REQUEST
+
+
 @then("the status code should be HTTP 404")
 def response_status_code_404(result: dict[str, Any]) -> None:
     """Verify the API response has status code 404."""
@@ -406,6 +477,16 @@ def response_status_code_409(result: dict[str, Any]) -> None:
     assert response.get("status_code") == status.HTTP_409_CONFLICT
 
 
+@then("the status code should be HTTP 415")
+def response_status_code_415(result: dict[str, Any]) -> None:
+    """Verify the API response has status code 415."""
+    response = result.get("response")
+    assert response is not None
+    assert (
+        response.get("status_code") == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+    )
+
+
 @then("the status code should be HTTP 422")
 def response_status_code_422(result: dict[str, Any]) -> None:
     """Verify the API response has status code 422."""
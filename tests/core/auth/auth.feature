@@ -19,3 +19,30 @@ Feature: TokenBearerAuthBackend
         And no authorization header is present in the request
         When the authentication middleware is executed
         Then nothing is returned
+
+    Scenario: Authenticated tokens are cached until they expire
+        Given authentication is enabled
+        And an authentication header with a valid bearer token
+        And the exchanged token expires in 60 seconds
+        When the authentication middleware is executed
+        And the authentication middleware is executed
+        Then the token is exchanged 1 times
+        And the token cache has 1 hits and 1 misses
+
+    Scenario: Expired tokens are not cached
+        Given authentication is enabled
+        And an authentication header with a valid bearer token
+        And the exchanged token expires in -60 seconds
+        When the authentication middleware is executed
+        And the authentication middleware is executed
+        Then the token is exchanged 2 times
+        And the token cache has 0 hits and 2 misses
+
+    Scenario: Users created by a concurrent request are read back
+        Given authentication is enabled
+        And an authentication header with a valid bearer token
+        And the exchanged token expires in 60 seconds
+        And the token user is created by a concurrent request
+        When the authentication middleware is executed
+        Then the user created by the concurrent request is returned
+        And the failed user creation is rolled back
@@ -3,14 +3,23 @@
 # ruff: noqa: D103, SLF001
 
 import asyncio
+import datetime as dt
+import time
+import uuid
 from typing import Any
+from unittest.mock import AsyncMock
 
+import jwt
 import pytest
 from fastapi import status
 from fastapi.responses import JSONResponse
-from pytest_bdd import given, scenarios, then, when
+from pytest_bdd import given, parsers, scenarios, then, when
+from pytest_mock import MockerFixture
+from ska_src_maltopuft_backend.app.models import User
 from ska_src_maltopuft_backend.core.auth import BearerTokenAuthBackend
 from ska_src_maltopuft_backend.core.config import settings
+from ska_src_maltopuft_backend.core.exceptions import AlreadyExistsError
+from sqlalchemy.orm import Session
 from starlette.authentication import AuthenticationError
 
 from tests.extras import build_request
@@ -54,6 +63,62 @@ def no_auth_header(context: dict[str, Any]) -> None:
     context["request"] = build_request()
 
 
+@given(parsers.parse("the exchanged token expires in {seconds:d} seconds"))
+def mock_token_exchange(
+    context: dict[str, Any],
+    auth_backend: BearerTokenAuthBackend,
+    mocker: MockerFixture,
+    seconds: int,
+) -> None:
+    exchanged_token = jwt.encode(
+        {
+            **settings.TEST_SUPERUSER_DECODED_TOKEN,
+            "aud": settings.MALTOPUFT_AUDIENCE,
+            "exp": int(time.time()) + seconds,
+        },
+        key="maltopuft-test-token-signing-key",
+        algorithm="HS256",
+    )
+    context["exchange"] = mocker.patch.object(
+        auth_backend,
+        attribute="_do_exchange_token",
+        side_effect=AsyncMock(return_value=exchanged_token),
+    )
+
+
+@given("the token user is created by a concurrent request")
+def mock_concurrent_user_creation(
+    context: dict[str, Any],
+    auth_backend: BearerTokenAuthBackend,
+    mocker: MockerFixture,
+) -> None:
+    """The token user isn't found, then creating the user fails because a
+    concurrent request created it first.
+    """
+    created_at = dt.datetime.now(tz=dt.timezone.utc) - dt.timedelta(hours=1)
+    context["existing_user"] = User(
+        id=123,
+        uuid=uuid.UUID(settings.TEST_UUID4),
+        username="concurrent-user",
+        is_admin=False,
+        created_at=created_at,
+        updated_at=created_at,
+    )
+    context["db"] = mocker.MagicMock(spec=Session)
+    mocker.patch.object(auth_backend, attribute="db", new=context["db"])
+    user_controller = auth_backend.user_controller
+    mocker.patch.object(
+        user_controller.repository,
+        attribute="get_unique_by",
+        side_effect=AsyncMock(side_effect=[None, context["existing_user"]]),
+    )
+    mocker.patch.object(
+        user_controller,
+        attribute="create",
+        side_effect=AsyncMock(side_effect=AlreadyExistsError),
+    )
+
+
 @when("the authentication middleware is executed")
 def auth_flow(
     context: dict[str, Any],
@@ -115,3 +180,31 @@ def auth_error_response(auth_backend: BearerTokenAuthBackend) -> None:
     response = auth_backend.on_auth_error(exc)
     assert isinstance(response, JSONResponse)
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@then(parsers.parse("the token is exchanged {num:d} times"))
+def check_token_exchange_count(context: dict[str, Any], num: int) -> None:
+    assert context["exchange"].call_count == num
+
+
+@then(parsers.parse("the token cache has {hits:d} hits and {misses:d} misses"))
+def check_token_cache_stats(
+    auth_backend: BearerTokenAuthBackend,
+    hits: int,
+    misses: int,
+) -> None:
+    stats = auth_backend.token_cache.stats()
+    assert stats["hits"] == hits
+    assert stats["misses"] == misses
+
+
+@then("the user created by the concurrent request is returned")
+def check_existing_user_returned(context: dict[str, Any]) -> None:
+    _, user = context["auth_result"]
+    assert user.id == context["existing_user"].id
+    assert user.username == context["existing_user"].username
+
+
+@then("the failed user creation is rolled back")
+def check_user_creation_rolled_back(context: dict[str, Any]) -> None:
+    context["db"].rollback.assert_called_once_with()
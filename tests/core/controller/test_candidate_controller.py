@@ -0,0 +1,99 @@
+"""Candidate controller tests."""
+
+import datetime as dt
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from ska_src_maltopuft_backend.app.schemas.requests import (
+    CandidateCrossMatchQueryParams,
+)
+from ska_src_maltopuft_backend.app.schemas.responses import KnownPulsar
+from ska_src_maltopuft_backend.candle.controller import CandidateController
+from ska_src_maltopuft_backend.catalogue import models
+from ska_src_maltopuft_backend.core.cache import TTLCache
+from ska_src_maltopuft_backend.core.factory import Factory
+from sqlalchemy.orm import Session
+
+
+@pytest.fixture()
+def controller() -> CandidateController:
+    """Candidate controller fixture."""
+    return Factory().get_candidate_controller()
+
+
+def _partition_exists(db: Session, name: str) -> bool:
+    return db.execute(
+        sa.text("SELECT to_regclass(:name) IS NOT NULL"),
+        {"name": name},
+    ).scalar_one()
+
+
+@pytest.mark.asyncio()
+async def test_upcoming_partitions_are_created(
+    db: Session,
+    controller: CandidateController,
+) -> None:
+    """The partitions of the current month and the upcoming months should
+    be created, and creating them again should succeed.
+    """
+    await controller.create_upcoming_partitions(db=db, months=1)
+    await controller.create_upcoming_partitions(db=db, months=1)
+
+    month = dt.datetime.now(tz=dt.timezone.utc).replace(day=1)
+    next_month = (month + dt.timedelta(days=32)).replace(day=1)
+    for table in ("candidate", "sp_candidate"):
+        for month_at in (month, next_month):
+            assert _partition_exists(
+                db=db,
+                name=f"{table}_{month_at:%Y_%m}",
+            )
+
+
+@pytest.mark.asyncio()
+async def test_crossmatches_are_cached_without_orm_objects(
+    controller: CandidateController,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Cached cross-matches should hold known pulsar response models, not
+    ORM objects bound to the session which loaded them.
+    """
+    created_at = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+    known_pulsar = models.KnownPulsar(
+        id=1,
+        name="J0000+0000",
+        dm=10.0,
+        width=None,
+        ra=10.0,
+        dec=-10.0,
+        period=None,
+        created_at=created_at,
+        updated_at=created_at,
+    )
+
+    async def crossmatch(**_: Any) -> list[SimpleNamespace]:
+        return [
+            SimpleNamespace(
+                candidate_id=1,
+                observation_id=1,
+                beam_id=1,
+                separation=0.01,
+                dm_difference=0.5,
+                KnownPulsar=known_pulsar,
+            ),
+        ]
+
+    controller.crossmatch_cache = TTLCache(name="test", ttl=60, max_size=1)
+    monkeypatch.setattr(controller.repository, "crossmatch", crossmatch)
+    q = CandidateCrossMatchQueryParams(
+        observation_id=[1],
+        beam_id=[],
+        radius=0.1,
+        dm_tolerance=5.0,
+    )
+
+    [match] = await controller.crossmatch(db=None, q=q)
+    assert type(match.known_pulsar) is KnownPulsar
+    assert await controller.crossmatch(db=None, q=q) == [match]
+    assert controller.crossmatch_cache.stats()["hits"] == 1
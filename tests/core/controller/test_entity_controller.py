@@ -0,0 +1,60 @@
+"""Entity controller tests."""
+
+import pytest
+from ska_src_maltopuft_backend.core.cache import TTLCache
+from ska_src_maltopuft_backend.core.factory import Factory
+from ska_src_maltopuft_backend.label.controller import EntityController
+from sqlalchemy.orm import Session
+
+from tests.api.v1.datagen import entity_data_generator
+
+
+@pytest.fixture()
+def controller() -> EntityController:
+    """Entity controller fixture with its own entity cache."""
+    controller = Factory().get_entity_controller()
+    controller.entity_cache = TTLCache(name="test", ttl=60, max_size=1)
+    return controller
+
+
+@pytest.mark.asyncio()
+async def test_entities_are_cached(
+    db: Session,
+    controller: EntityController,
+) -> None:
+    """Entities should be read from the database once and then from the
+    cache.
+    """
+    entity = await controller.create(
+        db=db,
+        attributes=entity_data_generator(type_="RFI"),
+    )
+
+    entities = await controller.get_entities(db=db)
+    assert entities[entity.id].type == entity.type
+    assert await controller.get_entities(db=db) is entities
+    assert controller.entity_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio()
+async def test_create_entity_invalidates_cache(
+    db: Session,
+    controller: EntityController,
+) -> None:
+    """Creating an entity should clear the cached entities so that the new
+    entity is listed.
+    """
+    rfi = await controller.create(
+        db=db,
+        attributes=entity_data_generator(type_="RFI"),
+    )
+    assert set(await controller.get_entities(db=db)) == {rfi.id}
+
+    single_pulse = await controller.create(
+        db=db,
+        attributes=entity_data_generator(type_="SINGLE_PULSE"),
+    )
+    assert set(await controller.get_entities(db=db)) == {
+        rfi.id,
+        single_pulse.id,
+    }
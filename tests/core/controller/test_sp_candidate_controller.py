@@ -0,0 +1,65 @@
+"""Single pulse candidate controller tests."""
+
+#  ruff: noqa: SLF001, PLR2004
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from ska_src_maltopuft_backend.candle.controller import SPCandidateController
+from ska_src_maltopuft_backend.core.cache import TTLCache
+from ska_src_maltopuft_backend.core.factory import Factory
+from sqlalchemy.orm import Session
+
+
+@pytest.fixture()
+def controller() -> SPCandidateController:
+    """Single pulse candidate controller fixture with a mocked observation
+    controller and its own latest observation cache.
+    """
+    controller = Factory().get_sp_candidate_controller()
+    controller.observation_controller = AsyncMock()
+    controller.latest_observation_cache = TTLCache(
+        name="test",
+        ttl=60,
+        max_size=1,
+    )
+    return controller
+
+
+@pytest.mark.asyncio()
+async def test_latest_observation_id_is_cached(
+    db: Session,
+    controller: SPCandidateController,
+) -> None:
+    """The latest observation should only be queried once until the cache
+    is invalidated.
+    """
+    get_all = controller.observation_controller.get_all
+    get_all.return_value = [SimpleNamespace(id=1)]
+
+    assert await controller._get_latest_observation_id(db=db) == 1
+    assert await controller._get_latest_observation_id(db=db) == 1
+    get_all.assert_awaited_once()
+
+    get_all.return_value = [SimpleNamespace(id=2)]
+    controller.latest_observation_cache.invalidate()
+    assert await controller._get_latest_observation_id(db=db) == 2
+    assert get_all.await_count == 2
+
+
+@pytest.mark.asyncio()
+async def test_missing_latest_observation_is_not_cached(
+    db: Session,
+    controller: SPCandidateController,
+) -> None:
+    """A missing latest observation should be queried again so that the
+    first observation is found as soon as it's written.
+    """
+    get_all = controller.observation_controller.get_all
+    get_all.return_value = []
+
+    assert await controller._get_latest_observation_id(db=db) is None
+    get_all.return_value = [SimpleNamespace(id=1)]
+    assert await controller._get_latest_observation_id(db=db) == 1
+    assert get_all.await_count == 2
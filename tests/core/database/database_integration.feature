@@ -17,3 +17,38 @@ Feature: Backend-database connection
     Scenario: Connection to invalid database user
         Given an invalid database user in the connection string
         Then a 'Database unavailable' error message is raised
+
+    Scenario: Importing the application doesn't create database engines
+        Given the application is imported in a new process
+        Then no database engine should be initialised
+
+    Scenario: Application lifespan manages database engines
+        When the application starts and stops
+        Then the database engines should be initialised on startup
+        And the database engines should be disposed on shutdown
+
+    Scenario: Pool status doesn't create database engines
+        Given no database engines are initialised
+        When the connection pool status is requested
+        Then no connection pools should be reported
+        And no database engine should be created
+
+    Scenario Outline: Short-lived sessions match the session setting
+        Given the asyncio database session setting is <async>
+        When a short-lived session is opened
+        Then the session should be a <session_type>
+
+        Examples:
+            | async | session_type |
+            | 0     | Session      |
+            | 1     | AsyncSession |
+
+    Scenario Outline: Only the engine of the session setting is initialised
+        Given the asyncio database session setting is <async>
+        When the database engines are initialised
+        Then only the <engine> engine should be created
+
+        Examples:
+            | async | engine |
+            | 0     | sync   |
+            | 1     | async  |
@@ -2,15 +2,32 @@
 
 # ruff: noqa: D103
 
+import asyncio
+import subprocess
+import sys
+from typing import Any
+
 import fastapi
 import pytest
 import sqlalchemy
-from pytest_bdd import given, scenarios, then
+from fastapi.testclient import TestClient
+from pytest_bdd import given, parsers, scenarios, then, when
 from ska_src_maltopuft_backend.core.config import settings
 from ska_src_maltopuft_backend.core.database.database import (
+    engines,
+    get_pool_status,
     init_engine,
     ping_db,
+    session_scope,
 )
+from ska_src_maltopuft_backend.core.server import app
+
+# Prints whether importing the application initialised an engine
+IMPORT_APP = """
+from ska_src_maltopuft_backend.core.database.database import engines
+import ska_src_maltopuft_backend.core.server
+print(engines._engine is not None or engines._async_engine is not None)
+"""
 
 scenarios("./database_integration.feature")
 
@@ -57,11 +74,114 @@ def invalid_database_user_in_conn_string(
     )
 
 
+@given(
+    "the application is imported in a new process",
+    target_fixture="imported_engines",
+)
+def import_app() -> str:
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", IMPORT_APP],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return result.stdout.strip()
+
+
+@given("no database engines are initialised")
+def no_engines() -> None:
+    asyncio.run(engines.dispose())
+
+
+@given(
+    parsers.parse("the asyncio database session setting is {async_:d}"),
+)
+def session_setting(monkeypatch: pytest.MonkeyPatch, async_: int) -> None:
+    monkeypatch.setattr(settings, "MALTOPUFT_POSTGRES_ASYNC", async_)
+
+
+##############################################################################
+# When steps #################################################################
+##############################################################################
+
+
+@when(
+    "the connection pool status is requested",
+    target_fixture="pool_status",
+)
+def request_pool_status() -> list[dict[str, Any]]:
+    return get_pool_status()
+
+
+@when("a short-lived session is opened", target_fixture="session_type")
+def open_session_scope() -> str:
+    async def _open() -> str:
+        async with session_scope() as db:
+            return type(db).__name__
+
+    try:
+        return asyncio.run(_open())
+    finally:
+        asyncio.run(engines.dispose())
+
+
+@when("the database engines are initialised", target_fixture="pool_names")
+def init_engines() -> list[str]:
+    engines.init()
+    try:
+        return list(engines.pools())
+    finally:
+        asyncio.run(engines.dispose())
+
+
+@when("the application starts and stops", target_fixture="lifespan_engines")
+def start_and_stop_app() -> dict[str, bool]:
+    with TestClient(app):
+        started = engines._engine is not None  # noqa: SLF001
+    stopped = engines._engine is None  # noqa: SLF001
+    return {"started": started, "stopped": stopped}
+
+
 ##############################################################################
 # Then steps #################################################################
 ##############################################################################
 
 
+@then("no database engine should be initialised")
+def engines_not_initialised(imported_engines: str) -> None:
+    assert imported_engines == "False"
+
+
+@then("no connection pools should be reported")
+def no_pools_reported(pool_status: list[dict[str, Any]]) -> None:
+    assert pool_status == []
+
+
+@then("no database engine should be created")
+def no_engine_created() -> None:
+    assert engines.pools() == {}
+
+
+@then(parsers.parse("only the {engine} engine should be created"))
+def only_engine_created(pool_names: list[str], engine: str) -> None:
+    assert pool_names == [engine]
+
+
+@then(parsers.parse("the session should be a {expected}"))
+def session_is_expected_type(session_type: str, expected: str) -> None:
+    assert session_type == expected
+
+
+@then("the database engines should be initialised on startup")
+def engines_initialised(lifespan_engines: dict[str, bool]) -> None:
+    assert lifespan_engines["started"]
+
+
+@then("the database engines should be disposed on shutdown")
+def engines_disposed(lifespan_engines: dict[str, bool]) -> None:
+    assert lifespan_engines["stopped"]
+
+
 @then("a minimal database operation should return a valid result")
 def result_object_is_returned() -> None:
     result = ping_db()
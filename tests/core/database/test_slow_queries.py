@@ -0,0 +1,156 @@
+"""Slow query log tests."""
+
+# ruff: noqa: D103, PLR2004
+
+from collections.abc import Generator
+
+import pytest
+import sqlalchemy as sa
+from fastapi import FastAPI
+from fastapi.middleware import Middleware
+from fastapi.testclient import TestClient
+from ska_src_maltopuft_backend.core.database.slow_queries import (
+    SlowQueryLog,
+    SlowQueryMiddleware,
+    parameter_shape,
+)
+from ska_src_maltopuft_backend.core.metrics import query_source
+from ska_src_maltopuft_backend.label.models import Entity
+from sqlalchemy.orm import Session
+
+
+def make_log(
+    engine: sa.engine.Engine,
+    threshold_ms: float = 1e-9,
+    explain_interval: float = 60,
+) -> SlowQueryLog:
+    log = SlowQueryLog(
+        threshold_ms=threshold_ms,
+        max_size=2,
+        explain_interval=explain_interval,
+    )
+    log.register(engine)
+    return log
+
+
+@pytest.fixture()
+def sqlite_engine() -> Generator[sa.engine.Engine, None, None]:
+    engine = sa.create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+def test_slow_statements_are_recorded(
+    sqlite_engine: sa.engine.Engine,
+) -> None:
+    log = make_log(sqlite_engine)
+    with sqlite_engine.connect() as conn, query_source(
+        "TestRepository",
+        "get_all",
+    ):
+        conn.execute(sa.select(sa.literal(1).label("one")))
+
+    [entry] = log.entries()
+    assert entry.statement.startswith("SELECT")
+    assert (entry.repository, entry.method) == ("TestRepository", "get_all")
+    assert entry.route is None
+    assert entry.duration_ms > 0
+
+
+def test_slow_statements_are_recorded_with_route(
+    sqlite_engine: sa.engine.Engine,
+) -> None:
+    log = make_log(sqlite_engine)
+    app = FastAPI(middleware=[Middleware(SlowQueryMiddleware)])
+
+    @app.get("/slow/{id_}")
+    async def slow(id_: int) -> dict:
+        with sqlite_engine.connect() as conn:
+            conn.execute(sa.select(sa.literal(id_)))
+        return {}
+
+    assert TestClient(app).get("/slow/1").status_code == 200
+    assert [entry.route for entry in log.entries()] == ["GET /slow/{id_}"]
+
+
+def test_fast_statements_are_not_recorded(
+    sqlite_engine: sa.engine.Engine,
+) -> None:
+    log = make_log(sqlite_engine, threshold_ms=60_000)
+    with sqlite_engine.connect() as conn:
+        conn.execute(sa.select(sa.literal(1)))
+
+    assert log.entries() == []
+
+
+def test_disabled_log_does_not_record(
+    sqlite_engine: sa.engine.Engine,
+) -> None:
+    log = make_log(sqlite_engine, threshold_ms=0)
+    with sqlite_engine.connect() as conn:
+        conn.execute(sa.select(sa.literal(1)))
+
+    assert not log.enabled
+    assert log.entries() == []
+
+
+def test_log_keeps_latest_statements(sqlite_engine: sa.engine.Engine) -> None:
+    log = make_log(sqlite_engine, explain_interval=0)
+    with sqlite_engine.connect() as conn:
+        for value in range(3):
+            conn.execute(sa.text(f"SELECT {value}"))
+
+    assert [entry.statement for entry in log.entries()] == [
+        "SELECT 2",
+        "SELECT 1",
+    ]
+
+
+def test_failed_statements_are_not_recorded(
+    sqlite_engine: sa.engine.Engine,
+) -> None:
+    log = make_log(sqlite_engine, explain_interval=0)
+    with sqlite_engine.connect() as conn:
+        with pytest.raises(sa.exc.OperationalError):
+            conn.execute(sa.text("SELECT missing FROM missing"))
+        conn.execute(sa.text("SELECT 1"))
+        assert "slow_query_started_at" not in conn.info
+
+    assert [entry.statement for entry in log.entries()] == ["SELECT 1"]
+
+def test_failed_explain_does_not_abort_transaction(
+    sqlite_engine: sa.engine.Engine,
+) -> None:
+    """SQLite can't EXPLAIN (ANALYZE, BUFFERS), so the plan isn't recorded
+    but the connection's transaction can still be used.
+    """
+    log = make_log(sqlite_engine)
+    with sqlite_engine.connect() as conn:
+        conn.execute(sa.select(sa.literal(1)))
+        assert conn.execute(sa.select(sa.literal(2))).scalar_one() == 2
+
+    assert [entry.plan for entry in log.entries()] == [None, None]
+
+
+def test_parameter_shape_omits_values() -> None:
+    assert parameter_shape({"id_1": 3, "type_1": ["RFI", "SINGLE_PULSE"]}) == {
+        "id_1": "int",
+        "type_1": "list[2]",
+    }
+    assert parameter_shape([{"id": 1}, {"id": 2}]) == [
+        {"id": "int"},
+        "... 2 parameter sets",
+    ]
+
+
+def test_select_statements_are_explained(db: Session) -> None:
+    log = make_log(db.get_bind().engine)
+
+    db.execute(sa.select(Entity).where(Entity.type == "RFI")).all()
+    assert db.execute(sa.select(sa.func.count(Entity.id))).scalar_one() == 0
+
+    count, select = log.entries()
+    assert select.parameters == {"type_1": "str"}
+    assert "actual time" in select.plan
+    assert "Buffers" in select.plan
+    assert count.plan is not None
@@ -0,0 +1,196 @@
+"""Application metrics tests."""
+
+# ruff: noqa: D103, PLR2004
+
+import os
+
+import pytest
+import sqlalchemy as sa
+from fastapi import FastAPI
+from fastapi.middleware import Middleware
+from fastapi.testclient import TestClient
+from ska_src_maltopuft_backend.core.cache import TTLCache
+from ska_src_maltopuft_backend.core.metrics import (
+    CACHE_HITS,
+    CACHE_MISSES,
+    QUERY_DURATION,
+    REQUEST_DURATION,
+    Counter,
+    Histogram,
+    MetricsMiddleware,
+    MetricsRegistry,
+    instrument_repository,
+)
+
+
+def sample(lines: list[str], prefix: str) -> str:
+    """Return the value of the exposition line starting with prefix."""
+    return next(line for line in lines if line.startswith(prefix)).split()[-1]
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    histogram = Histogram(
+        "test_duration_seconds",
+        "Test durations.",
+        labelnames=("route",),
+        buckets=(0.1, 1.0),
+    )
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(value, route="/a")
+
+    lines = list(histogram.collect())
+    assert lines[:2] == [
+        "# HELP test_duration_seconds Test durations.",
+        "# TYPE test_duration_seconds histogram",
+    ]
+    assert lines[2:] == [
+        'test_duration_seconds_bucket{route="/a",le="0.1"} 2',
+        'test_duration_seconds_bucket{route="/a",le="1.0"} 3',
+        'test_duration_seconds_bucket{route="/a",le="+Inf"} 4',
+        'test_duration_seconds_sum{route="/a"} 5.65',
+        'test_duration_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_counter_label_values_are_escaped() -> None:
+    counter = Counter("test_total", "Test events.", labelnames=("name",))
+    counter.inc(name='a "quoted"\\name')
+    counter.inc(2, name='a "quoted"\\name')
+
+    assert list(counter.collect())[-1] == (
+        'test_total{name="a \\"quoted\\"\\\\name"} 3.0'
+    )
+
+
+def test_samples_are_labelled_by_worker() -> None:
+    registry = MetricsRegistry()
+    counter = registry.register(
+        Counter("test_total", "Test events.", labelnames=("name",)),
+    )
+    counter.inc(name="a")
+
+    assert registry.render().splitlines()[-1] == (
+        f'test_total{{name="a",worker="{os.getpid()}"}} 1.0'
+    )
+
+
+def test_reset_discards_values() -> None:
+    registry = MetricsRegistry()
+    counter = registry.register(
+        Counter("test_total", "Test events.", labelnames=("name",)),
+    )
+    histogram = registry.register(
+        Histogram(
+            "test_duration_seconds",
+            "Test durations.",
+            labelnames=("route",),
+        ),
+    )
+    counter.inc(name="a")
+    histogram.observe(0.5, route="/a")
+
+    registry.reset()
+    assert registry.render().splitlines() == [
+        "# HELP test_total Test events.",
+        "# TYPE test_total counter",
+        "# HELP test_duration_seconds Test durations.",
+        "# TYPE test_duration_seconds histogram",
+    ]
+
+
+def test_requests_are_labelled_by_route_template() -> None:
+    app = FastAPI(middleware=[Middleware(MetricsMiddleware)])
+
+    @app.get("/metrics-test/{id_}")
+    async def read(id_: int) -> dict:
+        return {"id": id_}
+
+    client = TestClient(app)
+    for id_ in (1, 2):
+        assert client.get(f"/metrics-test/{id_}").status_code == 200
+    assert client.get("/metrics-test-missing").status_code == 404
+
+    lines = list(REQUEST_DURATION.collect())
+    assert (
+        sample(
+            lines,
+            "maltopuft_http_request_duration_seconds_count"
+            '{method="GET",route="/metrics-test/{id_}",status="200"}',
+        )
+        == "2"
+    )
+    assert not any("/metrics-test/1" in line for line in lines)
+    assert any(
+        'route="unmatched",status="404"' in line and "_count" in line
+        for line in lines
+    )
+
+
+@pytest.mark.asyncio()
+async def test_statements_are_attributed_to_repository_methods() -> None:
+    engine = sa.create_engine("sqlite://")
+
+    class MetricsTestRepository:
+        async def select_one(self) -> int:
+            with engine.connect() as conn:
+                return conn.execute(sa.text("SELECT 1")).scalar_one()
+
+    instrument_repository(MetricsTestRepository)
+    assert await MetricsTestRepository().select_one() == 1
+
+    assert (
+        sample(
+            list(QUERY_DURATION.collect()),
+            "maltopuft_db_query_duration_seconds_count"
+            '{repository="MetricsTestRepository",method="select_one"}',
+        )
+        == "1"
+    )
+
+
+@pytest.mark.asyncio()
+async def test_failed_statements_are_not_timed() -> None:
+    engine = sa.create_engine("sqlite://")
+
+    class FailedMetricsTestRepository:
+        async def select(self) -> int:
+            with engine.connect() as conn:
+                with pytest.raises(sa.exc.OperationalError):
+                    conn.execute(sa.text("SELECT missing FROM missing"))
+                result = conn.execute(sa.text("SELECT 1")).scalar_one()
+                assert "query_started_at" not in conn.info
+                return result
+
+    instrument_repository(FailedMetricsTestRepository)
+    assert await FailedMetricsTestRepository().select() == 1
+
+    assert (
+        sample(
+            list(QUERY_DURATION.collect()),
+            "maltopuft_db_query_duration_seconds_count"
+            '{repository="FailedMetricsTestRepository",method="select"}',
+        )
+        == "1"
+    )
+
+def test_cache_lookups_are_counted_by_cache() -> None:
+    cache = TTLCache(name="metrics_test", ttl=60, max_size=1)
+    cache.get("a")
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+
+    assert (
+        sample(
+            list(CACHE_HITS.collect()),
+            'maltopuft_cache_hits_total{cache="metrics_test"}',
+        )
+        == "2.0"
+    )
+    assert (
+        sample(
+            list(CACHE_MISSES.collect()),
+            'maltopuft_cache_misses_total{cache="metrics_test"}',
+        )
+        == "1.0"
+    )
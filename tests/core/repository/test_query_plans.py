@@ -0,0 +1,269 @@
+"""Query plan regression tests for the candidate filter indexes."""
+
+#  ruff: noqa: PLR2004
+
+import asyncio
+import datetime as dt
+import json
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from pytest_mock import MockerFixture
+from ska_src_maltopuft_backend.app.models import Candidate, SPCandidate
+from ska_src_maltopuft_backend.candle.partitions import CREATE_PARTITIONS
+from ska_src_maltopuft_backend.candle.router import CANDIDATE_KEYSET
+from ska_src_maltopuft_backend.core.factory import Factory
+from ska_src_maltopuft_backend.label.router import LABEL_LOAD
+from sqlalchemy import Executable
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from tests.observation import datagen
+
+SP_CANDIDATE_JOINS = [
+    "candidate",
+    "beam",
+    "host",
+    "observation",
+    "schedule_block",
+]
+
+# The repository method calls made by listing endpoints, with the query
+# parameters of a request filtering by a foreign key or column
+QUERY_PLANS: list[
+    tuple[str, Callable[[Session], Coroutine[Any, Any, Any]], str]
+] = [
+    (
+        "sp candidates of a beam in time order",
+        lambda db: Factory.sp_candidate_repository().get_all(
+            db=db,
+            join_=SP_CANDIDATE_JOINS,
+            q={"beam_id": [1]},
+            keyset_=CANDIDATE_KEYSET,
+            load_=["candidate"],
+        ),
+        "candidate_beam_id_observed_at_idx",
+    ),
+    (
+        "sp candidates of an observation",
+        lambda db: Factory.sp_candidate_repository().get_all(
+            db=db,
+            join_=SP_CANDIDATE_JOINS,
+            q={"observation_id": [1]},
+            keyset_=CANDIDATE_KEYSET,
+            load_=["candidate"],
+        ),
+        "beam_observation_id_idx",
+    ),
+    (
+        "labels of a candidate",
+        lambda db: Factory.label_repository().get_all(
+            db=db,
+            join_=["candidate"],
+            q={"candidate_id": [1]},
+            load_=LABEL_LOAD,
+        ),
+        "label_candidate_id_idx",
+    ),
+    (
+        "labels of a labeller",
+        lambda db: Factory.label_repository().get_all(
+            db=db,
+            join_=["candidate"],
+            q={"labeller_id": [1]},
+            load_=LABEL_LOAD,
+        ),
+        "label_labeller_id_key",
+    ),
+    (
+        "latest observation",
+        lambda db: Factory.observation_repository().get_all(
+            db=db,
+            order_={"desc": ["t_min"]},
+            q={"skip": 0, "limit": 1},
+        ),
+        "observation_t_min_key",
+    ),
+    (
+        "unclustered candidates",
+        lambda db: Factory.candidate_repository().get_unclustered_ids(
+            db=db,
+            limit=100,
+        ),
+        "candidate_unclustered_id_idx",
+    ),
+]
+
+
+def _executed_query(
+    mocker: MockerFixture,
+    call: Callable[[Session], Coroutine[Any, Any, Any]],
+) -> Executable:
+    """Return the statement executed by a repository method call."""
+    recorder = mocker.MagicMock(spec=Session)
+    asyncio.run(call(recorder))
+    return recorder.execute.call_args.args[0]
+
+
+def _index_names(plan: dict[str, Any]) -> set[str]:
+    """Return the names of the indexes scanned by a query plan node and its
+    children.
+    """
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= _index_names(child)
+    return names
+
+
+def _explain(
+    db: Session,
+    query: Executable,
+    *,
+    analyze: bool = False,
+) -> dict[str, Any]:
+    """Return the plan of a query, with its execution statistics if
+    analyzed.
+    """
+    sql = query.compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"literal_binds": True},
+    )
+    options = "ANALYZE, FORMAT JSON" if analyze else "FORMAT JSON"
+    plan = db.execute(sa.text(f"EXPLAIN ({options}) {sql}")).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def _scanned_indexes(db: Session, query: Executable) -> set[str]:
+    """Return the names of the indexes scanned by a query, including the
+    partitioned indexes of scanned partition indexes.
+    """
+    names = _index_names(_explain(db=db, query=query))
+    if not names:
+        return names
+    ancestors = db.execute(
+        sa.text(
+            "SELECT ancestor.relid::regclass::text "
+            "FROM unnest(CAST(:names AS text[])) AS name, "
+            "pg_partition_ancestors(to_regclass(name)) AS ancestor",
+        ),
+        {"names": sorted(names)},
+    ).scalars()
+    return names | set(ancestors)
+
+
+@pytest.mark.parametrize(
+    ("description", "call", "index"),
+    QUERY_PLANS,
+    ids=[description for description, _, _ in QUERY_PLANS],
+)
+def test_query_uses_index(
+    db: Session,
+    mocker: MockerFixture,
+    description: str,  # noqa: ARG001
+    call: Callable[[Session], Coroutine[Any, Any, Any]],
+    index: str,
+) -> None:
+    """Given the query executed by a repository method for a listing
+    request,
+    When the query is planned without sequential scans,
+    Then the plan should scan the index which serves the query's filter.
+
+    Sequential scans are disabled because the test tables are too small
+    for index scans to be cheaper.
+    """
+    query = _executed_query(mocker=mocker, call=call)
+    db.execute(sa.text("SET LOCAL enable_seqscan = off"))
+    assert index in _scanned_indexes(db=db, query=query)
+
+
+def _executed_partitions(plan: dict[str, Any]) -> set[str]:
+    """Return the names of the candidate partitions scanned by an analyzed
+    query plan node and its children. Partitions pruned while the query
+    was executed are never scanned.
+    """
+    names = (
+        {plan["Relation Name"]}
+        if plan.get("Relation Name", "").startswith(
+            ("candidate_", "sp_candidate_"),
+        )
+        and plan["Actual Loops"] > 0
+        else set()
+    )
+    for child in plan.get("Plans", []):
+        names |= _executed_partitions(child)
+    return names
+
+
+def test_candidate_partitions_are_pruned(
+    db: Session,
+    mocker: MockerFixture,
+) -> None:
+    """Given monthly candidate partitions and an observation whose
+    candidates were observed within one month,
+    When the query executed by the repository for the observation's sp
+    candidates is analyzed,
+    Then the plan should only scan that month's partitions.
+    """
+    args = {
+        "id": 1,
+        "schedule_block_id": 1,
+        "observation_id": 1,
+        "coherent_beam_config_id": 1,
+        "host_id": 1,
+        "beam_id": 1,
+    }
+    db.add(datagen.sb_data_generator(**args))
+    db.add(datagen.obs_data_generator(**args))
+    db.add(datagen.cb_config_data_generator(**args))
+    db.add(datagen.host_data_generator(**args))
+    db.add(datagen.beam_data_generator(**args))
+    observed_at = dt.datetime(2024, 6, 15, tzinfo=dt.UTC)
+    db.execute(
+        CREATE_PARTITIONS,
+        {
+            "observed_at": [
+                dt.datetime(2024, 5, 15, tzinfo=dt.UTC),
+                observed_at,
+            ],
+        },
+    )
+    candidate = Candidate(
+        dm=1,
+        snr=1,
+        width=1,
+        ra=1,
+        dec=1,
+        pos="(1d, 1d)",
+        observed_at=observed_at,
+        beam_id=1,
+    )
+    db.add(candidate)
+    db.flush()
+    db.add(
+        SPCandidate(
+            plot_path="/plots/1.png",
+            candidate_id=candidate.id,
+            observed_at=observed_at,
+        ),
+    )
+    db.commit()
+
+    query = _executed_query(
+        mocker=mocker,
+        call=lambda db: Factory.sp_candidate_repository().get_all(
+            db=db,
+            join_=SP_CANDIDATE_JOINS,
+            q={"observation_id": [1]},
+            keyset_=CANDIDATE_KEYSET,
+            load_=["candidate"],
+        ),
+    )
+    plan = _explain(db=db, query=query, analyze=True)
+    assert _executed_partitions(plan) == {
+        "candidate_2024_06",
+        "sp_candidate_2024_06",
+    }
@@ -8,11 +8,14 @@ from typing import Any
 import pytest
 import pytest_asyncio
 import sqlalchemy as sa
-from ska_src_maltopuft_backend.app.models import User
+from ska_src_maltopuft_backend.app.models import Candidate, Label, User
 from ska_src_maltopuft_backend.app.schemas.requests import CreateUser
 from ska_src_maltopuft_backend.core.database.base import Base
 from ska_src_maltopuft_backend.core.repository import BaseRepository
+from ska_src_maltopuft_backend.label.repository import LabelRepository
 from sqlalchemy import Select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, Session, mapped_column
 from sqlalchemy.orm.exc import ObjectDeletedError
 
@@ -55,6 +58,38 @@ async def test_get_all(
     assert len(users) == 2
 
 
+@pytest.mark.asyncio()
+async def test_get_all_with_async_session(
+    async_db: AsyncSession,
+    repository: BaseRepository,
+) -> None:
+    """Given two users are created in the database with an asyncio session,
+    When all users are retrieved and counted with the asyncio session,
+    Then the result should have two records.
+    """
+    await repository.create(db=async_db, attributes=user_data_generator())
+    await repository.create(db=async_db, attributes=user_data_generator())
+    await async_db.flush()
+
+    users = await repository.get_all(db=async_db)
+    assert len(users) == 2
+    assert await repository.count(db=async_db) == 2
+
+
+@pytest.mark.asyncio()
+async def test_create_many_with_async_session(
+    async_db: AsyncSession,
+    repository: BaseRepository,
+) -> None:
+    """Given a list of valid user data,
+    When the users are bulk created with an asyncio session,
+    Then an id should be returned for each user.
+    """
+    users = [user_data_generator() for _ in range(3)]
+    ids = await repository.create_many(db=async_db, objects=users)
+    assert len(ids) == 3
+
+
 @pytest.mark.asyncio()
 async def test_get_by(db: Session, repository: BaseRepository) -> None:
     """Given a user exists in the database,
@@ -650,3 +685,64 @@ def test_has_pos_filter_with_valid_params(repository: BaseRepository) -> None:
         "radius": 1,
     }
     assert repository._has_pos_filter_params(q=q)
+
+
+def test_pos_filter_uses_indexed_expression() -> None:
+    """The cone search predicate compares the indexed pgSphere point
+    expression with a circle in radians.
+    """
+    candidate_repository = BaseRepository(model=Candidate)
+    query = candidate_repository._apply_filters(
+        query=sa.select(Candidate),
+        q={
+            "ra": 90.75270833,
+            "dec": -40.05644444,
+            "pos": "(6h03m00.65s,-40d03m23.2s)",
+            "radius": 1,
+        },
+    )
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert (
+        "spoint(radians(candidate.ra), radians(candidate.dec)) @ "
+        "scircle(spoint(radians(" in sql
+    )
+
+
+def test_load_plan_reuses_joins() -> None:
+    """Relationships to joined tables are loaded from the join, other
+    relationships are loaded in the same query with an outer join.
+    """
+    label_repository = LabelRepository(model=Label)
+    query = label_repository._build_query(
+        join_=["candidate"],
+        load_=["candidate", "candidate.sp_candidate", "labeller"],
+    )
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert sql.count("JOIN candidate ") == 1
+    assert "LEFT OUTER JOIN sp_candidate AS sp_candidate_1" in sql
+    assert 'LEFT OUTER JOIN "user" AS user_1' in sql
+
+
+def test_load_plan_selectin_loads() -> None:
+    """Relationships in the repository's selectin_loads are loaded in a
+    separate query instead of being joined.
+    """
+    label_repository = LabelRepository(model=Label)
+    query = label_repository._build_query(
+        join_=["candidate"],
+        load_=["candidate", "entity", "labeller"],
+    )
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert "JOIN entity" not in sql
+    assert 'LEFT OUTER JOIN "user" AS user_1' in sql
+
+
+def test_load_plan_with_invalid_relationship() -> None:
+    """A load plan path containing a column or unknown attribute raises a
+    ValueError.
+    """
+    label_repository = BaseRepository(model=Label)
+    with pytest.raises(ValueError, match="Invalid relationship"):
+        label_repository._build_query(load_=["candidate.dm"])
+    with pytest.raises(ValueError, match="Invalid relationship"):
+        label_repository._build_query(load_=["not_a_relationship"])